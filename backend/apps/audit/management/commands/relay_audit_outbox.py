@@ -0,0 +1,70 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.utils import DatabaseError
+
+from apps.audit.outbox import relay_audit_outbox
+from apps.audit.producers import get_audit_producer
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Relay audit records from the audit_outbox table to the Kafka audit topic"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.AUDIT_OUTBOX_BATCH_SIZE,
+            help="Maximum number of records produced per batch",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.AUDIT_OUTBOX_POLL_INTERVAL,
+            help="Seconds to wait when the outbox is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        poll_interval = options["poll_interval"]
+        producer = get_audit_producer()
+
+        self._running = True
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+
+        total = 0
+        try:
+            while self._running:
+                try:
+                    relayed = relay_audit_outbox(batch_size=batch_size, producer=producer)
+                except DatabaseError:
+                    logger.exception("Audit outbox relay failed, retrying")
+                    close_old_connections()
+                    relayed = 0
+                total += relayed
+
+                if relayed < batch_size:
+                    if options["once"]:
+                        break
+                    # a full batch means there is more backlog, only idle when drained
+                    time.sleep(poll_interval)
+        finally:
+            producer.flush()
+
+        self.stdout.write(self.style.SUCCESS(f"Relayed {total} audit record(s)."))
+
+    def _stop(self, *_):
+        self._running = False
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-03-28 10:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditOutbox',
+            fields=[
+                ('id', models.BigAutoField(editable=False, primary_key=True, serialize=False)),
+                ('payload', models.JSONField(help_text='AuditRecord.to_record() payload')),
+                (
+                    'key',
+                    models.CharField(help_text='Kafka message key (event type)', max_length=100),
+                ),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'audit_outbox',
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-04-02 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_audit_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditoutbox',
+            name='locked_until',
+            field=models.DateTimeField(
+                blank=True,
+                help_text='Lease of the relay producing the record, free once it has passed',
+                null=True,
+            ),
+        ),
+    ]
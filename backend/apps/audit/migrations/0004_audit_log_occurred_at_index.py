@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_auditoutbox_locked_until'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['occurred_at'], name='idx_audit_occurred_at'),
+        ),
+    ]
@@ -1,3 +1,4 @@
 from .audit_log import AuditLog
+from .audit_outbox import AuditOutbox
 
-__all__ = ['AuditLog']
+__all__ = ['AuditLog', 'AuditOutbox']
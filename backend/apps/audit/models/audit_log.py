@@ -47,6 +47,8 @@ class AuditLog(models.Model):
         db_table = 'audit_logs'
         ordering = ['-occurred_at']
         indexes = [
+            # default ordering and the admin date_hierarchy
+            models.Index(fields=['occurred_at'], name='idx_audit_occurred_at'),
             models.Index(
                 fields=['entity_type', 'entity_id', 'occurred_at'],
                 name='idx_audit_entity_time',
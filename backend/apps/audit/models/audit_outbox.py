@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils import timezone
+
+
+class AuditOutbox(models.Model):
+    """
+    Audit record waiting to be relayed to Kafka.
+
+    Written in the same transaction as the domain change it describes and deleted
+    by the relay once produced, so the table only holds the undelivered backlog.
+    """
+
+    id = models.BigAutoField(primary_key=True, editable=False)
+    payload = models.JSONField(help_text='AuditRecord.to_record() payload')
+    key = models.CharField(max_length=100, help_text='Kafka message key (event type)')
+    created_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Lease of the relay producing the record, free once it has passed',
+    )
+
+    class Meta:
+        db_table = 'audit_outbox'
@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+from typing import Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.audit.audit_record import AuditRecord
+from apps.audit.models import AuditOutbox
+from apps.audit.producers import get_audit_producer
+from producers.kafka_producer import KafkaProducer, ProduceResult
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_audit_event(*, event: AuditRecord) -> None:
+    """Store an audit event in the outbox, in the caller's transaction."""
+    enqueue_audit_events(events=[event])
+
+
+def enqueue_audit_events(*, events: Sequence[AuditRecord]) -> None:
+    """
+    Store audit events in the outbox with one INSERT.
+
+    Called inside the transaction of the domain change they describe: the records
+    are committed (or rolled back) together with it and relayed to Kafka later by
+    `relay_audit_outbox`, so the caller never waits for the broker.
+    """
+    if not events:
+        return
+
+    AuditOutbox.objects.bulk_create(
+        [AuditOutbox(payload=event.to_record(), key=event.event_type) for event in events]
+    )
+
+
+def relay_audit_outbox(
+    *,
+    batch_size: int,
+    producer: Optional[KafkaProducer] = None,
+    flush_timeout: float = 5.0,
+) -> int:
+    """
+    Produce the oldest `batch_size` outbox records to the audit topic and delete
+    the ones the broker acknowledged. Returns the number of relayed records.
+
+    Records are claimed with a lease (locked_until) in a short SKIP LOCKED
+    transaction, so several relays can run side by side without holding row
+    locks while waiting for the broker. Only records whose delivery report came
+    back without error within `flush_timeout` are deleted; the lease of the
+    others is released and they are retried, the duplicates this may cause are
+    dropped by the audit writer on audit_event_id.
+    """
+    if producer is None:
+        producer = get_audit_producer()
+
+    rows = _claim_outbox_rows(batch_size=batch_size, lease_seconds=flush_timeout * 2)
+    if not rows:
+        return 0
+
+    delivered: list[int] = []
+
+    def on_delivery(index: int, error) -> None:
+        if error is None:
+            delivered.append(rows[index][0])
+
+    results = producer.produce_batch(
+        ((payload, key) for _, payload, key in rows), on_delivery=on_delivery
+    )
+    undelivered = producer.flush(flush_timeout)
+
+    done = set(delivered)
+    for (outbox_id, _, _), result in zip(rows, results):
+        if result == ProduceResult.SERIALIZATION_FAILED:
+            # retrying cannot help, drop it instead of blocking the outbox
+            logger.error('Audit outbox record %s cannot be serialized, dropped', outbox_id)
+            done.add(outbox_id)
+
+    retried = len(rows) - len(done)
+    if retried:
+        logger.warning(
+            'Audit outbox: %s record(s) not delivered (%s still in flight after %ss), '
+            'they will be retried',
+            retried,
+            undelivered,
+            flush_timeout,
+        )
+
+    ids = [outbox_id for outbox_id, _, _ in rows]
+    with transaction.atomic():
+        AuditOutbox.objects.filter(id__in=done).delete()
+        AuditOutbox.objects.filter(id__in=ids).update(locked_until=None)
+
+    return len(done)
+
+
+def _claim_outbox_rows(*, batch_size: int, lease_seconds: float) -> list[tuple[int, dict, str]]:
+    """Lease the oldest free outbox records to this relay, the row locks end with the claim."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            AuditOutbox.objects.select_for_update(skip_locked=True)
+            .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+            .order_by('id')
+            .values_list('id', 'payload', 'key')[:batch_size]
+        )
+        if rows:
+            AuditOutbox.objects.filter(id__in=[outbox_id for outbox_id, _, _ in rows]).update(
+                locked_until=now + timedelta(seconds=lease_seconds)
+            )
+    return rows
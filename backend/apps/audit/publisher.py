@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Sequence
 
 from apps.audit.audit_record import AuditRecord
 from apps.audit.producers import get_audit_producer
@@ -19,3 +19,19 @@ def publish_audit_event(
         payload=event.to_record(),
         key=event.event_type,
     )
+
+
+def publish_audit_events(
+    *,
+    events: Sequence[AuditRecord],
+    producer: Optional[KafkaProducer] = None,
+) -> list[ProduceResult]:
+    """Publish a batch of audit events to Kafka with a single producer poll."""
+
+    if not events:
+        return []
+
+    if producer is None:
+        producer = get_audit_producer()
+
+    return producer.produce_batch((event.to_record(), event.event_type) for event in events)
@@ -2,6 +2,7 @@ import datetime
 import uuid
 from typing import Any, Optional
 
+from apps.audit.models import AuditLog
 from apps.audit.types import AuditLogCreateData
 from apps.common.serializers import JSONSerializer, BaseSerializer
 from utils.normalization import normalize_str, parse_iso8601_utc
@@ -29,9 +30,13 @@ class AuditLogSerializer(JSONSerializer):
             'entity_type': normalize_str(data.get('entity_type')),
             'entity_id': self._normalize_id(data.get('entity_id')),
             'event_type': normalize_str(data.get('event_type')),
-            'actor_type': normalize_str(data.get('actor_type', '')),
+            'actor_type': self._validate_choice(
+                'actor_type', data.get('actor_type'), AuditLog.Actor.values
+            ),
             'actor_id': self._normalize_id(data.get('actor_id')),
-            'severity': normalize_str(data.get('severity', '')),
+            'severity': self._validate_choice(
+                'severity', data.get('severity'), AuditLog.Severity.values
+            ),
             'occurred_at': self._validate_occurred_at(data.get('occurred_at')),
             'details': self._validate_details(data.get('details')),
         }
@@ -54,6 +59,18 @@ class AuditLogSerializer(JSONSerializer):
             return s or None
         return None
 
+    def _validate_choice(
+        self, field: str, value_raw: Optional[str], choices: list[str]
+    ) -> Optional[str]:
+        value = normalize_str(value_raw or '')
+        if not value:
+            return None
+        value = value.lower()
+        if value not in choices:
+            self._errors[field] = f'{field} must be one of: {choices}.'
+            return None
+        return value
+
     def _validate_audit_event_id(self, audit_event_id_raw: str) -> Optional[uuid.UUID]:
         try:
             return uuid.UUID(normalize_str(audit_event_id_raw))
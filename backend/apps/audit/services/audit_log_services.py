@@ -1,8 +1,14 @@
+import json
 from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Sequence
 from uuid import UUID
 
+from django.db import connection, transaction
+
 from apps.audit.types import AuditLogCreateData
 from apps.audit.models import AuditLog
+from apps.common.utils.db_utils import delete_older_than_batch
 from utils.dicts import normalize_schema
 
 REQUIRED_FIELDS = {"audit_event_id", "entity_type", "entity_id", "event_type"}
@@ -10,11 +16,26 @@ OPTIONAL_FIELDS = {"actor_type", "actor_id", "severity", "occurred_at", "details
 ALLOWED_ACTOR_TYPES = AuditLog.Actor.values
 ALLOWED_SEVERITIES = AuditLog.Severity.values
 
+COPY_COLUMNS = (
+    'audit_event_id',
+    'actor_type',
+    'actor_id',
+    'entity_type',
+    'entity_id',
+    'event_type',
+    'severity',
+    'occurred_at',
+    'details',
+)
+STAGING_TABLE = 'audit_logs_staging'
+
 
 @dataclass(slots=True)
 class AuditLogCreateResult:
     attempted: int = 0
     created: int = 0
+    # valid items skipped because their audit_event_id was already stored or repeated
+    duplicates: int = 0
     errors: dict[int, dict[str, str]] = field(default_factory=dict)
 
     def add_error(self, i: int, field: str, message: str) -> None:
@@ -27,14 +48,14 @@ def audit_log_create_batch(data: list[AuditLogCreateData]) -> AuditLogCreateResu
 
     - Deduplicates by audit_event_id within the batch.
     - Validates optional actor_type/severity against model choices.
-    - Inserts via bulk_create(ignore_conflicts=True) for idempotency.
+    - Inserts with `audit_log_insert_batch`, skipping already stored audit_event_ids.
     """
     result = AuditLogCreateResult(attempted=len(data))
     if not data:
         return result
 
     # collect valid items
-    to_create: list[AuditLog] = []
+    to_create: list[AuditLogCreateData] = []
     seen: set[UUID] = set()
 
     for i, entry in enumerate(data):
@@ -74,9 +95,73 @@ def audit_log_create_batch(data: list[AuditLogCreateData]) -> AuditLogCreateResu
                 continue
             normalized["severity"] = severity
 
-        to_create.append(AuditLog(**normalized))
+        to_create.append(normalized)
+
+    result.created = _copy_insert([_copy_row(item) for item in to_create])
+    result.duplicates = len(to_create) - result.created
+    return result
+
 
-    AuditLog.objects.bulk_create(to_create, ignore_conflicts=True)
+def audit_log_insert_batch(items: Sequence[AuditLogCreateData]) -> AuditLogCreateResult:
+    """
+    Insert items already validated and normalized by AuditLogSerializer.
 
-    result.created = len(to_create)
+    Items repeating an audit_event_id (within the batch or already stored) are
+    counted as duplicates, so `created` is the number of rows actually inserted.
+    """
+    result = AuditLogCreateResult(attempted=len(items))
+    unique: dict[UUID, AuditLogCreateData] = {}
+    for item in items:
+        unique.setdefault(item['audit_event_id'], item)
+    if not unique:
+        return result
+
+    result.created = _copy_insert([_copy_row(item) for item in unique.values()])
+    result.duplicates = result.attempted - result.created
     return result
+
+
+def audit_log_delete_expired_batch(*, older_than: datetime, batch_size: int) -> int:
+    """Delete one batch of audit logs that occurred before `older_than`, oldest first."""
+    return delete_older_than_batch(
+        AuditLog, time_field='occurred_at', older_than=older_than, batch_size=batch_size
+    )
+
+
+def _copy_row(item: AuditLogCreateData) -> tuple:
+    """COPY_COLUMNS values of an item, with model defaults for omitted fields."""
+    row = []
+    for column in COPY_COLUMNS:
+        value = item.get(column)
+        if value is None:
+            value = AuditLog._meta.get_field(column).get_default()
+        if column == 'details':
+            value = json.dumps(value)
+        row.append(value)
+    return tuple(row)
+
+
+def _copy_insert(rows: list[tuple]) -> int:
+    """
+    COPY rows into a session temp table and move them to audit_logs with one
+    INSERT ... SELECT ... ON CONFLICT (audit_event_id) DO NOTHING.
+    Returns the number inserted.
+    """
+    if not rows:
+        return 0
+
+    columns = ', '.join(COPY_COLUMNS)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} AS '
+            f'SELECT {columns} FROM {AuditLog._meta.db_table} WITH NO DATA'
+        )
+        cursor.execute(f'TRUNCATE {STAGING_TABLE}')
+        with cursor.copy(f'COPY {STAGING_TABLE} ({columns}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(
+            f'INSERT INTO {AuditLog._meta.db_table} ({columns}) '
+            f'SELECT {columns} FROM {STAGING_TABLE} ON CONFLICT (audit_event_id) DO NOTHING'
+        )
+        return cursor.rowcount
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.utils import timezone
+
+from apps.audit.services.audit_log_services import audit_log_delete_expired_batch
+
+logger_celery = get_task_logger(__name__)
+
+
+@shared_task
+def prune_expired_audit_logs():
+    """
+    Periodic task that deletes audit logs older than AUDIT_LOG_RETENTION_DAYS,
+    batch by batch. AUDIT_LOG_RETENTION_DAYS=0 keeps audit logs forever.
+    """
+    if not settings.AUDIT_LOG_RETENTION_DAYS:
+        return
+    older_than = timezone.now() - timedelta(days=settings.AUDIT_LOG_RETENTION_DAYS)
+    batch_size = settings.RETENTION_DELETE_BATCH_SIZE
+
+    total = 0
+    while True:
+        deleted = audit_log_delete_expired_batch(older_than=older_than, batch_size=batch_size)
+        total += deleted
+        if deleted < batch_size:
+            break
+
+    if total:
+        logger_celery.info("Deleted %s expired audit logs.", total)
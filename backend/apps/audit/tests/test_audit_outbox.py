@@ -0,0 +1,172 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from apps.audit.audit_record import AuditActor, AuditEntity, AuditRecord
+from apps.audit.models import AuditOutbox
+from apps.audit.outbox import enqueue_audit_event, enqueue_audit_events, relay_audit_outbox
+from producers.config import ProducerConfig
+from producers.kafka_producer import KafkaProducer, ProduceResult
+
+pytestmark = pytest.mark.django_db
+
+
+def make_record(entity_id: str = "42") -> AuditRecord:
+    return AuditRecord(
+        actor=AuditActor.user(7),
+        entity=AuditEntity(type="rules.Rule", id=entity_id),
+        event_type="rules.RULE_UPDATED",
+        details={"changed_fields": ["name"]},
+    )
+
+
+def make_producer(results=None, undelivered=0, failed=()):
+    """
+    Fake producer reporting every enqueued message as delivered on flush(),
+    except the last `undelivered` ones (no report) and the indexes in `failed`
+    (error report).
+    """
+    producer = MagicMock()
+    producer.produced = []
+    pending = []
+
+    def produce_batch(messages, on_delivery=None):
+        messages = list(messages)
+        producer.produced.extend(messages)
+        batch = [results.pop(0) if results else ProduceResult.ENQUEUED for _ in messages]
+        pending.extend(
+            (on_delivery, index)
+            for index, result in enumerate(batch)
+            if result == ProduceResult.ENQUEUED
+        )
+        return batch
+
+    def flush(timeout=None):
+        reported = pending[: len(pending) - undelivered]
+        for on_delivery, index in reported:
+            on_delivery(index, "broker error" if index in failed else None)
+        pending.clear()
+        return undelivered
+
+    producer.produce_batch.side_effect = produce_batch
+    producer.flush.side_effect = flush
+    return producer
+
+
+def test_enqueue_stores_the_kafka_record():
+    record = make_record()
+
+    enqueue_audit_event(event=record)
+
+    row = AuditOutbox.objects.get()
+    assert row.payload == record.to_record()
+    assert row.key == "rules.RULE_UPDATED"
+
+
+def test_enqueue_is_rolled_back_with_the_transaction():
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            enqueue_audit_events(events=[make_record(), make_record()])
+            raise RuntimeError
+
+    assert not AuditOutbox.objects.exists()
+
+
+def test_relay_produces_oldest_batch_and_deletes_it():
+    records = [make_record(str(i)) for i in range(3)]
+    enqueue_audit_events(events=records)
+    producer = make_producer()
+
+    assert relay_audit_outbox(batch_size=2, producer=producer) == 2
+
+    assert producer.produced == [(r.to_record(), r.event_type) for r in records[:2]]
+    producer.flush.assert_called_once()
+    [left] = AuditOutbox.objects.all()
+    assert left.payload["entity_id"] == "2"
+
+
+def test_relay_keeps_records_whose_delivery_is_not_confirmed():
+    enqueue_audit_events(events=[make_record("ok"), make_record("late")])
+
+    assert relay_audit_outbox(batch_size=10, producer=make_producer(undelivered=1)) == 1
+
+    [left] = AuditOutbox.objects.all()
+    assert left.payload["entity_id"] == "late"
+    assert left.locked_until is None
+
+
+def test_relay_keeps_records_that_failed_delivery():
+    enqueue_audit_events(events=[make_record("failed"), make_record("ok")])
+
+    assert relay_audit_outbox(batch_size=10, producer=make_producer(failed={0})) == 1
+
+    [left] = AuditOutbox.objects.all()
+    assert left.payload["entity_id"] == "failed"
+
+
+def test_relay_skips_records_leased_by_another_relay():
+    enqueue_audit_events(events=[make_record("leased"), make_record("free")])
+    AuditOutbox.objects.filter(payload__entity_id="leased").update(
+        locked_until=timezone.now() + timedelta(seconds=30)
+    )
+    producer = make_producer()
+
+    assert relay_audit_outbox(batch_size=10, producer=producer) == 1
+
+    assert [payload["entity_id"] for payload, _ in producer.produced] == ["free"]
+    assert AuditOutbox.objects.get().payload["entity_id"] == "leased"
+
+
+def test_relay_keeps_rejected_records_and_drops_unserializable_ones():
+    enqueue_audit_events(events=[make_record("ok"), make_record("full"), make_record("bad")])
+    producer = make_producer(
+        results=[
+            ProduceResult.ENQUEUED,
+            ProduceResult.BUFFER_FULL,
+            ProduceResult.SERIALIZATION_FAILED,
+        ]
+    )
+
+    assert relay_audit_outbox(batch_size=10, producer=producer) == 2
+
+    [left] = AuditOutbox.objects.all()
+    assert left.payload["entity_id"] == "full"
+
+
+def test_relay_with_empty_outbox_does_not_produce():
+    producer = make_producer()
+
+    assert relay_audit_outbox(batch_size=10, producer=producer) == 0
+    producer.produce_batch.assert_not_called()
+
+
+def test_relay_command_once_drains_the_outbox(mocker):
+    enqueue_audit_events(events=[make_record(str(i)) for i in range(5)])
+    producer = make_producer()
+    mocker.patch(
+        "apps.audit.management.commands.relay_audit_outbox.get_audit_producer",
+        return_value=producer,
+    )
+
+    call_command("relay_audit_outbox", "--once", "--batch-size", "2", stdout=MagicMock())
+
+    assert not AuditOutbox.objects.exists()
+    assert producer.produce_batch.call_count == 3
+
+
+def test_produce_batch_reports_delivery_per_message(mocker):
+    kafka = mocker.patch("producers.kafka_producer.Producer").return_value
+    producer = KafkaProducer(config=ProducerConfig(), topic="audit")
+    reports = []
+
+    producer.produce_batch(
+        [({"a": 1}, "k"), ({"b": 2}, "k")], on_delivery=lambda *r: reports.append(r)
+    )
+    for index, call in enumerate(kafka.produce.call_args_list):
+        call.kwargs["on_delivery"](None if index else "timed out", MagicMock())
+
+    assert reports == [(0, "timed out"), (1, None)]
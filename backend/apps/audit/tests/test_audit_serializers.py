@@ -226,3 +226,24 @@ def test_audit_batch_serializer_all_invalid_items_returns_errors(valid_audit_log
     assert 1 in s.errors['items']
     assert 'entity_type' in s.errors['items'][0]
     assert 'occurred_at' in s.errors['items'][1]
+
+
+def test_audit_serializer_normalizes_choices_to_lowercase(valid_audit_log_payload):
+    """Test actor_type/severity are lowercased in the single validation pass."""
+    payload = dict(valid_audit_log_payload, actor_type='SyStEm', severity='WARNING')
+
+    s = AuditLogSerializer(payload)
+    assert s.is_valid() is True, s.errors
+
+    assert s.validated_data['actor_type'] == 'system'
+    assert s.validated_data['severity'] == 'warning'
+
+
+@pytest.mark.parametrize('field', ['actor_type', 'severity'])
+def test_audit_serializer_rejects_unknown_choice(valid_audit_log_payload, field):
+    """Test actor_type/severity outside the model choices are rejected."""
+    payload = dict(valid_audit_log_payload, **{field: 'unknown'})
+
+    s = AuditLogSerializer(payload)
+    assert s.is_valid() is False
+    assert field in s.errors
@@ -1,11 +1,17 @@
 import uuid
+from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from apps.audit.models import AuditLog
+from apps.audit.tasks import prune_expired_audit_logs
 from apps.audit.types import AuditLogCreateData
 from apps.audit.services.audit_log_services import (
     audit_log_create_batch,
+    audit_log_insert_batch,
     REQUIRED_FIELDS,
 )
 
@@ -155,3 +161,76 @@ def test_ignore_conflicts_skips_existing_audit_event_id(make_entry):
 
     assert result.attempted == 1
     assert AuditLog.objects.filter(audit_event_id=audit_event_id).count() == 1
+
+
+@pytest.mark.django_db
+def test_existing_audit_event_id_is_not_counted_as_created(make_entry):
+    """Test created only counts rows actually inserted."""
+    existing = make_entry()
+    audit_log_create_batch([existing])
+
+    result = audit_log_create_batch([make_entry(audit_event_id=existing["audit_event_id"])])
+
+    assert result.created == 0
+    assert result.duplicates == 1
+
+
+@pytest.mark.django_db
+def test_insert_batch_reports_created_and_duplicates(make_entry):
+    """Test validated items are inserted with real created/duplicate counts."""
+    stored = make_entry()
+    audit_log_insert_batch([stored])
+    new = make_entry()
+
+    result = audit_log_insert_batch([stored, new, dict(new)])
+
+    assert result.attempted == 3
+    assert result.created == 1
+    assert result.duplicates == 2
+    assert AuditLog.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_insert_batch_fills_model_defaults(make_entry):
+    """Test omitted optional fields get the model defaults."""
+    entry = make_entry()
+
+    audit_log_insert_batch([entry])
+
+    obj = AuditLog.objects.get(audit_event_id=entry["audit_event_id"])
+    assert obj.actor_type == AuditLog.Actor.SYSTEM
+    assert obj.severity == AuditLog.Severity.INFO
+    assert obj.actor_id is None
+    assert obj.occurred_at is not None
+    assert obj.details == {"changed_fields": ["name"]}
+
+
+@pytest.mark.django_db
+def test_insert_batch_runs_one_insert(make_entry):
+    """Test the batch is written with COPY plus a single INSERT ... SELECT."""
+    entries = [make_entry() for _ in range(50)]
+
+    with CaptureQueriesContext(connection) as queries:
+        result = audit_log_insert_batch(entries)
+
+    inserts = [q["sql"] for q in queries.captured_queries if "INSERT INTO audit_logs" in q["sql"]]
+    assert len(inserts) == 1
+    assert "SELECT" in inserts[0]
+    assert result.created == 50
+
+
+@pytest.mark.django_db
+def test_prune_expired_audit_logs_deletes_old_rows_in_batches(make_entry, settings):
+    """Test audit logs older than the retention are deleted batch by batch."""
+    settings.AUDIT_LOG_RETENTION_DAYS = 30
+    settings.RETENTION_DELETE_BATCH_SIZE = 2
+    old = timezone.now() - timedelta(days=31)
+    audit_log_create_batch([make_entry(occurred_at=old) for _ in range(3)])
+    recent = make_entry()
+    audit_log_create_batch([recent])
+
+    prune_expired_audit_logs()
+
+    assert list(AuditLog.objects.values_list("audit_event_id", flat=True)) == [
+        recent["audit_event_id"]
+    ]
@@ -12,7 +12,16 @@ Usage:
     ingestion_messages_total.labels(source='mqtt', status='success').inc()
 """
 
-from prometheus_client import Counter, Histogram, Gauge
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
 
 # ============================================================
 # INGESTION METRICS (MQTT / Kafka)
@@ -69,6 +78,54 @@ events_created_total = Counter(
     ['severity'],  # info, warning, critical
 )
 
+# maintained with inc/dec deltas from every process, so the aggregate is their sum
 events_unacknowledged = Gauge(
-    'iot_events_unacknowledged_total', 'Current number of unacknowledged events'
+    'iot_events_unacknowledged_total',
+    'Current number of unacknowledged events',
+    multiprocess_mode='sum',
+)
+
+# ============================================================
+# DELIVERY METRICS
+# ============================================================
+
+webhook_deliveries_total = Counter(
+    'iot_webhook_deliveries_total',
+    'Webhook delivery attempts made by the async delivery worker',
+    ['outcome'],  # success, retry, rejected, parked
+)
+
+webhook_delivery_seconds = Histogram(
+    'iot_webhook_delivery_seconds',
+    'Duration of a single webhook HTTP request',
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
 )
+
+# ============================================================
+# WEBSOCKET METRICS
+# ============================================================
+
+websocket_frames_total = Counter(
+    'iot_websocket_frames_total',
+    'Telemetry frames handled per WebSocket connection by delivery mode',
+    # mode: stream/batch/latest/replay, outcome: sent, dropped, conflated, duplicate
+    ['mode', 'outcome'],
+)
+
+
+def scrape_registry() -> CollectorRegistry:
+    """
+    Registry as exposed on /metrics: aggregated over all processes when
+    PROMETHEUS_MULTIPROC_DIR is set, the default registry otherwise.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def reported_value(metric) -> float:
+    """Current value of an unlabeled metric as Prometheus would scrape it."""
+    name = metric.describe()[0].name
+    return scrape_registry().get_sample_value(name) or 0
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Sequence, TypeVar
+
+from django.db import connection, models, transaction
+
+ModelT = TypeVar('ModelT', bound=models.Model)
+
+
+def to_python_values(obj: ModelT) -> ModelT:
+    """
+    Convert raw field values (e.g. strings from a JSON payload) of an unsaved instance
+    to their Python types in place, so bad items can be rejected one by one before a
+    bulk insert. Raises ValidationError for values a field cannot convert.
+    """
+    for field in obj._meta.concrete_fields:
+        if not field.primary_key:
+            setattr(obj, field.attname, field.to_python(getattr(obj, field.attname)))
+    return obj
+
+
+def bulk_insert_ignore_conflicts(
+    objs: Sequence[ModelT],
+    *,
+    conflict_fields: Sequence[str],
+) -> list[ModelT]:
+    """
+    Insert unsaved model instances with one multi-row
+    INSERT ... ON CONFLICT (conflict_fields) DO NOTHING RETURNING statement.
+
+    Unlike bulk_create(ignore_conflicts=True), the rows actually inserted are known:
+    the returned instances have their primary key set, conflicting ones are dropped.
+    Instances must have distinct values for `conflict_fields`.
+    """
+    if not objs:
+        return []
+
+    meta = objs[0]._meta
+    quote = connection.ops.quote_name
+    pk = meta.pk
+    fields = [f for f in meta.concrete_fields if f is not pk or f.has_default()]
+    conflict_columns = [meta.get_field(name).column for name in conflict_fields]
+
+    params = []
+    for obj in objs:
+        params.extend(f.get_db_prep_save(f.pre_save(obj, add=True), connection) for f in fields)
+
+    row = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    sql = (
+        f'INSERT INTO {quote(meta.db_table)} ({", ".join(quote(f.column) for f in fields)}) '
+        f'VALUES {", ".join([row] * len(objs))} '
+        f'ON CONFLICT ({", ".join(quote(c) for c in conflict_columns)}) DO NOTHING '
+        f'RETURNING {quote(pk.column)}, {", ".join(quote(c) for c in conflict_columns)}'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        inserted = {tuple(row[1:]): row[0] for row in cursor.fetchall()}
+
+    created = []
+    for obj in objs:
+        key = tuple(
+            meta.get_field(name).get_db_prep_value(getattr(obj, name), connection)
+            for name in conflict_fields
+        )
+        pk_value = inserted.get(key)
+        if pk_value is not None:
+            obj.pk = pk_value
+            obj._state.adding = False
+            obj._state.db = connection.alias
+            created.append(obj)
+    return created
+
+
+def delete_older_than_batch(
+    model: type[models.Model], *, time_field: str, older_than: datetime, batch_size: int
+) -> int:
+    """
+    Delete one batch of the oldest rows whose `time_field` is before `older_than`,
+    walking an index on `time_field`. Returns the number of deleted rows.
+
+    Plain-table retention: callers loop until a batch comes back smaller than
+    `batch_size`, so no statement holds locks on more than `batch_size` rows.
+    """
+    quote = connection.ops.quote_name
+    meta = model._meta
+    table = quote(meta.db_table)
+    pk = quote(meta.pk.column)
+    column = quote(meta.get_field(time_field).column)
+    sql = f"""
+        DELETE FROM {table}
+        WHERE {pk} IN (
+            SELECT {pk} FROM {table}
+            WHERE {column} < %s
+            ORDER BY {column}
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [older_than, batch_size])
+        return cursor.rowcount
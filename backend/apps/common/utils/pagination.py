@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, TypeVar
+
+from django.db import connection, models
+from django.db.models import QuerySet
+
+ModelT = TypeVar('ModelT', bound=models.Model)
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+# below this many estimated rows an exact COUNT(*) is cheap enough to run instead
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque URL-safe cursor for the sort key `values` of the last item of a page."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, *, size: int) -> list[Any]:
+    """
+    Decode a cursor made by `encode_cursor` into its `size` sort key values.
+    Raises ValueError for malformed cursors.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError('Invalid cursor.') from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def keyset_page(queryset: QuerySet[ModelT], *, limit: int) -> tuple[list[ModelT], bool]:
+    """
+    Fetch one page of an already ordered and cursor-filtered queryset.
+    Returns the items and whether there are more after them.
+    """
+    items = list(queryset[: limit + 1])
+    return items[:limit], len(items) > limit
+
+
+def parse_count_mode(raw: Optional[str]) -> Optional[str]:
+    """Count mode of a `count` query param (estimate by default), None when invalid."""
+    if raw is None or raw == '':
+        return COUNT_ESTIMATE
+    mode = raw.strip().lower()
+    return mode if mode in COUNT_MODES else None
+
+
+def estimated_count(queryset: QuerySet) -> int:
+    """
+    Row count estimate without scanning the table: pg_class statistics for an
+    unfiltered queryset, the planner's row estimate otherwise.
+    """
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0 for partitioned/hypertable parents) until analyzed
+        if row and row[0] > 0:
+            return row[0]
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(queryset: QuerySet, *, mode: str) -> tuple[Optional[int], bool]:
+    """
+    Total for a list response as (count, is_estimate).
+
+    `exact` always runs COUNT(*), `none` skips counting (count is None) and
+    `estimate` only runs COUNT(*) when the estimate is below EXACT_COUNT_THRESHOLD.
+    """
+    if mode == COUNT_NONE:
+        return None, False
+    if mode == COUNT_ESTIMATE:
+        estimate = estimated_count(queryset)
+        if estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate, True
+    return queryset.count(), False
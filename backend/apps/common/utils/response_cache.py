@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import time
+from functools import partial, wraps
+from typing import Optional, Sequence
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ALIAS = 'api'
+
+
+def generation_key(table: str) -> str:
+    return f'gen:{table}'
+
+
+def _initial_generation() -> int:
+    # a fresh counter (first use, eviction, flush) never repeats an earlier value
+    return time.time_ns()
+
+
+def _incr_generations(tables: Sequence[str]) -> None:
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    for table in tables:
+        key = generation_key(table)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                if not cache.add(key, _initial_generation(), timeout=None):
+                    cache.incr(key)
+        except Exception as exc:
+            logger.warning('Cannot bump response generation of %s: %s', table, exc)
+
+
+def bump_generation(*tables: str) -> None:
+    """
+    Invalidate the ETags and cached responses of every view depending on `tables`
+    once the current transaction commits, so no response built from the old rows
+    can be cached under the new generation.
+
+    Called by model signals; writes that bypass them (queryset.update, raw SQL)
+    must call it themselves.
+    """
+    transaction.on_commit(partial(_incr_generations, tables))
+
+
+def get_generations(tables: Sequence[str]) -> Optional[list[int]]:
+    """Current generation of each table, None when the cache is unavailable."""
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    keys = [generation_key(table) for table in tables]
+    try:
+        values = cache.get_many(keys)
+        for key in keys:
+            if key not in values:
+                cache.add(key, _initial_generation(), timeout=None)
+                values[key] = cache.get(key)
+    except Exception as exc:
+        logger.warning('Response cache unavailable: %s', exc)
+        return None
+    if any(values[key] is None for key in keys):
+        return None
+    return [values[key] for key in keys]
+
+
+def response_etag(request, tables: Sequence[str]) -> Optional[str]:
+    """
+    Validator of a GET response: the request URL and user plus the generation of
+    every table the response is built from. None when it cannot be computed.
+    """
+    generations = get_generations(tables)
+    if generations is None:
+        return None
+    user = request.user
+    material = '|'.join(
+        [
+            request.get_full_path(),
+            str(user.pk),
+            str(getattr(user, 'role', '')),
+            *(f'{table}:{generation}' for table, generation in zip(tables, generations)),
+        ]
+    )
+    return '"%s"' % hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+def conditional_response(*depends_on: type[models.Model]):
+    """
+    Decorator for authenticated JSON GET views built from the `depends_on` models.
+
+    Adds an ETag and answers 304 Not Modified to a matching If-None-Match without
+    running the view. With API_RESPONSE_CACHE_TTL > 0 successful bodies are also
+    cached per ETag (so per user and query) for that many seconds. When the cache
+    is down the view runs as if undecorated.
+    """
+    tables = [model._meta.db_table for model in depends_on]
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            etag = response_etag(request, tables)
+            if etag is None:
+                return view_func(request, *args, **kwargs)
+
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified.headers['ETag'] = etag
+                return not_modified
+
+            cache = caches[RESPONSE_CACHE_ALIAS]
+            body_key = f'response:{etag}'
+            ttl = settings.API_RESPONSE_CACHE_TTL
+            body = None
+            if ttl > 0:
+                try:
+                    body = cache.get(body_key)
+                except Exception as exc:
+                    logger.warning('Response cache unavailable: %s', exc)
+
+            if body is not None:
+                response = HttpResponse(body, content_type='application/json')
+            else:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if ttl > 0:
+                    try:
+                        cache.set(body_key, response.content, timeout=ttl)
+                    except Exception as exc:
+                        logger.warning('Response cache unavailable: %s', exc)
+
+            response.headers['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
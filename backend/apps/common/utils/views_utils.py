@@ -1,9 +1,21 @@
+import gzip
 import json
-from typing import Any, Optional
+from json.decoder import WHITESPACE
+from typing import Any, BinaryIO, Iterator, Optional
 
+from django.conf import settings
 from django.http import JsonResponse
 
+from utils.payload_codecs import JSON, PayloadDecodeError, decode_payload
+
 JsonPayload = dict[str, Any] | list[Any]
+RawRecord = tuple[Any, bytes]
+
+_DECODER = json.JSONDecoder()
+
+
+class RequestBodyTooLarge(Exception):
+    """A streamed request body exceeded its decoded size limit."""
 
 
 def parse_json_body(
@@ -33,3 +45,191 @@ def parse_json_body(
     if not ok:
         return None, JsonResponse({'error': message}, status=400)
     return payload, None
+
+
+def parse_body(
+    body: bytes,
+    payload_format: str = JSON,
+    *,
+    allow_array: bool = False,
+) -> tuple[Optional[JsonPayload], Optional[JsonResponse]]:
+    """
+    Parse a JSON, MessagePack or CBOR request body (see utils.payload_codecs)
+    into the structure parse_json_body returns.
+
+    Returns:
+        (payload, None) on success
+        (None, JsonResponse) on failure
+    """
+    if payload_format == JSON:
+        return parse_json_body(body, allow_array=allow_array)
+
+    try:
+        payload = decode_payload(body, payload_format)
+    except PayloadDecodeError:
+        return None, JsonResponse({'error': f'Invalid {payload_format} payload.'}, status=400)
+
+    if allow_array:
+        ok = isinstance(payload, (dict, list))
+        message = 'Payload must be a map or an array.'
+    else:
+        ok = isinstance(payload, dict)
+        message = 'Payload must be a map.'
+
+    if not ok:
+        return None, JsonResponse({'error': message}, status=400)
+    return payload, None
+
+
+def encode_json_records(payload: JsonPayload) -> list[tuple[Any, Optional[bytes]]]:
+    """
+    (record, JSON bytes) pairs of a decoded object or array, as
+    split_json_records returns them for a JSON body. Records without a JSON
+    representation (e.g. binary values of a MessagePack or CBOR payload) are
+    paired with None.
+    """
+    records = [payload] if isinstance(payload, dict) else payload
+    encoded = []
+    for record in records:
+        try:
+            raw = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        except (TypeError, ValueError):
+            raw = None
+        encoded.append((record, raw))
+    return encoded
+
+
+def split_json_records(body: bytes) -> tuple[Optional[list[RawRecord]], Optional[JsonResponse]]:
+    """
+    Split a JSON object or array body into (record, raw bytes) pairs.
+
+    The raw bytes of every top-level element are sliced from the body as sent,
+    so records can be forwarded without serializing them again. Element
+    boundaries come from the C scanner of the json module (raw_decode).
+
+    Returns:
+        (records, None) on success, [] for an empty array
+        (None, JsonResponse) on failure
+    """
+    invalid = None, JsonResponse({'error': 'Invalid JSON.'}, status=400)
+    try:
+        text = body.decode('utf-8')
+        pos = WHITESPACE.match(text).end()
+        if not text.startswith('[', pos):
+            payload, stop = _DECODER.raw_decode(text, pos)
+            if WHITESPACE.match(text, stop).end() != len(text):
+                return invalid
+            if not isinstance(payload, dict):
+                return None, JsonResponse(
+                    {'error': 'Payload must be a JSON object or a JSON array.'}, status=400
+                )
+            return [(payload, text[pos:stop].encode('utf-8'))], None
+
+        records = []
+        pos = WHITESPACE.match(text, pos + 1).end()
+        closed = text.startswith(']', pos)
+        while not closed:
+            record, stop = _DECODER.raw_decode(text, pos)
+            records.append((record, text[pos:stop].encode('utf-8')))
+            pos = WHITESPACE.match(text, stop).end()
+            closed = text.startswith(']', pos)
+            if not closed:
+                if not text.startswith(',', pos):
+                    return invalid
+                pos = WHITESPACE.match(text, pos + 1).end()
+    except ValueError:
+        return invalid
+
+    if WHITESPACE.match(text, pos + 1).end() != len(text):
+        return invalid
+    return records, None
+
+
+def open_request_body(request) -> tuple[Optional[BinaryIO], Optional[JsonResponse]]:
+    """
+    Readable stream of the request body, decoded according to Content-Encoding
+    (identity, gzip or zstd). The request is read incrementally, so the body
+    is never held in memory as a whole.
+
+    Returns:
+        (stream, None) on success
+        (None, JsonResponse) for an unsupported encoding
+    """
+    encoding = request.headers.get('Content-Encoding', '').strip().lower()
+    if encoding in ('', 'identity'):
+        return request, None
+    if encoding == 'gzip':
+        return gzip.GzipFile(fileobj=request, mode='rb'), None
+    if encoding == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            return None, JsonResponse(
+                {'error': 'Content-Encoding zstd is not available.'}, status=415
+            )
+        return zstandard.ZstdDecompressor().stream_reader(request), None
+    return None, JsonResponse({'error': f'Unsupported Content-Encoding: {encoding}.'}, status=415)
+
+
+def read_request_body(request) -> tuple[Optional[bytes], Optional[JsonResponse]]:
+    """
+    Whole request body, decoded according to Content-Encoding. Decoded bodies
+    are limited to DATA_UPLOAD_MAX_MEMORY_SIZE like plain ones.
+
+    Returns:
+        (body, None) on success
+        (None, JsonResponse) on failure
+    """
+    if not request.headers.get('Content-Encoding'):
+        return request.body, None
+
+    stream, error_response = open_request_body(request)
+    if error_response:
+        return None, error_response
+
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    try:
+        body = stream.read() if limit is None else stream.read(limit + 1)
+    except Exception:
+        return None, JsonResponse({'error': 'Invalid compressed body.'}, status=400)
+    if limit is not None and len(body) > limit:
+        return None, JsonResponse({'error': 'Request body is too large.'}, status=413)
+    return body, None
+
+
+def iter_body_lines(
+    stream: BinaryIO,
+    *,
+    max_line_bytes: int,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[tuple[int, Optional[bytes]]]:
+    """
+    Yield (line number, line) for every line of a stream, reading chunk_size
+    bytes at a time. Lines longer than max_line_bytes are discarded and
+    yielded as (line number, None), so memory stays bounded by one chunk plus
+    one line. Raises RequestBodyTooLarge once more than max_bytes were read.
+    Errors of the stream (e.g. a corrupt compressed body) propagate.
+    """
+    line_no = 0
+    total = 0
+    buffer = b''
+    oversized = False
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise RequestBodyTooLarge(max_bytes)
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            line_no += 1
+            yield line_no, (None if oversized or len(line) > max_line_bytes else line)
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer = b''
+    if buffer or oversized:
+        yield line_no + 1, None if oversized else buffer
@@ -1,12 +1,7 @@
-import os
-
 from django.http import HttpResponse
-from prometheus_client import (
-    CollectorRegistry,
-    generate_latest,
-    multiprocess,
-    CONTENT_TYPE_LATEST,
-)
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+from apps.common.metrics import scrape_registry
 
 
 def metrics_view(request):
@@ -20,13 +15,5 @@ def metrics_view(request):
     If PROMETHEUS_MULTIPROC_DIR is not set, falls back to the default registry
     (single-process mode, suitable for local development without Celery).
     """
-    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
-        registry = CollectorRegistry()
-        multiprocess.MultiProcessCollector(registry)
-    else:
-        from prometheus_client import REGISTRY
-
-        registry = REGISTRY
-
-    data = generate_latest(registry)
+    data = generate_latest(scrape_registry())
     return HttpResponse(data, content_type=CONTENT_TYPE_LATEST)
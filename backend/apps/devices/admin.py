@@ -6,6 +6,8 @@ from django.db.models import Max
 from django.http import HttpResponse
 from django.utils.html import format_html, format_html_join
 
+from apps.common.utils.response_cache import bump_generation
+
 from .models import Device, Telemetry, Metric, DeviceMetric
 
 
@@ -181,6 +183,7 @@ class DeviceAdmin(admin.ModelAdmin):
         except Exception as exc:
             self.message_user(request, f"Failed to enable devices: {exc}", level="error")
             return
+        bump_generation(Device._meta.db_table)
 
         self.message_user(request, f"{updated} device(s) successfully enabled.")
 
@@ -195,6 +198,7 @@ class DeviceAdmin(admin.ModelAdmin):
         except Exception as exc:
             self.message_user(request, f"Failed to disable devices: {exc}", level="error")
             return
+        bump_generation(Device._meta.db_table)
 
         self.message_user(request, f"{updated} device(s) successfully disabled.")
 
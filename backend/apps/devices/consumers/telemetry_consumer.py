@@ -1,33 +1,118 @@
 import json
 import logging
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterator, Optional
 from urllib.parse import parse_qs
 
 from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
 
-from apps.devices.models import Device
+from apps.devices.services.telemetry_stream_delivery import (
+    build_telemetry_sink,
+    parse_delivery_options,
+)
+from apps.devices.services.telemetry_stream_hub import Series, get_telemetry_stream_hub
+from apps.devices.services.telemetry_stream_publisher import build_telemetry_payload
+from apps.devices.services.telemetry_stream_replay import (
+    ReplayGate,
+    ReplayingSink,
+    telemetry_replay_points,
+)
 from apps.users.models import UserRole
+from apps.users.principal_cache import (
+    cached_owned_device_serial_ids,
+    get_owned_device_serial_ids,
+)
 
 logger = logging.getLogger(__name__)
 
+SUBSCRIPTION_ACTIONS = ("subscribe", "unsubscribe")
+
+
+async def _devices_owned_by_user(device_serial_ids: set[str], user) -> set[str]:
+    owned = cached_owned_device_serial_ids(user.pk)
+    if owned is None:
+        owned = await database_sync_to_async(get_owned_device_serial_ids)(user.pk)
+    return set(device_serial_ids) & owned
+
+
+def _parse_series(items) -> list[Series]:
+    """
+    Parse [{"device": ..., "metric": ...}, ...] into (device, metric) patterns.
+    A missing device or metric matches any value. Raises ValueError.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("series must be a non-empty list")
+
+    series: list[Series] = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("series items must be objects")
+        pattern = []
+        for key in ("device", "metric"):
+            value = item.get(key)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"series '{key}' must be a string")
+            pattern.append((value or "").strip() or None)
+        if tuple(pattern) not in series:
+            series.append(tuple(pattern))
+    return series
+
+
+def _parse_since(value, series: list[Series]) -> Optional[datetime]:
+    """Replay start of a subscribe message; replay needs a device in every series."""
+    if value is None:
+        return None
+    since = parse_datetime(value) if isinstance(value, str) else None
+    if since is None:
+        raise ValueError("since must be an ISO 8601 timestamp")
+    if any(device is None for device, _ in series):
+        raise ValueError("since requires a device in every series")
+    if is_naive(since):
+        since = make_aware(since, timezone.utc)
+    return since
+
+
+@sync_to_async
+def _next_chunk(points: Iterator[dict], size: int) -> list[dict]:
+    # plain sync_to_async: the server-side cursor has to stay on the same
+    # connection between chunks, database_sync_to_async may close it
+    return list(islice(points, size))
+
 
 @sync_to_async
-def _device_belongs_to_user(device_serial_id: str, user) -> bool:
-    return Device.objects.filter(
-        serial_id=device_serial_id,
-        user=user,
-        is_active=True,
-    ).exists()
+def _close_points(points) -> None:
+    points.close()
+
+
+def _series_json(series) -> list[dict]:
+    return [{"device": device, "metric": metric} for device, metric in series]
 
 
 class TelemetryConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer for telemetry stream. Requires JWT with claim 'role' (admin/client).
-    Close codes 4401/4403/4404 are application-specific (RFC 6455 allows 4xxx for app use).
+    Close codes 4400/4401/4403/4500 are application-specific (RFC 6455 allows 4xxx for app use).
+
+    Frames are delivered by the process-local TelemetryStreamHub: without query
+    params the socket receives all telemetry (unless ?global=0), with ?device=
+    and/or ?metric= only telemetry of that device or metric. More series are
+    added and removed over the same socket with
+    {"action": "subscribe" | "unsubscribe", "series": [{"device": ..., "metric": ...}]};
+    new subscriptions get a telemetry.snapshot of their latest values, or with
+    "since" a telemetry.replay of their stored points before going live.
+    ?mode=batch|latest (with interval_ms) and ?max_rate= select the
+    per-connection delivery, see telemetry_stream_delivery.
     """
 
     ALLOWED_ROLES = {"admin", "client"}
-    BASE_GROUP = "telemetry.global"
+    # no per-socket channel layer receive loop, the hub writes to the socket directly
+    channel_layer_alias = None
 
     async def connect(self):
         user = self.scope.get("user")
@@ -41,53 +126,205 @@ class TelemetryConsumer(AsyncWebsocketConsumer):
             await self.close(code=4403)
             return
 
-        if self.channel_layer is None:
-            await self.close(code=4404)
-            return
-
         params = parse_qs(self.scope.get("query_string", b"").decode())
         device = (params.get("device", [None])[0] or "").strip()
         metric = (params.get("metric", [None])[0] or "").strip()
 
-        # Device-level authorization: non-admin users can subscribe only to their own devices
-        if device and role != UserRole.ADMIN:
-            try:
-                allowed = await _device_belongs_to_user(device, user)
-            except Exception as e:
-                logger.error("Error checking device ownership for '%s': %s", device, e)
-                await self.close(code=4500)
-                return
-
-            if not allowed:
-                logger.warning(
-                    "User %s (role=%s) attempted to subscribe to unauthorized device '%s'",
-                    getattr(user, "id", None),
-                    role,
-                    device,
-                )
-                await self.close(code=4403)
-                return
+        try:
+            options = parse_delivery_options(params)
+        except ValueError as e:
+            logger.info("Invalid telemetry stream delivery options: %s", e)
+            await self.close(code=4400)
+            return
 
-        self.groups_to_join = [self.BASE_GROUP]
+        self.user = user
+        self.role = role
+        self.series: set[Series] = set()
+
+        initial: list[Series] = []
         if device:
-            self.groups_to_join.append(f"telemetry.device.{device}")
+            initial.append((device, None))
         if metric:
-            self.groups_to_join.append(f"telemetry.metric.{metric}")
+            initial.append((None, metric))
+        if not initial and params.get("global", ["1"])[0] != "0":
+            initial.append((None, None))
 
+        # Device-level authorization: non-admin users can subscribe only to their own devices
         try:
-            for group_name in self.groups_to_join:
-                await self.channel_layer.group_add(group_name, self.channel_name)
+            allowed, rejected = await self._authorize(initial)
         except Exception as e:
-            logger.error("Error connecting to telemetry stream: %s", e)
+            logger.error("Error checking device ownership for '%s': %s", device, e)
             await self.close(code=4500)
             return
 
+        if rejected:
+            logger.warning(
+                "User %s (role=%s) attempted to subscribe to unauthorized device '%s'",
+                getattr(user, "id", None),
+                role,
+                device,
+            )
+            await self.close(code=4403)
+            return
+
         await self.accept()
 
+        self.sink = ReplayingSink(build_telemetry_sink(self, options))
+        try:
+            self.sink.start()
+            await self._subscribe(allowed)
+        except Exception as e:
+            logger.error("Error connecting to telemetry stream: %s", e)
+            await self.close(code=4500)
+
     async def disconnect(self, close_code):
-        if self.channel_layer is not None:
-            for group_name in getattr(self, "groups_to_join", []):
-                await self.channel_layer.group_discard(group_name, self.channel_name)
+        sink = getattr(self, "sink", None)
+        if sink is not None:
+            get_telemetry_stream_hub().unsubscribe(sink)
+            await sink.close()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or "")
+        except ValueError:
+            await self._send_error("Message must be valid JSON.")
+            return
+
+        action = message.get("action") if isinstance(message, dict) else None
+        if action not in SUBSCRIPTION_ACTIONS:
+            await self._send_error(f"action must be one of {', '.join(SUBSCRIPTION_ACTIONS)}.")
+            return
+
+        try:
+            series = _parse_series(message.get("series"))
+            since = _parse_since(message.get("since"), series) if action == "subscribe" else None
+        except ValueError as e:
+            await self._send_error(f"{e}.")
+            return
+
+        if action == "unsubscribe":
+            get_telemetry_stream_hub().unsubscribe(self.sink, series)
+            self.series.difference_update(series)
+            await self._send_ack(action, subscribed=series, rejected=[])
+            return
+
+        if len(self.series | set(series)) > settings.TELEMETRY_WS_MAX_SERIES:
+            await self._send_error(
+                f"At most {settings.TELEMETRY_WS_MAX_SERIES} series per connection."
+            )
+            return
+
+        try:
+            allowed, rejected = await self._authorize(series)
+        except Exception as e:
+            logger.error("Error checking device ownership for subscription: %s", e)
+            await self._send_error("Subscription could not be authorized.")
+            return
+
+        await self._send_ack(action, subscribed=allowed, rejected=rejected)
+        if since is None:
+            await self._subscribe(allowed)
+        elif allowed:
+            await self._replay(allowed, since)
+
+    async def _authorize(self, series: list[Series]) -> tuple[list[Series], list[Series]]:
+        """
+        Split series into allowed and rejected with a single ownership query:
+        non-admin users can subscribe only to devices they own.
+        """
+        devices = {device for device, _ in series if device}
+        if self.role == UserRole.ADMIN or not devices:
+            return list(series), []
+
+        owned = await _devices_owned_by_user(devices, self.user)
+        allowed = [s for s in series if s[0] is None or s[0] in owned]
+        rejected = [s for s in series if s[0] is not None and s[0] not in owned]
+        return allowed, rejected
+
+    async def _subscribe(self, series: list[Series], *, snapshot: bool = True) -> None:
+        """Subscribe the sink, then send the latest values of the new series."""
+        new = [s for s in series if s not in self.series]
+        if not new:
+            return
+
+        await get_telemetry_stream_hub().subscribe(self.sink, new)
+        self.series.update(new)
+        if not snapshot:
+            return
+
+        try:
+            frames = await get_telemetry_stream_hub().last_values(new)
+        except Exception as e:
+            logger.warning("Telemetry snapshot unavailable: %s", e)
+            return
+        if frames:
+            await self.send(
+                text_data='{"type": "telemetry.snapshot", "items": [' + ",".join(frames) + "]}"
+            )
+
+    async def _replay(self, series: list[Series], since: datetime) -> None:
+        """
+        Stream stored points of the series since `since` as telemetry.replay
+        frames, then switch to live: live frames arriving meanwhile are held
+        by a ReplayGate and released without the points already replayed.
+        """
+        gate = ReplayGate(series, buffer_size=settings.TELEMETRY_WS_BUFFER_SIZE)
+        self.sink.gates.append(gate)
+        await self._subscribe(series, snapshot=False)
+
+        max_points = settings.TELEMETRY_WS_REPLAY_MAX_POINTS
+        chunk_size = settings.TELEMETRY_WS_REPLAY_CHUNK_SIZE
+        sent_at = now().isoformat()
+        count, until, truncated, failed = 0, None, False, False
+
+        points = telemetry_replay_points(series, since)
+        try:
+            while count < max_points:
+                chunk = await _next_chunk(points, min(chunk_size, max_points - count))
+                if not chunk:
+                    break
+                frames = []
+                for point in chunk:
+                    gate.record(point)
+                    frames.append(json.dumps(build_telemetry_payload(point, sent_at=sent_at)))
+                await self.send(
+                    text_data='{"type": "telemetry.replay", "items": [' + ",".join(frames) + "]}"
+                )
+                count += len(chunk)
+                until = chunk[-1]["ts"]
+            else:
+                truncated = bool(await _next_chunk(points, 1))
+        except Exception as e:
+            logger.error("Telemetry replay failed: %s", e)
+            failed = True
+        finally:
+            await _close_points(points)
+
+        released = gate.finish()
+        done = {
+            "type": "telemetry.replay.done",
+            "series": _series_json(series),
+            "count": count,
+            "until": until.isoformat() if until else None,
+            "truncated": truncated,
+        }
+        if failed:
+            done["error"] = "Replay was interrupted."
+        await self.send(text_data=json.dumps(done))
+        for frame, frame_series in released:
+            await self.sink.sink.push(frame, frame_series)
+
+    async def _send_ack(self, action: str, *, subscribed, rejected) -> None:
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "subscription.ack",
+                    "action": action,
+                    "series": _series_json(subscribed),
+                    "rejected": _series_json(rejected),
+                }
+            )
+        )
 
-    async def telemetry_update(self, event):
-        await self.send(text_data=json.dumps(event["payload"]))
+    async def _send_error(self, error: str) -> None:
+        await self.send(text_data=json.dumps({"type": "error", "error": error}))
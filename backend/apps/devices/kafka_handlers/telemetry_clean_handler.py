@@ -1,89 +1,84 @@
 import logging
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 from django.utils.dateparse import parse_datetime
 
 from consumers.message_handlers import KafkaPayloadHandler
-from apps.devices.services.telemetry_stream_publisher import publish_telemetry_event
+from apps.devices.services.telemetry_samples import expand_sample_rows
+from apps.devices.services.telemetry_stream_publisher import publish_telemetry_rows
 
 logger = logging.getLogger(__name__)
 
 REQUIRED_FIELDS = [
-    "device_serial_id",
-    "device_id",
-    "metric",
-    "metric_type",
-    "value",
+    "device_metric_id",
+    "value_jsonb",
     "ts",
 ]
 
 
 class WebSocketTelemetryCleanHandler(KafkaPayloadHandler):
+    """
+    Streams telemetry.clean records to WebSocket groups.
+
+    Accepts a single record or a batch (consume_batch=True). Compact
+    schema_version 2 records are expanded into one row per sample. Invalid
+    records are logged and skipped; the remaining ones are published in one fan-out.
+    """
 
     def handle(self, payload: Any) -> None:
-        if not isinstance(payload, dict):
+        if isinstance(payload, dict):
+            payload = [payload]
+        if not isinstance(payload, list):
             logger.error("Invalid payload type: %s", type(payload))
             return
 
-        missing = [f for f in REQUIRED_FIELDS if f not in payload]
-        if missing:
-            logger.error("telemetry.clean missing required fields: %s", ", ".join(missing))
+        records = expand_sample_rows(payload)
+        rows = [row for row in (self._parse_record(record) for record in records) if row]
+        if not rows:
             return
 
-        # Type and format validation for critical fields
-        device_serial_id = payload.get("device_serial_id")
-        if not isinstance(device_serial_id, str) or not (device_serial_id or "").strip():
-            logger.error(
-                "telemetry.clean 'device_serial_id' must be a non-empty string, got %s",
-                type(device_serial_id),
+        if not publish_telemetry_rows(rows):
+            logger.error("telemetry.clean: publish_telemetry_rows returned False")
+            raise RuntimeError(
+                "Failed to publish telemetry to channel layer; offset will not be committed."
             )
-            return
-        device_id = payload.get("device_id")
-        if not isinstance(device_id, int):
-            logger.error("telemetry.clean 'device_id' must be int, got %s", type(device_id))
-            return
-        metric = payload.get("metric")
-        if not isinstance(metric, str) or not (metric or "").strip():
+
+    @staticmethod
+    def _parse_record(record: Any) -> Optional[dict]:
+        if not isinstance(record, dict):
+            logger.error("telemetry.clean record must be an object, got %s", type(record))
+            return None
+
+        missing = [f for f in REQUIRED_FIELDS if f not in record]
+        if missing:
+            logger.error("telemetry.clean missing required fields: %s", ", ".join(missing))
+            return None
+
+        device_metric_id = record["device_metric_id"]
+        if not isinstance(device_metric_id, int) or isinstance(device_metric_id, bool):
             logger.error(
-                "telemetry.clean 'metric' must be a non-empty string, got %s", type(metric)
+                "telemetry.clean 'device_metric_id' must be int, got %s", type(device_metric_id)
             )
-            return
-        metric_type = payload.get("metric_type")
-        if not isinstance(metric_type, str) or not (metric_type or "").strip():
+            return None
+
+        value_jsonb = record["value_jsonb"]
+        if not isinstance(value_jsonb, dict):
             logger.error(
-                "telemetry.clean 'metric_type' must be a non-empty string, got %s",
-                type(metric_type),
+                "telemetry.clean 'value_jsonb' must be an object, got %s", type(value_jsonb)
             )
-            return
+            return None
 
-        ts_raw = payload["ts"]
+        ts_raw = record["ts"]
         if isinstance(ts_raw, str):
             ts = parse_datetime(ts_raw)
             if ts is None:
                 logger.warning("telemetry.clean invalid 'ts': %s", ts_raw)
-                return
+                return None
         elif isinstance(ts_raw, datetime):
             ts = ts_raw
         else:
             logger.warning("telemetry.clean 'ts' type not supported: %s", type(ts_raw))
-            return
+            return None
 
-        value = payload["value"]
-
-        try:
-            if not publish_telemetry_event(
-                device_serial_id=device_serial_id,
-                device_id=device_id,
-                metric=metric,
-                metric_type=metric_type,
-                value=value,
-                ts=ts,
-            ):
-                logger.error("telemetry.clean: publish_telemetry_event returned False")
-                raise RuntimeError(
-                    "Failed to publish telemetry to channel layer; offset will not be committed."
-                )
-        except (TypeError, ValueError) as e:
-            logger.warning("telemetry.clean skipped message due to invalid data: %s", e)
-            return
+        return {"device_metric_id": device_metric_id, "value_jsonb": value_jsonb, "ts": ts}
@@ -1,12 +1,27 @@
 import datetime
 from typing import Optional, Any
 
+from django.conf import settings
+
 from apps.common.serializers import BaseSerializer, JSONSerializer
+from apps.devices.services.telemetry_samples import SAMPLES_FIELD, expand_sample_row
 from utils.normalization import parse_iso8601_utc, normalize_str
 
 
 class TelemetryCreateSerializer(JSONSerializer):
+    """
+    Telemetry message of a device.
+
+    schema_version 1: one reading per metric at ts,
+        {"metrics": {"temp": {"value": 21.5, "unit": "C"}}}
+    schema_version 2: samples of each metric as [ts_offset, value] pairs,
+    ts_offset in whole seconds from ts, the unit declared once,
+        {"metrics": {"temp": {"unit": "C", "samples": [[0, 21.5], [1, 21.6]]}}}
+    """
+
     SCHEMA_VERSION = 1
+    SAMPLES_SCHEMA_VERSION = 2
+    SUPPORTED_SCHEMA_VERSIONS = (SCHEMA_VERSION, SAMPLES_SCHEMA_VERSION)
     METRIC_VALUE_TYPES = (bool, int, float, str)
 
     REQUIRED_FIELDS = {
@@ -17,20 +32,26 @@ class TelemetryCreateSerializer(JSONSerializer):
     }
 
     def _validate_fields(self, data: dict[str, Any]) -> dict[str, Any]:
-        if not self._schema_version_valid(data["schema_version"]):
+        schema_version = data["schema_version"]
+        if not self._schema_version_valid(schema_version):
             return {}
 
+        if schema_version == self.SAMPLES_SCHEMA_VERSION:
+            metrics = self._validate_sample_metrics(data["metrics"])
+        else:
+            metrics = self._validate_metrics(data["metrics"])
+
         return {
             "device_serial_id": self._validate_device(data["device"]),
-            "metrics": self._validate_metrics(data["metrics"]),
+            "metrics": metrics,
             "ts": self._validate_ts(data["ts"]),
         }
 
     def _schema_version_valid(self, schema_version: int) -> bool:
-        if schema_version != self.SCHEMA_VERSION:
+        if schema_version not in self.SUPPORTED_SCHEMA_VERSIONS:
+            supported = ", ".join(str(v) for v in self.SUPPORTED_SCHEMA_VERSIONS)
             self._errors["schema_version"] = (
-                f"Unsupported schema_version: {schema_version}. "
-                f"Supported: {self.SCHEMA_VERSION}."
+                f"Unsupported schema_version: {schema_version}. Supported: {supported}."
             )
             return False
         return True
@@ -83,6 +104,69 @@ class TelemetryCreateSerializer(JSONSerializer):
 
         return validated
 
+    def _validate_sample_metrics(self, metrics_raw: dict) -> Optional[dict[str, Any]]:
+        if not metrics_raw:
+            self._errors["metrics"] = {"non_field_errors": "Metrics cannot be empty."}
+            return None
+
+        max_samples = settings.TELEMETRY_MAX_SAMPLES_PER_METRIC
+        validated = {}
+        errors = {}
+
+        for name, metric_data in metrics_raw.items():
+            if not isinstance(name, str) or not name.strip():
+                errors[str(name)] = "Metric name must be a non-empty string."
+                continue
+
+            if not isinstance(metric_data, dict):
+                errors[name] = "Metric must be a dictionary with 'unit' and 'samples'."
+                continue
+            if "unit" not in metric_data or SAMPLES_FIELD not in metric_data:
+                errors[name] = "Metric must contain both 'unit' and 'samples' keys."
+                continue
+
+            unit = metric_data.get("unit")
+            samples = metric_data.get(SAMPLES_FIELD)
+
+            if not isinstance(unit, str) or not unit.strip():
+                errors[name] = "Metric unit must be a non-empty string."
+                continue
+
+            if not isinstance(samples, list) or not samples:
+                errors[name] = "Metric samples must be a non-empty array."
+                continue
+            if len(samples) > max_samples:
+                errors[name] = f"Metric cannot have more than {max_samples} samples."
+                continue
+
+            sample_error = self._sample_error(samples)
+            if sample_error:
+                errors[name] = sample_error
+                continue
+
+            validated[name.strip()] = {
+                "unit": unit.strip(),
+                SAMPLES_FIELD: [[offset, value] for offset, value in samples],
+            }
+
+        if errors:
+            self._errors["metrics"] = errors
+            return None
+
+        return validated
+
+    def _sample_error(self, samples: list) -> Optional[str]:
+        for index, sample in enumerate(samples):
+            if not isinstance(sample, list) or len(sample) != 2:
+                return f"Sample {index} must be a [ts_offset, value] pair."
+
+            offset, value = sample
+            if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+                return f"Sample {index} ts_offset must be a non-negative integer."
+            if not isinstance(value, self.METRIC_VALUE_TYPES):
+                return f"Sample {index} value must be bool/int/float/str."
+        return None
+
     def _validate_ts(self, ts_raw: str) -> Optional[datetime.datetime]:
         ts = parse_iso8601_utc(ts_raw)
 
@@ -141,12 +225,18 @@ class TelemetryBatchCreateSerializer(BaseSerializer):
             return None
 
         for index, item in enumerate(self.initial_data):
-            serializer = TelemetryProducerMessageSerializer(item)
-
-            if serializer.is_valid():
-                self._valid_items.append(serializer.validated_data)
+            if isinstance(item, dict) and SAMPLES_FIELD in item:
+                serializer = TelemetryProducerSamplesSerializer(item)
             else:
+                serializer = TelemetryProducerMessageSerializer(item)
+
+            if not serializer.is_valid():
                 self._item_errors[index] = serializer.errors
+            elif isinstance(serializer, TelemetryProducerSamplesSerializer):
+                # compact schema_version 2 rows are expanded only here, at write time
+                self._valid_items.extend(serializer.validated_data)
+            else:
+                self._valid_items.append(serializer.validated_data)
 
         if self._item_errors:
             self._errors["items"] = self._item_errors
@@ -306,3 +396,40 @@ class TelemetryProducerMessageSerializer:
             "t": value_jsonb["t"],
             "v": value_jsonb["v"],
         }
+
+
+class TelemetryProducerSamplesSerializer(TelemetryProducerMessageSerializer):
+    """
+    Compact row of schema_version 2 telemetry as produced to telemetry.clean /
+    telemetry.expired: the samples of one device metric relative to ts.
+    validated_data is the list of expanded per-sample rows.
+    """
+
+    REQUIRED_FIELDS: dict[str, type] = {
+        "device_serial_id": str,
+        "device_metric_id": int,
+        "ts": str,
+        "t": str,
+        SAMPLES_FIELD: list,
+    }
+
+    def _validate_fields(self, data: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+        ts = self._validate_ts(data["ts"])
+        samples = data[SAMPLES_FIELD]
+        value_types = self.VALUE_JSONB_REQUIRED_FIELDS["v"]
+
+        for index, sample in enumerate(samples):
+            if (
+                not isinstance(sample, list)
+                or len(sample) != 2
+                or not isinstance(sample[0], int)
+                or isinstance(sample[0], bool)
+                or not isinstance(sample[1], value_types)
+            ):
+                self._errors[SAMPLES_FIELD] = f"Invalid sample {index}: {sample}."
+                break
+
+        if self._errors:
+            return None
+
+        return expand_sample_row({**data, "ts": ts})
@@ -0,0 +1,69 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from utils.normalization import parse_iso8601_utc
+
+logger = logging.getLogger(__name__)
+
+SAMPLES_FIELD = "samples"
+
+
+def sample_ts(base: datetime, offset: int) -> datetime:
+    return base + timedelta(seconds=offset)
+
+
+def is_sample_row(row: Any) -> bool:
+    return isinstance(row, dict) and SAMPLES_FIELD in row
+
+
+def sample_count(rows: Iterable[Any]) -> int:
+    """Number of telemetry points in rows, counting every sample of compact rows."""
+    return sum(len(row[SAMPLES_FIELD]) if is_sample_row(row) else 1 for row in rows)
+
+
+def expand_sample_row(row: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Expand a compact schema_version 2 row
+    {device_serial_id, device_metric_id, ts, t, samples: [[ts_offset, value], ...]}
+    into one {device_serial_id, device_metric_id, ts, value_jsonb} row per sample.
+    The ts of the expanded rows keeps the type of the base ts (datetime or
+    ISO-8601 string, as read from Kafka).
+    Raises KeyError / TypeError / ValueError on malformed rows.
+    """
+    base = row["ts"]
+    as_str = isinstance(base, str)
+    if as_str:
+        base = parse_iso8601_utc(base)
+        if base is None:
+            raise ValueError(f"Invalid ts: {row['ts']}")
+
+    rows = []
+    for offset, value in row[SAMPLES_FIELD]:
+        ts = sample_ts(base, offset)
+        rows.append(
+            {
+                "device_serial_id": row["device_serial_id"],
+                "device_metric_id": row["device_metric_id"],
+                "ts": ts.isoformat() if as_str else ts,
+                "value_jsonb": {"t": row["t"], "v": value},
+            }
+        )
+    return rows
+
+
+def expand_sample_rows(rows: Iterable[Any]) -> list[Any]:
+    """
+    Expand the compact rows of a batch, other items are passed through unchanged.
+    Malformed compact rows are logged and dropped.
+    """
+    expanded = []
+    for row in rows:
+        if not is_sample_row(row):
+            expanded.append(row)
+            continue
+        try:
+            expanded.extend(expand_sample_row(row))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipped malformed telemetry samples row %s: %s", row, e)
+    return expanded
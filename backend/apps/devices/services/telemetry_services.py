@@ -2,9 +2,11 @@ import logging
 from dataclasses import dataclass, field
 from typing import Literal
 
+from django.db import transaction
+
 from apps.devices.models import Device, DeviceMetric
 from apps.devices.models.telemetry import Telemetry
-from apps.devices.services.telemetry_stream_publisher import publish_telemetry_event
+from apps.devices.services.telemetry_samples import expand_sample_rows
 from validator.telemetry_validator import TelemetryBatchValidator
 
 logger = logging.getLogger(__name__)
@@ -26,13 +28,20 @@ class TelemetryIngestResult:
     status: IngestStatus = "success"
 
 
-def telemetry_create(*, valid_data: list[dict]) -> TelemetryIngestResult:
+def telemetry_create(*, valid_data: list[dict], stream: bool = True) -> TelemetryIngestResult:
     """
     Service function to ingest telemetry. Creates multiple
     Telemetry objects for each metric-value pair provided.
     valid_data is expected to be validator's validated_rows:
-    list of dicts with device_metric_id, ts, value_jsonb.
+    list of dicts with device_metric_id, ts, value_jsonb. Compact
+    schema_version 2 rows (ts, t, samples) are expanded here, one
+    Telemetry object per sample.
+
+    With stream=True the rows are handed to the WebSocket fan-out task
+    once the write commits. Callers fed from telemetry.clean pass
+    stream=False, that topic is already streamed by its own consumer.
     """
+    valid_data = expand_sample_rows(valid_data)
     logger.info("Starting telemetry ingestion for %d items", len(valid_data))
 
     result = TelemetryIngestResult()
@@ -43,13 +52,6 @@ def telemetry_create(*, valid_data: list[dict]) -> TelemetryIngestResult:
         result.status = "success"
         return result
 
-    # Load DeviceMetrics for publish payloads
-    dm_ids = [row["device_metric_id"] for row in valid_data]
-    device_metrics_map = {
-        dm.id: dm
-        for dm in DeviceMetric.objects.filter(id__in=dm_ids).select_related("device", "metric")
-    }
-
     to_create = [
         Telemetry(
             device_metric_id=row["device_metric_id"],
@@ -66,18 +68,10 @@ def telemetry_create(*, valid_data: list[dict]) -> TelemetryIngestResult:
     )
     result.created_count = len(created_objects)
 
-    # Publish telemetry updates to websocket groups
-    for row in valid_data:
-        dm = device_metrics_map.get(row["device_metric_id"])
-        if dm is not None:
-            publish_telemetry_event(
-                device_serial_id=dm.device.serial_id,
-                device_id=dm.device.id,
-                metric=dm.metric.metric_type,
-                metric_type=dm.metric.data_type,
-                value=row["value_jsonb"].get("v"),
-                ts=row["ts"],
-            )
+    if stream:
+        from apps.devices.tasks import stream_telemetry_rows
+
+        transaction.on_commit(lambda: stream_telemetry_rows.delay(valid_data))
 
     if result.attempted_count == 0:
         result.status = "success"
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+from apps.common.metrics import websocket_frames_total
+from apps.devices.services.telemetry_stream_hub import Series
+
+logger = logging.getLogger(__name__)
+
+STREAM = "stream"
+BATCH = "batch"
+LATEST = "latest"
+DELIVERY_MODES = (STREAM, BATCH, LATEST)
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryOptions:
+    mode: str = STREAM
+    interval_ms: int = 250
+    max_rate: float = 0.0
+    buffer_size: int = 1000
+
+
+def parse_delivery_options(params: dict[str, list[str]]) -> DeliveryOptions:
+    """
+    Build delivery options from WebSocket query params
+    (mode, interval_ms, max_rate), falling back to settings.
+    Raises ValueError on invalid values.
+    """
+
+    def param(name: str) -> Optional[str]:
+        value = (params.get(name, [None])[0] or "").strip()
+        return value or None
+
+    mode = param("mode") or STREAM
+    if mode not in DELIVERY_MODES:
+        raise ValueError(f"mode must be one of {', '.join(DELIVERY_MODES)}")
+
+    interval_ms = int(param("interval_ms") or settings.TELEMETRY_WS_INTERVAL_MS)
+    if interval_ms < settings.TELEMETRY_WS_MIN_INTERVAL_MS:
+        raise ValueError(f"interval_ms must be at least {settings.TELEMETRY_WS_MIN_INTERVAL_MS}")
+
+    max_rate = float(param("max_rate") or settings.TELEMETRY_WS_MAX_RATE)
+    if max_rate < 0:
+        raise ValueError("max_rate must not be negative")
+
+    return DeliveryOptions(
+        mode=mode,
+        interval_ms=interval_ms,
+        max_rate=max_rate,
+        buffer_size=settings.TELEMETRY_WS_BUFFER_SIZE,
+    )
+
+
+class TelemetrySink:
+    """
+    Per-connection delivery of telemetry frames pushed by the TelemetryStreamHub.
+    The default sink sends every frame as it arrives, dropping frames above
+    max_rate frames per second.
+    """
+
+    mode = STREAM
+
+    def __init__(self, socket, options: DeliveryOptions):
+        self._socket = socket
+        self._options = options
+        self._sent = websocket_frames_total.labels(mode=self.mode, outcome="sent")
+        self._dropped = websocket_frames_total.labels(mode=self.mode, outcome="dropped")
+        self._conflated = websocket_frames_total.labels(mode=self.mode, outcome="conflated")
+        self._tokens = max(options.max_rate, 1.0)
+        self._refilled_at = time.monotonic()
+
+    def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def push(self, frame: str, series: Series, ts: Optional[str] = None) -> None:
+        if not self._take_token():
+            self._dropped.inc()
+            return
+        await self._socket.send(text_data=frame)
+        self._sent.inc()
+
+    def _take_token(self) -> bool:
+        rate = self._options.max_rate
+        if not rate:
+            return True
+        now = time.monotonic()
+        self._tokens = min(max(rate, 1.0), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+class BufferedTelemetrySink(TelemetrySink):
+    """
+    Collects frames in a bounded per-connection buffer and sends them every
+    interval_ms as one JSON array frame. max_rate stretches the interval so
+    that no more than max_rate frames per second go out.
+    """
+
+    def __init__(self, socket, options: DeliveryOptions):
+        super().__init__(socket, options)
+        interval = options.interval_ms / 1000
+        if options.max_rate:
+            interval = max(interval, 1 / options.max_rate)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def flush(self) -> int:
+        frames = self._drain()
+        if not frames:
+            return 0
+        try:
+            await self._socket.send(text_data="[" + ",".join(frames) + "]")
+        except Exception as e:
+            logger.debug("Telemetry frames not delivered to a socket: %s", e)
+            self._dropped.inc(len(frames))
+            return 0
+        self._sent.inc(len(frames))
+        return len(frames)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def _drain(self) -> list[str]:
+        raise NotImplementedError
+
+
+class BatchTelemetrySink(BufferedTelemetrySink):
+    """Sends every frame, batched; the oldest frames are dropped when the buffer is full."""
+
+    mode = BATCH
+
+    def __init__(self, socket, options: DeliveryOptions):
+        super().__init__(socket, options)
+        self._buffer: deque[str] = deque(maxlen=options.buffer_size)
+
+    async def push(self, frame: str, series: Series, ts: Optional[str] = None) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped.inc()
+        self._buffer.append(frame)
+
+    def _drain(self) -> list[str]:
+        frames = list(self._buffer)
+        self._buffer.clear()
+        return frames
+
+
+class LatestTelemetrySink(BufferedTelemetrySink):
+    """
+    Keeps only the latest frame per series (device, metric) between flushes.
+    Replaced frames are counted as conflated; new series beyond the buffer
+    size are dropped.
+    """
+
+    mode = LATEST
+
+    def __init__(self, socket, options: DeliveryOptions):
+        super().__init__(socket, options)
+        self._latest: dict[Series, str] = {}
+
+    async def push(self, frame: str, series: Series, ts: Optional[str] = None) -> None:
+        if series in self._latest:
+            self._conflated.inc()
+        elif len(self._latest) >= self._options.buffer_size:
+            self._dropped.inc()
+            return
+        self._latest[series] = frame
+
+    def _drain(self) -> list[str]:
+        frames = list(self._latest.values())
+        self._latest.clear()
+        return frames
+
+
+_SINKS = {
+    STREAM: TelemetrySink,
+    BATCH: BatchTelemetrySink,
+    LATEST: LatestTelemetrySink,
+}
+
+
+def build_telemetry_sink(socket, options: DeliveryOptions) -> TelemetrySink:
+    return _SINKS[options.mode](socket, options)
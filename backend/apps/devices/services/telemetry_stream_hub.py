@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+
+LAST_VALUE_KEY_PREFIX = "telemetry:last:"
+LAST_VALUE_TS_KEY_PREFIX = "telemetry:last_ts:"
+
+Series = tuple[Optional[str], Optional[str]]
+
+
+class TelemetryStreamHub:
+    """
+    Node-local WebSocket fan-out for telemetry.
+
+    One instance per ASGI process keeps a single Redis pub/sub subscription
+    and an in-memory index of the connected sockets' sinks by series pattern
+    (device, metric), None matching any value: (None, None) receives every
+    point, (device, None) and (None, metric) every point of that device or
+    metric, (device, metric) that single series. Frames arrive already
+    serialized and the same string is pushed to every matching sink, so the
+    fan-out cost grows with the number of processes, not with the number
+    of sockets.
+    """
+
+    def __init__(self, *, channel: str):
+        self.channel = channel
+        self._index: dict[Series, set] = defaultdict(set)
+        self._filters: dict[Any, set[Series]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._redis: Optional[aioredis.Redis] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._filters)
+
+    async def subscribe(self, sink, series: Iterable[Series]) -> None:
+        """
+        Add series patterns for a sink (see TelemetrySink: async push(frame, series, ts)).
+        Starts the Redis reader for the first subscriber of the process.
+        """
+        patterns = self._filters.setdefault(sink, set())
+        for pattern in series:
+            patterns.add(pattern)
+            self._index[pattern].add(sink)
+
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    def unsubscribe(self, sink, series: Optional[Iterable[Series]] = None) -> None:
+        """
+        Remove the given series patterns of a sink, or the sink altogether.
+        The Redis reader is stopped once the process has no subscribers left.
+        """
+        patterns = self._filters.get(sink)
+        if patterns is None:
+            return
+
+        for pattern in list(patterns) if series is None else series:
+            patterns.discard(pattern)
+            sinks = self._index.get(pattern)
+            if sinks is not None:
+                sinks.discard(sink)
+                if not sinks:
+                    del self._index[pattern]
+
+        if series is None:
+            del self._filters[sink]
+
+        if not self._filters and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    async def dispatch(self, points: list[dict]) -> int:
+        """
+        Push every point frame to the sinks with a pattern matching its series.
+        Returns the number of frames pushed.
+        """
+        written = 0
+        for point in points:
+            series, patterns = self._route(point)
+            targets = set()
+            for pattern in patterns:
+                targets |= self._index.get(pattern, set())
+            frame = point["frame"]
+            for sink in targets:
+                try:
+                    await sink.push(frame, series, point.get("ts"))
+                    written += 1
+                except Exception as e:
+                    logger.debug("Telemetry frame not delivered to a socket: %s", e)
+        return written
+
+    def _route(self, point: dict) -> tuple[Series, tuple[Series, ...]]:
+        """Series of an envelope point and the subscription patterns it matches."""
+        device, metric = point.get("device"), point.get("metric")
+        return (device, metric), ((None, None), (device, None), (None, metric), (device, metric))
+
+    async def last_values(self, series: Iterable[Series]) -> list[str]:
+        """
+        Latest frames of the given series from the last-value store. Patterns
+        without a device have no snapshot; (device, None) returns every metric
+        of the device.
+        """
+        lookups = [(device, metric) for device, metric in series if device]
+        if not lookups:
+            return []
+
+        if self._redis is None:
+            self._redis = aioredis.Redis(**settings.REDIS_CONFIG)
+        pipeline = self._redis.pipeline(transaction=False)
+        for device, metric in lookups:
+            if metric:
+                pipeline.hget(last_value_key(device), metric)
+            else:
+                pipeline.hgetall(last_value_key(device))
+
+        frames = []
+        for result in await pipeline.execute():
+            if isinstance(result, dict):
+                frames.extend(result.values())
+            elif result is not None:
+                frames.append(result)
+        return [f.decode() if isinstance(f, bytes) else f for f in frames]
+
+    async def _read(self) -> None:
+        while True:
+            client = aioredis.Redis(**settings.REDIS_CONFIG)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    points = _decode_envelope(message.get("data"))
+                    if points:
+                        await self.dispatch(points)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Subscription to %s failed, reconnecting: %s", self.channel, e)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+def last_value_key(device: str) -> str:
+    """Redis hash holding the latest frame per metric of a device."""
+    return f"{LAST_VALUE_KEY_PREFIX}{device}"
+
+
+def last_value_ts_key(device: str) -> str:
+    """Redis hash holding the Unix ts of the latest frame per metric of a device."""
+    return f"{LAST_VALUE_TS_KEY_PREFIX}{device}"
+
+
+def encode_envelope(points: list[dict]) -> str:
+    """
+    Envelope published once per batch: [{device, metric, ts, frame}, ...],
+    frame being the serialized telemetry.update message.
+    """
+    return json.dumps({"points": points})
+
+
+def _decode_envelope(data) -> list[dict]:
+    if not isinstance(data, (str, bytes)):
+        return []
+    try:
+        points = json.loads(data).get("points")
+    except (ValueError, AttributeError):
+        logger.warning("Invalid telemetry stream envelope received")
+        return []
+    if not isinstance(points, list):
+        return []
+    return [p for p in points if isinstance(p, dict) and isinstance(p.get("frame"), str)]
+
+
+@lru_cache(maxsize=1)
+def get_telemetry_stream_hub() -> TelemetryStreamHub:
+    return TelemetryStreamHub(channel=settings.TELEMETRY_STREAM_CHANNEL)
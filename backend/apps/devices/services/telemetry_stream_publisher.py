@@ -1,12 +1,41 @@
+import json
 import uuid
 import logging
+from datetime import datetime, timezone
 from decimal import Decimal
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
+from typing import Iterable
+
+from django.conf import settings
 from django.utils.timezone import now
 
+from apps.common.redis_client import get_redis_client
+from apps.devices.models import DeviceMetric
+from apps.devices.services.telemetry_stream_hub import (
+    encode_envelope,
+    last_value_key,
+    last_value_ts_key,
+)
+
 logger = logging.getLogger(__name__)
 
+# KEYS: (frames hash, ts hash) per device; ARGV: ttl, then (key index, metric, ts, frame)
+# per series. A frame replaces the stored one only if its ts is not older.
+STORE_LAST_VALUES_LUA = """
+local ttl = tonumber(ARGV[1])
+for i = 2, #ARGV, 4 do
+    local frames, stamps = KEYS[tonumber(ARGV[i])], KEYS[tonumber(ARGV[i]) + 1]
+    local metric, ts = ARGV[i + 1], ARGV[i + 2]
+    local stored = redis.call('HGET', stamps, metric)
+    if not stored or tonumber(ts) >= tonumber(stored) then
+        redis.call('HSET', frames, metric, ARGV[i + 3])
+        redis.call('HSET', stamps, metric, ts)
+    end
+end
+for i = 1, #KEYS do
+    redis.call('EXPIRE', KEYS[i], ttl)
+end
+"""
+
 
 def _normalize_telemetry_value(value):
     """Return a JSON-serializable value for WebSocket payload. Logs and returns str(value) on unsupported types."""
@@ -36,50 +65,155 @@ def publish_telemetry_event(
     *, device_serial_id: str, device_id: int, metric: str, metric_type: str, value, ts
 ) -> bool:
     """
-    Publish a telemetry event to Channel layer groups (WebSocket).
+    Publish a single telemetry event to the WebSocket hubs.
+    Thin wrapper around publish_telemetry_batch() for one point.
+    """
+    return publish_telemetry_batch(
+        [
+            {
+                "device_serial_id": device_serial_id,
+                "device_id": device_id,
+                "metric": metric,
+                "metric_type": metric_type,
+                "value": value,
+                "ts": ts,
+            }
+        ]
+    )
+
+
+def publish_telemetry_rows(rows: Iterable[dict]) -> bool:
+    """
+    Publish validated telemetry rows (device_metric_id, ts, value_jsonb),
+    as produced by the validator into telemetry.clean. Device and metric
+    details are loaded with one query per batch. Rows whose device metric
+    no longer exists are skipped.
+    """
+    rows = list(rows)
+    if not rows:
+        return True
+
+    dm_ids = {row["device_metric_id"] for row in rows}
+    device_metrics_map = {
+        dm.id: dm
+        for dm in DeviceMetric.objects.filter(id__in=dm_ids).select_related("device", "metric")
+    }
+
+    points = []
+    for row in rows:
+        dm = device_metrics_map.get(row["device_metric_id"])
+        if dm is None:
+            logger.warning(
+                "Telemetry stream skipped unknown device_metric_id=%s", row["device_metric_id"]
+            )
+            continue
+        points.append(
+            {
+                "device_serial_id": dm.device.serial_id,
+                "device_id": dm.device.id,
+                "metric": dm.metric.metric_type,
+                "metric_type": dm.metric.data_type,
+                "value": (row.get("value_jsonb") or {}).get("v"),
+                "ts": row["ts"],
+            }
+        )
+    return publish_telemetry_batch(points)
+
+
+def publish_telemetry_batch(points: Iterable[dict]) -> bool:
+    """
+    Publish a batch of telemetry events to the WebSocket hubs.
+
+    Every point is serialized once and the whole batch goes out as a single
+    Redis PUBLISH on TELEMETRY_STREAM_CHANNEL; the hub of each ASGI process
+    routes the frames to its sockets by device and metric. The same pipeline
+    stores the newest frame (by ts) per series for subscribe snapshots.
     Returns True if sent successfully, False otherwise.
     Callers that require at-least-once delivery (e.g. Kafka handler) should raise on False.
     """
+    sent_at = now().isoformat()
+    envelope_points = []
+    for point in points:
+        payload = build_telemetry_payload(point, sent_at=sent_at)
+        envelope_points.append(
+            {
+                "device": point["device_serial_id"],
+                "metric": point["metric"],
+                "ts": payload["data"]["ts"],
+                "frame": json.dumps(payload),
+            }
+        )
+    if not envelope_points:
+        return True
+
+    try:
+        client = get_redis_client()
+        pipeline = client.pipeline(transaction=False)
+        keys, args = _last_value_script_args(envelope_points)
+        client.register_script(STORE_LAST_VALUES_LUA)(keys=keys, args=args, client=pipeline)
+        pipeline.publish(settings.TELEMETRY_STREAM_CHANNEL, encode_envelope(envelope_points))
+        pipeline.execute()
+        return True
+    except Exception as e:
+        logger.error("Error publishing telemetry batch: %s", e)
+        return False
+
+
+def _last_value_script_args(envelope_points: list[dict]) -> tuple[list[str], list]:
+    """
+    KEYS and ARGV of STORE_LAST_VALUES_LUA for the newest point of every series
+    of the batch. Points are compared by ts, not by arrival, so backfills and
+    replayed batches do not replace newer snapshot frames.
+    """
+    latest: dict[tuple[str, str], tuple[float, str]] = {}
+    for point in envelope_points:
+        series = (point["device"], point["metric"])
+        ts = _epoch(point["ts"])
+        if series not in latest or ts >= latest[series][0]:
+            latest[series] = (ts, point["frame"])
+
+    keys: list[str] = []
+    key_index: dict[str, int] = {}
+    args: list = [settings.TELEMETRY_LAST_VALUE_TTL]
+    for (device, metric), (ts, frame) in latest.items():
+        if device not in key_index:
+            key_index[device] = len(keys) + 1  # Lua arrays are 1-based
+            keys.extend((last_value_key(device), last_value_ts_key(device)))
+        args.extend((key_index[device], metric, repr(ts), frame))
+    return keys, args
+
+
+def _epoch(ts: str) -> float:
+    """Unix time of an ISO-8601 ts, now() for unparseable values."""
+    try:
+        parsed = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return now().timestamp()
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def build_telemetry_payload(point: dict, *, sent_at: str) -> dict:
+    """telemetry.update message of a point, as sent to WebSocket clients."""
     try:
-        value_safe = _normalize_telemetry_value(value)
-        ts_str = _ts_to_iso(ts)
+        value_safe = _normalize_telemetry_value(point["value"])
+        ts_str = _ts_to_iso(point["ts"])
     except Exception as e:
         logger.exception("Error normalizing telemetry for WebSocket: %s", e)
-        value_safe = str(value) if value is not None else None
-        ts_str = now().isoformat()
-    payload = {
+        value_safe = str(point["value"]) if point["value"] is not None else None
+        ts_str = sent_at
+    return {
         "event_id": str(uuid.uuid4()),
         "type": "telemetry.update",
         "schema_version": 1,
-        "sent_at": now().isoformat(),
+        "sent_at": sent_at,
         "data": {
-            "device_serial_id": device_serial_id,
-            "device_id": device_id,
-            "metric": metric,
-            "metric_type": metric_type,
+            "device_serial_id": point["device_serial_id"],
+            "device_id": point["device_id"],
+            "metric": point["metric"],
+            "metric_type": point["metric_type"],
             "value": value_safe,
             "ts": ts_str,
         },
     }
-
-    layer = get_channel_layer()
-    if layer is None:
-        logger.error("Channel layer is not configured")
-        return False
-
-    try:
-        async_to_sync(layer.group_send)(
-            "telemetry.global", {"type": "telemetry_update", "payload": payload}
-        )
-        async_to_sync(layer.group_send)(
-            f"telemetry.device.{device_serial_id}",
-            {"type": "telemetry_update", "payload": payload},
-        )
-        async_to_sync(layer.group_send)(
-            f"telemetry.metric.{metric}",
-            {"type": "telemetry_update", "payload": payload},
-        )
-        return True
-    except Exception as e:
-        logger.error("Error publishing telemetry event: %s", e)
-        return False
@@ -0,0 +1,162 @@
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+from apps.common.metrics import websocket_frames_total
+from apps.devices.models import Telemetry
+from apps.devices.services.telemetry_stream_hub import Series
+
+logger = logging.getLogger(__name__)
+
+ReplayKey = tuple[Optional[str], Optional[str], datetime]
+
+_sent = websocket_frames_total.labels(mode="replay", outcome="sent")
+_duplicates = websocket_frames_total.labels(mode="replay", outcome="duplicate")
+_dropped = websocket_frames_total.labels(mode="replay", outcome="dropped")
+
+
+def telemetry_replay_points(series: Iterable[Series], since: datetime) -> Iterator[dict]:
+    """
+    Stored points of the given series (each with a device) from `since` on,
+    ordered by ts and read through a server-side cursor in chunks of
+    TELEMETRY_WS_REPLAY_CHUNK_SIZE rows.
+    """
+    query = Q()
+    for device, metric in series:
+        pattern = Q(device_metric__device__serial_id=device)
+        if metric:
+            pattern &= Q(device_metric__metric__metric_type=metric)
+        query |= pattern
+
+    rows = (
+        Telemetry.objects.filter(query, ts__gte=since)
+        .order_by("ts", "device_metric_id")
+        .values_list(
+            "device_metric__device__serial_id",
+            "device_metric__device_id",
+            "device_metric__metric__metric_type",
+            "device_metric__metric__data_type",
+            "value_jsonb",
+            "ts",
+        )
+    )
+    for serial_id, device_id, metric, metric_type, value_jsonb, ts in rows.iterator(
+        chunk_size=settings.TELEMETRY_WS_REPLAY_CHUNK_SIZE
+    ):
+        yield {
+            "device_serial_id": serial_id,
+            "device_id": device_id,
+            "metric": metric,
+            "metric_type": metric_type,
+            "value": (value_jsonb or {}).get("v"),
+            "ts": ts,
+        }
+
+
+def _replay_key(series: Series, ts) -> Optional[ReplayKey]:
+    if isinstance(ts, str):
+        ts = parse_datetime(ts)
+    if not isinstance(ts, datetime):
+        return None
+    return (series[0], series[1], ts)
+
+
+class ReplayGate:
+    """
+    Joins a historical replay to the live stream of the same series.
+
+    While the replay runs, live frames of the series are held back (bounded by
+    TELEMETRY_WS_BUFFER_SIZE, oldest dropped). When it finishes, held frames
+    of points the replay already sent are discarded and the rest is released.
+    For TELEMETRY_WS_REPLAY_DEDUPE_SECONDS afterwards live frames of replayed
+    points are still dropped, covering points streamed after they were stored.
+    Only points younger than TELEMETRY_MAX_AGE_SECONDS are remembered, older
+    ones never reach the live stream.
+    """
+
+    def __init__(self, series: Iterable[Series], *, buffer_size: int):
+        self.series = set(series)
+        self.replaying = True
+        self._held: deque[tuple[Optional[ReplayKey], str, Series]] = deque(maxlen=buffer_size)
+        self._replayed: set[ReplayKey] = set()
+        self._live_after = now() - timedelta(seconds=settings.TELEMETRY_MAX_AGE_SECONDS)
+        self._expires_at: Optional[float] = None
+
+    @property
+    def expired(self) -> bool:
+        return self._expires_at is not None and time.monotonic() > self._expires_at
+
+    def matches(self, series: Series) -> bool:
+        return (series[0], None) in self.series or series in self.series
+
+    def record(self, point: dict) -> None:
+        """Remember a replayed point."""
+        _sent.inc()
+        if point["ts"] >= self._live_after:
+            self._replayed.add((point["device_serial_id"], point["metric"], point["ts"]))
+
+    def take(self, frame: str, series: Series, ts) -> bool:
+        """
+        Offer a live frame. Returns True if the gate held or dropped it,
+        False if it should be delivered.
+        """
+        if not self.matches(series):
+            return False
+
+        key = _replay_key(series, ts)
+        if self.replaying:
+            if len(self._held) == self._held.maxlen:
+                _dropped.inc()
+            self._held.append((key, frame, series))
+            return True
+
+        if key is not None and key in self._replayed:
+            _duplicates.inc()
+            return True
+        return False
+
+    def finish(self) -> list[tuple[str, Series]]:
+        """Switch to live: returns the held frames that were not replayed."""
+        self.replaying = False
+        self._expires_at = time.monotonic() + settings.TELEMETRY_WS_REPLAY_DEDUPE_SECONDS
+
+        released = []
+        for key, frame, series in self._held:
+            if key is not None and key in self._replayed:
+                _duplicates.inc()
+                continue
+            released.append((frame, series))
+        self._held.clear()
+        return released
+
+
+class ReplayingSink:
+    """
+    Wraps a connection's TelemetrySink and routes live frames through the
+    ReplayGates of running or just finished replays.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.gates: list[ReplayGate] = []
+
+    def start(self) -> None:
+        self.sink.start()
+
+    async def close(self) -> None:
+        await self.sink.close()
+
+    async def push(self, frame: str, series: Series, ts: Optional[str] = None) -> None:
+        if self.gates:
+            self.gates = [gate for gate in self.gates if not gate.expired]
+            for gate in self.gates:
+                if gate.take(frame, series, ts):
+                    return
+        await self.sink.push(frame, series, ts)
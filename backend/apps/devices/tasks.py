@@ -7,7 +7,9 @@ from django.db import OperationalError, InterfaceError
 from producers.kafka_producer import ProduceResult
 
 from .serializers.telemetry_serializers import TelemetryBatchCreateSerializer
+from .services.telemetry_samples import sample_count
 from .services.telemetry_services import telemetry_create, telemetry_validate
+from .services.telemetry_stream_publisher import publish_telemetry_rows
 from apps.devices.producers import (
     get_telemetry_clean_producer,
     get_telemetry_dlq_producer,
@@ -112,7 +114,7 @@ def validate_telemetry_payload(self, payload: dict | list) -> dict:
 
     validation_result = telemetry_validate(payload=serializer.valid_items)
 
-    valid_count = len(validation_result.validated_rows)
+    valid_count = sample_count(validation_result.validated_rows)
     error_count = len(validation_result.errors)
 
     if valid_count > 0:
@@ -136,7 +138,7 @@ def validate_telemetry_payload(self, payload: dict | list) -> dict:
     return {
         "valid": valid_count,
         "errors": error_count,
-        "expired": len(validation_result.expired_rows),
+        "expired": sample_count(validation_result.expired_rows),
     }
 
 
@@ -164,7 +166,8 @@ def write_telemetry_payload(self, payload: dict | list) -> dict:
         ingestion_latency_seconds.labels(source=source).observe(latency)
         return item_errors
 
-    result = telemetry_create(valid_data=valid_items)
+    # telemetry.clean is streamed to WebSockets by consumers.telemetry_clean_ws
+    result = telemetry_create(valid_data=valid_items, stream=False)
 
     if result.created_count > 0:
         ingestion_messages_total.labels(source=source, status='success').inc(result.created_count)
@@ -187,6 +190,15 @@ def write_telemetry_payload(self, payload: dict | list) -> dict:
     }
 
 
+@shared_task
+def stream_telemetry_rows(rows: list[dict[str, Any]]) -> None:
+    """
+    Fan out written telemetry rows to WebSocket groups, off the DB write path.
+    """
+    if not publish_telemetry_rows(rows):
+        logger.warning("Telemetry stream publish failed for %d rows", len(rows))
+
+
 def normalize_payload(payload: dict | list, source: str = 'unknown') -> list | None:
     """
     Normalize payload to list.
@@ -33,6 +33,25 @@ def valid_telemetry_payload():
     }
 
 
+@pytest.fixture
+def samples_telemetry_payload():
+    return {
+        'schema_version': 2,
+        'device': 'DEV-001',
+        'metrics': {
+            'temperature': {
+                'unit': 'celsius',
+                'samples': [[0, 21.5], [1, 21.6], [2, 21.8]],
+            },
+            'door_open': {
+                'unit': 'open',
+                'samples': [[0, False], [2, True]],
+            },
+        },
+        'ts': '2026-02-04T12:00:00Z',
+    }
+
+
 @pytest.fixture
 def validated_telemetry_row(device_metric_numeric):
     return {
@@ -0,0 +1,264 @@
+import asyncio
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.db import connections
+from django.test import override_settings
+
+from apps.devices.consumers import telemetry_consumer
+from apps.devices.consumers.telemetry_consumer import TelemetryConsumer
+from apps.devices.models import Device, Telemetry
+from apps.devices.services.telemetry_stream_hub import TelemetryStreamHub
+
+
+@pytest.fixture
+def hub():
+    hub = TelemetryStreamHub(channel='telemetry.stream.test')
+    hub._read = lambda: asyncio.sleep(0)
+    hub.last_values = AsyncMock(return_value=[])
+    with patch(
+        'apps.devices.consumers.telemetry_consumer.get_telemetry_stream_hub', return_value=hub
+    ):
+        yield hub
+
+
+@pytest.fixture
+def other_device(db, django_user_model):
+    owner = django_user_model.objects.create(username='other-user', email='other@example.com')
+    return Device.objects.create(serial_id='DEV-OTHER', is_active=True, user=owner)
+
+
+def communicator(user, role='client', query=''):
+    comm = WebsocketCommunicator(TelemetryConsumer.as_asgi(), f'/ws/telemetry/stream/?{query}')
+    comm.scope['user'] = user
+    comm.scope['role'] = role
+    return comm
+
+
+def run(coro):
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            # the consumer queries from the executor thread, close its connection
+            await database_sync_to_async(connections.close_all)()
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_subscribe_many_series_with_one_ownership_check(hub, user, active_device, other_device):
+    async def scenario():
+        comm = communicator(user, query='global=0')
+        connected, _ = await comm.connect()
+        assert connected
+        await comm.send_json_to(
+            {
+                'action': 'subscribe',
+                'series': [
+                    {'device': active_device.serial_id, 'metric': 'temperature'},
+                    {'device': active_device.serial_id, 'metric': 'humidity'},
+                    {'device': other_device.serial_id},
+                ],
+            }
+        )
+        ack = await comm.receive_json_from()
+        await comm.disconnect()
+        return ack
+
+    with patch(
+        'apps.devices.consumers.telemetry_consumer._devices_owned_by_user',
+        wraps=telemetry_consumer._devices_owned_by_user,
+    ) as owned_mock:
+        ack = run(scenario())
+
+    owned_mock.assert_called_once()
+    assert ack['type'] == 'subscription.ack'
+    assert ack['series'] == [
+        {'device': 'DEV-001', 'metric': 'temperature'},
+        {'device': 'DEV-001', 'metric': 'humidity'},
+    ]
+    assert ack['rejected'] == [{'device': 'DEV-OTHER', 'metric': None}]
+    hub.last_values.assert_awaited_once_with([('DEV-001', 'temperature'), ('DEV-001', 'humidity')])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_subscribe_sends_snapshot_then_live_frames(hub, user, active_device):
+    hub.last_values.return_value = ['{"value": 1}', '{"value": 2}']
+
+    async def scenario():
+        comm = communicator(user, query='global=0')
+        await comm.connect()
+        await comm.send_json_to(
+            {'action': 'subscribe', 'series': [{'device': active_device.serial_id}]}
+        )
+        ack = await comm.receive_json_from()
+        snapshot = await comm.receive_json_from()
+        await hub.dispatch(
+            [
+                {'device': 'DEV-001', 'metric': 'temperature', 'frame': '{"value": 3}'},
+                {'device': 'DEV-002', 'metric': 'temperature', 'frame': '{"value": 4}'},
+            ]
+        )
+        live = await comm.receive_json_from()
+        nothing_else = await comm.receive_nothing()
+        await comm.send_json_to(
+            {'action': 'unsubscribe', 'series': [{'device': active_device.serial_id}]}
+        )
+        unsubscribed = await comm.receive_json_from()
+        await comm.disconnect()
+        return ack, snapshot, live, nothing_else, unsubscribed
+
+    ack, snapshot, live, nothing_else, unsubscribed = run(scenario())
+
+    assert ack['series'] == [{'device': 'DEV-001', 'metric': None}]
+    assert snapshot == {'type': 'telemetry.snapshot', 'items': [{'value': 1}, {'value': 2}]}
+    assert live == {'value': 3}
+    assert nothing_else
+    assert unsubscribed['action'] == 'unsubscribe'
+    assert hub.subscriber_count == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(TELEMETRY_WS_MAX_SERIES=2)
+@pytest.mark.parametrize(
+    'message',
+    [
+        'not json',
+        json.dumps({'action': 'watch', 'series': [{'device': 'DEV-001'}]}),
+        json.dumps({'action': 'subscribe', 'series': []}),
+        json.dumps({'action': 'subscribe', 'series': [{'device': 1}]}),
+        json.dumps({'action': 'subscribe', 'series': [{'metric': 'a'}, {'metric': 'b'}]}),
+    ],
+)
+def test_invalid_subscription_messages_get_error(hub, user, message):
+    async def scenario():
+        comm = communicator(user)
+        await comm.connect()
+        await comm.send_to(text_data=message)
+        reply = await comm.receive_json_from()
+        await comm.disconnect()
+        return reply
+
+    reply = run(scenario())
+
+    assert reply['type'] == 'error'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_query_param_device_of_other_user_is_rejected(hub, user, other_device):
+    async def scenario():
+        comm = communicator(user, query=f'device={other_device.serial_id}')
+        connected, code = await comm.connect()
+        return connected, code
+
+    connected, code = run(scenario())
+
+    assert not connected
+    assert code == 4403
+
+
+@pytest.fixture
+def stored_points(device_metric_numeric, ts):
+    return [
+        Telemetry.objects.create(
+            device_metric=device_metric_numeric,
+            ts=ts - timedelta(seconds=30 - i * 10),
+            value_jsonb={'t': 'numeric', 'v': i},
+        )
+        for i in range(3)
+    ]
+
+
+def live_point(row, value):
+    frame = json.dumps({'data': {'value': value}})
+    return {'device': 'DEV-001', 'metric': 'temperature', 'ts': row.ts.isoformat(), 'frame': frame}
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(TELEMETRY_WS_REPLAY_CHUNK_SIZE=2)
+def test_subscribe_since_replays_in_chunks_then_goes_live(hub, user, stored_points):
+    since = stored_points[0].ts.isoformat()
+
+    async def scenario():
+        comm = communicator(user, query='global=0')
+        await comm.connect()
+        await comm.send_json_to(
+            {
+                'action': 'subscribe',
+                'series': [{'device': 'DEV-001', 'metric': 'temperature'}],
+                'since': since,
+            }
+        )
+        messages = [await comm.receive_json_from() for _ in range(4)]
+        # live frame of an already replayed point, then a new point
+        new_row = Telemetry(ts=stored_points[-1].ts + timedelta(seconds=10))
+        await hub.dispatch([live_point(stored_points[-1], 2), live_point(new_row, 3)])
+        live = await comm.receive_json_from()
+        nothing_else = await comm.receive_nothing()
+        await comm.disconnect()
+        return messages, live, nothing_else
+
+    messages, live, nothing_else = run(scenario())
+
+    ack, first, second, done = messages
+    assert ack['type'] == 'subscription.ack'
+    assert first['type'] == second['type'] == 'telemetry.replay'
+    assert [item['data']['value'] for item in first['items'] + second['items']] == [0, 1, 2]
+    assert first['items'][0]['type'] == 'telemetry.update'
+    assert done['type'] == 'telemetry.replay.done'
+    assert done['count'] == 3
+    assert done['truncated'] is False
+    assert done['until'] == stored_points[-1].ts.isoformat()
+    assert live == {'data': {'value': 3}}
+    assert nothing_else
+    hub.last_values.assert_not_awaited()
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(TELEMETRY_WS_REPLAY_MAX_POINTS=2)
+def test_replay_is_truncated_at_max_points(hub, user, stored_points):
+    async def scenario():
+        comm = communicator(user, query='global=0')
+        await comm.connect()
+        await comm.send_json_to(
+            {
+                'action': 'subscribe',
+                'series': [{'device': 'DEV-001'}],
+                'since': stored_points[0].ts.isoformat(),
+            }
+        )
+        messages = [await comm.receive_json_from() for _ in range(3)]
+        await comm.disconnect()
+        return messages
+
+    _, replay, done = run(scenario())
+
+    assert len(replay['items']) == 2
+    assert done['count'] == 2
+    assert done['truncated'] is True
+    assert done['until'] == stored_points[1].ts.isoformat()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    'series, since',
+    [
+        ([{'device': 'DEV-001'}], 'yesterday'),
+        ([{'metric': 'temperature'}], '2026-02-04T12:00:00Z'),
+    ],
+)
+def test_invalid_replay_requests_get_error(hub, user, series, since):
+    async def scenario():
+        comm = communicator(user, query='global=0')
+        await comm.connect()
+        await comm.send_json_to({'action': 'subscribe', 'series': series, 'since': since})
+        reply = await comm.receive_json_from()
+        await comm.disconnect()
+        return reply
+
+    assert run(scenario())['type'] == 'error'
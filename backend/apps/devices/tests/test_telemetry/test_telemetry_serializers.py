@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.utils import timezone
 import pytest
 
@@ -224,3 +225,77 @@ def test_batch_serializer_empty_list_returns_empty_batch_error():
     assert s.is_valid() is False
     assert 'items' in s.errors
     assert s.errors['items']['non_field_errors'] == 'Empty batch.'
+
+
+def test_samples_schema_version_is_accepted(samples_telemetry_payload):
+    """Test schema_version 2 keeps the unit once and the samples per metric."""
+    s = TelemetryCreateSerializer(samples_telemetry_payload)
+
+    assert s.is_valid() is True
+    assert s.validated_data['ts'].isoformat() == '2026-02-04T12:00:00+00:00'
+    assert s.validated_data['metrics']['temperature'] == {
+        'unit': 'celsius',
+        'samples': [[0, 21.5], [1, 21.6], [2, 21.8]],
+    }
+
+
+@pytest.mark.parametrize(
+    'metric',
+    [
+        {'value': 21.5, 'unit': 'celsius'},
+        {'unit': 'celsius', 'samples': []},
+        {'unit': 'celsius', 'samples': [21.5]},
+        {'unit': 'celsius', 'samples': [[0, 21.5, 1]]},
+        {'unit': 'celsius', 'samples': [[-1, 21.5]]},
+        {'unit': 'celsius', 'samples': [[0.5, 21.5]]},
+        {'unit': 'celsius', 'samples': [[True, 21.5]]},
+        {'unit': 'celsius', 'samples': [[0, {'nested': 'object'}]]},
+        {'unit': '', 'samples': [[0, 21.5]]},
+    ],
+)
+def test_samples_schema_version_rejects_invalid_metrics(samples_telemetry_payload, metric):
+    """Test schema_version 2 metrics must carry a unit and [ts_offset, value] samples."""
+    payload = samples_telemetry_payload
+    payload['metrics']['temperature'] = metric
+
+    s = TelemetryCreateSerializer(payload)
+    assert s.is_valid() is False
+    assert 'temperature' in s.errors['metrics']
+
+
+@override_settings(TELEMETRY_MAX_SAMPLES_PER_METRIC=2)
+def test_samples_schema_version_limits_samples_per_metric(samples_telemetry_payload):
+    """Test the number of samples per metric is capped."""
+    s = TelemetryCreateSerializer(samples_telemetry_payload)
+
+    assert s.is_valid() is False
+    assert list(s.errors['metrics']) == ['temperature']
+
+
+def test_producer_batch_expands_sample_rows():
+    """Test compact rows read from telemetry.clean are expanded at write time."""
+    rows = [
+        {
+            'device_serial_id': 'DEV-001',
+            'device_metric_id': 7,
+            'ts': '2026-02-04T12:00:00+00:00',
+            't': 'numeric',
+            'samples': [[0, 1.5], [60, 2.5]],
+        },
+        {
+            'device_serial_id': 'DEV-001',
+            'device_metric_id': 7,
+            'ts': '2026-02-04T12:00:00+00:00',
+            't': 'numeric',
+            'samples': [[0]],
+        },
+    ]
+
+    valid_items, item_errors = TelemetryBatchCreateSerializer(rows).validate_producer_batch()
+
+    assert [(r['ts'].isoformat(), r['value_jsonb']) for r in valid_items] == [
+        ('2026-02-04T12:00:00+00:00', {'t': 'numeric', 'v': 1.5}),
+        ('2026-02-04T12:01:00+00:00', {'t': 'numeric', 'v': 2.5}),
+    ]
+    assert list(item_errors) == [1]
+    assert 'samples' in item_errors[1]
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 from unittest.mock import patch
 from apps.devices.models import Metric, DeviceMetric, Telemetry
@@ -178,7 +180,7 @@ def test_telemetry_create_type_mismatch_str(active_device, device_metric_str, ts
 
 
 @pytest.mark.django_db
-@patch('apps.devices.services.telemetry_services.publish_telemetry_event')
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
 @patch(
     'validator.telemetry_validator.TelemetryBatchValidator._validate_duplicates', lambda self: None
 )
@@ -213,3 +215,40 @@ def test_telemetry_create_creates_rows_for_valid_metrics_only(
         e for e in validation.errors if e.get("index") == 0 and e.get("metric") == "unknown_metric"
     ]
     assert unknown_errors
+
+
+@pytest.mark.django_db
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
+@patch(
+    'validator.telemetry_validator.TelemetryBatchValidator._validate_duplicates', lambda self: None
+)
+def test_telemetry_create_expands_samples_rows(
+    stream_mock,
+    active_device,
+    device_metric_numeric,
+    device_metric_bool,
+    ts,
+):
+    base = ts.replace(microsecond=0) - timedelta(seconds=60)
+    payload = [
+        {
+            "device_serial_id": active_device.serial_id,
+            "metrics": {
+                "temperature": {"unit": "celsius", "samples": [[0, 21.5], [1, 21.6], [2, 21.8]]},
+                "door_open": {"unit": "open", "samples": [[0, False], [2, True]]},
+            },
+            "ts": base,
+        }
+    ]
+
+    validation = telemetry_validate(payload)
+    result = telemetry_create(valid_data=validation.validated_rows)
+
+    assert len(validation.validated_rows) == 2
+    assert result.attempted_count == result.created_count == 5
+    temperature = Telemetry.objects.filter(device_metric=device_metric_numeric).order_by('ts')
+    assert [(t.ts - base, t.value_jsonb['v']) for t in temperature] == [
+        (timedelta(seconds=0), 21.5),
+        (timedelta(seconds=1), 21.6),
+        (timedelta(seconds=2), 21.8),
+    ]
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from apps.common.metrics import websocket_frames_total
+from apps.devices.services.telemetry_stream_delivery import (
+    BatchTelemetrySink,
+    DeliveryOptions,
+    LatestTelemetrySink,
+    TelemetrySink,
+    build_telemetry_sink,
+    parse_delivery_options,
+)
+
+
+class FakeSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send(self, text_data=None):
+        self.frames.append(text_data)
+
+
+def frame(value, device='DEV-001', metric='temperature'):
+    return json.dumps({'data': {'device_serial_id': device, 'metric': metric, 'value': value}})
+
+
+def frames_counter(mode, outcome):
+    return websocket_frames_total.labels(mode=mode, outcome=outcome)._value.get()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@override_settings(
+    TELEMETRY_WS_INTERVAL_MS=250,
+    TELEMETRY_WS_MIN_INTERVAL_MS=50,
+    TELEMETRY_WS_MAX_RATE=0,
+    TELEMETRY_WS_BUFFER_SIZE=1000,
+)
+def test_parse_delivery_options_defaults_and_params():
+    assert parse_delivery_options({}) == DeliveryOptions()
+
+    options = parse_delivery_options(
+        {'mode': ['latest'], 'interval_ms': ['500'], 'max_rate': ['10']}
+    )
+
+    assert options == DeliveryOptions(mode='latest', interval_ms=500, max_rate=10.0)
+
+
+@pytest.mark.parametrize(
+    'params',
+    [
+        {'mode': ['firehose']},
+        {'interval_ms': ['10']},
+        {'interval_ms': ['soon']},
+        {'max_rate': ['-1']},
+    ],
+)
+def test_parse_delivery_options_rejects_invalid_params(params):
+    with pytest.raises(ValueError):
+        parse_delivery_options(params)
+
+
+def test_build_telemetry_sink_per_mode():
+    socket = FakeSocket()
+
+    assert type(build_telemetry_sink(socket, DeliveryOptions())) is TelemetrySink
+    assert isinstance(
+        build_telemetry_sink(socket, DeliveryOptions(mode='batch')), BatchTelemetrySink
+    )
+    assert isinstance(
+        build_telemetry_sink(socket, DeliveryOptions(mode='latest')), LatestTelemetrySink
+    )
+
+
+def test_stream_sink_drops_frames_above_max_rate():
+    socket = FakeSocket()
+    sink = TelemetrySink(socket, DeliveryOptions(max_rate=2))
+    dropped_before = frames_counter('stream', 'dropped')
+
+    async def scenario():
+        for i in range(5):
+            await sink.push(frame(i), ('DEV-001', 'temperature'))
+
+    with patch('apps.devices.services.telemetry_stream_delivery.time.monotonic', return_value=1):
+        sink._refilled_at = 1
+        run(scenario())
+
+    assert [json.loads(f)['data']['value'] for f in socket.frames] == [0, 1]
+    assert frames_counter('stream', 'dropped') - dropped_before == 3
+
+
+def test_batch_sink_sends_array_frame_and_bounds_buffer():
+    socket = FakeSocket()
+    sink = BatchTelemetrySink(socket, DeliveryOptions(mode='batch', buffer_size=3))
+    dropped_before = frames_counter('batch', 'dropped')
+
+    async def scenario():
+        for i in range(5):
+            await sink.push(frame(i), ('DEV-001', 'temperature'))
+        return await sink.flush()
+
+    assert run(scenario()) == 3
+
+    assert len(socket.frames) == 1
+    assert [item['data']['value'] for item in json.loads(socket.frames[0])] == [2, 3, 4]
+    assert frames_counter('batch', 'dropped') - dropped_before == 2
+
+
+def test_latest_sink_conflates_per_series():
+    socket = FakeSocket()
+    sink = LatestTelemetrySink(socket, DeliveryOptions(mode='latest', buffer_size=2))
+    conflated_before = frames_counter('latest', 'conflated')
+    dropped_before = frames_counter('latest', 'dropped')
+
+    async def scenario():
+        await sink.push(frame(1), ('DEV-001', 'temperature'))
+        await sink.push(frame(2, metric='humidity'), ('DEV-001', 'humidity'))
+        await sink.push(frame(3), ('DEV-001', 'temperature'))
+        await sink.push(frame(4, device='DEV-002'), ('DEV-002', 'temperature'))
+        await sink.flush()
+
+    run(scenario())
+
+    items = json.loads(socket.frames[0])
+    assert [item['data']['value'] for item in items] == [3, 2]
+    assert frames_counter('latest', 'conflated') - conflated_before == 1
+    assert frames_counter('latest', 'dropped') - dropped_before == 1
+
+
+def test_buffered_sink_flushes_on_interval_until_closed():
+    socket = FakeSocket()
+    sink = BatchTelemetrySink(socket, DeliveryOptions(mode='batch', interval_ms=10))
+
+    async def scenario():
+        sink.start()
+        await sink.push(frame(1), ('DEV-001', 'temperature'))
+        await asyncio.sleep(0.05)
+        await sink.close()
+        await sink.push(frame(2), ('DEV-001', 'temperature'))
+        await asyncio.sleep(0.03)
+
+    run(scenario())
+
+    assert len(socket.frames) == 1
+    assert json.loads(socket.frames[0])[0]['data']['value'] == 1
+
+
+def test_max_rate_stretches_buffered_interval():
+    sink = BatchTelemetrySink(FakeSocket(), DeliveryOptions(mode='batch', max_rate=2))
+
+    assert sink.interval == 0.5
@@ -0,0 +1,190 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import fakeredis
+
+from apps.devices.services.telemetry_stream_delivery import DeliveryOptions, TelemetrySink
+from apps.devices.services.telemetry_stream_hub import TelemetryStreamHub
+from apps.devices.services.telemetry_stream_publisher import publish_telemetry_batch
+
+
+class FakeSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send(self, text_data=None):
+        self.frames.append(text_data)
+
+
+class FakeSink:
+    def __init__(self):
+        self.frames = []
+
+    async def push(self, frame, series, ts=None):
+        self.frames.append(frame)
+
+
+class BrokenSink:
+    async def push(self, frame, series, ts=None):
+        raise ConnectionError('socket closed')
+
+
+def point(device, metric, frame):
+    return {'device': device, 'metric': metric, 'frame': frame}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_hub():
+    hub = TelemetryStreamHub(channel='telemetry.stream.test')
+    hub._read = lambda: asyncio.sleep(0)
+    return hub
+
+
+def test_dispatch_routes_frames_by_device_and_metric():
+    hub = make_hub()
+    everything, dev1, temperature, broken = (
+        FakeSink(),
+        FakeSink(),
+        FakeSink(),
+        BrokenSink(),
+    )
+
+    async def scenario():
+        await hub.subscribe(everything, [(None, None)])
+        await hub.subscribe(dev1, [('DEV-001', None)])
+        await hub.subscribe(temperature, [(None, 'temperature')])
+        await hub.subscribe(broken, [('DEV-001', None)])
+        return await hub.dispatch(
+            [
+                point('DEV-001', 'temperature', 'a'),
+                point('DEV-002', 'humidity', 'b'),
+                point('DEV-002', 'temperature', 'c'),
+            ]
+        )
+
+    written = run(scenario())
+
+    assert everything.frames == ['a', 'b', 'c']
+    assert dev1.frames == ['a']
+    assert temperature.frames == ['a', 'c']
+    assert written == 6
+
+
+def test_socket_matching_several_patterns_gets_frame_once():
+    hub = make_hub()
+    socket = FakeSink()
+
+    async def scenario():
+        await hub.subscribe(socket, [('DEV-001', None), (None, 'temperature')])
+        await hub.dispatch([point('DEV-001', 'temperature', 'a')])
+
+    run(scenario())
+
+    assert socket.frames == ['a']
+
+
+def test_series_pattern_matches_only_that_device_metric_pair():
+    hub = make_hub()
+    socket = FakeSink()
+
+    async def scenario():
+        await hub.subscribe(socket, [('DEV-001', 'temperature'), ('DEV-002', 'humidity')])
+        await hub.dispatch(
+            [
+                point('DEV-001', 'temperature', 'a'),
+                point('DEV-001', 'humidity', 'b'),
+                point('DEV-002', 'humidity', 'c'),
+            ]
+        )
+
+    run(scenario())
+
+    assert socket.frames == ['a', 'c']
+
+
+def test_unsubscribe_series_keeps_other_patterns():
+    hub = make_hub()
+    socket = FakeSink()
+
+    async def scenario():
+        await hub.subscribe(socket, [('DEV-001', None), ('DEV-002', None)])
+        hub.unsubscribe(socket, [('DEV-001', None)])
+        await hub.dispatch([point('DEV-001', 'temperature', 'a'), point('DEV-002', 'x', 'b')])
+
+    run(scenario())
+
+    assert socket.frames == ['b']
+    assert hub.subscriber_count == 1
+
+
+def test_unsubscribe_removes_socket_from_index():
+    hub = make_hub()
+    socket = FakeSink()
+
+    async def scenario():
+        await hub.subscribe(socket, [('DEV-001', None)])
+        hub.unsubscribe(socket)
+        await hub.dispatch([point('DEV-001', 'temperature', 'a')])
+
+    run(scenario())
+
+    assert socket.frames == []
+    assert hub.subscriber_count == 0
+    assert hub._index == {}
+
+
+def test_published_batch_reaches_sockets_through_one_subscription():
+    server = fakeredis.FakeServer()
+    hub = TelemetryStreamHub(channel='telemetry.stream')
+    sockets = [FakeSocket() for _ in range(3)]
+    sinks = [TelemetrySink(socket, DeliveryOptions()) for socket in sockets]
+    points = [
+        {
+            'device_serial_id': 'DEV-001',
+            'device_id': 1,
+            'metric': 'temperature',
+            'metric_type': 'numeric',
+            'value': i,
+            'ts': '2026-02-04T12:00:00+00:00',
+        }
+        for i in range(2)
+    ]
+
+    async def scenario():
+        for sink in sinks:
+            await hub.subscribe(sink, [('DEV-001', None)])
+        await asyncio.sleep(0.05)
+        assert publish_telemetry_batch(points) is True
+        for _ in range(100):
+            if all(len(s.frames) == 2 for s in sockets):
+                break
+            await asyncio.sleep(0.01)
+        snapshot = await hub.last_values(
+            [('DEV-001', None), ('DEV-001', 'temperature'), (None, 'temperature')]
+        )
+        for sink in sinks:
+            hub.unsubscribe(sink)
+        return snapshot
+
+    with (
+        patch(
+            'apps.devices.services.telemetry_stream_hub.aioredis.Redis',
+            lambda **kwargs: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+        ),
+        patch(
+            'apps.devices.services.telemetry_stream_publisher.get_redis_client',
+            return_value=fakeredis.FakeRedis(server=server),
+        ),
+    ):
+        snapshot = run(scenario())
+
+    # latest frame of the series, once per device pattern and once per exact series
+    assert [json.loads(f)['data']['value'] for f in snapshot] == [1, 1]
+    for socket in sockets:
+        assert [json.loads(f)['data']['value'] for f in socket.frames] == [0, 1]
+    # the same serialized frame object is written to every socket
+    assert sockets[0].frames[0] is sockets[1].frames[0]
@@ -0,0 +1,240 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from apps.devices.kafka_handlers.telemetry_clean_handler import WebSocketTelemetryCleanHandler
+from apps.devices.services.telemetry_services import telemetry_create
+from apps.devices.services.telemetry_stream_publisher import (
+    publish_telemetry_batch,
+    publish_telemetry_rows,
+)
+
+
+def make_point(serial='DEV-001', metric='temperature', value=1.5):
+    return {
+        'device_serial_id': serial,
+        'device_id': 1,
+        'metric': metric,
+        'metric_type': 'numeric',
+        'value': value,
+        'ts': '2026-02-04T12:00:00+00:00',
+    }
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    with patch(
+        'apps.devices.services.telemetry_stream_publisher.get_redis_client', return_value=client
+    ):
+        yield client
+
+
+def published_points(client) -> list[dict]:
+    points = []
+    for call in client.pipeline.return_value.publish.call_args_list:
+        channel, envelope = call.args
+        assert channel == 'telemetry.stream'
+        for point in json.loads(envelope)['points']:
+            points.append({**point, 'frame': json.loads(point['frame'])})
+    return points
+
+
+def test_batch_is_published_once(redis_client):
+    points = [make_point(value=i) for i in range(100)]
+
+    assert publish_telemetry_batch(points) is True
+
+    pipeline = redis_client.pipeline.return_value
+    pipeline.publish.assert_called_once()
+    pipeline.execute.assert_called_once()
+    published = published_points(redis_client)
+    assert [p['frame']['data']['value'] for p in published] == list(range(100))
+    assert {(p['device'], p['metric']) for p in published} == {('DEV-001', 'temperature')}
+
+
+def stored_last_values(client) -> dict:
+    """(frames key, metric) -> (ts, value) passed to the last-value script."""
+    script = client.register_script.return_value
+    keys, args = script.call_args.kwargs['keys'], script.call_args.kwargs['args']
+    stored = {}
+    for i in range(1, len(args), 4):
+        index, metric, ts, frame = args[i : i + 4]
+        stored[(keys[index - 1], metric)] = (float(ts), json.loads(frame)['data']['value'])
+    return stored
+
+
+def test_batch_stores_latest_frame_per_series(redis_client):
+    points = [make_point(value=1), make_point(value=2), make_point(metric='humidity', value=3)]
+
+    publish_telemetry_batch(points)
+
+    script = redis_client.register_script.return_value
+    script.assert_called_once()
+    assert script.call_args.kwargs['client'] is redis_client.pipeline.return_value
+    assert script.call_args.kwargs['keys'] == [
+        'telemetry:last:DEV-001',
+        'telemetry:last_ts:DEV-001',
+    ]
+    assert script.call_args.kwargs['args'][0] == 86400
+    assert {key: value for key, (_, value) in stored_last_values(redis_client).items()} == {
+        ('telemetry:last:DEV-001', 'temperature'): 2,
+        ('telemetry:last:DEV-001', 'humidity'): 3,
+    }
+
+
+def test_batch_stores_newest_frame_by_ts_not_arrival(redis_client):
+    points = [
+        {**make_point(value=1), 'ts': '2026-02-04T12:00:05+00:00'},
+        {**make_point(value=2), 'ts': '2026-02-04T12:00:00+00:00'},
+    ]
+
+    publish_telemetry_batch(points)
+
+    assert list(stored_last_values(redis_client).values()) == [(1770206405.0, 1)]
+
+
+def test_last_value_script_keeps_newer_stored_frame():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    newer = {**make_point(value=2), 'ts': '2026-02-04T13:00:00+00:00'}
+    older = {**make_point(value=1), 'ts': '2026-02-04T12:00:00+00:00'}
+
+    with patch(
+        'apps.devices.services.telemetry_stream_publisher.get_redis_client', return_value=client
+    ):
+        publish_telemetry_batch([newer])
+        publish_telemetry_batch([older, make_point(metric='humidity', value=3)])
+
+    stored = client.hgetall('telemetry:last:DEV-001')
+    assert json.loads(stored['temperature'])['data']['value'] == 2
+    assert json.loads(stored['humidity'])['data']['value'] == 3
+    assert 0 < client.ttl('telemetry:last_ts:DEV-001') <= 86400
+
+
+def test_batch_points_share_sent_at(redis_client):
+    points = [
+        make_point(serial='DEV-001', metric='temperature'),
+        make_point(serial='DEV-002', metric='humidity'),
+    ]
+
+    publish_telemetry_batch(points)
+
+    published = published_points(redis_client)
+    assert [p['device'] for p in published] == ['DEV-001', 'DEV-002']
+    assert [p['metric'] for p in published] == ['temperature', 'humidity']
+    assert len({p['frame']['sent_at'] for p in published}) == 1
+    assert published[0]['frame']['type'] == 'telemetry.update'
+
+
+def test_empty_batch_sends_nothing(redis_client):
+    assert publish_telemetry_batch([]) is True
+    redis_client.pipeline.assert_not_called()
+
+
+def test_batch_returns_false_when_publish_fails(redis_client):
+    redis_client.pipeline.return_value.execute.side_effect = ConnectionError('redis down')
+
+    assert publish_telemetry_batch([make_point()]) is False
+
+
+@pytest.mark.django_db
+def test_rows_are_resolved_with_device_metric_details(
+    redis_client, device_metric_numeric, validated_telemetry_row, django_assert_num_queries
+):
+    rows = [validated_telemetry_row, {**validated_telemetry_row, 'device_metric_id': 999999}]
+
+    with django_assert_num_queries(1):
+        assert publish_telemetry_rows(rows) is True
+
+    published = published_points(redis_client)
+    assert len(published) == 1
+    data = published[0]['frame']['data']
+    assert data['device_serial_id'] == device_metric_numeric.device.serial_id
+    assert data['metric'] == device_metric_numeric.metric.metric_type
+    assert data['value'] == 100
+
+
+@pytest.mark.django_db
+def test_clean_handler_publishes_valid_records_in_one_batch(device_metric_numeric):
+    records = [
+        {
+            'device_metric_id': device_metric_numeric.id,
+            'ts': '2026-02-04T12:00:00Z',
+            'value_jsonb': {'t': 'numeric', 'v': 1},
+        },
+        {
+            'device_metric_id': device_metric_numeric.id,
+            'ts': 'not-a-date',
+            'value_jsonb': {'t': 'numeric', 'v': 2},
+        },
+        {'ts': '2026-02-04T12:00:00Z'},
+    ]
+
+    with patch(
+        'apps.devices.kafka_handlers.telemetry_clean_handler.publish_telemetry_rows',
+        return_value=True,
+    ) as publish_mock:
+        WebSocketTelemetryCleanHandler().handle(records)
+
+    publish_mock.assert_called_once()
+    (rows,) = publish_mock.call_args.args
+    assert [row['value_jsonb']['v'] for row in rows] == [1]
+
+
+def test_clean_handler_expands_sample_rows():
+    record = {
+        'device_serial_id': 'DEV-001',
+        'device_metric_id': 1,
+        'ts': '2026-02-04T12:00:00+00:00',
+        't': 'numeric',
+        'samples': [[0, 1], [30, 2]],
+    }
+
+    with patch(
+        'apps.devices.kafka_handlers.telemetry_clean_handler.publish_telemetry_rows',
+        return_value=True,
+    ) as publish_mock:
+        WebSocketTelemetryCleanHandler().handle([record])
+
+    (rows,) = publish_mock.call_args.args
+    assert [(row['ts'].isoformat(), row['value_jsonb']['v']) for row in rows] == [
+        ('2026-02-04T12:00:00+00:00', 1),
+        ('2026-02-04T12:00:30+00:00', 2),
+    ]
+
+
+def test_clean_handler_raises_when_publish_fails():
+    record = {'device_metric_id': 1, 'ts': '2026-02-04T12:00:00Z', 'value_jsonb': {'v': 1}}
+
+    with patch(
+        'apps.devices.kafka_handlers.telemetry_clean_handler.publish_telemetry_rows',
+        return_value=False,
+    ):
+        with pytest.raises(RuntimeError):
+            WebSocketTelemetryCleanHandler().handle(record)
+
+
+@pytest.mark.django_db
+def test_telemetry_create_streams_rows_after_commit(
+    validated_telemetry_row, django_capture_on_commit_callbacks
+):
+    with patch('apps.devices.tasks.stream_telemetry_rows.delay') as delay_mock:
+        with django_capture_on_commit_callbacks(execute=True):
+            telemetry_create(valid_data=[validated_telemetry_row])
+            delay_mock.assert_not_called()
+
+    delay_mock.assert_called_once_with([validated_telemetry_row])
+
+
+@pytest.mark.django_db
+def test_telemetry_create_without_stream_does_not_schedule(
+    validated_telemetry_row, django_capture_on_commit_callbacks
+):
+    with patch('apps.devices.tasks.stream_telemetry_rows.delay') as delay_mock:
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            telemetry_create(valid_data=[validated_telemetry_row], stream=False)
+
+    assert callbacks == []
+    delay_mock.assert_not_called()
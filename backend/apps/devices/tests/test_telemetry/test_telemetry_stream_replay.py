@@ -0,0 +1,78 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from apps.devices.models import Telemetry
+from apps.devices.services.telemetry_stream_replay import ReplayGate, telemetry_replay_points
+
+
+def replayed(ts, device='DEV-001', metric='temperature'):
+    return {'device_serial_id': device, 'metric': metric, 'ts': ts}
+
+
+def test_gate_holds_live_frames_and_releases_unreplayed_ones():
+    ts = timezone.now()
+    gate = ReplayGate([('DEV-001', None)], buffer_size=10)
+
+    assert gate.take('a', ('DEV-001', 'temperature'), ts.isoformat()) is True
+    assert gate.take('b', ('DEV-001', 'humidity'), ts.isoformat()) is True
+    assert gate.take('c', ('DEV-002', 'temperature'), ts.isoformat()) is False
+    gate.record(replayed(ts))
+
+    assert gate.finish() == [('b', ('DEV-001', 'humidity'))]
+
+
+def test_gate_drops_late_live_duplicates_until_it_expires():
+    ts = timezone.now()
+    gate = ReplayGate([('DEV-001', 'temperature')], buffer_size=10)
+    gate.record(replayed(ts))
+    gate.finish()
+
+    # same instant in another UTC offset is the same point
+    other_offset = ts.astimezone(timezone.get_fixed_timezone(120)).isoformat()
+    assert gate.take('a', ('DEV-001', 'temperature'), other_offset) is True
+    assert gate.take('b', ('DEV-001', 'temperature'), (ts + timedelta(1)).isoformat()) is False
+    assert gate.expired is False
+
+    with patch('apps.devices.services.telemetry_stream_replay.time.monotonic', return_value=1e12):
+        assert gate.expired is True
+
+
+def test_gate_forgets_points_too_old_for_the_live_stream():
+    old = timezone.now() - timedelta(days=2)
+    gate = ReplayGate([('DEV-001', None)], buffer_size=10)
+    gate.record(replayed(old))
+    gate.finish()
+
+    assert gate._replayed == set()
+
+
+def test_gate_buffer_is_bounded():
+    gate = ReplayGate([('DEV-001', None)], buffer_size=2)
+    for frame in 'abc':
+        gate.take(frame, ('DEV-001', 'temperature'), None)
+
+    assert [frame for frame, _ in gate.finish()] == ['b', 'c']
+
+
+@pytest.mark.django_db
+def test_replay_points_filters_series_and_orders_by_ts(
+    device_metric_numeric, device_metric_bool, ts
+):
+    for i in range(3):
+        Telemetry.objects.create(
+            device_metric=device_metric_numeric,
+            ts=ts - timedelta(minutes=i),
+            value_jsonb={'t': 'numeric', 'v': i},
+        )
+    Telemetry.objects.create(
+        device_metric=device_metric_bool, ts=ts, value_jsonb={'t': 'bool', 'v': True}
+    )
+
+    points = list(telemetry_replay_points([('DEV-001', 'temperature')], ts - timedelta(minutes=1)))
+
+    assert [p['value'] for p in points] == [1, 0]
+    assert points[0]['device_serial_id'] == 'DEV-001'
+    assert points[0]['metric'] == 'temperature'
@@ -1,7 +1,7 @@
 from django.conf import settings
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from django.utils import timezone
 from datetime import datetime, timedelta
 from validator.telemetry_validator import TelemetryBatchValidator
@@ -177,3 +177,94 @@ def test_batch_validator_multiple_metrics(active_device, device_metric, temperat
 
     validated_metrics = [r["device_metric_id"] for r in validator.expired_rows]
     assert len(validated_metrics) == 1
+
+
+@pytest.mark.django_db
+def test_batch_validator_samples_kept_as_one_row(active_device, device_metric):
+    ts = timezone.now().replace(microsecond=0) - timedelta(seconds=10)
+    payload = [
+        {
+            "device_serial_id": active_device.serial_id,
+            "metrics": {
+                "humidity": {
+                    "unit": "percent",
+                    "samples": [[0, 55], [1, "not_numeric"], [2, 56.5]],
+                }
+            },
+            "ts": ts,
+        }
+    ]
+
+    with patch.object(TelemetryBatchValidator, "_validate_duplicates", lambda self: None):
+        validator = TelemetryBatchValidator(payload)
+        validator.validate()
+
+    assert validator.validated_rows == [
+        {
+            "device_serial_id": active_device.serial_id,
+            "device_metric_id": device_metric.id,
+            "ts": ts,
+            "t": "numeric",
+            "samples": [[0, 55], [2, 56.5]],
+        }
+    ]
+    [error] = validator.invalid_rows
+    assert error["error"] == "type_mismatch"
+    assert error["ts"] == ts + timedelta(seconds=1)
+
+
+@pytest.mark.django_db
+def test_batch_validator_samples_unit_checked_once(active_device, device_metric):
+    payload = [
+        {
+            "device_serial_id": active_device.serial_id,
+            "metrics": {"humidity": {"unit": "wrong_unit", "samples": [[0, 55], [1, 56]]}},
+            "ts": timezone.now(),
+        }
+    ]
+    validator = TelemetryBatchValidator(payload)
+    validator.validate()
+
+    assert validator.validated_rows == []
+    assert [e["error"] for e in validator.invalid_rows] == ["unit_mismatch"]
+
+
+@pytest.mark.django_db
+def test_batch_validator_splits_expired_samples(active_device, device_metric):
+    ts = timezone.now() - timedelta(seconds=settings.TELEMETRY_MAX_AGE_SECONDS + 10)
+    payload = [
+        {
+            "device_serial_id": active_device.serial_id,
+            "metrics": {"humidity": {"unit": "percent", "samples": [[0, 55], [60, 56]]}},
+            "ts": ts,
+        }
+    ]
+
+    with patch.object(TelemetryBatchValidator, "_validate_duplicates", lambda self: None):
+        validator = TelemetryBatchValidator(payload)
+        validator.validate()
+
+    assert [r["samples"] for r in validator.expired_rows] == [[[0, 55]]]
+    assert [r["samples"] for r in validator.validated_rows] == [[[60, 56]]]
+
+
+@pytest.mark.django_db
+def test_batch_validator_drops_duplicate_samples(active_device, device_metric):
+    ts = timezone.now().replace(microsecond=0)
+    payload = [
+        {
+            "device_serial_id": active_device.serial_id,
+            "metrics": {"humidity": {"unit": "percent", "samples": [[0, 55], [1, 56]]}},
+            "ts": ts,
+        }
+    ]
+    seen = {f"{device_metric.id},{ts}"}
+    checker = MagicMock()
+    checker.process.side_effect = lambda key: key not in seen
+
+    with patch("validator.telemetry_validator.build_redis_checker", return_value=checker):
+        validator = TelemetryBatchValidator(payload)
+        validator.validate()
+
+    assert [r["samples"] for r in validator.validated_rows] == [[[1, 56]]]
+    assert [(e["error"], e["ts"]) for e in validator.invalid_rows] == [("duplicate", ts)]
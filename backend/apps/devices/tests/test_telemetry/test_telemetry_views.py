@@ -1,9 +1,17 @@
+import gzip
+import io
 import json
+import time
+
+import cbor2
+import msgpack
 import pytest
 from unittest.mock import Mock, patch, create_autospec
 
 from django.test import override_settings
 
+from apps.common.utils.views_utils import iter_body_lines, split_json_records
+from producers.config import ProducerConfig
 from producers.kafka_producer import KafkaProducer, ProduceResult
 
 
@@ -30,7 +38,7 @@ def test_request_triggers_telemetry_producer(
 ):
     """Test view triggers 202 and activates KafkaProducer produce()."""
     producer = create_autospec(KafkaProducer, instance=True)
-    producer.produce.return_value = ProduceResult.ENQUEUED
+    producer.produce_raw_batch.return_value = [ProduceResult.ENQUEUED]
     get_producer_mock.return_value = producer
 
     res = post_json(
@@ -41,12 +49,65 @@ def test_request_triggers_telemetry_producer(
     )
 
     assert res.status_code == 202
-    producer.produce.assert_called_once()
+    producer.produce_raw_batch.assert_called_once()
+    producer.produce.assert_not_called()
 
     data = res.json()
     assert data['status'] == 'accepted'
 
 
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_request_records_are_produced_as_sent(get_producer_mock, client, telemetry_ingest_url):
+    """Test array items are forwarded as their raw bytes in one batch, keyed by device."""
+    producer = create_autospec(KafkaProducer, instance=True)
+    producer.produce_raw_batch.return_value = [
+        ProduceResult.ENQUEUED,
+        ProduceResult.BUFFER_FULL,
+    ]
+    get_producer_mock.return_value = producer
+    body = '[ {"device": "DEV-001", "metrics": {"t": 1.50}} , 7,\n{"device":"DEV-ü"} ]'
+
+    res = client.post(telemetry_ingest_url, data=body, content_type='application/json')
+
+    assert res.status_code == 202
+    producer.produce_raw_batch.assert_called_once_with(
+        [
+            (b'{"device": "DEV-001", "metrics": {"t": 1.50}}', 'DEV-001'),
+            ('{"device":"DEV-ü"}'.encode(), 'DEV-ü'),
+        ]
+    )
+    data = res.json()
+    assert data['accepted'] == 1
+    assert data['skipped'] == 1
+    assert data['errors'] == {
+        '1': 'Payload items must be JSON objects.',
+        '2': ProduceResult.BUFFER_FULL.value,
+    }
+
+
+@pytest.mark.parametrize(
+    'body, records',
+    [
+        (b' {"device": "a"} ', [({'device': 'a'}, b'{"device": "a"}')]),
+        (b'[]', []),
+        (b'[{"a": [1, {"b": "]"}]}]', [({'a': [1, {'b': ']'}]}, b'{"a": [1, {"b": "]"}]}')]),
+    ],
+)
+def test_split_json_records(body, records):
+    assert split_json_records(body) == (records, None)
+
+
+@pytest.mark.parametrize(
+    'body',
+    [b'', b'[', b'[{"a": 1},]', b'[{"a": 1} {"b": 2}]', b'[{"a": 1}] x', b'{"a": 1} {}', b'"a"'],
+)
+def test_split_json_records_rejects_invalid_bodies(body):
+    records, error_response = split_json_records(body)
+
+    assert records is None
+    assert error_response.status_code == 400
+
+
 # ------------ tests for dev-only sync mode ------------
 
 
@@ -209,3 +270,282 @@ def test_ingest_wrong_payload_type_returns_400(client, telemetry_ingest_url):
     data = res.json()
     assert 'error' in data
     assert 'json' in data['error'].lower()
+
+
+# ------------ NDJSON and compressed bodies ------------
+
+
+def ndjson_producer(get_producer_mock):
+    producer = create_autospec(KafkaProducer, instance=True)
+    producer.produce_raw_batch.side_effect = lambda messages, **kwargs: [
+        ProduceResult.ENQUEUED
+    ] * len(messages)
+    get_producer_mock.return_value = producer
+    return producer
+
+
+def produced(producer):
+    return [
+        [value for value, _ in call.args[0]] for call in producer.produce_raw_batch.call_args_list
+    ]
+
+
+@override_settings(TELEMETRY_NDJSON_BATCH_SIZE=2)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_ndjson_lines_are_produced_in_batches(get_producer_mock, client, telemetry_ingest_url):
+    """Test NDJSON lines are produced as sent in batches, with errors per line number."""
+    producer = ndjson_producer(get_producer_mock)
+    body = b'{"device": "a"}\n\n{bad\n{"device": "b"}\r\n[1]\n{"device": "c"}'
+
+    res = client.post(telemetry_ingest_url, data=body, content_type='application/x-ndjson')
+
+    assert res.status_code == 202
+    assert produced(producer) == [[b'{"device": "a"}', b'{"device": "b"}'], [b'{"device": "c"}']]
+    assert producer.produce_raw_batch.call_args_list[0].args[0][1] == (b'{"device": "b"}', 'b')
+    data = res.json()
+    assert data['accepted'] == 3
+    assert data['skipped'] == 2
+    assert data['errors'] == {
+        '3': 'Line must be a JSON object.',
+        '5': 'Line must be a JSON object.',
+    }
+
+
+@override_settings(TELEMETRY_INGEST_MAX_ERRORS=1)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_ndjson_errors_are_capped(get_producer_mock, client, telemetry_ingest_url):
+    producer = ndjson_producer(get_producer_mock)
+
+    res = client.post(telemetry_ingest_url, data=b'1\n2\n3\n', content_type='application/x-ndjson')
+
+    assert res.status_code == 422
+    producer.produce_raw_batch.assert_not_called()
+    data = res.json()
+    assert data['skipped'] == 3
+    assert data['errors'] == {'1': 'Line must be a JSON object.'}
+    assert data['errors_truncated'] is True
+
+
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_gzip_ndjson_body_is_streamed(get_producer_mock, client, telemetry_ingest_url):
+    producer = ndjson_producer(get_producer_mock)
+    lines = [json.dumps({'device': f'DEV-{i}'}).encode() for i in range(1000)]
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=gzip.compress(b'\n'.join(lines)),
+        content_type='application/x-ndjson',
+        HTTP_CONTENT_ENCODING='gzip',
+    )
+
+    assert res.status_code == 202
+    assert res.json()['accepted'] == 1000
+    assert [value for batch in produced(producer) for value in batch] == lines
+
+
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_gzip_json_array_body(get_producer_mock, client, telemetry_ingest_url):
+    producer = ndjson_producer(get_producer_mock)
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=gzip.compress(b'[{"device": "a"}, {"device": "b"}]'),
+        content_type='application/json',
+        HTTP_CONTENT_ENCODING='gzip',
+    )
+
+    assert res.status_code == 202
+    assert produced(producer) == [[b'{"device": "a"}', b'{"device": "b"}']]
+
+
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_zstd_ndjson_body(get_producer_mock, client, telemetry_ingest_url):
+    zstandard = pytest.importorskip('zstandard')
+    producer = ndjson_producer(get_producer_mock)
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=zstandard.ZstdCompressor().compress(b'{"device": "a"}\n'),
+        content_type='application/x-ndjson',
+        HTTP_CONTENT_ENCODING='zstd',
+    )
+
+    assert res.status_code == 202
+    assert produced(producer) == [[b'{"device": "a"}']]
+
+
+@pytest.mark.parametrize('content_type', ['application/json', 'application/x-ndjson'])
+@pytest.mark.parametrize(
+    'encoding, body, status',
+    [('br', b'{}', 415), ('gzip', b'not gzip', 400)],
+)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_invalid_encoded_bodies_are_rejected(
+    get_producer_mock, client, telemetry_ingest_url, content_type, encoding, body, status
+):
+    producer = ndjson_producer(get_producer_mock)
+    res = client.post(
+        telemetry_ingest_url,
+        data=body,
+        content_type=content_type,
+        HTTP_CONTENT_ENCODING=encoding,
+    )
+
+    assert res.status_code == status
+    producer.produce_raw_batch.assert_not_called()
+
+
+@override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100)
+def test_decoded_json_body_is_size_limited(client, telemetry_ingest_url):
+    res = client.post(
+        telemetry_ingest_url,
+        data=gzip.compress(json.dumps([{'device': 'a' * 200}]).encode()),
+        content_type='application/json',
+        HTTP_CONTENT_ENCODING='gzip',
+    )
+
+    assert res.status_code == 413
+
+
+@override_settings(TELEMETRY_NDJSON_MAX_BODY_BYTES=100)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_decoded_ndjson_body_is_size_limited(get_producer_mock, client, telemetry_ingest_url):
+    producer = ndjson_producer(get_producer_mock)
+    lines = [json.dumps({'device': f'DEV-{i}'}).encode() for i in range(100)]
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=gzip.compress(b'\n'.join(lines)),
+        content_type='application/x-ndjson',
+        HTTP_CONTENT_ENCODING='gzip',
+    )
+
+    assert res.status_code == 413
+    assert res.json()['errors'] == {'body': 'Request body is too large.'}
+    producer.produce_raw_batch.assert_not_called()
+
+
+@override_settings(TELEMETRY_NDJSON_BATCH_SIZE=2)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_ndjson_stops_reading_when_producer_queue_stays_full(
+    get_producer_mock, client, telemetry_ingest_url
+):
+    producer = ndjson_producer(get_producer_mock)
+    producer.produce_raw_batch.side_effect = lambda messages, **kwargs: [
+        ProduceResult.ENQUEUED,
+        ProduceResult.BUFFER_FULL,
+    ]
+    body = b'\n'.join(json.dumps({'device': f'DEV-{i}'}).encode() for i in range(6))
+
+    res = client.post(telemetry_ingest_url, data=body, content_type='application/x-ndjson')
+
+    assert res.status_code == 202
+    assert producer.produce_raw_batch.call_count == 1
+    assert 'deadline' in producer.produce_raw_batch.call_args.kwargs
+    data = res.json()
+    assert data['accepted'] == 1
+    assert data['errors'] == {
+        '2': 'buffer_full',
+        'queue': 'Producer queue is full, lines after 2 were not read.',
+    }
+
+
+@patch('producers.kafka_producer.Producer')
+def test_produce_raw_batch_waits_for_queue_space_until_deadline(producer_cls):
+    kafka = producer_cls.return_value
+    kafka.produce.side_effect = [BufferError, None, BufferError]
+    producer = KafkaProducer(config=ProducerConfig(), topic='telemetry.raw')
+
+    waited = producer.produce_raw_batch([(b'1', None)], deadline=time.monotonic() + 5)
+    dropped = producer.produce_raw_batch([(b'2', None)], deadline=time.monotonic() - 1)
+
+    assert waited == [ProduceResult.ENQUEUED]
+    assert dropped == [ProduceResult.BUFFER_FULL]
+    assert 0 < kafka.poll.call_args_list[0].args[0] <= 0.1
+
+
+def test_iter_body_lines_bounds_line_length():
+    body = io.BytesIO(b'short\n' + b'x' * 50 + b'\nlast' + b'y' * 30)
+
+    lines = list(iter_body_lines(body, max_line_bytes=20, chunk_size=8))
+
+    assert lines == [(1, b'short'), (2, None), (3, None)]
+
+
+# ------------ MessagePack and CBOR bodies ------------
+
+
+@pytest.mark.parametrize(
+    'content_type, dumps',
+    [
+        ('application/msgpack', msgpack.packb),
+        ('application/vnd.msgpack', msgpack.packb),
+        ('application/cbor', cbor2.dumps),
+    ],
+)
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_binary_bodies_are_produced_as_json(
+    get_producer_mock, client, telemetry_ingest_url, valid_telemetry_payload, content_type, dumps
+):
+    """Test MessagePack/CBOR records are produced as the JSON the JSON path would see."""
+    producer = ndjson_producer(get_producer_mock)
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=dumps([valid_telemetry_payload, 7]),
+        content_type=content_type,
+    )
+
+    assert res.status_code == 202
+    ((value, key),) = producer.produce_raw_batch.call_args.args[0]
+    assert json.loads(value) == valid_telemetry_payload
+    assert key == 'DEV-001'
+    assert res.json()['errors'] == {'1': 'Payload items must be JSON objects.'}
+
+
+@patch('apps.devices.views.telemetry_views.get_telemetry_raw_producer')
+def test_binary_records_without_json_form_are_skipped(
+    get_producer_mock, client, telemetry_ingest_url
+):
+    producer = ndjson_producer(get_producer_mock)
+    body = msgpack.packb([{'device': 'a'}, {'device': 'b', 'blob': b'\x00\x01'}])
+
+    res = client.post(telemetry_ingest_url, data=body, content_type='application/msgpack')
+
+    assert res.status_code == 202
+    assert produced(producer) == [[b'{"device":"a"}']]
+    assert res.json()['errors'] == {'1': 'Payload item has values not representable as JSON.'}
+
+
+@pytest.mark.parametrize(
+    'content_type, body',
+    [
+        ('application/msgpack', b'\xc1'),
+        ('application/msgpack', msgpack.packb('device')),
+        ('application/cbor', b'\xa1'),
+    ],
+)
+def test_invalid_binary_bodies_are_rejected(client, telemetry_ingest_url, content_type, body):
+    res = client.post(telemetry_ingest_url, data=body, content_type=content_type)
+
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+@override_settings(DEBUG=True)
+@patch('apps.devices.views.telemetry_views.telemetry_create')
+def test_ingest_sync_cbor_payload(
+    telemetry_create_mock, client, telemetry_ingest_url, valid_telemetry_payload
+):
+    """Test the dev sync path validates CBOR payloads like JSON ones."""
+    telemetry_create_mock.return_value = Mock(created_count=1, errors={})
+
+    res = client.post(
+        telemetry_ingest_url,
+        data=cbor2.dumps(valid_telemetry_payload),
+        content_type='application/cbor',
+        HTTP_INGEST_SYNC='1',
+    )
+
+    assert res.status_code == 201
+    telemetry_create_mock.assert_called_once()
@@ -16,6 +16,15 @@ from apps.devices.serializers.device_serializers.update_device_serializer import
     DeviceUpdateV1Serializer,
 )
 from apps.devices.services.device_service import DeviceService
+from apps.common.utils.pagination import (
+    COUNT_MODES,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    parse_count_mode,
+)
+from apps.common.utils.response_cache import conditional_response
 from apps.common.utils.views_utils import parse_json_body
 
 
@@ -23,6 +32,7 @@ from apps.common.utils.views_utils import parse_json_body
 @method_decorator(jwt_required, name="dispatch")
 @method_decorator(role_required({"GET": ["client", "admin"], "POST": ["admin"]}), name="dispatch")
 class DeviceView(View):
+    @method_decorator(conditional_response(Device))
     def get(self, request):
         try:
             limit = int(request.GET.get("limit", 5))
@@ -34,11 +44,40 @@ class DeviceView(View):
             return JsonResponse({"error": "Limit must be greater than 0"}, status=400)
         if offset < 0:
             return JsonResponse({"error": "Offset must be positive integer"}, status=400)
+
+        count_mode = parse_count_mode(request.GET.get("count"))
+        if count_mode is None:
+            return JsonResponse(
+                {"error": f"count must be one of: {', '.join(COUNT_MODES)}"}, status=400
+            )
+
         devices_qs = Device.objects.select_related("user").all().order_by("id")
-        total = devices_qs.count()
-        devices = devices_qs[offset : offset + limit]
+        total, is_estimate = count_rows(devices_qs, mode=count_mode)
+
+        cursor = request.GET.get("cursor")
+        if cursor:
+            if offset:
+                return JsonResponse({"error": "offset cannot be combined with cursor"}, status=400)
+            try:
+                (last_id,) = decode_cursor(cursor, size=1)
+                devices_qs = devices_qs.filter(id__gt=int(last_id))
+            except (TypeError, ValueError):
+                return JsonResponse({"error": "cursor is invalid"}, status=400)
+        else:
+            devices_qs = devices_qs[offset:]
+
+        devices, has_more = keyset_page(devices_qs, limit=limit)
         data = [DeviceOutputSerializer().to_representation(instance=d) for d in devices]
-        return JsonResponse({"total": total, "limit": limit, "offset": offset, "items": data})
+        return JsonResponse(
+            {
+                "total": total,
+                "total_is_estimate": is_estimate,
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": encode_cursor([devices[-1].id]) if has_more else None,
+                "items": data,
+            }
+        )
 
     def post(self, request):
         data, error_response = parse_json_body(request.body)
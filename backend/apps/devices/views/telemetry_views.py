@@ -1,11 +1,24 @@
+import json
+import logging
+import time
 from typing import Any, Callable, Optional
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from apps.common.utils.views_utils import parse_json_body
+from apps.common.utils.views_utils import (
+    RawRecord,
+    RequestBodyTooLarge,
+    encode_json_records,
+    iter_body_lines,
+    open_request_body,
+    parse_body,
+    read_request_body,
+    split_json_records,
+)
 from apps.devices.serializers.telemetry_serializers import (
     TelemetryCreateSerializer,
     TelemetryBatchCreateSerializer,
@@ -17,9 +30,14 @@ from apps.devices.services.telemetry_services import (
 )
 from apps.devices.producers import get_telemetry_raw_producer
 from producers.kafka_producer import KafkaProducer, ProduceResult
+from utils.payload_codecs import JSON, content_type_format
+
+logger = logging.getLogger(__name__)
 
 _RESERVED_RESPONSE_KEYS = {'status', 'created', 'errors'}
 
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
 TelemetryIngestService = Callable[..., TelemetryIngestResult]
 
 TELEMETRY_KEY_FIELD = getattr(settings, 'TELEMETRY_KEY_FIELD', 'device')
@@ -27,17 +45,59 @@ TELEMETRY_KEY_FIELD = getattr(settings, 'TELEMETRY_KEY_FIELD', 'device')
 
 @csrf_exempt
 @require_http_methods(['POST'])
-def ingest_telemetry(request):
-    payload, error_response = parse_json_body(request.body, allow_array=True)
+async def ingest_telemetry(request):
+    """
+    POST /api/telemetry/
+    Body: a telemetry message or an array of them (application/json,
+    application/msgpack or application/cbor), or one JSON message per line
+    (application/x-ndjson); optionally Content-Encoding gzip/zstd.
+    JSON records are produced to telemetry.raw as sent (see split_json_records),
+    MessagePack and CBOR records as their JSON encoding, without blocking a
+    worker thread. NDJSON bodies are read and produced line by line as they
+    stream in.
+    """
+    if request.content_type == NDJSON_CONTENT_TYPE:
+        return await sync_to_async(_produce_telemetry_ndjson, thread_sensitive=False)(request)
+
+    if request.headers.get('Content-Encoding'):
+        body, error_response = await sync_to_async(read_request_body, thread_sensitive=False)(
+            request
+        )
+        if error_response:
+            return error_response
+    else:
+        body = request.body
+
+    payload_format = content_type_format(request.content_type)
+
+    if _should_ingest_sync(request):
+        return await sync_to_async(_ingest_telemetry_sync)(body, payload_format)
+
+    if payload_format == JSON:
+        records, error_response = split_json_records(body)
+    else:
+        records, error_response = _decode_telemetry_records(body, payload_format)
     if error_response:
         return error_response
 
-    if _should_ingest_sync(request):
-        if isinstance(payload, dict):
-            return _ingest_telemetry_single(payload)
-        return _ingest_telemetry_batch(payload)
+    return _produce_telemetry_records(records=records)
+
+
+def _decode_telemetry_records(body: bytes, payload_format: str):
+    payload, error_response = parse_body(body, payload_format, allow_array=True)
+    if error_response:
+        return None, error_response
+    return encode_json_records(payload), None
+
 
-    return _produce_telemetry_records(payload=payload)
+def _ingest_telemetry_sync(body: bytes, payload_format: str = JSON) -> JsonResponse:
+    payload, error_response = parse_body(body, payload_format, allow_array=True)
+    if error_response:
+        return error_response
+
+    if isinstance(payload, dict):
+        return _ingest_telemetry_single(payload)
+    return _ingest_telemetry_batch(payload)
 
 
 def _should_ingest_sync(request, header_name=None) -> bool:
@@ -54,19 +114,10 @@ def _should_ingest_sync(request, header_name=None) -> bool:
 
 def _produce_telemetry_records(
     *,
-    payload: dict | list,
+    records: list[RawRecord],
     producer: Optional[KafkaProducer] = None,
 ):
-    if not isinstance(payload, (dict, list)):
-        return JsonResponse(
-            {'errors': {'json': 'Payload must be a JSON object or a JSON array.'}},
-            status=400,
-        )
-
-    if isinstance(payload, dict):
-        payload = [payload]
-
-    if len(payload) == 0:
+    if len(records) == 0:
         return JsonResponse(
             {'status': 'rejected', 'errors': {'payload': 'Payload array is empty.'}},
             status=422,
@@ -81,20 +132,146 @@ def _produce_telemetry_records(
         'errors': {},
     }
 
-    for index, record in enumerate(payload):
+    indexes = []
+    messages = []
+    for index, (record, raw) in enumerate(records):
         if not isinstance(record, dict):
             results['errors'][index] = 'Payload items must be JSON objects.'
             results['skipped'] += 1
             continue
+        if raw is None:
+            results['errors'][index] = 'Payload item has values not representable as JSON.'
+            results['skipped'] += 1
+            continue
 
-        key = record.get(TELEMETRY_KEY_FIELD, None)
+        indexes.append(index)
+        messages.append((raw, record.get(TELEMETRY_KEY_FIELD, None)))
 
-        result = producer.produce(payload=record, key=key)
+    for index, result in zip(indexes, producer.produce_raw_batch(messages)):
         if result == ProduceResult.ENQUEUED:
             results['accepted'] += 1
         else:
             results['errors'][index] = result.value
 
+    return _produce_json_response(results)
+
+
+def _produce_telemetry_ndjson(
+    request,
+    *,
+    producer: Optional[KafkaProducer] = None,
+) -> JsonResponse:
+    """
+    Produce an NDJSON body line by line, in batches of TELEMETRY_NDJSON_BATCH_SIZE
+    records, so memory stays constant whatever the body size. Errors are
+    reported per line number, at most TELEMETRY_INGEST_MAX_ERRORS of them.
+
+    The decoded body is limited to TELEMETRY_NDJSON_MAX_BODY_BYTES. While the
+    producer queue is full the request waits for Kafka, up to
+    TELEMETRY_NDJSON_PRODUCE_TIMEOUT seconds in total; after that the rest of
+    the body is not read and the response reports the lines not produced.
+    """
+    stream, error_response = open_request_body(request)
+    if error_response:
+        return error_response
+
+    if producer is None:
+        producer = get_telemetry_raw_producer()
+
+    results = {
+        'accepted': 0,
+        'skipped': 0,
+        'errors': {},
+    }
+    line_numbers: list[int] = []
+    messages: list[tuple[bytes, Any]] = []
+    empty = True
+    body_error_status = 400
+    deadline = time.monotonic() + settings.TELEMETRY_NDJSON_PRODUCE_TIMEOUT
+
+    lines = iter_body_lines(
+        stream,
+        max_line_bytes=settings.TELEMETRY_NDJSON_MAX_LINE_BYTES,
+        max_bytes=settings.TELEMETRY_NDJSON_MAX_BODY_BYTES,
+    )
+    try:
+        for line_no, line in lines:
+            if line is None:
+                results['skipped'] += 1
+                _add_error(results, line_no, 'Line is too long.')
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            empty = False
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                results['skipped'] += 1
+                _add_error(results, line_no, 'Line must be a JSON object.')
+                continue
+
+            line_numbers.append(line_no)
+            messages.append((line, record.get(TELEMETRY_KEY_FIELD, None)))
+            if len(messages) >= settings.TELEMETRY_NDJSON_BATCH_SIZE:
+                queue_full = _produce_ndjson_batch(
+                    producer, line_numbers, messages, results, deadline
+                )
+                line_numbers, messages = [], []
+                if queue_full:
+                    results['errors'][
+                        'queue'
+                    ] = f'Producer queue is full, lines after {line_no} were not read.'
+                    break
+    except RequestBodyTooLarge:
+        results['errors']['body'] = 'Request body is too large.'
+        body_error_status = 413
+    except Exception as e:
+        logger.warning('Telemetry NDJSON body could not be read: %s', e)
+        results['errors']['body'] = 'Invalid compressed body.'
+    if messages:
+        _produce_ndjson_batch(producer, line_numbers, messages, results, deadline)
+
+    if 'body' in results['errors'] and results['accepted'] == 0:
+        return JsonResponse({'status': 'rejected', **results}, status=body_error_status)
+    if empty and not results['skipped']:
+        return JsonResponse(
+            {'status': 'rejected', 'errors': {'payload': 'Payload is empty.'}},
+            status=422,
+        )
+    return _produce_json_response(results)
+
+
+def _produce_ndjson_batch(
+    producer: KafkaProducer,
+    line_numbers: list[int],
+    messages: list[tuple[bytes, Any]],
+    results: dict,
+    deadline: float,
+) -> bool:
+    """Produce a batch of NDJSON lines, True if the producer queue stayed full until deadline."""
+    queue_full = False
+    batch = producer.produce_raw_batch(messages, deadline=deadline)
+    for line_no, result in zip(line_numbers, batch):
+        if result == ProduceResult.ENQUEUED:
+            results['accepted'] += 1
+        else:
+            queue_full = queue_full or result == ProduceResult.BUFFER_FULL
+            _add_error(results, line_no, result.value)
+    return queue_full
+
+
+def _add_error(results: dict, key: int, message: str) -> None:
+    if len(results['errors']) < settings.TELEMETRY_INGEST_MAX_ERRORS:
+        results['errors'][key] = message
+    else:
+        results['errors_truncated'] = True
+
+
+def _produce_json_response(results: dict) -> JsonResponse:
     body = {'status': 'accepted', **results}
     status_code = 202
 
@@ -2,10 +2,17 @@ import json
 from django import forms
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.timezone import localtime
-from .models import Rule, Event, EventDelivery
+from apps.audit.outbox import enqueue_audit_events
+from apps.common.metrics import events_unacknowledged
+from apps.common.utils.response_cache import bump_generation
+from .audit.events_audit import event_acknowledged
+from .models import Rule, RuleTemplate, Event, EventDelivery, EventDeliveryArchive
+from .services.event_service import event_bulk_ack
+from .tasks import stream_event_acks_on_commit
 from .validators.rule_validator import validate_action, validate_condition
 
 
@@ -25,6 +32,7 @@ class RuleAdminForm(forms.ModelForm):
             "name": "A short, unique name for this rule (e.g. 'CPU Overheat Alert').",
             "description": "Optional. Describe what this rule monitors and why.",
             "device_metric": "The specific device+metric pair this rule applies to.",
+            "template": "Optional. Fleet-wide template this rule replaces for its device metric.",
             "is_active": "Inactive rules are stored but never evaluated.",
             "condition": "Expression or criteria that trigger this rule.",
             "action": "What happens when this rule triggers.",
@@ -121,7 +129,7 @@ class RuleAdmin(admin.ModelAdmin):
         (
             "Configuration",
             {
-                "fields": ("device_metric", "condition", "action"),
+                "fields": ("device_metric", "template", "condition", "action"),
                 "description": "Link this rule to a device metric and define its condition and action.",
             },
         ),
@@ -209,6 +217,63 @@ class RuleAdmin(admin.ModelAdmin):
         return format_html('<span style="color: gray;">Never</span>')
 
 
+class RuleTemplateAdminForm(forms.ModelForm):
+    class Meta:
+        model = RuleTemplate
+        fields = "__all__"
+        help_texts = {
+            "name": "A short name, unique per metric (e.g. 'Fleet Overheat Alert').",
+            "metric": "Every device metric of this metric type is evaluated against the template.",
+            "user": "Optional. Only apply to devices owned by this user.",
+            "is_active": "Inactive templates are stored but never evaluated.",
+            "condition": "Expression or criteria that trigger this template.",
+            "action": "What happens when this template triggers.",
+        }
+        widgets = {
+            "description": forms.Textarea(attrs={"rows": 5}),
+            "condition": forms.Textarea(attrs={"rows": 5}),
+            "action": forms.Textarea(attrs={"rows": 5}),
+        }
+
+    def clean_name(self):
+        name = self.cleaned_data.get("name", "").strip()
+        if not name:
+            raise ValidationError("Template name cannot be blank or whitespace only.")
+        return name
+
+    def clean_condition(self):
+        raw = self.cleaned_data.get("condition")
+        validate_condition(raw)
+        if isinstance(raw, str):
+            return json.loads(raw)
+        return raw
+
+    def clean_action(self):
+        raw = self.cleaned_data.get("action")
+        validate_action(raw)
+        if isinstance(raw, str):
+            return json.loads(raw)
+        return raw
+
+
+@admin.register(RuleTemplate)
+class RuleTemplateAdmin(admin.ModelAdmin):
+    form = RuleTemplateAdminForm
+
+    list_display = ("id", "name", "metric", "user", "is_active", "override_count", "condition")
+    list_filter = ("is_active", "metric")
+    list_select_related = ("metric", "user")
+    search_fields = ("name", "description", "metric__metric_type")
+    search_help_text = "Search by template name, description, or metric type."
+    ordering = ("-id",)
+    list_per_page = 25
+    readonly_fields = ("id", "created_at")
+
+    @admin.display(description="Overrides")
+    def override_count(self, obj):
+        return obj.overrides.count()
+
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_select_related = ()
@@ -238,11 +303,14 @@ class EventAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request)
 
-        rule_ids = set(qs.values_list("rule", flat=True))
+        rule_ids = set(qs.filter(is_template=False).values_list("rule", flat=True))
+        template_ids = set(qs.filter(is_template=True).values_list("rule", flat=True))
         rules_map = {r.id: r for r in Rule.objects.filter(id__in=rule_ids)}
+        templates_map = {t.id: t for t in RuleTemplate.objects.filter(id__in=template_ids)}
 
         for obj in qs:
-            obj._rule_obj = rules_map.get(obj.rule)
+            lookup = templates_map if obj.is_template else rules_map
+            obj._rule_obj = lookup.get(obj.rule)
 
         return qs
 
@@ -258,7 +326,10 @@ class EventAdmin(admin.ModelAdmin):
         rule = getattr(obj, "_rule_obj", None)
 
         if rule:
-            url = reverse("admin:rules_rule_change", args=[rule.id])
+            viewname = (
+                "admin:rules_ruletemplate_change" if obj.is_template else "admin:rules_rule_change"
+            )
+            url = reverse(viewname, args=[rule.id])
             return format_html('<a href="{}">{}</a>', url, rule.name)
 
         if obj.rule:
@@ -273,12 +344,19 @@ class EventAdmin(admin.ModelAdmin):
             return
 
         try:
-            updated = queryset.update(acknowledged=True)
+            with transaction.atomic():
+                result = event_bulk_ack(events=queryset)
+                enqueue_audit_events(
+                    events=[
+                        event_acknowledged(request.user.pk, event_id) for event_id in result.ids
+                    ]
+                )
+                stream_event_acks_on_commit(result.ids)
         except Exception as exc:
             self.message_user(request, f"Failed to acknowledge events: {exc}", level="error")
             return
 
-        self.message_user(request, f"{updated} event(s) marked as acknowledged.")
+        self.message_user(request, f"{len(result.ids)} event(s) marked as acknowledged.")
 
     @admin.action(description="Mark selected events as unacknowledged")
     def mark_unacknowledged(self, request, queryset):
@@ -287,10 +365,12 @@ class EventAdmin(admin.ModelAdmin):
             return
 
         try:
-            updated = queryset.update(acknowledged=False)
+            updated = queryset.filter(acknowledged=True).update(acknowledged=False)
         except Exception as exc:
             self.message_user(request, f"Failed to unacknowledge events: {exc}", level="error")
             return
+        bump_generation(Event._meta.db_table)
+        events_unacknowledged.inc(updated)
 
         self.message_user(request, f"{updated} event(s) marked as unacknowledged.")
 
@@ -374,3 +454,18 @@ class EventDeliveryAdmin(admin.ModelAdmin):
             color,
             obj.get_status_display().upper(),
         )
+
+
+@admin.register(EventDeliveryArchive)
+class EventDeliveryArchiveAdmin(EventDeliveryAdmin):
+    """Read-only view of finished deliveries moved out of event_deliveries."""
+
+    list_display = EventDeliveryAdmin.list_display + ("archived_at",)
+    list_filter = ("status", "delivery_type", "archived_at")
+    readonly_fields = EventDeliveryAdmin.readonly_fields + ("archived_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
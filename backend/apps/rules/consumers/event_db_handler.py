@@ -1,9 +1,11 @@
-from typing import Union
+from typing import Optional, Union
 import logging
 
-from apps.audit.publisher import publish_audit_event
+from apps.audit.publisher import publish_audit_event, publish_audit_events
+from apps.common.utils.db_utils import to_python_values
 from apps.rules.audit.events_audit import event_created
 from apps.rules.models.event import Event
+from apps.rules.services.event_service import event_bulk_create
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError
 
@@ -17,11 +19,61 @@ class EventDBHandler:
 
     def handle(self, payload: Union[dict, list[dict]]) -> None:
         if isinstance(payload, list):
-            for item in payload:
-                self._process_single(item)
+            self._process_batch(payload)
         else:
             self._process_single(payload)
 
+    def _process_batch(self, items: list[dict]) -> None:
+        """
+        Persists a batch with one INSERT ... ON CONFLICT (event_uuid) DO NOTHING and
+        publishes audit records only for the events actually created, in one produce batch.
+        Invalid items are logged and skipped, database errors fail the whole batch.
+        """
+        events: dict = {}
+        for data in items:
+            event = self._build_event(data)
+            if event is not None:
+                events.setdefault(event.event_uuid, event)
+
+        if not events:
+            return
+
+        try:
+            created = event_bulk_create(events=list(events.values()))
+        except DatabaseError as dbe:
+            logger.exception('Database connection error: %s', dbe)
+            raise
+
+        if created:
+            publish_audit_events(events=[event_created(event) for event in created])
+        logger.info(
+            'Created %s Event(s) from batch of %s, %s already existed',
+            len(created),
+            len(items),
+            len(events) - len(created),
+        )
+
+    def _build_event(self, data: dict) -> Optional[Event]:
+        """Builds an unsaved Event with field values converted to their Python types."""
+        try:
+            return to_python_values(
+                Event(
+                    event_uuid=data['event_uuid'],
+                    rule_triggered_at=data['rule_triggered_at'],
+                    rule=data['rule_id'],
+                    is_external=data.get('is_external', False),
+                    is_template=data.get('is_template', False),
+                    acknowledged=False,
+                    trigger_device_serial_id=data['trigger_device_serial_id'],
+                    trigger_context=data.get('trigger_context', {}),
+                )
+            )
+        except KeyError as ke:
+            logger.error('Missing required field %s in payload: %s', ke, data)
+        except (ValueError, TypeError, ValidationError) as ve:
+            logger.error('Data validation failed for payload %s: %s', data, ve)
+        return None
+
     def _process_single(self, data: dict) -> None:
         """Processes a single event payload, creating an Event record in the database."""
         """NOTE: Unvalid messages should not only be logged but also sent to a dead-letter queue for later analysis. This is a TODO for future improvement."""
@@ -34,6 +86,7 @@ class EventDBHandler:
                     'rule_triggered_at': data['rule_triggered_at'],
                     'rule': data['rule_id'],
                     'is_external': data.get('is_external', False),
+                    'is_template': data.get('is_template', False),
                     'acknowledged': False,
                     'trigger_device_serial_id': data['trigger_device_serial_id'],
                     'trigger_context': data.get('trigger_context', {}),
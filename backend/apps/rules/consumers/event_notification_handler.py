@@ -1,10 +1,18 @@
 import logging
 from typing import Union
+from celery import group
 from django.db import transaction
+from django.utils import timezone
 
-from apps.audit.publisher import publish_audit_event
+from apps.audit.publisher import publish_audit_event, publish_audit_events
+from apps.common.utils.db_utils import bulk_insert_ignore_conflicts, to_python_values
 from apps.rules.audit.actions_audit import action_started
 from apps.rules.models.event_delivery import EventDelivery, DeliveryType
+from apps.rules.services.delivery_service import (
+    delivery_countdown,
+    delivery_uses_celery,
+    initial_next_retry_at,
+)
 from apps.rules.tasks import process_delivery_task
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError
@@ -15,11 +23,99 @@ logger = logging.getLogger(__name__)
 class EventNotificationHandler:
     def handle(self, payload: Union[dict, list[dict]]) -> None:
         if isinstance(payload, list):
-            for item in payload:
-                self._process_single(item)
+            self._process_batch(payload)
         else:
             self._process_single(payload)
 
+    def _process_batch(self, items: list[dict]) -> None:
+        """
+        Creates deliveries for a whole Kafka batch in one transaction with a single
+        INSERT ... ON CONFLICT (event_uuid, delivery_type) DO NOTHING (the
+        unique_event_delivery_type constraint),
+        enqueues the new delivery IDs with one grouped Celery call after commit
+        (batched webhooks are delayed by their `max_wait_ms`) and
+        publishes their audit records in one produce batch.
+        """
+        deliveries = {}
+        for data in items:
+            for delivery in self._build_deliveries(data):
+                deliveries.setdefault((delivery.event_uuid, delivery.delivery_type), delivery)
+
+        if not deliveries:
+            return
+
+        try:
+            with transaction.atomic():
+                created = bulk_insert_ignore_conflicts(
+                    list(deliveries.values()), conflict_fields=['event_uuid', 'delivery_type']
+                )
+                to_dispatch = [
+                    delivery
+                    for delivery in created
+                    if delivery_uses_celery(delivery.delivery_type)
+                ]
+                if to_dispatch:
+                    transaction.on_commit(lambda: self._dispatch(to_dispatch))
+        except DatabaseError as dbe:
+            logger.exception('Database connection error: %s', dbe)
+            raise
+
+        if created:
+            publish_audit_events(events=[action_started(delivery) for delivery in created])
+        logger.info(
+            'Created %s delivery(ies) from batch of %s, %s already existed',
+            len(created),
+            len(items),
+            len(deliveries) - len(created),
+        )
+
+    def _build_deliveries(self, data: dict) -> list[EventDelivery]:
+        """Builds unsaved deliveries for the enabled actions of a single event payload."""
+        try:
+            event_uuid = data['event_uuid']
+            rule_id = data['rule_id']
+            device_serial_id = data['trigger_device_serial_id']
+            action = data.get('action') or {}
+            now = timezone.now()
+
+            deliveries = []
+            for delivery_type in (DeliveryType.WEBHOOK, DeliveryType.NOTIFICATION):
+                action_data = action.get(delivery_type.value) or {}
+                if action_data.get('enabled'):
+                    deliveries.append(
+                        to_python_values(
+                            EventDelivery(
+                                event_uuid=event_uuid,
+                                rule_id=rule_id,
+                                trigger_device_serial_id=device_serial_id,
+                                delivery_type=delivery_type,
+                                payload=action_data,
+                                max_attempts=5,
+                                next_retry_at=initial_next_retry_at(
+                                    delivery_type, action_data, now
+                                ),
+                            )
+                        )
+                    )
+            return deliveries
+        except KeyError as ke:
+            logger.error('Missing required field %s in payload: %s', ke, data)
+        except (ValueError, TypeError, AttributeError, ValidationError) as ve:
+            logger.error('Data validation failed for payload %s: %s', data, ve)
+        return []
+
+    @staticmethod
+    def _dispatch(deliveries: list[EventDelivery]) -> None:
+        signatures = []
+        for delivery in deliveries:
+            signature = process_delivery_task.s(delivery.id)
+            countdown = delivery_countdown(delivery)
+            if countdown:
+                # batched webhooks wait for siblings to the same URL, see _claim_batch_siblings
+                signature = signature.set(countdown=countdown)
+            signatures.append(signature)
+        group(signatures).apply_async()
+
     def _process_single(self, data: dict) -> None:
         """Processes a single event payload, creating EventDelivery records for enabled actions and dispatching them to Celery."""
         """NOTE: Unvalid messages should not olny be logged but also sent to a dead-letter queue for later analysis. This is a TODO for future improvement."""
@@ -74,6 +170,7 @@ class EventNotificationHandler:
                 'trigger_device_serial_id': device_serial,
                 'payload': payload,
                 'max_attempts': 5,
+                'next_retry_at': initial_next_retry_at(delivery_type, payload, timezone.now()),
             },
         )
 
@@ -82,7 +179,13 @@ class EventNotificationHandler:
                 f"Created {delivery_type} delivery {delivery.id} for Event {event_uuid}. Preparing dispatch..."
             )
 
-            transaction.on_commit(lambda: process_delivery_task.delay(delivery.id))
+            countdown = delivery_countdown(delivery)
+            if delivery_uses_celery(delivery_type) and countdown:
+                transaction.on_commit(
+                    lambda: process_delivery_task.apply_async((delivery.id,), countdown=countdown)
+                )
+            elif delivery_uses_celery(delivery_type):
+                transaction.on_commit(lambda: process_delivery_task.delay(delivery.id))
             publish_audit_event(event=action_started(delivery))
         else:
             logger.debug(
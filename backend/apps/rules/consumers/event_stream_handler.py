@@ -0,0 +1,30 @@
+import logging
+from typing import Union
+
+from apps.rules.services.event_stream import publish_events
+
+logger = logging.getLogger(__name__)
+
+
+class EventStreamHandler:
+    """
+    Pushes rule events from rules.events.triggered / rules.events.external to
+    the WebSocket event hubs. Accepts a single event or a batch; the batch is
+    published in one fan-out and the offsets are not committed if that fails.
+    """
+
+    def handle(self, payload: Union[dict, list[dict]]) -> None:
+        if isinstance(payload, dict):
+            payload = [payload]
+        if not isinstance(payload, list):
+            logger.error('Invalid payload type: %s', type(payload))
+            return
+
+        items = [item for item in payload if isinstance(item, dict)]
+        if not items:
+            return
+
+        if not publish_events(items):
+            raise RuntimeError(
+                'Failed to publish events to the event stream; offset will not be committed.'
+            )
@@ -0,0 +1,61 @@
+import json
+import logging
+from typing import Optional
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from apps.devices.services.telemetry_stream_hub import Series
+from apps.rules.services.event_stream import get_event_stream_hub
+from apps.users.models import UserRole
+
+logger = logging.getLogger(__name__)
+
+
+class EventConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for rule events. Requires JWT with claim 'role' (admin/client).
+    Close codes 4401/4403/4500 are application-specific (RFC 6455 allows 4xxx for app use).
+
+    Pushes event.created frames of new events and event.acknowledged frames of
+    acknowledged ones. Clients receive the events of their devices and of the
+    rules on their devices, admins every event. Frames are delivered by the
+    process-local EventStreamHub; the socket itself is the hub sink.
+    """
+
+    ALLOWED_ROLES = {"admin", "client"}
+    # no per-socket channel layer receive loop, the hub writes to the socket directly
+    channel_layer_alias = None
+
+    async def connect(self):
+        user = self.scope.get("user")
+        role = self.scope.get("role")
+
+        if not (user and user.is_authenticated):
+            await self.close(code=4401)
+            return
+
+        if role not in self.ALLOWED_ROLES:
+            await self.close(code=4403)
+            return
+
+        await self.accept()
+
+        series: Series = (None, None) if role == UserRole.ADMIN else (str(user.pk), None)
+        try:
+            await get_event_stream_hub().subscribe(self, [series])
+            self.subscribed = True
+        except Exception as e:
+            logger.error("Error connecting to event stream: %s", e)
+            await self.close(code=4500)
+
+    async def disconnect(self, close_code):
+        if getattr(self, "subscribed", False):
+            get_event_stream_hub().unsubscribe(self)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        await self.send(
+            text_data=json.dumps({"type": "error", "error": "The event stream is push only."})
+        )
+
+    async def push(self, frame: str, series: Series, ts: Optional[str] = None) -> None:
+        await self.send(text_data=frame)
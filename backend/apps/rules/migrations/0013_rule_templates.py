@@ -0,0 +1,77 @@
+# Generated by Django 5.2.10 on 2026-03-24 11:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0006_remove_metric_check_valid_device_metric_type_and_more'),
+        ('rules', '0012_alter_event_rule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='is_template',
+            field=models.BooleanField(
+                default=False, help_text='When set, `rule` references a RuleTemplate id.'
+            ),
+        ),
+        migrations.CreateModel(
+            name='RuleTemplate',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('condition', models.JSONField()),
+                ('action', models.JSONField()),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                (
+                    'metric',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to='devices.metric'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        blank=True,
+                        help_text='Restrict the template to devices owned by this user.',
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'rule_templates',
+            },
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='template',
+            field=models.ForeignKey(
+                blank=True,
+                help_text='Fleet-wide template this rule overrides for its device metric.',
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='overrides',
+                to='rules.ruletemplate',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='ruletemplate',
+            index=models.Index(fields=['metric', 'is_active'], name='idx_rule_tpl_metric_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='ruletemplate',
+            constraint=models.UniqueConstraint(
+                fields=('metric', 'name'), name='unique_rule_template_name'
+            ),
+        ),
+    ]
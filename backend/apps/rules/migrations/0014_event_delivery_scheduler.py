@@ -0,0 +1,115 @@
+# Generated by Django 5.2.10 on 2026-03-26 10:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0013_rule_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventDeliveryArchive',
+            fields=[
+                ('event_uuid', models.UUIDField(help_text='Logical reference to the Event ID')),
+                ('rule_id', models.IntegerField(help_text='Logical reference to the Rule ID')),
+                (
+                    'trigger_device_serial_id',
+                    models.CharField(
+                        help_text='Device serial for quick filtering', max_length=255
+                    ),
+                ),
+                (
+                    'delivery_type',
+                    models.CharField(
+                        choices=[('webhook', 'Webhook'), ('notification', 'Notification')],
+                        max_length=20,
+                    ),
+                ),
+                ('payload', models.JSONField()),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'Pending'),
+                            ('processing', 'Processing'),
+                            ('retry', 'Retry'),
+                            ('success', 'Success'),
+                            ('rejected', 'Rejected'),
+                        ],
+                        default='pending',
+                        max_length=20,
+                    ),
+                ),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('next_retry_at', models.DateTimeField(blank=True, null=True)),
+                ('response_status', models.IntegerField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    'id',
+                    models.BigIntegerField(
+                        help_text='ID the row had in event_deliveries',
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Archived Event Delivery',
+                'verbose_name_plural': 'Archived Event Deliveries',
+                'db_table': 'event_deliveries_archive',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='eventdelivery',
+            name='idx_event_deliveries_status',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventdelivery',
+            name='idx_event_deliv_status_retry',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventdelivery',
+            name='idx_event_deliv_status_updated',
+        ),
+        migrations.AddIndex(
+            model_name='eventdelivery',
+            index=models.Index(
+                condition=models.Q(('status__in', ['pending', 'retry'])),
+                fields=['next_retry_at'],
+                name='idx_event_deliv_due',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='eventdelivery',
+            index=models.Index(
+                condition=models.Q(('status', 'processing')),
+                fields=['updated_at'],
+                name='idx_event_deliv_processing',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='eventdelivery',
+            index=models.Index(
+                condition=models.Q(('status__in', ['success', 'rejected'])),
+                fields=['updated_at'],
+                name='idx_event_deliv_finished',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='eventdeliveryarchive',
+            index=models.Index(fields=['event_uuid'], name='idx_event_deliv_arch_uuid'),
+        ),
+        migrations.AddIndex(
+            model_name='eventdeliveryarchive',
+            index=models.Index(fields=['archived_at'], name='idx_event_deliv_arch_at'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-03-27 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0014_event_delivery_scheduler'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='idx_events_rule_triggered_at',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(
+                fields=['rule_triggered_at', 'id'], name='idx_events_triggered_at_id'
+            ),
+        ),
+    ]
@@ -1,11 +1,14 @@
 from .rule import Rule
+from .rule_template import RuleTemplate
 from .event import Event
-from .event_delivery import EventDelivery, DeliveryType, Status
+from .event_delivery import EventDelivery, EventDeliveryArchive, DeliveryType, Status
 
 __all__ = [
     'Rule',
+    'RuleTemplate',
     'Event',
     'EventDelivery',
+    'EventDeliveryArchive',
     'DeliveryType',
     'Status',
 ]
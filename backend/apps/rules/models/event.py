@@ -10,6 +10,9 @@ class Event(models.Model):
     rule = models.IntegerField(null=False)
     acknowledged = models.BooleanField(default=False)
     is_external = models.BooleanField(default=False)
+    is_template = models.BooleanField(
+        default=False, help_text="When set, `rule` references a RuleTemplate id."
+    )
     created_at = models.DateTimeField(auto_now_add=True, null=False)
     trigger_device_serial_id = models.CharField(max_length=255, null=False)
 
@@ -24,7 +27,8 @@ class Event(models.Model):
         verbose_name_plural = "Events"
         db_table = 'events'
         indexes = [
-            models.Index(fields=['rule_triggered_at'], name='idx_events_rule_triggered_at'),
+            # keyset pagination of the events list walks (rule_triggered_at, id)
+            models.Index(fields=['rule_triggered_at', 'id'], name='idx_events_triggered_at_id'),
             models.Index(fields=['rule'], name='idx_events_rule'),
             models.Index(fields=['acknowledged'], name='idx_events_ack'),
             models.Index(fields=['trigger_device_serial_id'], name='idx_events_device_serial_id'),
@@ -15,7 +15,9 @@ class Status(models.TextChoices):
     REJECTED = "rejected"
 
 
-class EventDelivery(models.Model):
+class BaseEventDelivery(models.Model):
+    """Fields shared by the hot `event_deliveries` table and its archive."""
+
     event_uuid = models.UUIDField(null=False, help_text="Logical reference to the Event ID")
     rule_id = models.IntegerField(null=False, help_text="Logical reference to the Rule ID")
     trigger_device_serial_id = models.CharField(
@@ -48,14 +50,37 @@ class EventDelivery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        abstract = True
+
+
+ACTIVE_STATUSES = [Status.PENDING, Status.RETRY]
+FINISHED_STATUSES = [Status.SUCCESS, Status.REJECTED]
+
+
+class EventDelivery(BaseEventDelivery):
     class Meta:
         db_table = "event_deliveries"
         verbose_name = "Event Delivery"
         verbose_name_plural = "Event Deliveries"
         indexes = [
-            models.Index(fields=["status"], name="idx_event_deliveries_status"),
-            models.Index(fields=["status", "next_retry_at"], name="idx_event_deliv_status_retry"),
-            models.Index(fields=["status", "updated_at"], name="idx_event_deliv_status_updated"),
+            # partial indexes: the scheduler, the stuck sweep and the archiver each scan
+            # only the small set of rows in the statuses they care about
+            models.Index(
+                fields=["next_retry_at"],
+                name="idx_event_deliv_due",
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+            ),
+            models.Index(
+                fields=["updated_at"],
+                name="idx_event_deliv_processing",
+                condition=models.Q(status=Status.PROCESSING),
+            ),
+            models.Index(
+                fields=["updated_at"],
+                name="idx_event_deliv_finished",
+                condition=models.Q(status__in=FINISHED_STATUSES),
+            ),
             models.Index(fields=["event_uuid"], name="idx_event_deliv_event_uuid"),
             models.Index(fields=["rule_id"], name="idx_event_deliv_rule_id"),
             models.Index(fields=["trigger_device_serial_id"], name="idx_event_deliv_device_id"),
@@ -65,3 +90,19 @@ class EventDelivery(models.Model):
                 fields=['event_uuid', 'delivery_type'], name='unique_event_delivery_type'
             )
         ]
+
+
+class EventDeliveryArchive(BaseEventDelivery):
+    """Finished (SUCCESS/REJECTED) deliveries moved out of `event_deliveries`."""
+
+    id = models.BigIntegerField(primary_key=True, help_text="ID the row had in event_deliveries")
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "event_deliveries_archive"
+        verbose_name = "Archived Event Delivery"
+        verbose_name_plural = "Archived Event Deliveries"
+        indexes = [
+            models.Index(fields=["event_uuid"], name="idx_event_deliv_arch_uuid"),
+            models.Index(fields=["archived_at"], name="idx_event_deliv_arch_at"),
+        ]
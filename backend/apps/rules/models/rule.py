@@ -11,6 +11,14 @@ class Rule(models.Model):
     device_metric = models.ForeignKey(
         'devices.DeviceMetric', on_delete=models.CASCADE, null=False, db_index=True
     )
+    template = models.ForeignKey(
+        'rules.RuleTemplate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='overrides',
+        help_text="Fleet-wide template this rule overrides for its device metric.",
+    )
 
     class Meta:
         db_table = 'rules'
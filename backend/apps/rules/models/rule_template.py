@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class RuleTemplate(models.Model):
+    """
+    Fleet-wide rule bound to a Metric instead of a single DeviceMetric.
+
+    A template is evaluated for every device metric of its metric type, optionally
+    restricted to devices owned by `user`. A device-level Rule that references the
+    template through `Rule.template` overrides it for that device metric.
+    """
+
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=255, null=False)
+    description = models.TextField(blank=True, null=True)
+    condition = models.JSONField(null=False)
+    action = models.JSONField(null=False)
+    is_active = models.BooleanField(default=True, db_index=True)
+    metric = models.ForeignKey(
+        'devices.Metric', on_delete=models.CASCADE, null=False, db_index=True
+    )
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Restrict the template to devices owned by this user.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, null=False)
+
+    class Meta:
+        db_table = 'rule_templates'
+        indexes = [
+            models.Index(fields=['metric', 'is_active'], name='idx_rule_tpl_metric_active'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'name'], name='unique_rule_template_name')
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def applies_to(self, device_user_id: int | None) -> bool:
+        """Return True if the template targets devices owned by `device_user_id`."""
+        return self.user_id is None or self.user_id == device_user_id
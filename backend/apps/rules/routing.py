@@ -0,0 +1,6 @@
+from django.urls import re_path
+from apps.rules.consumers.event_ws_consumer import EventConsumer
+
+websocket_urlpatterns = [
+    re_path(r"ws/events/stream/$", EventConsumer.as_asgi()),
+]
@@ -4,7 +4,10 @@ from typing import Any, Optional, Dict
 import hashlib
 
 
+from django.utils.dateparse import parse_datetime
+
 from apps.common.serializers import BaseSerializer
+from apps.common.utils.pagination import COUNT_MODES, decode_cursor, parse_count_mode
 import uuid
 
 # =========================
@@ -21,6 +24,8 @@ class EventListQuery:
     acknowledged: Optional[bool] = None
     limit: int = 50
     offset: int = 0
+    cursor: Optional[tuple[datetime, int]] = None  # (rule_triggered_at, id) of the last seen event
+    count_mode: str = "estimate"
 
 
 class EventListQuerySerializer(BaseSerializer):
@@ -34,6 +39,8 @@ class EventListQuerySerializer(BaseSerializer):
     - acknowledged: bool
     - limit: int
     - offset: int
+    - cursor: str (next_cursor of the previous page, cannot be combined with offset)
+    - count: exact | estimate | none
     """
 
     DEFAULT_LIMIT = 50
@@ -69,6 +76,14 @@ class EventListQuerySerializer(BaseSerializer):
 
         severity = self._parse_optional_string(data.get("severity"), field="severity")
 
+        cursor = self._parse_optional_cursor(data.get("cursor"), field="cursor")
+        if cursor is not None and offset:
+            self._errors["offset"] = "offset cannot be combined with cursor."
+
+        count_mode = parse_count_mode(data.get("count"))
+        if count_mode is None:
+            self._errors["count"] = f"count must be one of: {', '.join(COUNT_MODES)}."
+
         if limit is None:
             limit = self.DEFAULT_LIMIT
         if offset is None:
@@ -88,8 +103,26 @@ class EventListQuerySerializer(BaseSerializer):
             is_external=is_external,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_mode=count_mode,
         )
 
+    def _parse_optional_cursor(self, raw: Any, *, field: str) -> Optional[tuple[datetime, int]]:
+        if raw is None or raw == "":
+            return None
+
+        try:
+            triggered_at, event_id = decode_cursor(raw, size=2)
+            triggered_at = parse_datetime(triggered_at)
+        except (TypeError, ValueError):
+            triggered_at = None
+
+        if triggered_at is None or not isinstance(event_id, int):
+            self._errors[field] = f"{field} is invalid."
+            return None
+
+        return triggered_at, event_id
+
     def _parse_optional_positive_int(self, raw: Any, *, field: str) -> Optional[int]:
         if raw is None or raw == "":
             return None
@@ -155,6 +188,99 @@ class EventListQuerySerializer(BaseSerializer):
         return value or None
 
 
+# =========================
+# Input serializer (POST bulk ack)
+# =========================
+
+
+@dataclass(slots=True)
+class EventAckQuery:
+    event_uuids: Optional[list[uuid.UUID]] = None
+    rule_id: Optional[int] = None
+    device_serial_id: Optional[str] = None
+    before: Optional[datetime] = None  # rule_triggered_at < before
+
+
+class EventBulkAckSerializer(BaseSerializer):
+    """
+    Validates body for POST /api/events/ack/
+
+    All fields are optional but at least one is required; given fields are combined:
+    - event_uuids: list[str]
+    - rule_id: int
+    - device_serial_id: str
+    - before: ISO 8601 timestamp (events triggered before it)
+    """
+
+    MAX_EVENT_UUIDS = 1000
+
+    def __init__(self, data: Any):
+        super().__init__(data)
+        self._validated_data: Optional[EventAckQuery] = None
+
+    def _validate(self, data: Any) -> Optional[EventAckQuery]:
+        if not isinstance(data, dict):
+            self._errors["body"] = "Payload must be a JSON object."
+            return None
+
+        event_uuids = self._parse_event_uuids(data.get("event_uuids"))
+
+        rule_id = data.get("rule_id")
+        if rule_id is not None and (
+            not isinstance(rule_id, int) or isinstance(rule_id, bool) or rule_id <= 0
+        ):
+            self._errors["rule_id"] = "rule_id must be a positive integer."
+
+        device_serial_id = data.get("device_serial_id")
+        if device_serial_id is not None and (
+            not isinstance(device_serial_id, str) or not device_serial_id.strip()
+        ):
+            self._errors["device_serial_id"] = "device_serial_id must be a non-empty string."
+
+        before = data.get("before")
+        if before is not None:
+            parsed = parse_datetime(before) if isinstance(before, str) else None
+            if parsed is None:
+                self._errors["before"] = "before must be a valid ISO 8601 string."
+            before = parsed
+
+        if self._errors:
+            return None
+
+        if event_uuids is None and rule_id is None and device_serial_id is None and before is None:
+            self._errors["body"] = (
+                "Provide event_uuids or at least one of rule_id, device_serial_id, before."
+            )
+            return None
+
+        return EventAckQuery(
+            event_uuids=event_uuids,
+            rule_id=rule_id,
+            device_serial_id=device_serial_id.strip() if device_serial_id else None,
+            before=before,
+        )
+
+    def _parse_event_uuids(self, raw: Any) -> Optional[list[uuid.UUID]]:
+        if raw is None:
+            return None
+
+        if not isinstance(raw, list) or not raw:
+            self._errors["event_uuids"] = "event_uuids must be a non-empty list."
+            return None
+
+        if len(raw) > self.MAX_EVENT_UUIDS:
+            self._errors["event_uuids"] = (
+                f"event_uuids must contain at most {self.MAX_EVENT_UUIDS} items."
+            )
+            return None
+
+        try:
+            return [uuid.UUID(value) for value in raw]
+        except (TypeError, ValueError, AttributeError):
+            self._errors["event_uuids"] = "event_uuids must contain valid UUIDs."
+            return None
+
+
 # =========================
 # Output serializers
 # =========================
@@ -172,6 +298,7 @@ class EventListItemSerializer:
             "event_uuid": str(event.event_uuid),
             "rule_triggered_at": event.rule_triggered_at.isoformat(),
             "is_external": event.is_external,
+            "is_template": event.is_template,
             "created_at": event.created_at.isoformat(),
             "acknowledged": event.acknowledged,
             "rule": event.rule,
@@ -191,6 +318,7 @@ class EventDetailSerializer:
             "event_uuid": str(event.event_uuid),
             "rule_triggered_at": event.rule_triggered_at.isoformat(),
             "is_external": event.is_external,
+            "is_template": event.is_template,
             "created_at": event.created_at.isoformat(),
             "acknowledged": event.acknowledged,
             "rule": event.rule,
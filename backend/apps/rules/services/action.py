@@ -5,6 +5,7 @@ import numbers
 from decimal import Decimal
 
 from apps.rules.models.rule import Rule
+from apps.rules.models.rule_template import RuleTemplate
 from apps.rules.utils.rule_engine_utils import TelemetryEvent
 from apps.common.metrics import events_created_total
 
@@ -33,9 +34,11 @@ class Action:
     """
 
     @staticmethod
-    def dispatch_action(rule: Rule, telemetry: TelemetryEvent) -> str:
+    def dispatch_action(rule: Rule | RuleTemplate, telemetry: TelemetryEvent) -> str:
         """
         Produce Event to Kafka instead of creating it in the DB directly.
+        For a RuleTemplate the event is flagged with `is_template` so `rule_id` is
+        read as a template id.
         Returns the generated event_uuid.
         """
         severity = 'info'
@@ -49,6 +52,7 @@ class Action:
             "event_uuid": event_uuid,
             "rule_triggered_at": timezone.now().isoformat(),
             "rule_id": rule.id,
+            "is_template": isinstance(rule, RuleTemplate),
             "trigger_device_serial_id": telemetry.device_serial_id,
             "trigger_context": {
                 "device_metric_id": telemetry.device_metric_id,
@@ -1,9 +1,12 @@
 import logging
+import math
+import numbers
 from typing import Any, Callable, List, Optional
 import operator
 from dataclasses import dataclass
 
-from apps.rules.utils.rule_engine_utils import TelemetryEvent
+from apps.rules.utils.quantile_sketch import DEFAULT_COMPRESSION, QuantileSketch
+from apps.rules.utils.rule_engine_utils import SeriesStateStore, TelemetryEvent
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +22,8 @@ PYTHON_OPERATOR_MAP = {
 
 DEFAULT_THRESHOLD_PERCENTAGE = 0.8  # default value to meet "threshold"
 
+DEFAULT_MIN_SAMPLES = 10  # warm-up samples before statistical rules may trigger
+
 
 def _get_comparison_operator(condition: dict) -> str:
     """Returns the comparison operator for the condition"""
@@ -43,10 +48,36 @@ def _validate_count(value: Any) -> int:
     raise ValueError("Invalid count value")
 
 
+def _numeric(value: Any) -> Optional[float]:
+    """Return value as float, or None for non-numeric (incl. bool) values"""
+    if isinstance(value, bool) or not isinstance(value, numbers.Number):
+        return None
+    return float(value)
+
+
+def _compare(condition: dict, observed: float, expected: Any) -> bool:
+    compare_func = PYTHON_OPERATOR_MAP.get(condition.get("operator"))
+    if compare_func is None:
+        logger.warning(f"Unsupported operator: {condition.get('operator')}")
+        return False
+    return compare_func(observed, expected)
+
+
+def _is_fraction(value: Any) -> bool:
+    return _numeric(value) is not None and 0 < value <= 1
+
+
+def _is_positive_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
 @dataclass
 class EvaluationContext:
     telemetry: Optional[TelemetryEvent]
     telemetries_in_window: List[TelemetryEvent]
+    state_store: Optional[SeriesStateStore] = None
+    rule_id: Optional[int] = None
+    is_template: bool = False
 
 
 class ThresholdEvaluator:
@@ -203,6 +234,192 @@ class CompositeEvaluator:
             return False
 
 
+class StatefulEvaluator:
+    """
+    Base for evaluators that keep O(1) incremental state per series instead of
+    reading a telemetry window. State lives in `context.state_store`, separately for
+    the rule of the context, and is updated atomically once per telemetry; telemetry
+    not newer than the last processed timestamp is ignored, so redelivered or
+    out-of-order samples do not skew the statistics.
+    """
+
+    rule_type: str
+
+    @classmethod
+    def evaluate(cls, condition: dict, context: EvaluationContext, **kwargs) -> bool:
+        telemetry = context.telemetry
+        store = context.state_store
+        if telemetry is None or store is None:
+            logger.warning(f"{cls.__name__}: no telemetry or state store in context")
+            return False
+
+        value = _numeric(telemetry.value)
+        if value is None:
+            return False
+
+        key = store.key(
+            condition, telemetry.device_metric_id, context.rule_id, context.is_template
+        )
+        ts = telemetry.timestamp.timestamp()
+
+        def advance(stored: Optional[list]):
+            if stored and ts <= stored[0]:
+                logger.debug(f"{cls.__name__}: telemetry at {ts} already processed, skipping")
+                return False, None
+
+            prev_ts, state = (stored[0], stored[1:]) if stored else (None, None)
+            try:
+                dt = ts - prev_ts if prev_ts else 0
+                triggered, new_state = cls.step(condition, state, value, dt)
+            except (ValueError, TypeError, IndexError) as e:
+                logger.warning(f"{cls.__name__}: resetting invalid state: {e}")
+                triggered, new_state = cls.step(condition, None, value, 0)
+            return triggered, [ts, *new_state]
+
+        return bool(store.update(key, advance))
+
+    @staticmethod
+    def step(condition: dict, state: Optional[list], value: float, dt: float):
+        """Return (triggered, new_state) for one sample; `state` is None for a new series."""
+        raise NotImplementedError
+
+
+class EwmaEvaluator(StatefulEvaluator):
+    """
+    Triggers when the absolute deviation of the value from the exponentially
+    weighted moving average (before including the value) matches operator/value.
+    State: [samples, ewma].
+    """
+
+    rule_type = "ewma"
+    schema = {
+        "required": {"operator": str, "value": (int, float)},
+        "operators": [">", ">=", "<", "<="],
+        "validators": {
+            "alpha": _is_fraction,
+            "min_samples": _is_positive_int,
+        },
+    }
+
+    @staticmethod
+    def step(condition: dict, state: Optional[list], value: float, dt: float):
+        if not state:
+            return False, [1, value]
+
+        samples, ewma = state
+        alpha = condition.get("alpha", 0.3)
+        deviation = abs(value - ewma)
+        triggered = samples >= condition.get("min_samples", DEFAULT_MIN_SAMPLES) and _compare(
+            condition, deviation, condition["value"]
+        )
+        return triggered, [samples + 1, ewma + alpha * (value - ewma)]
+
+
+class ZScoreEvaluator(StatefulEvaluator):
+    """
+    Triggers when |z| of the value against the exponentially weighted mean and
+    standard deviation (before including the value) matches operator/value.
+    State: [samples, mean, variance].
+    """
+
+    rule_type = "zscore"
+    schema = {
+        "required": {"operator": str, "value": (int, float)},
+        "operators": [">", ">=", "<", "<="],
+        "validators": {
+            "alpha": _is_fraction,
+            "min_samples": _is_positive_int,
+        },
+    }
+
+    @staticmethod
+    def step(condition: dict, state: Optional[list], value: float, dt: float):
+        if not state:
+            return False, [1, value, 0.0]
+
+        samples, mean, variance = state
+        alpha = condition.get("alpha", 0.05)
+        diff = value - mean
+        z = abs(diff) / math.sqrt(variance) if variance > 0 else 0.0
+        triggered = samples >= condition.get("min_samples", DEFAULT_MIN_SAMPLES) and _compare(
+            condition, z, condition["value"]
+        )
+
+        increment = alpha * diff
+        return triggered, [
+            samples + 1,
+            mean + increment,
+            (1 - alpha) * (variance + diff * increment),
+        ]
+
+
+class RateOfChangeEvaluator(StatefulEvaluator):
+    """
+    Triggers when the change from the previous value, scaled to `per_seconds`
+    (default 60), matches operator/value. The rate is signed, use "<" for drops.
+    State: [previous value].
+    """
+
+    rule_type = "rate_of_change"
+    schema = {
+        "required": {"operator": str, "value": (int, float)},
+        "operators": [">", ">=", "<", "<="],
+        "validators": {
+            "per_seconds": lambda x: _numeric(x) is not None and x > 0,
+        },
+    }
+
+    @staticmethod
+    def step(condition: dict, state: Optional[list], value: float, dt: float):
+        if not state or dt <= 0:
+            return False, [value]
+
+        (previous,) = state
+        rate = (value - previous) / dt * condition.get("per_seconds", 60)
+        return _compare(condition, rate, condition["value"]), [value]
+
+
+class QuantileEvaluator(StatefulEvaluator):
+    """
+    Compares the value against the estimated `quantile` of all previous values of
+    the series, e.g. {"quantile": 0.99, "operator": ">"} flags values above p99.
+    The distribution is kept in a bounded QuantileSketch.
+    State: [samples, sketch].
+    """
+
+    rule_type = "quantile"
+    schema = {
+        "required": {"operator": str, "quantile": (int, float)},
+        "operators": [">", ">=", "<", "<="],
+        "validators": {
+            "quantile": lambda x: 0 < x < 1,
+            "min_samples": _is_positive_int,
+            "compression": lambda x: _is_positive_int(x) and 10 <= x <= 500,
+        },
+    }
+
+    @staticmethod
+    def step(condition: dict, state: Optional[list], value: float, dt: float):
+        compression = condition.get("compression", DEFAULT_COMPRESSION)
+        samples, sketch = 0, QuantileSketch(compression=compression)
+        if state:
+            samples, sketch = state[0], QuantileSketch.from_list(state[1], compression)
+
+        triggered = False
+        if samples >= condition.get("min_samples", DEFAULT_MIN_SAMPLES):
+            estimate = sketch.quantile(condition["quantile"])
+            triggered = estimate is not None and _compare(condition, value, estimate)
+
+        sketch.add(value)
+        return triggered, [samples + 1, sketch.to_list()]
+
+
+STATEFUL_RULE_TYPES = {
+    cls.rule_type
+    for cls in (EwmaEvaluator, ZScoreEvaluator, RateOfChangeEvaluator, QuantileEvaluator)
+}
+
+
 class ConditionEvaluator:
     _evaluators = {
         "threshold": ThresholdEvaluator.evaluate,
@@ -210,6 +427,10 @@ class ConditionEvaluator:
         "composite": CompositeEvaluator.evaluate,
         "boolean": BooleanEvaluator.evaluate,
         "string_match": StringMatchEvaluator.evaluate,
+        "ewma": EwmaEvaluator.evaluate,
+        "zscore": ZScoreEvaluator.evaluate,
+        "rate_of_change": RateOfChangeEvaluator.evaluate,
+        "quantile": QuantileEvaluator.evaluate,
     }
 
     @staticmethod
@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.audit.outbox import enqueue_audit_events
+from apps.rules.audit.actions_audit import action_rejected
+from apps.rules.models.event_delivery import (
+    ACTIVE_STATUSES,
+    FINISHED_STATUSES,
+    DeliveryType,
+    EventDelivery,
+    EventDeliveryArchive,
+    Status,
+)
+
+RETRY_BASE_DELAY_SECONDS = 20
+DEFAULT_WEBHOOK_BATCH_WAIT_MS = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookBatching:
+    max_batch: int
+    max_wait_ms: int
+
+
+def delivery_retry_delay(attempts: int) -> int:
+    """Exponential backoff (in seconds) before the next attempt of a failed delivery."""
+    return (2**attempts) * RETRY_BASE_DELAY_SECONDS
+
+
+def delivery_uses_celery(delivery_type: str) -> bool:
+    """
+    Webhooks are sent by the async delivery worker when it is enabled, email
+    notifications by the periodic digest task when a digest window is configured.
+    """
+    if delivery_type == DeliveryType.WEBHOOK:
+        return not settings.WEBHOOK_WORKER_ENABLED
+    if delivery_type == DeliveryType.NOTIFICATION:
+        return not settings.EMAIL_DIGEST_WINDOW_SECONDS
+    return True
+
+
+def due_delivery_filter(now: datetime) -> Q:
+    """
+    Deliveries that may be attempted now:
+    status IN (pending, retry) AND next_retry_at <= now (NULL means immediately).
+    Matches the partial index idx_event_deliv_due.
+    """
+    return Q(status__in=ACTIVE_STATUSES) & (
+        Q(next_retry_at__lte=now) | Q(next_retry_at__isnull=True)
+    )
+
+
+def initial_next_retry_at(delivery_type: str, payload: Any, now: datetime) -> Optional[datetime]:
+    """
+    `next_retry_at` of a new delivery. Celery-delivered ones get a task right away, so
+    the scheduler only takes them over once DELIVERY_PENDING_GRACE_SECONDS (plus the
+    batching wait) have passed; the webhook worker and digests claim them immediately.
+    """
+    if not delivery_uses_celery(delivery_type):
+        return None
+    wait = settings.DELIVERY_PENDING_GRACE_SECONDS
+    batching = webhook_batching(payload) if delivery_type == DeliveryType.WEBHOOK else None
+    if batching:
+        wait += batching.max_wait_ms / 1000
+    return now + timedelta(seconds=wait)
+
+
+def claim_due_deliveries(*, limit: int, delivery_types: list[str]) -> list[EventDelivery]:
+    """
+    Claim up to `limit` due deliveries with
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent claimers never share rows, and mark
+    them PROCESSING (attempts + 1). Deliveries that exhausted their attempts are
+    rejected instead.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EventDelivery.objects.select_for_update(skip_locked=True)
+            .filter(due_delivery_filter(now), delivery_type__in=delivery_types)
+            .order_by('id')[:limit]
+        )
+
+        claimed, rejected = [], []
+        for delivery in rows:
+            delivery.updated_at = now
+            if delivery.attempts >= delivery.max_attempts:
+                delivery.status = Status.REJECTED
+                rejected.append(delivery)
+            else:
+                delivery.status = Status.PROCESSING
+                delivery.attempts += 1
+                delivery.last_attempt_at = now
+                claimed.append(delivery)
+
+        if rows:
+            EventDelivery.objects.bulk_update(
+                rows, ['status', 'attempts', 'last_attempt_at', 'updated_at']
+            )
+        if rejected:
+            enqueue_audit_events(events=[action_rejected(delivery) for delivery in rejected])
+
+    return claimed
+
+
+def archive_finished_batch(*, older_than: datetime, batch_size: int) -> int:
+    """
+    Move one batch of SUCCESS/REJECTED deliveries last updated before `older_than`
+    from event_deliveries to event_deliveries_archive in a single statement.
+    Returns the number of archived rows.
+
+    Once archived, a redelivered Kafka message for the same event would create a new
+    delivery, so `older_than` must be well beyond any redelivery window.
+    """
+    columns = ', '.join(
+        connection.ops.quote_name(field.column) for field in EventDelivery._meta.concrete_fields
+    )
+    sql = f"""
+        WITH moved AS (
+            DELETE FROM {EventDelivery._meta.db_table}
+            WHERE id IN (
+                SELECT id FROM {EventDelivery._meta.db_table}
+                WHERE status = ANY(%s) AND updated_at < %s
+                ORDER BY updated_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {columns}
+        )
+        INSERT INTO {EventDeliveryArchive._meta.db_table} ({columns}, archived_at)
+        SELECT {columns}, %s FROM moved
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [
+                [str(status) for status in FINISHED_STATUSES],
+                older_than,
+                batch_size,
+                timezone.now(),
+            ],
+        )
+        return cursor.rowcount
+
+
+def webhook_body(delivery: EventDelivery) -> dict[str, Any]:
+    """JSON body POSTed to the webhook URL for a single delivery."""
+    return {
+        "event_uuid": str(delivery.event_uuid),
+        "rule_id": delivery.rule_id,
+        "device_serial": delivery.trigger_device_serial_id,
+        "timestamp": timezone.now().isoformat(),
+    }
+
+
+def webhook_batch_body(deliveries: list[EventDelivery]) -> list[dict[str, Any]]:
+    """JSON array POSTed once for a batch of deliveries to the same webhook URL."""
+    return [webhook_body(delivery) for delivery in deliveries]
+
+
+def webhook_batching(payload: Any) -> Optional[WebhookBatching]:
+    """
+    Batching settings of a webhook action (`max_batch`, `max_wait_ms`).
+    None means the action was not opted in and every delivery is POSTed on its own.
+    """
+    if not isinstance(payload, dict):
+        return None
+    max_batch = payload.get('max_batch') or 1
+    if max_batch <= 1:
+        return None
+    return WebhookBatching(
+        max_batch=max_batch,
+        max_wait_ms=payload.get('max_wait_ms', DEFAULT_WEBHOOK_BATCH_WAIT_MS),
+    )
+
+
+def group_webhook_batches(deliveries: list[EventDelivery]) -> list[list[EventDelivery]]:
+    """
+    Split deliveries into requests: those of batched webhook actions are coalesced per
+    URL up to `max_batch`, every other delivery is a request on its own.
+    """
+    batches, open_batches = [], {}
+    for delivery in deliveries:
+        batching = webhook_batching(delivery.payload)
+        if delivery.delivery_type != DeliveryType.WEBHOOK or batching is None:
+            batches.append([delivery])
+            continue
+        url = delivery.payload.get('url')
+        batch = open_batches.get(url)
+        if batch is None or len(batch) >= webhook_batching(batch[0].payload).max_batch:
+            batch = open_batches[url] = []
+            batches.append(batch)
+        batch.append(delivery)
+    return batches
+
+
+def delivery_countdown(delivery: EventDelivery) -> Optional[float]:
+    """Seconds to hold a new delivery back so that its batch can fill up."""
+    if delivery.delivery_type != DeliveryType.WEBHOOK:
+        return None
+    batching = webhook_batching(delivery.payload)
+    if batching is None or batching.max_wait_ms <= 0:
+        return None
+    return batching.max_wait_ms / 1000
+
+
+def apply_delivery_result(
+    delivery: EventDelivery,
+    *,
+    response_status: Optional[int],
+    error: Optional[str],
+    now: datetime,
+) -> None:
+    """
+    Set the status of an attempted delivery from the outcome of its request or email:
+    SUCCESS, RETRY with exponential backoff, or REJECTED once attempts are exhausted.
+    """
+    delivery.response_status = response_status
+    delivery.error_message = error
+    delivery.updated_at = now
+    if error is None:
+        delivery.status = Status.SUCCESS
+    elif delivery.attempts >= delivery.max_attempts:
+        delivery.status = Status.REJECTED
+    else:
+        delivery.status = Status.RETRY
+        delivery.next_retry_at = now + timedelta(seconds=delivery_retry_delay(delivery.attempts))
@@ -1,16 +1,34 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from django.db.models import QuerySet
+from django.db import connection
+from django.db.models import Q, QuerySet
 
+from apps.common.metrics import events_unacknowledged, reported_value
+from apps.common.utils.db_utils import bulk_insert_ignore_conflicts, delete_older_than_batch
+from apps.common.utils.pagination import count_rows, encode_cursor, keyset_page
+from apps.common.utils.response_cache import bump_generation
+from apps.devices.models import Device
 from apps.rules.models.event import Event
-from apps.rules.serializers.event_serializer import EventListQuery
+from apps.rules.models.rule import Rule
+from apps.rules.serializers.event_serializer import EventAckQuery, EventListQuery
 
 
 @dataclass(slots=True)
 class EventListResult:
-    count: int
+    count: Optional[int]
     results: list[Event]
+    next_cursor: Optional[str] = None
+    count_is_estimate: bool = False
+
+
+@dataclass(slots=True)
+class EventAckResult:
+    ids: list[int]
+    event_uuids: list[UUID]
+    has_more: bool = False
 
 
 def event_list(*, query: EventListQuery) -> EventListResult:
@@ -25,7 +43,11 @@ def event_list(*, query: EventListQuery) -> EventListResult:
 
     Pagination:
     - limit
-    - offset
+    - cursor: keyset on (rule_triggered_at, id), every page costs the same
+    - offset (legacy, cost grows with the offset)
+
+    Count:
+    - exact, estimate (planner statistics for large results) or none
 
     Ordering:
     - newest first (rule_triggered_at desc)
@@ -34,16 +56,46 @@ def event_list(*, query: EventListQuery) -> EventListResult:
 
     qs = _apply_filters(qs, query=query)
 
-    total = qs.count()
+    total, is_estimate = count_rows(qs, mode=query.count_mode)
+
+    qs = qs.order_by("-rule_triggered_at", "-id")
+    if query.cursor is not None:
+        triggered_at, event_id = query.cursor
+        # the first condition bounds the index range scan, the second breaks ties
+        qs = qs.filter(rule_triggered_at__lte=triggered_at).filter(
+            Q(rule_triggered_at__lt=triggered_at) | Q(id__lt=event_id)
+        )
+    else:
+        qs = qs[query.offset :]
 
-    qs = qs.order_by("-rule_triggered_at", "-id")[query.offset : query.offset + query.limit]
+    events, has_more = keyset_page(qs, limit=query.limit)
+    next_cursor = None
+    if has_more:
+        last = events[-1]
+        next_cursor = encode_cursor([last.rule_triggered_at.isoformat(), last.id])
 
     return EventListResult(
         count=total,
-        results=list(qs),
+        results=events,
+        next_cursor=next_cursor,
+        count_is_estimate=is_estimate,
     )
 
 
+def event_bulk_create(*, events: list[Event]) -> list[Event]:
+    """
+    Insert events in one statement, skipping event_uuids that already exist.
+
+    Returns only the events that were actually created (with pk set).
+    """
+    created = bulk_insert_ignore_conflicts(events, conflict_fields=["event_uuid"])
+    if created:
+        # raw INSERT, no post_save signals
+        bump_generation(Event._meta.db_table)
+        events_unacknowledged.inc(sum(not event.acknowledged for event in created))
+    return created
+
+
 def event_get(*, event_uuid: UUID | str) -> Event:
     """
     Get a single event by event_uuid.
@@ -51,28 +103,129 @@ def event_get(*, event_uuid: UUID | str) -> Event:
     return Event.objects.get(event_uuid=event_uuid)
 
 
-def event_ack(*, event_uuid: UUID | str) -> Event:
+def events_owned_by(qs: QuerySet[Event], *, user) -> QuerySet[Event]:
+    """
+    Events of `qs` whose trigger device or rule device belongs to `user`.
+    Template events carry a RuleTemplate id, so only their trigger device counts.
+    """
+    return qs.filter(
+        Q(trigger_device_serial_id__in=Device.objects.filter(user=user).values("serial_id"))
+        | Q(
+            is_template=False,
+            rule__in=Rule.objects.filter(device_metric__device__user=user).values("id"),
+        )
+    )
+
+
+def event_ack(*, event_uuid: UUID | str, owner=None) -> Event:
     """
-    Acknowledge an event.
+    Acknowledge an event, of `owner` only when given.
 
     Idempotent behavior:
     - if already acknowledged: keep it true
     - return updated event
     """
-    event = Event.objects.get(event_uuid=event_uuid)
+    qs = Event.objects.all()
+    if owner is not None:
+        qs = events_owned_by(qs, user=owner)
+    event = qs.get(event_uuid=event_uuid)
 
     if not event.acknowledged:
         event.acknowledged = True
         event.save(update_fields=["acknowledged"])
+        events_unacknowledged.dec()
 
     return event
 
 
+def event_ack_queryset(*, query: EventAckQuery, owner=None) -> QuerySet[Event]:
+    """Events selected by a bulk acknowledge request, of `owner` only when given."""
+    qs = Event.objects.all()
+    if owner is not None:
+        qs = events_owned_by(qs, user=owner)
+
+    if query.event_uuids is not None:
+        qs = qs.filter(event_uuid__in=query.event_uuids)
+
+    if query.rule_id is not None:
+        # template events keep a RuleTemplate id in the same column
+        qs = qs.filter(rule=query.rule_id, is_template=False)
+
+    if query.device_serial_id is not None:
+        qs = qs.filter(trigger_device_serial_id=query.device_serial_id)
+
+    if query.before is not None:
+        qs = qs.filter(rule_triggered_at__lt=query.before)
+
+    return qs
+
+
+def event_bulk_ack(*, events: QuerySet[Event], limit: Optional[int] = None) -> EventAckResult:
+    """
+    Acknowledge every not yet acknowledged event of `events`, or the `limit`
+    oldest ones, with a single UPDATE ... RETURNING statement. `has_more` tells
+    whether the limit left matching unacknowledged events for another call.
+
+    Returns only the events this call changed, so concurrent acknowledgements
+    are neither audited nor subtracted from the gauge twice.
+    """
+    pending = events.filter(acknowledged=False)
+    ids = pending.order_by().values("id")
+    if limit is not None:
+        ids = pending.order_by("id").values("id")[:limit]
+    subquery, params = ids.query.sql_with_params()
+    table = connection.ops.quote_name(Event._meta.db_table)
+    sql = (
+        f"UPDATE {table} SET acknowledged = TRUE "
+        f"WHERE id IN ({subquery}) AND acknowledged = FALSE "
+        f"RETURNING id, event_uuid"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    if rows:
+        bump_generation(Event._meta.db_table)
+        events_unacknowledged.dec(len(rows))
+
+    return EventAckResult(
+        ids=[row[0] for row in rows],
+        event_uuids=[row[1] for row in rows],
+        has_more=limit is not None and len(rows) >= limit and pending.exists(),
+    )
+
+
+def sync_unacknowledged_gauge() -> int:
+    """
+    Correct drift of the incrementally maintained unacknowledged events gauge
+    (process restarts, deletes, writes outside this service) against an exact count.
+    Returns the exact count.
+    """
+    actual = Event.objects.filter(acknowledged=False).count()
+    events_unacknowledged.inc(actual - reported_value(events_unacknowledged))
+    return actual
+
+
+def event_delete_expired_batch(*, older_than: datetime, batch_size: int) -> int:
+    """
+    Delete one batch of events triggered before `older_than`, oldest first.
+    Returns the number of deleted events.
+    """
+    deleted = delete_older_than_batch(
+        Event, time_field='rule_triggered_at', older_than=older_than, batch_size=batch_size
+    )
+    if deleted:
+        # raw DELETE, no post_delete signals
+        bump_generation(Event._meta.db_table)
+    return deleted
+
+
 def _apply_filters(qs: QuerySet[Event], *, query: EventListQuery) -> QuerySet[Event]:
     """TODO: severity filter is reserved for future use when severity field is added to Event model"""
 
     if query.rule_id is not None:
-        qs = qs.filter(rule=query.rule_id)
+        # template events keep a RuleTemplate id in the same column
+        qs = qs.filter(rule=query.rule_id, is_template=False)
 
     if query.acknowledged is not None:
         qs = qs.filter(acknowledged=query.acknowledged)
@@ -0,0 +1,161 @@
+import json
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from apps.common.redis_client import get_redis_client
+from apps.devices.models import Device
+from apps.devices.services.telemetry_stream_hub import (
+    Series,
+    TelemetryStreamHub,
+    encode_envelope,
+)
+from apps.rules.models import Event, Rule
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "event.created"
+EVENT_ACKNOWLEDGED = "event.acknowledged"
+
+
+class EventStreamHub(TelemetryStreamHub):
+    """
+    Node-local WebSocket fan-out for rule events.
+
+    Same mechanics as the TelemetryStreamHub on EVENTS_STREAM_CHANNEL, but
+    envelope points are routed by the ids of the users owning the event
+    ({"users": [...], "frame": ...}): a socket subscribes to (user_id, None)
+    for its own events, admins to (None, None) for every event.
+    """
+
+    def _route(self, point: dict) -> tuple[Series, tuple[Series, ...]]:
+        users = point.get("users") or []
+        return (None, None), ((None, None), *((str(user_id), None) for user_id in users))
+
+
+@lru_cache(maxsize=1)
+def get_event_stream_hub() -> EventStreamHub:
+    return EventStreamHub(channel=settings.EVENTS_STREAM_CHANNEL)
+
+
+def event_owners(
+    events: Iterable[tuple[Optional[int], Optional[str], bool]],
+) -> list[frozenset[int]]:
+    """
+    Users owning each (rule_id, trigger_device_serial_id, is_template): the owner
+    of the trigger device and, for rule events, the owner of the rule's device.
+    Template events carry a RuleTemplate id in the Rule id space, so they are only
+    routed to the trigger device owner. Two queries per batch.
+    """
+    events = list(events)
+    serial_ids = {serial_id for _, serial_id, _ in events if serial_id}
+    rule_ids = {
+        rule_id for rule_id, _, is_template in events if rule_id is not None and not is_template
+    }
+
+    device_owners = dict(
+        Device.objects.filter(serial_id__in=serial_ids).values_list("serial_id", "user_id")
+    )
+    rule_owners = dict(
+        Rule.objects.filter(id__in=rule_ids).values_list("id", "device_metric__device__user_id")
+    )
+
+    owners = []
+    for rule_id, serial_id, is_template in events:
+        users = {device_owners.get(serial_id)}
+        if not is_template:
+            users.add(rule_owners.get(rule_id))
+        users.discard(None)
+        owners.append(frozenset(users))
+    return owners
+
+
+def publish_events(items: Iterable[dict]) -> bool:
+    """
+    Publish rule events as read from rules.events.triggered / rules.events.external
+    as event.created frames, in one Redis PUBLISH on EVENTS_STREAM_CHANNEL.
+    Items without event_uuid, rule_id or trigger_device_serial_id are skipped.
+    Returns True if sent successfully, False otherwise.
+    """
+    sent_at = now().isoformat()
+    events = []
+    for item in items:
+        try:
+            rule_id = int(item["rule_id"])
+            data = {
+                "event_uuid": str(item["event_uuid"]),
+                "rule_triggered_at": item["rule_triggered_at"],
+                "is_external": bool(item.get("is_external", False)),
+                "is_template": bool(item.get("is_template", False)),
+                "acknowledged": False,
+                "rule": rule_id,
+                "trigger_device_serial_id": item["trigger_device_serial_id"],
+                "trigger_context": item.get("trigger_context", {}),
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Event stream skipped invalid event %s: %s", item, e)
+            continue
+        events.append(data)
+    if not events:
+        return True
+
+    owners = event_owners(
+        (e["rule"], e["trigger_device_serial_id"], e["is_template"]) for e in events
+    )
+    points = [
+        {
+            "users": sorted(users),
+            "frame": json.dumps({"type": EVENT_CREATED, "sent_at": sent_at, "data": data}),
+        }
+        for data, users in zip(events, owners)
+    ]
+    return _publish(points)
+
+
+def publish_event_acks(event_ids: Iterable[int]) -> bool:
+    """
+    Publish acknowledged events as event.acknowledged frames, one per set of
+    owning users, in one Redis PUBLISH on EVENTS_STREAM_CHANNEL.
+    Returns True if sent successfully, False otherwise.
+    """
+    rows = list(
+        Event.objects.filter(id__in=list(event_ids)).values_list(
+            "event_uuid", "rule", "trigger_device_serial_id", "is_template"
+        )
+    )
+    if not rows:
+        return True
+
+    sent_at = now().isoformat()
+    by_owners: dict[frozenset[int], list[str]] = defaultdict(list)
+    owners = event_owners(row[1:] for row in rows)
+    for (event_uuid, *_), users in zip(rows, owners):
+        by_owners[users].append(str(event_uuid))
+
+    points = [
+        {
+            "users": sorted(users),
+            "frame": json.dumps(
+                {
+                    "type": EVENT_ACKNOWLEDGED,
+                    "sent_at": sent_at,
+                    "data": {"event_uuids": event_uuids},
+                }
+            ),
+        }
+        for users, event_uuids in by_owners.items()
+    ]
+    return _publish(points)
+
+
+def _publish(points: list[dict]) -> bool:
+    try:
+        get_redis_client().publish(settings.EVENTS_STREAM_CHANNEL, encode_envelope(points))
+        return True
+    except Exception as e:
+        logger.error("Error publishing event stream batch: %s", e)
+        return False
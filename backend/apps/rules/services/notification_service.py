@@ -0,0 +1,141 @@
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from apps.audit.outbox import enqueue_audit_events
+from apps.rules.audit.actions_audit import action_rejected, action_succeeded
+from apps.rules.models.event_delivery import EventDelivery, Status
+from apps.rules.services.delivery_service import apply_delivery_result
+from apps.rules.utils.rule_engine_utils import NotificationChannels
+
+logger = logging.getLogger(__name__)
+
+EMAIL_SIGNATURE = 'Sent by IoT Hub Platform'
+
+
+def notification_from_email() -> str:
+    return getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@iot-hub.local')
+
+
+def notification_subject(delivery: EventDelivery) -> str:
+    return delivery.payload.get('subject', f"IoT Alert: Rule {delivery.rule_id}")
+
+
+def notification_text(delivery: EventDelivery) -> str:
+    """Alert message with its details, without the signature."""
+    message_text = delivery.payload.get('message', 'Alert triggered.')
+    return (
+        f"{message_text}\n\n"
+        f"--- Alert Details ---\n"
+        f"Device Serial: {delivery.trigger_device_serial_id}\n"
+        f"Event UUID: {delivery.event_uuid}"
+    )
+
+
+def notification_email_body(delivery: EventDelivery) -> str:
+    return f"{notification_text(delivery)}\n\n{EMAIL_SIGNATURE}"
+
+
+def digest_email(recipient: str, deliveries: list[EventDelivery], connection=None) -> EmailMessage:
+    """One email for all `deliveries` to `recipient`; a single delivery is sent as is."""
+    if len(deliveries) == 1:
+        subject = notification_subject(deliveries[0])
+        body = notification_email_body(deliveries[0])
+    else:
+        subject = f"IoT Alert digest: {len(deliveries)} alerts"
+        sections = [
+            f"[{number}] {notification_subject(delivery)}\n{notification_text(delivery)}"
+            for number, delivery in enumerate(deliveries, start=1)
+        ]
+        body = (
+            f"{len(deliveries)} alerts were triggered:\n\n"
+            + "\n\n".join(sections)
+            + f"\n\n{EMAIL_SIGNATURE}"
+        )
+    return EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=notification_from_email(),
+        to=[recipient],
+        connection=connection,
+    )
+
+
+def _digest_error(delivery: EventDelivery) -> Optional[str]:
+    """Reason a delivery cannot be part of an email digest, None when it can."""
+    channel = delivery.payload.get('channel')
+    if channel != NotificationChannels.EMAIL.value:
+        return f"Unsupported notification channel: {channel}"
+    if not delivery.payload.get('recipient'):
+        return "Recipient email is missing in payload."
+    return None
+
+
+def send_digests(deliveries: list[EventDelivery]) -> int:
+    """
+    Send claimed notification deliveries as one digest per recipient over a single
+    SMTP connection and record each digest's outcome on every delivery it includes.
+    Returns the number of digests sent.
+    """
+    if not deliveries:
+        return 0
+
+    outcomes: dict[int, Optional[str]] = {}
+    by_recipient = defaultdict(list)
+    for delivery in deliveries:
+        error = _digest_error(delivery)
+        if error:
+            outcomes[delivery.id] = error
+        else:
+            by_recipient[delivery.payload['recipient']].append(delivery)
+
+    sent = 0
+    if by_recipient:
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.warning("Cannot open email connection: %s", exc)
+            outcomes.update(
+                (delivery.id, str(exc)) for group in by_recipient.values() for delivery in group
+            )
+        else:
+            try:
+                for recipient, group in by_recipient.items():
+                    try:
+                        digest_email(recipient, group, connection=connection).send()
+                        error = None
+                        sent += 1
+                    except Exception as exc:
+                        logger.warning("Email digest to %s failed: %s", recipient, exc)
+                        error = str(exc)
+                    outcomes.update((delivery.id, error) for delivery in group)
+            finally:
+                connection.close()
+
+    now = timezone.now()
+    audit = []
+    for delivery in deliveries:
+        error = outcomes[delivery.id]
+        apply_delivery_result(
+            delivery, response_status=None if error else 200, error=error, now=now
+        )
+        if delivery.status == Status.SUCCESS:
+            audit.append(action_succeeded(delivery))
+        elif delivery.status == Status.REJECTED:
+            audit.append(action_rejected(delivery))
+
+    with transaction.atomic():
+        EventDelivery.objects.bulk_update(
+            deliveries,
+            ['status', 'response_status', 'error_message', 'next_retry_at', 'updated_at'],
+        )
+        enqueue_audit_events(events=audit)
+
+    logger.info("Sent %s email digest(s) for %s delivery(ies)", sent, len(deliveries))
+    return sent
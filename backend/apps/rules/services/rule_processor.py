@@ -4,9 +4,11 @@ from django.core.cache import caches
 from django.conf import settings
 
 from apps.rules.models.rule import Rule
+from apps.rules.models.rule_template import RuleTemplate
+from apps.devices.models.device_metric import DeviceMetric
 from apps.devices.models.telemetry import Telemetry
 from apps.rules.services.action import Action
-from apps.rules.services.condition_evaluator import ConditionEvaluator
+from apps.rules.services.condition_evaluator import ConditionEvaluator, STATEFUL_RULE_TYPES
 from apps.rules.utils.rule_engine_utils import (
     map_telemetry_json_to_event,
     map_telemetry_model_to_event,
@@ -15,6 +17,7 @@ from apps.rules.utils.rule_engine_utils import (
     TelemetryEvent,
     RedisTelemetryRepository,
     PostgresTelemetryRepository,
+    SeriesStateStore,
     TelemetryRepository,
 )
 from apps.common.redis_client import get_redis_client
@@ -45,15 +48,36 @@ class TelemetryMapper:
         raise TypeError(f"Unsupported telemetry type: {type(self.telemetry)}")
 
 
+def rule_cache_key(device_serial_id: str, device_metric_id: int) -> str:
+    return f"{device_serial_id}:{device_metric_id}"
+
+
+def binding_cache_key(device_metric_id: int) -> str:
+    return f"binding:{device_metric_id}"
+
+
+def template_index_cache_key(metric_id: int) -> str:
+    return f"templates:metric:{metric_id}"
+
+
 class RuleCache:
-    """Fetches and caches active rules for a given telemetry device and metric"""
+    """
+    Fetches and caches active rules for a given telemetry device and metric.
+
+    Device-level rules are cached per device metric. Fleet-wide templates are cached
+    once per metric (the metric-type index) and resolved for a device metric through
+    a small cached binding (metric id, owner id, overridden template ids), so cache
+    size and invalidation cost scale with the number of templates, not with the fleet.
+    """
 
     def __init__(self, telemetry: TelemetryEvent):
         self.telemetry = telemetry
 
     def get_rules(self) -> list[Rule]:
         cache = caches["rules"]
-        cache_key = f"{self.telemetry.device_serial_id}:{self.telemetry.device_metric_id}"
+        cache_key = rule_cache_key(
+            self.telemetry.device_serial_id, self.telemetry.device_metric_id
+        )
 
         rules = cache.get(cache_key)
         if rules is None:
@@ -66,6 +90,57 @@ class RuleCache:
             cache.set(cache_key, rules, timeout=settings.RULES_CACHE_TTL)
         return rules
 
+    def get_templates(self) -> list[RuleTemplate]:
+        binding = self._get_binding()
+        if binding is None:
+            return []
+
+        overridden = set(binding["overridden_template_ids"])
+        return [
+            template
+            for template in self._get_metric_templates(binding["metric_id"])
+            if template.id not in overridden and template.applies_to(binding["user_id"])
+        ]
+
+    def _get_binding(self) -> dict | None:
+        cache = caches["rules"]
+        device_metric_id = self.telemetry.device_metric_id
+        cache_key = binding_cache_key(device_metric_id)
+
+        binding = cache.get(cache_key)
+        if binding is None:
+            row = (
+                DeviceMetric.objects.filter(id=device_metric_id)
+                .values("metric_id", "device__user_id")
+                .first()
+            )
+            if row is None:
+                return None
+            binding = {
+                "metric_id": row["metric_id"],
+                "user_id": row["device__user_id"],
+                # Any device-level rule pointing at a template overrides it, an inactive
+                # override simply switches the template off for this device metric.
+                "overridden_template_ids": list(
+                    RuleTemplate.objects.filter(
+                        overrides__device_metric_id=device_metric_id
+                    ).values_list("id", flat=True)
+                ),
+            }
+            cache.set(cache_key, binding, timeout=settings.RULES_CACHE_TTL)
+        return binding
+
+    @staticmethod
+    def _get_metric_templates(metric_id: int) -> list[RuleTemplate]:
+        cache = caches["rules"]
+        cache_key = template_index_cache_key(metric_id)
+
+        templates = cache.get(cache_key)
+        if templates is None:
+            templates = list(RuleTemplate.objects.filter(is_active=True, metric_id=metric_id))
+            cache.set(cache_key, templates, timeout=settings.RULES_CACHE_TTL)
+        return templates
+
 
 def choose_repository(duration_minutes: int) -> TelemetryRepository:
     """
@@ -109,37 +184,15 @@ class RuleProcessor:
             },
         )
 
-        rules = RuleCache(telemetry=mapped_telemetry).get_rules()  # get rules from cache
-
-        for rule in rules:
-            condition = rule.condition
-            rule_type = condition.get("type", "unknown")
-            logger.debug("Evaluating rule", extra={"rule_id": rule.id, "rule_type": rule_type})
-
-            rules_evaluated_total.labels(rule_type=rule_type).inc()
-            duration_minutes = condition.get("duration_minutes", DEFAULT_TELEMETRY_WINDOW_MINUTES)
+        rule_cache = RuleCache(telemetry=mapped_telemetry)
 
-            telemetry_window = get_window(mapped_telemetry, duration_minutes)
+        for rule in rule_cache.get_rules():
+            triggered = RuleProcessor._evaluate(rule, mapped_telemetry)
+            results.append({"rule_id": rule.id, "triggered": triggered})
 
-            if ConditionEvaluator.evaluate(
-                condition,
-                context=EvaluationContext(
-                    telemetry=mapped_telemetry, telemetries_in_window=telemetry_window
-                ),
-            ):
-                rules_triggered_total.labels(rule_type=rule_type).inc()
-                logger.debug(
-                    "Rule triggered - dispatching action",
-                    extra={"rule_id": rule.id, "rule_type": rule_type},
-                )
-                Action.dispatch_action(rule, mapped_telemetry)
-                results.append({"rule_id": rule.id, "triggered": True})
-            else:
-                logger.debug(
-                    "Rule not triggered",
-                    extra={"rule_id": rule.id, "rule_type": rule_type},
-                )
-                results.append({"rule_id": rule.id, "triggered": False})
+        for template in rule_cache.get_templates():
+            triggered = RuleProcessor._evaluate(template, mapped_telemetry)
+            results.append({"rule_template_id": template.id, "triggered": triggered})
 
         duration = time.perf_counter() - start_time
         rule_processing_seconds.observe(duration)
@@ -152,3 +205,38 @@ class RuleProcessor:
             },
             "results": results,
         }
+
+    @staticmethod
+    def _evaluate(rule: Rule | RuleTemplate, telemetry: TelemetryEvent) -> bool:
+        """Evaluate a single rule or template and dispatch its action when it triggers."""
+        condition = rule.condition
+        rule_type = condition.get("type", "unknown")
+        is_template = isinstance(rule, RuleTemplate)
+        log_extra = {"rule_id": rule.id, "rule_type": rule_type, "is_template": is_template}
+        logger.debug("Evaluating rule", extra=log_extra)
+
+        rules_evaluated_total.labels(rule_type=rule_type).inc()
+        if rule_type in STATEFUL_RULE_TYPES:
+            # incremental evaluators read their own series state, not a window
+            telemetry_window = []
+        else:
+            duration_minutes = condition.get("duration_minutes", DEFAULT_TELEMETRY_WINDOW_MINUTES)
+            telemetry_window = get_window(telemetry, duration_minutes)
+
+        if ConditionEvaluator.evaluate(
+            condition,
+            context=EvaluationContext(
+                telemetry=telemetry,
+                telemetries_in_window=telemetry_window,
+                state_store=SeriesStateStore(redis_client, settings.RULES_STATE_TTL),
+                rule_id=rule.id,
+                is_template=is_template,
+            ),
+        ):
+            rules_triggered_total.labels(rule_type=rule_type).inc()
+            logger.debug("Rule triggered - dispatching action", extra=log_extra)
+            Action.dispatch_action(rule, telemetry)
+            return True
+
+        logger.debug("Rule not triggered", extra=log_extra)
+        return False
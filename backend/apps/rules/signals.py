@@ -1,9 +1,19 @@
 import logging
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import caches
 
+from apps.common.utils.response_cache import bump_generation
+from apps.devices.models.device import Device
+from apps.devices.models.device_metric import DeviceMetric
+from apps.rules.models.event import Event
 from apps.rules.models.rule import Rule
+from apps.rules.models.rule_template import RuleTemplate
+from apps.rules.services.rule_processor import (
+    binding_cache_key,
+    rule_cache_key,
+    template_index_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +30,57 @@ def invalidate_rule_cache(sender, instance, **kwargs):
             serial_id = device_metric.device.serial_id
             device_metric_id = device_metric.id
 
-            cache_key = f"{serial_id}:{device_metric_id}"
+            cache_key = rule_cache_key(serial_id, device_metric_id)
 
-            cache_rule.delete(cache_key)
+            # the binding holds the template ids overridden by this device metric
+            cache_rule.delete_many([cache_key, binding_cache_key(device_metric_id)])
             logger.debug(f"!!! CACHE DELETED: {cache_key} !!!")
             logger.debug(f"Cache invalidated for key: {cache_key}")
 
     except Exception as e:
         logger.exception(f"!!! ERROR IN SIGNAL: {e} !!!")
+
+
+@receiver(pre_save, sender=RuleTemplate)
+def remember_template_metric(sender, instance, **kwargs):
+    """Keep the previous metric id so a re-targeted template leaves no stale index entry."""
+    if instance.pk is None:
+        instance._previous_metric_id = None
+        return
+    instance._previous_metric_id = (
+        RuleTemplate.objects.filter(pk=instance.pk).values_list("metric_id", flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=RuleTemplate)
+def invalidate_template_index(sender, instance, **kwargs):
+    try:
+        metric_ids = {instance.metric_id, getattr(instance, "_previous_metric_id", None)}
+        keys = [template_index_cache_key(metric_id) for metric_id in metric_ids if metric_id]
+        caches["rules"].delete_many(keys)
+        logger.debug("Template index invalidated", extra={"keys": keys})
+    except Exception as e:
+        logger.exception(f"Failed to invalidate template index: {e}")
+
+
+@receiver(post_save, sender=Device)
+def invalidate_device_bindings(sender, instance, created, **kwargs):
+    """Device owner changes affect which user-scoped templates apply."""
+    if created:
+        return
+    try:
+        device_metric_ids = DeviceMetric.objects.filter(device=instance).values_list(
+            "id", flat=True
+        )
+        caches["rules"].delete_many([binding_cache_key(dm_id) for dm_id in device_metric_ids])
+    except Exception as e:
+        logger.exception(f"Failed to invalidate device bindings: {e}")
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=Rule)
+@receiver([post_save, post_delete], sender=Device)
+@receiver([post_save, post_delete], sender=DeviceMetric)
+def bump_response_generation(sender, **kwargs):
+    """Changes the ETag of the list/detail responses built from this table."""
+    bump_generation(sender._meta.db_table)
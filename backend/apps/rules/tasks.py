@@ -1,17 +1,38 @@
 import requests
 import time
 from datetime import timedelta
-from celery import shared_task, current_task
+from typing import Optional
+from celery import group, shared_task, current_task
 from celery.utils.log import get_task_logger
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import F, Q
 from django.core.mail import send_mail
 from django.conf import settings
 from django.db import transaction
 
-from apps.audit.publisher import publish_audit_event
+from apps.audit.outbox import enqueue_audit_event, enqueue_audit_events
 from apps.rules.audit.actions_audit import action_rejected, action_succeeded
 from apps.rules.audit.rules_audit import rule_evaluated
+from apps.rules.services.delivery_service import (
+    apply_delivery_result,
+    archive_finished_batch,
+    claim_due_deliveries,
+    delivery_retry_delay,
+    delivery_uses_celery,
+    due_delivery_filter,
+    group_webhook_batches,
+    webhook_batch_body,
+    webhook_batching,
+    webhook_body,
+)
+from apps.rules.services.notification_service import (
+    notification_email_body,
+    notification_from_email,
+    notification_subject,
+    send_digests,
+)
+from apps.rules.services.event_service import event_delete_expired_batch, sync_unacknowledged_gauge
+from apps.rules.services.event_stream import publish_event_acks
 from apps.rules.services.rule_processor import RuleProcessor
 from apps.rules.models.event_delivery import EventDelivery, Status, DeliveryType
 from conf.utils.logging_context import task_id_var, task_name_var
@@ -40,7 +61,7 @@ def evaluate_rule(telemetry: dict):
 
         for eval_res in res.get("results", []):
             if eval_res.get("triggered"):
-                publish_audit_event(
+                enqueue_audit_event(
                     event=rule_evaluated(
                         rule_id=eval_res.get("rule_id"),
                         details=res.get("telemetry"),
@@ -66,45 +87,72 @@ def evaluate_rule(telemetry: dict):
     )
 
 
-@shared_task(bind=True, max_retries=None)
-def process_delivery_task(self, delivery_id: int):
-    """Asynchronous task to process an EventDelivery (webhook or notification) with retry logic and status updates in the database."""
+@shared_task
+def process_delivery_task(
+    delivery_id: int, claimed: bool = False, sibling_ids: Optional[list[int]] = None
+):
+    """
+    Asynchronous task to process an EventDelivery (webhook or notification) and record the outcome in the database.
+    A failed attempt is not retried with a Celery countdown: the delivery is left in RETRY with
+    `next_retry_at` and claimed again by `dispatch_due_deliveries`, which passes `claimed=True`
+    (and the ids of batched webhook siblings) for rows it already marked PROCESSING.
+    """
     try:
         with transaction.atomic():
             delivery = EventDelivery.objects.select_for_update().get(id=delivery_id)
 
-            if delivery.status in [Status.SUCCESS, Status.REJECTED]:
-                logger_celery.info(
-                    "Delivery %s is already %s. Skipping.", delivery_id, delivery.status
-                )
-                return
-
-            if delivery.attempts >= delivery.max_attempts:
-                logger_celery.warning("Delivery %s reached max attempts. Skipping.", delivery_id)
-                delivery.status = Status.REJECTED
-                delivery.save(update_fields=['status', 'updated_at'])
-                publish_audit_event(event=action_rejected(delivery))
-                return
-
-            if delivery.status == Status.PROCESSING:
-                logger_celery.warning(
-                    "Delivery %s is currently being processed. Skipping.", delivery_id
-                )
-                return
-
-            if delivery.status == Status.RETRY and delivery.next_retry_at:
-                if timezone.now() < delivery.next_retry_at:
+            if claimed:
+                if delivery.status != Status.PROCESSING:
                     logger_celery.info(
-                        "Delivery %s is in RETRY but it's too early (next: %s). Skipping.",
+                        "Delivery %s is no longer claimed (%s). Skipping.",
                         delivery_id,
-                        delivery.next_retry_at,
+                        delivery.status,
+                    )
+                    return
+                siblings = list(
+                    EventDelivery.objects.filter(
+                        id__in=sibling_ids or [], status=Status.PROCESSING
+                    ).order_by('id')
+                )
+            else:
+                if delivery.status in [Status.SUCCESS, Status.REJECTED]:
+                    logger_celery.info(
+                        "Delivery %s is already %s. Skipping.", delivery_id, delivery.status
                     )
                     return
 
-            delivery.status = Status.PROCESSING
-            delivery.attempts += 1
-            delivery.last_attempt_at = timezone.now()
-            delivery.save(update_fields=['status', 'attempts', 'last_attempt_at', 'updated_at'])
+                if delivery.attempts >= delivery.max_attempts:
+                    logger_celery.warning(
+                        "Delivery %s reached max attempts. Skipping.", delivery_id
+                    )
+                    delivery.status = Status.REJECTED
+                    delivery.save(update_fields=['status', 'updated_at'])
+                    enqueue_audit_event(event=action_rejected(delivery))
+                    return
+
+                if delivery.status == Status.PROCESSING:
+                    logger_celery.warning(
+                        "Delivery %s is currently being processed. Skipping.", delivery_id
+                    )
+                    return
+
+                if delivery.status == Status.RETRY and delivery.next_retry_at:
+                    if timezone.now() < delivery.next_retry_at:
+                        logger_celery.info(
+                            "Delivery %s is in RETRY but it's too early (next: %s). Skipping.",
+                            delivery_id,
+                            delivery.next_retry_at,
+                        )
+                        return
+
+                delivery.status = Status.PROCESSING
+                delivery.attempts += 1
+                delivery.last_attempt_at = delivery.updated_at = timezone.now()
+                delivery.save(
+                    update_fields=['status', 'attempts', 'last_attempt_at', 'updated_at']
+                )
+
+                siblings = _claim_batch_siblings(delivery)
 
     except EventDelivery.DoesNotExist:
         logger_celery.error("EventDelivery %s not found. Dropping task.", delivery_id)
@@ -112,7 +160,7 @@ def process_delivery_task(self, delivery_id: int):
 
     try:
         if delivery.delivery_type == DeliveryType.WEBHOOK:
-            _process_webhook(delivery)
+            _process_webhook(delivery, siblings)
         elif delivery.delivery_type == DeliveryType.NOTIFICATION:
             _process_notification(delivery)
         else:
@@ -120,8 +168,12 @@ def process_delivery_task(self, delivery_id: int):
 
         delivery.status = Status.SUCCESS
         delivery.error_message = None
-        delivery.save(update_fields=['status', 'response_status', 'error_message', 'updated_at'])
-        publish_audit_event(event=action_succeeded(delivery))
+        with transaction.atomic():
+            delivery.save(
+                update_fields=['status', 'response_status', 'error_message', 'updated_at']
+            )
+            enqueue_audit_event(event=action_succeeded(delivery))
+            _record_batch_siblings(siblings, response_status=delivery.response_status, error=None)
 
         logger_celery.info("Delivery %s completed successfully.", delivery_id)
 
@@ -131,42 +183,100 @@ def process_delivery_task(self, delivery_id: int):
         )
 
         delivery.error_message = str(exc)
+        _record_batch_siblings(
+            siblings, response_status=delivery.response_status, error=delivery.error_message
+        )
 
         if delivery.attempts >= delivery.max_attempts:
             delivery.status = Status.REJECTED
-            delivery.save(update_fields=['status', 'error_message', 'updated_at'])
-            publish_audit_event(event=action_rejected(delivery))
+            with transaction.atomic():
+                delivery.save(update_fields=['status', 'error_message', 'updated_at'])
+                enqueue_audit_event(event=action_rejected(delivery))
             logger_celery.error(
                 "Delivery %s REJECTED after %s attempts.", delivery_id, delivery.max_attempts
             )
         else:
             delivery.status = Status.RETRY
 
-            delay_seconds = (2**delivery.attempts) * 20
+            delay_seconds = delivery_retry_delay(delivery.attempts)
 
+            # claimed again by dispatch_due_deliveries once next_retry_at has passed
             delivery.next_retry_at = timezone.now() + timezone.timedelta(seconds=delay_seconds)
             delivery.save(update_fields=['status', 'error_message', 'next_retry_at', 'updated_at'])
 
-            if delay_seconds >= 3600:
-                return
 
-            raise self.retry(exc=exc, countdown=delay_seconds)
+def _claim_batch_siblings(delivery: EventDelivery) -> list[EventDelivery]:
+    """
+    For a webhook action with `max_batch`, lock other due batched deliveries to the same
+    URL and mark them PROCESSING so they are sent in the same request.
+    Must run inside the transaction that claimed `delivery`.
+    """
+    if delivery.delivery_type != DeliveryType.WEBHOOK:
+        return []
+    batching = webhook_batching(delivery.payload)
+    if batching is None:
+        return []
+
+    now = timezone.now()
+    siblings = list(
+        EventDelivery.objects.select_for_update(skip_locked=True)
+        .filter(
+            # new siblings are not due for the scheduler yet, but may join the batch
+            Q(status=Status.PENDING) | due_delivery_filter(now),
+            delivery_type=DeliveryType.WEBHOOK,
+            payload__url=delivery.payload.get('url'),
+            payload__max_batch__gt=1,
+            attempts__lt=F('max_attempts'),
+        )
+        .exclude(id=delivery.id)
+        .order_by('id')[: batching.max_batch - 1]
+    )
+    for sibling in siblings:
+        sibling.status = Status.PROCESSING
+        sibling.attempts += 1
+        sibling.last_attempt_at = now
+        sibling.updated_at = now
+    if siblings:
+        EventDelivery.objects.bulk_update(
+            siblings, ['status', 'attempts', 'last_attempt_at', 'updated_at']
+        )
+    return siblings
+
+
+def _record_batch_siblings(siblings: list[EventDelivery], *, response_status, error) -> None:
+    """Record the outcome of a batched request on the deliveries sent along with the task's own."""
+    if not siblings:
+        return
+
+    now = timezone.now()
+    audit = []
+    for sibling in siblings:
+        apply_delivery_result(sibling, response_status=response_status, error=error, now=now)
+        if sibling.status == Status.SUCCESS:
+            audit.append(action_succeeded(sibling))
+        elif sibling.status == Status.REJECTED:
+            audit.append(action_rejected(sibling))
+
+    with transaction.atomic():
+        EventDelivery.objects.bulk_update(
+            siblings,
+            ['status', 'response_status', 'error_message', 'next_retry_at', 'updated_at'],
+        )
+        enqueue_audit_events(events=audit)
 
 
-def _process_webhook(delivery: EventDelivery):
+def _process_webhook(delivery: EventDelivery, siblings: list[EventDelivery] = ()):
     """Additional helper function to send HTTP POST request for webhook deliveries."""
     url = delivery.payload.get('url')
     if not url:
         raise ValueError("Webhook URL is missing in payload.")
 
-    webhook_payload = {
-        "event_uuid": str(delivery.event_uuid),
-        "rule_id": delivery.rule_id,
-        "device_serial": delivery.trigger_device_serial_id,
-        "timestamp": timezone.now().isoformat(),
-    }
+    if webhook_batching(delivery.payload):
+        body = webhook_batch_body([delivery, *siblings])
+    else:
+        body = webhook_body(delivery)
 
-    response = requests.post(url, json=webhook_payload, timeout=10)
+    response = requests.post(url, json=body, timeout=10)
 
     delivery.response_status = response.status_code
 
@@ -178,9 +288,7 @@ def _process_notification(delivery: EventDelivery):
     """Processes a notification delivery, sending an email if the channel is 'email'. Raises exceptions on failure to trigger retries."""
 
     channel = delivery.payload.get('channel')
-    message_text = delivery.payload.get('message', 'Alert triggered.')
     recipient = delivery.payload.get('recipient')
-    subject = delivery.payload.get('subject', f"IoT Alert: Rule {delivery.rule_id}")
 
     if not channel:
         raise ValueError("Notification channel missing in payload.")
@@ -189,20 +297,12 @@ def _process_notification(delivery: EventDelivery):
         if not recipient:
             raise ValueError("Recipient email is missing in payload.")
 
-        full_message = (
-            f"{message_text}\n\n"
-            f"--- Alert Details ---\n"
-            f"Device Serial: {delivery.trigger_device_serial_id}\n"
-            f"Event UUID: {delivery.event_uuid}\n\n"
-            f"Sent by IoT Hub Platform"
-        )
-
         logger_celery.info(f"Sending real EMAIL to {recipient}...")
 
         send_mail(
-            subject=subject,
-            message=full_message,
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@iot-hub.local'),
+            subject=notification_subject(delivery),
+            message=notification_email_body(delivery),
+            from_email=notification_from_email(),
             recipient_list=[recipient],
             fail_silently=False,
         )
@@ -213,32 +313,139 @@ def _process_notification(delivery: EventDelivery):
 
 
 @shared_task
-def recover_stuck_deliveries():
-    """Periodic task to find stuck deliveries and re-queue them in Celery."""
+def dispatch_due_deliveries():
+    """
+    Scheduler loop for Celery-delivered actions: claims due deliveries in batches with
+    SELECT ... FOR UPDATE SKIP LOCKED (status IN (pending, retry) AND next_retry_at <= now)
+    and enqueues the claimed rows, batched webhooks to the same URL as one task.
+    """
+    delivery_types = [
+        delivery_type for delivery_type in DeliveryType if delivery_uses_celery(delivery_type)
+    ]
+    if not delivery_types:
+        return
 
-    now = timezone.now()
+    batch_size = settings.DELIVERY_SCHEDULER_BATCH_SIZE
+    total = 0
+    for _ in range(settings.DELIVERY_SCHEDULER_MAX_BATCHES):
+        claimed = claim_due_deliveries(limit=batch_size, delivery_types=delivery_types)
+        if claimed:
+            group(
+                [
+                    process_delivery_task.s(
+                        first.id, claimed=True, sibling_ids=[sibling.id for sibling in siblings]
+                    )
+                    for first, *siblings in group_webhook_batches(claimed)
+                ]
+            ).apply_async()
+            total += len(claimed)
+        if len(claimed) < batch_size:
+            break
+
+    if total:
+        logger_celery.info("Dispatched %s due deliveries.", total)
 
-    pending_threshold = now - timedelta(minutes=5)
 
+@shared_task
+def recover_stuck_deliveries():
+    """
+    Periodic task that makes deliveries stuck in PROCESSING (worker crash, lost task)
+    due again with one set-based UPDATE; the scheduler or the webhook worker picks them up.
+    """
+    now = timezone.now()
     processing_threshold = now - timedelta(minutes=15)
 
-    stuck_deliveries = EventDelivery.objects.filter(
-        Q(status=Status.PENDING, updated_at__lt=pending_threshold)
-        | Q(status=Status.PROCESSING, updated_at__lt=processing_threshold)
-        | Q(status=Status.RETRY, next_retry_at__lte=now)
+    count = EventDelivery.objects.filter(
+        status=Status.PROCESSING, updated_at__lt=processing_threshold
+    ).update(status=Status.RETRY, next_retry_at=now, updated_at=now)
+
+    if count > 0:
+        logger_celery.info(f"Recovered {count} stuck deliveries.")
+
+
+@shared_task
+def archive_finished_deliveries():
+    """
+    Periodic task that moves SUCCESS/REJECTED deliveries older than
+    DELIVERY_ARCHIVE_AFTER_HOURS to event_deliveries_archive, batch by batch.
+    """
+    older_than = timezone.now() - timedelta(hours=settings.DELIVERY_ARCHIVE_AFTER_HOURS)
+    batch_size = settings.DELIVERY_ARCHIVE_BATCH_SIZE
+
+    total = 0
+    while True:
+        archived = archive_finished_batch(older_than=older_than, batch_size=batch_size)
+        total += archived
+        if archived < batch_size:
+            break
+
+    if total:
+        logger_celery.info("Archived %s finished deliveries.", total)
+
+
+@shared_task
+def prune_expired_events():
+    """
+    Periodic task that deletes events triggered more than EVENTS_RETENTION_DAYS ago,
+    batch by batch. EVENTS_RETENTION_DAYS=0 keeps events forever.
+    """
+    if not settings.EVENTS_RETENTION_DAYS:
+        return
+    older_than = timezone.now() - timedelta(days=settings.EVENTS_RETENTION_DAYS)
+    batch_size = settings.RETENTION_DELETE_BATCH_SIZE
+
+    total = 0
+    while True:
+        deleted = event_delete_expired_batch(older_than=older_than, batch_size=batch_size)
+        total += deleted
+        if deleted < batch_size:
+            break
+
+    if total:
+        # deleted events may have been unacknowledged
+        sync_unacknowledged_gauge()
+        logger_celery.info("Deleted %s expired events.", total)
+
+
+@shared_task
+def send_email_digests():
+    """
+    Periodic task (every EMAIL_DIGEST_WINDOW_SECONDS) that sends the email deliveries
+    collected during the window as one digest per recipient.
+    """
+    deliveries = claim_due_deliveries(
+        limit=settings.EMAIL_DIGEST_BATCH_SIZE, delivery_types=[DeliveryType.NOTIFICATION]
     )
+    if deliveries:
+        send_digests(deliveries)
+
+
+@shared_task
+def sync_unacknowledged_events_gauge():
+    """
+    Periodic task that corrects the iot_events_unacknowledged_total gauge, which is
+    otherwise only moved incrementally by event inserts and acknowledgements.
+    """
+    sync_unacknowledged_gauge()
 
-    count = 0
-    for delivery in stuck_deliveries:
-        delivery.updated_at = now
-        delivery.save(update_fields=['updated_at'])
 
+@shared_task
+def stream_event_acks(event_ids: list[int]):
+    """
+    Push acknowledgements to WebSocket event subscribers, off the request path.
+    """
+    if not publish_event_acks(event_ids):
         logger_celery.warning(
-            f"Recovering stuck delivery {delivery.id} (Status: {delivery.status})"
+            "Event stream publish failed for %d acknowledgements", len(event_ids)
         )
 
-        process_delivery_task.delay(delivery.id)
-        count += 1
 
-    if count > 0:
-        logger_celery.info(f"Recovered {count} stuck deliveries.")
+def stream_event_acks_on_commit(event_ids: list[int]) -> None:
+    """
+    Queue stream_event_acks for `event_ids` once the current transaction commits,
+    in chunks of EVENTS_STREAM_ACK_CHUNK_SIZE.
+    """
+    chunk_size = settings.EVENTS_STREAM_ACK_CHUNK_SIZE
+    for start in range(0, len(event_ids), chunk_size):
+        chunk = event_ids[start : start + chunk_size]
+        transaction.on_commit(lambda chunk=chunk: stream_event_acks.delay(chunk))
@@ -0,0 +1,241 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from django.utils import timezone
+
+from apps.rules.models.event_delivery import (
+    DeliveryType,
+    EventDelivery,
+    EventDeliveryArchive,
+    Status,
+)
+from apps.rules.services.delivery_service import claim_due_deliveries
+from apps.rules.tasks import (
+    archive_finished_deliveries,
+    dispatch_due_deliveries,
+    process_delivery_task,
+    recover_stuck_deliveries,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def _disable_audit_publish():
+    with (
+        patch('apps.rules.tasks.enqueue_audit_event'),
+        patch('apps.rules.tasks.enqueue_audit_events'),
+        patch('apps.rules.services.delivery_service.enqueue_audit_events') as mock_publish,
+    ):
+        yield mock_publish
+
+
+def make_delivery(**kwargs):
+    defaults = dict(
+        event_uuid=uuid.uuid4(),
+        rule_id=1,
+        trigger_device_serial_id="DEV-001",
+        delivery_type=DeliveryType.WEBHOOK,
+        payload={"url": "https://example.com/hook", "enabled": True},
+    )
+    defaults.update(kwargs)
+    return EventDelivery.objects.create(**defaults)
+
+
+def dispatched_calls(mock_task):
+    return [(c.args, c.kwargs) for c in mock_task.s.call_args_list]
+
+
+# ============================================================================
+# Claiming
+# ============================================================================
+
+
+def test_claim_takes_only_due_active_deliveries():
+    now = timezone.now()
+    due_pending = make_delivery(next_retry_at=now - timedelta(seconds=1))
+    due_retry = make_delivery(status=Status.RETRY, next_retry_at=now - timedelta(seconds=1))
+    make_delivery(next_retry_at=now + timedelta(minutes=1))
+    make_delivery(status=Status.RETRY, next_retry_at=now + timedelta(minutes=1))
+    make_delivery(status=Status.SUCCESS)
+    make_delivery(status=Status.PROCESSING)
+
+    claimed = claim_due_deliveries(limit=10, delivery_types=[DeliveryType.WEBHOOK])
+
+    assert {d.id for d in claimed} == {due_pending.id, due_retry.id}
+    for delivery in claimed:
+        delivery.refresh_from_db()
+        assert delivery.status == Status.PROCESSING
+        assert delivery.attempts == 1
+
+
+def test_claim_respects_limit_and_type():
+    for _ in range(3):
+        make_delivery()
+    make_delivery(delivery_type=DeliveryType.NOTIFICATION, payload={"channel": "email"})
+
+    claimed = claim_due_deliveries(limit=2, delivery_types=[DeliveryType.WEBHOOK])
+
+    assert len(claimed) == 2
+    assert all(d.delivery_type == DeliveryType.WEBHOOK for d in claimed)
+
+
+def test_claim_rejects_exhausted_deliveries(_disable_audit_publish):
+    delivery = make_delivery(status=Status.RETRY, attempts=5, max_attempts=5)
+
+    assert claim_due_deliveries(limit=10, delivery_types=[DeliveryType.WEBHOOK]) == []
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.REJECTED
+    _disable_audit_publish.assert_called_once()
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+
+def test_scheduler_dispatches_claimed_deliveries_in_one_group():
+    deliveries = [make_delivery() for _ in range(3)]
+
+    with (
+        patch('apps.rules.tasks.process_delivery_task') as task,
+        patch('apps.rules.tasks.group') as mock_group,
+    ):
+        dispatch_due_deliveries()
+
+    mock_group.return_value.apply_async.assert_called_once()
+    assert dispatched_calls(task) == [
+        ((delivery.id,), {'claimed': True, 'sibling_ids': []}) for delivery in deliveries
+    ]
+
+
+def test_scheduler_groups_batched_webhooks_per_url():
+    payload = {"url": "https://example.com/hook", "enabled": True, "max_batch": 10}
+    first, *siblings = [make_delivery(payload=payload) for _ in range(3)]
+
+    with (
+        patch('apps.rules.tasks.process_delivery_task') as task,
+        patch('apps.rules.tasks.group'),
+    ):
+        dispatch_due_deliveries()
+
+    assert dispatched_calls(task) == [
+        ((first.id,), {'claimed': True, 'sibling_ids': [s.id for s in siblings]})
+    ]
+
+
+def test_scheduler_claims_in_batches(settings):
+    settings.DELIVERY_SCHEDULER_BATCH_SIZE = 2
+    for _ in range(5):
+        make_delivery()
+
+    with (
+        patch('apps.rules.tasks.process_delivery_task'),
+        patch('apps.rules.tasks.group') as mock_group,
+    ):
+        dispatch_due_deliveries()
+
+    assert mock_group.return_value.apply_async.call_count == 3
+    assert not EventDelivery.objects.filter(status=Status.PENDING).exists()
+
+
+def test_scheduler_leaves_deliveries_of_other_workers(settings):
+    settings.WEBHOOK_WORKER_ENABLED = True
+    delivery = make_delivery()
+
+    with patch('apps.rules.tasks.group') as mock_group:
+        dispatch_due_deliveries()
+
+    mock_group.assert_not_called()
+    delivery.refresh_from_db()
+    assert delivery.status == Status.PENDING
+
+
+# ============================================================================
+# Claimed task execution
+# ============================================================================
+
+
+def test_claimed_task_sends_without_claiming_again():
+    make_delivery()
+    [delivery] = claim_due_deliveries(limit=1, delivery_types=[DeliveryType.WEBHOOK])
+
+    with patch('apps.rules.tasks.requests.post') as mock_post:
+        mock_post.return_value = MagicMock(status_code=200)
+        process_delivery_task(delivery.id, claimed=True)
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.SUCCESS
+    assert delivery.attempts == 1
+
+
+def test_claimed_task_skips_rows_no_longer_processing():
+    delivery = make_delivery(status=Status.SUCCESS)
+
+    with patch('apps.rules.tasks.requests.post') as mock_post:
+        process_delivery_task(delivery.id, claimed=True)
+
+    mock_post.assert_not_called()
+
+
+def test_failed_attempt_is_left_for_the_scheduler():
+    delivery = make_delivery()
+    response = MagicMock(status_code=503)
+    response.raise_for_status.side_effect = requests.HTTPError('503 Service Unavailable')
+
+    with patch('apps.rules.tasks.requests.post', return_value=response):
+        process_delivery_task(delivery.id)
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.RETRY
+    assert delivery.next_retry_at > timezone.now()
+
+
+# ============================================================================
+# Stuck sweep and archiving
+# ============================================================================
+
+
+def test_stuck_processing_deliveries_are_made_due_again():
+    stale = timezone.now() - timedelta(minutes=30)
+    stuck = make_delivery(status=Status.PROCESSING, updated_at=stale)
+    fresh = make_delivery(status=Status.PROCESSING)
+
+    recover_stuck_deliveries()
+
+    stuck.refresh_from_db()
+    fresh.refresh_from_db()
+    assert stuck.status == Status.RETRY
+    assert stuck.next_retry_at <= timezone.now()
+    assert fresh.status == Status.PROCESSING
+
+
+def test_finished_deliveries_are_moved_to_archive(settings):
+    settings.DELIVERY_ARCHIVE_BATCH_SIZE = 2
+    old = timezone.now() - timedelta(days=2)
+    finished = [
+        make_delivery(status=Status.SUCCESS, updated_at=old, response_status=200),
+        make_delivery(status=Status.REJECTED, updated_at=old, error_message="boom"),
+        make_delivery(status=Status.SUCCESS, updated_at=old),
+    ]
+    recent = make_delivery(status=Status.SUCCESS)
+    active = make_delivery(status=Status.RETRY, updated_at=old)
+
+    archive_finished_deliveries()
+
+    assert set(EventDelivery.objects.values_list("id", flat=True)) == {recent.id, active.id}
+    archived = {row.id: row for row in EventDeliveryArchive.objects.all()}
+    assert set(archived) == {delivery.id for delivery in finished}
+    assert archived[finished[0].id].response_status == 200
+    assert archived[finished[1].id].error_message == "boom"
+    assert archived[finished[0].id].event_uuid == finished[0].event_uuid
+    assert archived[finished[0].id].archived_at is not None
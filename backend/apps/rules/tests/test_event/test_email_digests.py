@@ -0,0 +1,133 @@
+import uuid
+from smtplib import SMTPException
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.core.mail import get_connection
+
+from apps.rules.models.event_delivery import DeliveryType, EventDelivery, Status
+from apps.rules.services.delivery_service import delivery_uses_celery
+from apps.rules.tasks import send_email_digests
+
+pytestmark = pytest.mark.django_db
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def _disable_audit_publish():
+    with patch('apps.rules.services.notification_service.enqueue_audit_events') as mock_publish:
+        yield mock_publish
+
+
+def make_notification(recipient='ops@example.com', **kwargs):
+    payload = {
+        'channel': 'email',
+        'enabled': True,
+        'recipient': recipient,
+        'message': 'High temperature',
+    }
+    payload.update(kwargs.pop('payload', {}))
+    defaults = dict(
+        event_uuid=uuid.uuid4(),
+        rule_id=1,
+        trigger_device_serial_id='DEV-001',
+        delivery_type=DeliveryType.NOTIFICATION,
+        payload=payload,
+    )
+    defaults.update(kwargs)
+    return EventDelivery.objects.create(**defaults)
+
+
+# ============================================================================
+# Digests
+# ============================================================================
+
+
+def test_deliveries_are_grouped_into_one_digest_per_recipient():
+    ops = [make_notification() for _ in range(3)]
+    admin = make_notification('admin@example.com')
+
+    send_email_digests()
+
+    assert len(mail.outbox) == 2
+    by_recipient = {message.to[0]: message for message in mail.outbox}
+    assert by_recipient['ops@example.com'].subject == 'IoT Alert digest: 3 alerts'
+    for delivery in ops:
+        assert str(delivery.event_uuid) in by_recipient['ops@example.com'].body
+    assert by_recipient['admin@example.com'].subject == 'IoT Alert: Rule 1'
+
+    for delivery in [*ops, admin]:
+        delivery.refresh_from_db()
+        assert delivery.status == Status.SUCCESS
+        assert delivery.attempts == 1
+        assert delivery.response_status == 200
+
+
+def test_digests_share_one_connection():
+    make_notification('a@example.com')
+    make_notification('b@example.com')
+
+    with patch(
+        'apps.rules.services.notification_service.get_connection', wraps=get_connection
+    ) as mock_connection:
+        send_email_digests()
+
+    mock_connection.assert_called_once()
+    assert len(mail.outbox) == 2
+
+
+def test_failed_digest_is_recorded_on_every_delivery():
+    deliveries = [make_notification() for _ in range(2)]
+
+    with patch(
+        'django.core.mail.EmailMessage.send', side_effect=SMTPException('mailbox unavailable')
+    ):
+        send_email_digests()
+
+    for delivery in deliveries:
+        delivery.refresh_from_db()
+        assert delivery.status == Status.RETRY
+        assert delivery.error_message == 'mailbox unavailable'
+        assert delivery.next_retry_at is not None
+
+
+def test_invalid_deliveries_fail_without_blocking_the_digest():
+    valid = make_notification()
+    no_recipient = make_notification(payload={'recipient': ''})
+    sms = make_notification(payload={'channel': 'sms'})
+
+    send_email_digests()
+
+    assert len(mail.outbox) == 1
+    valid.refresh_from_db()
+    no_recipient.refresh_from_db()
+    sms.refresh_from_db()
+    assert valid.status == Status.SUCCESS
+    assert no_recipient.status == Status.RETRY
+    assert sms.error_message == 'Unsupported notification channel: sms'
+
+
+def test_exhausted_deliveries_are_rejected_without_sending():
+    delivery = make_notification(attempts=5, max_attempts=5)
+
+    with patch('apps.rules.services.delivery_service.enqueue_audit_events') as mock_publish:
+        send_email_digests()
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.REJECTED
+    assert mail.outbox == []
+    mock_publish.assert_called_once()
+
+
+def test_digest_window_takes_notifications_off_celery(settings):
+    settings.EMAIL_DIGEST_WINDOW_SECONDS = 0
+    assert delivery_uses_celery(DeliveryType.NOTIFICATION)
+
+    settings.EMAIL_DIGEST_WINDOW_SECONDS = 60
+    assert not delivery_uses_celery(DeliveryType.NOTIFICATION)
+    assert delivery_uses_celery(DeliveryType.WEBHOOK)
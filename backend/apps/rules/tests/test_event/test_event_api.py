@@ -1,16 +1,29 @@
+import json
+import os
+import subprocess
+import sys
 from unittest.mock import patch
 
 import pytest
 import jwt
 
 import uuid
+from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.admin import site as admin_site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from apps.users.models import User
 from apps.devices.models import Device, Metric, DeviceMetric
+from apps.common.metrics import events_unacknowledged, reported_value
+from apps.audit.models import AuditOutbox
 from apps.rules.models import Rule, Event
+from apps.rules.services.event_service import sync_unacknowledged_gauge
+from apps.rules.tasks import prune_expired_events
 
 pytestmark = pytest.mark.django_db
 
@@ -98,6 +111,15 @@ def rule2(device_metric2):
     )
 
 
+@pytest.fixture
+def stranger_event(db):
+    stranger = User.objects.create_user(
+        username="stranger_ev", email="stranger_ev@example.com", password="pass123"
+    )
+    Device.objects.create(user=stranger, serial_id="EV-DEV-999", name="Stranger Device")
+    return Event.objects.create(rule=999999, trigger_device_serial_id="EV-DEV-999")
+
+
 @pytest.fixture
 def event(rule):
     return Event.objects.create(rule=rule.pk)
@@ -242,6 +264,73 @@ def test_list_events_returns_400_for_non_integer_limit(client, client_token):
     assert "limit" in response.json()["errors"]
 
 
+def test_list_events_cursor_walks_all_pages(client, client_token, rule):
+    same_time = timezone.now()
+    events = [Event.objects.create(rule=rule.pk, rule_triggered_at=same_time) for _ in range(3)]
+    events += [
+        Event.objects.create(rule=rule.pk, rule_triggered_at=same_time - timedelta(seconds=i + 1))
+        for i in range(2)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        query = "/api/events/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(query, **auth(client_token)).json()
+        seen += [item["event_uuid"] for item in data["results"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(events, key=lambda e: (e.rule_triggered_at, e.id), reverse=True)
+    assert seen == [str(e.event_uuid) for e in expected]
+
+
+def test_list_events_next_cursor_is_null_on_last_page(client, client_token, event):
+    data = client.get("/api/events/?limit=5", **auth(client_token)).json()
+    assert data["next_cursor"] is None
+
+
+def test_list_events_returns_400_for_invalid_cursor(client, client_token):
+    response = client.get("/api/events/?cursor=not-a-cursor", **auth(client_token))
+    assert response.status_code == 400
+    assert "cursor" in response.json()["errors"]
+
+
+def test_list_events_returns_400_for_cursor_with_offset(client, client_token, rule):
+    Event.objects.create(rule=rule.pk)
+    Event.objects.create(rule=rule.pk)
+    cursor = client.get("/api/events/?limit=1", **auth(client_token)).json()["next_cursor"]
+
+    response = client.get(f"/api/events/?cursor={cursor}&offset=1", **auth(client_token))
+    assert response.status_code == 400
+    assert "offset" in response.json()["errors"]
+
+
+def test_list_events_count_can_be_skipped(client, client_token, event):
+    data = client.get("/api/events/?count=none", **auth(client_token)).json()
+    assert data["count"] is None
+    assert len(data["results"]) == 1
+
+
+def test_list_events_small_estimate_falls_back_to_exact_count(client, client_token, event):
+    data = client.get("/api/events/?count=estimate", **auth(client_token)).json()
+    assert data["count"] == 1
+    assert data["count_is_estimate"] is False
+
+
+def test_list_events_large_estimate_is_returned_as_is(client, client_token, event):
+    with patch("apps.common.utils.pagination.estimated_count", return_value=1_000_000):
+        data = client.get("/api/events/", **auth(client_token)).json()
+    assert data["count"] == 1_000_000
+    assert data["count_is_estimate"] is True
+
+
+def test_list_events_returns_400_for_invalid_count_mode(client, client_token):
+    response = client.get("/api/events/?count=maybe", **auth(client_token))
+    assert response.status_code == 400
+    assert "count" in response.json()["errors"]
+
+
 # ============================================================================
 # GET /api/events/ — filter by rule
 # ============================================================================
@@ -258,6 +347,17 @@ def test_filter_by_rule_returns_matching_events(client, client_token, rule, rule
     assert data["results"][0]["event_uuid"] == str(e1.event_uuid)
 
 
+def test_filter_by_rule_excludes_template_events_with_same_id(client, client_token, rule):
+    e1 = Event.objects.create(rule=rule.pk)
+    Event.objects.create(rule=rule.pk, is_template=True)
+
+    response = client.get(f"/api/events/?rule={rule.pk}", **auth(client_token))
+    data = response.json()
+
+    assert data["count"] == 1
+    assert data["results"][0]["event_uuid"] == str(e1.event_uuid)
+
+
 def test_filter_by_nonexistent_rule_returns_empty(client, client_token):
     response = client.get("/api/events/?rule=99999", **auth(client_token))
     data = response.json()
@@ -410,13 +510,23 @@ def test_event_detail_response_fields(client, client_token, event):
 # ============================================================================
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_returns_200(mock_publish, client, client_token, event):
     response = client.post(f"/api/events/{event.event_uuid}/ack/", **auth(client_token))
     assert response.status_code == 200
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+def test_ack_event_writes_audit_record_to_outbox(client, client_token, event):
+    with patch('apps.audit.publisher.get_audit_producer') as get_producer:
+        client.post(f"/api/events/{event.event_uuid}/ack/", **auth(client_token))
+
+    get_producer.assert_not_called()
+    record = AuditOutbox.objects.get()
+    assert record.key == "events.EVENT_ACKNOWLEDGED"
+    assert record.payload["event_type"] == "events.EVENT_ACKNOWLEDGED"
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_sets_acknowledged_true(mock_publish, client, client_token, event):
     assert event.acknowledged is False
 
@@ -426,7 +536,7 @@ def test_ack_event_sets_acknowledged_true(mock_publish, client, client_token, ev
     assert event.acknowledged is True
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_response_contains_acknowledged_true(mock_publish, client, client_token, event):
     response = client.post(f"/api/events/{event.event_uuid}/ack/", **auth(client_token))
     data = response.json()
@@ -440,12 +550,20 @@ def test_ack_event_returns_404_for_unknown_id(client, client_token):
     assert "detail" in response.json()
 
 
+def test_ack_event_returns_404_for_event_of_another_user(client, client_token, stranger_event):
+    response = client.post(f"/api/events/{stranger_event.event_uuid}/ack/", **auth(client_token))
+
+    assert response.status_code == 404
+    stranger_event.refresh_from_db()
+    assert stranger_event.acknowledged is False
+
+
 def test_ack_event_returns_401_without_token(client, event):
     response = client.post(f"/api/events/{event.event_uuid}/ack/")
     assert response.status_code == 401
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_is_idempotent(mock_publish, client, client_token, event):
     """Calling ack twice should keep acknowledged=True and not error"""
     client.post(f"/api/events/{event.event_uuid}/ack/", **auth(client_token))
@@ -459,7 +577,7 @@ def test_ack_event_is_idempotent(mock_publish, client, client_token, event):
     assert event.acknowledged is True
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_already_acknowledged_remains_200(
     mock_publish, client, client_token, event_acked
 ):
@@ -468,20 +586,20 @@ def test_ack_event_already_acknowledged_remains_200(
     assert response.json()["acknowledged"] is True
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_by_admin_returns_200(mock_publish, client, admin_token, event):
     response = client.post(f"/api/events/{event.event_uuid}/ack/", **auth(admin_token))
     assert response.status_code == 200
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_response_contains_rule_info(mock_publish, client, client_token, event, rule):
     response = client.post(f"/api/events/{event.event_uuid}/ack/", **auth(client_token))
     data = response.json()
     assert data["rule"] == rule.id
 
 
-@patch('apps.rules.views.event_views.publish_audit_event')
+@patch('apps.rules.views.event_views.enqueue_audit_event')
 def test_ack_event_does_not_change_other_events(mock_publish, client, client_token, rule):
     e1 = Event.objects.create(rule=rule.pk)
     e2 = Event.objects.create(rule=rule.pk)
@@ -490,3 +608,277 @@ def test_ack_event_does_not_change_other_events(mock_publish, client, client_tok
 
     e2.refresh_from_db()
     assert e2.acknowledged is False
+
+
+# ============================================================================
+# POST /api/events/ack/ — bulk acknowledge
+# ============================================================================
+
+
+def bulk_ack(client, token, body):
+    return client.post(
+        "/api/events/ack/", data=json.dumps(body), content_type="application/json", **auth(token)
+    )
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_by_uuids(mock_publish, client, client_token, rule):
+    events = [Event.objects.create(rule=rule.pk) for _ in range(3)]
+    other = Event.objects.create(rule=rule.pk)
+
+    response = bulk_ack(client, client_token, {"event_uuids": [str(e.event_uuid) for e in events]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["acknowledged"] == 3
+    assert set(data["event_uuids"]) == {str(e.event_uuid) for e in events}
+    assert Event.objects.filter(acknowledged=True).count() == 3
+    other.refresh_from_db()
+    assert other.acknowledged is False
+    assert len(mock_publish.call_args.kwargs["events"]) == 3
+    mock_publish.assert_called_once()
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_by_filters(mock_publish, client, client_token, rule, rule2):
+    cutoff = timezone.now()
+    old = Event.objects.create(
+        rule=rule.pk,
+        trigger_device_serial_id="SN-1",
+        rule_triggered_at=cutoff - timedelta(hours=1),
+    )
+    recent = Event.objects.create(
+        rule=rule.pk,
+        trigger_device_serial_id="SN-1",
+        rule_triggered_at=cutoff + timedelta(hours=1),
+    )
+    other_device = Event.objects.create(
+        rule=rule.pk,
+        trigger_device_serial_id="SN-2",
+        rule_triggered_at=cutoff - timedelta(hours=1),
+    )
+    other_rule = Event.objects.create(
+        rule=rule2.pk,
+        trigger_device_serial_id="SN-1",
+        rule_triggered_at=cutoff - timedelta(hours=1),
+    )
+
+    response = bulk_ack(
+        client,
+        client_token,
+        {"rule_id": rule.pk, "device_serial_id": "SN-1", "before": cutoff.isoformat()},
+    )
+
+    assert response.json()["event_uuids"] == [str(old.event_uuid)]
+    for event in (recent, other_device, other_rule):
+        event.refresh_from_db()
+        assert event.acknowledged is False
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_skips_already_acknowledged(
+    mock_publish, client, client_token, event, event_acked
+):
+    response = bulk_ack(client, client_token, {"rule_id": event.rule})
+
+    assert response.json()["event_uuids"] == [str(event.event_uuid)]
+    assert len(mock_publish.call_args.kwargs["events"]) == 1
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_by_rule_skips_template_events(mock_publish, client, client_token, rule):
+    event = Event.objects.create(rule=rule.pk)
+    template_event = Event.objects.create(rule=rule.pk, is_template=True)
+
+    response = bulk_ack(client, client_token, {"rule_id": rule.pk})
+
+    assert response.json()["event_uuids"] == [str(event.event_uuid)]
+    template_event.refresh_from_db()
+    assert template_event.acknowledged is False
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_runs_a_single_update(mock_publish, client, client_token, rule):
+    for _ in range(5):
+        Event.objects.create(rule=rule.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        bulk_ack(client, client_token, {"rule_id": rule.pk})
+
+    updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "RETURNING" in updates[0]
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_updates_unacknowledged_gauge(mock_publish, client, client_token, rule):
+    for _ in range(3):
+        Event.objects.create(rule=rule.pk)
+    before = events_unacknowledged._value.get()
+
+    bulk_ack(client, client_token, {"rule_id": rule.pk})
+
+    assert events_unacknowledged._value.get() == before - 3
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_is_scoped_to_client_events(
+    mock_publish, client, client_token, admin_token, event, stranger_event
+):
+    body = {"before": (timezone.now() + timedelta(hours=1)).isoformat()}
+
+    response = bulk_ack(client, client_token, body)
+
+    assert response.json()["event_uuids"] == [str(event.event_uuid)]
+    stranger_event.refresh_from_db()
+    assert stranger_event.acknowledged is False
+
+    response = bulk_ack(client, admin_token, body)
+
+    assert response.json()["event_uuids"] == [str(stranger_event.event_uuid)]
+
+
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_is_capped_per_request(mock_publish, client, client_token, rule, settings):
+    settings.EVENTS_BULK_ACK_MAX_ROWS = 2
+    events = [Event.objects.create(rule=rule.pk) for _ in range(3)]
+
+    first = bulk_ack(client, client_token, {"rule_id": rule.pk}).json()
+    second = bulk_ack(client, client_token, {"rule_id": rule.pk}).json()
+
+    assert (first["acknowledged"], first["has_more"]) == (2, True)
+    assert set(first["event_uuids"]) == {str(e.event_uuid) for e in events[:2]}
+    assert (second["acknowledged"], second["has_more"]) == (1, False)
+
+
+@patch('apps.rules.tasks.stream_event_acks')
+@patch('apps.rules.views.event_views.enqueue_audit_events')
+def test_bulk_ack_streams_acknowledgements_in_chunks(
+    mock_publish,
+    stream_mock,
+    client,
+    client_token,
+    rule,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.EVENTS_STREAM_ACK_CHUNK_SIZE = 2
+    events = [Event.objects.create(rule=rule.pk) for _ in range(5)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_ack(client, client_token, {"rule_id": rule.pk})
+
+    chunks = [call.args[0] for call in stream_mock.delay.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert sorted(sum(chunks, [])) == sorted(e.pk for e in events)
+
+
+@patch('apps.rules.tasks.stream_event_acks')
+@patch('apps.rules.admin.enqueue_audit_events')
+def test_admin_ack_action_streams_acknowledgements_in_chunks(
+    mock_publish, stream_mock, admin_user, rule, settings, django_capture_on_commit_callbacks
+):
+    settings.EVENTS_STREAM_ACK_CHUNK_SIZE = 2
+    events = [Event.objects.create(rule=rule.pk) for _ in range(3)]
+    admin_user.is_superuser = True
+    request = RequestFactory().post("/admin/rules/event/")
+    request.user = admin_user
+    model_admin = admin_site._registry[Event]
+
+    with (
+        patch.object(model_admin, "message_user"),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        model_admin.mark_acknowledged(request, Event.objects.all())
+
+    chunks = [call.args[0] for call in stream_mock.delay.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert sorted(sum(chunks, [])) == sorted(e.pk for e in events)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"event_uuids": []},
+        {"event_uuids": ["not-a-uuid"]},
+        {"event_uuids": "abc"},
+        {"rule_id": 0},
+        {"rule_id": "1"},
+        {"device_serial_id": ""},
+        {"before": "yesterday"},
+    ],
+)
+def test_bulk_ack_returns_400_for_invalid_body(client, client_token, body):
+    response = bulk_ack(client, client_token, body)
+    assert response.status_code == 400
+
+
+def test_bulk_ack_returns_400_for_too_many_uuids(client, client_token):
+    body = {"event_uuids": [str(uuid.uuid4()) for _ in range(1001)]}
+    response = bulk_ack(client, client_token, body)
+    assert response.status_code == 400
+    assert "event_uuids" in response.json()["errors"]
+
+
+def test_bulk_ack_returns_401_without_token(client):
+    response = client.post(
+        "/api/events/ack/", data=json.dumps({"rule_id": 1}), content_type="application/json"
+    )
+    assert response.status_code == 401
+
+
+def test_sync_unacknowledged_gauge_corrects_drift(rule):
+    Event.objects.create(rule=rule.pk)
+    Event.objects.create(rule=rule.pk)
+    Event.objects.create(rule=rule.pk, acknowledged=True)
+    events_unacknowledged.set(42)
+
+    assert sync_unacknowledged_gauge() == 2
+    assert events_unacknowledged._value.get() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_gauge_scrape_includes_inserts_from_another_process(tmp_path, monkeypatch):
+    # the event db writer runs in its own container and shares PROMETHEUS_MULTIPROC_DIR with web
+    script = (
+        "import django; django.setup()\n"
+        "from apps.rules.models import Event\n"
+        "from apps.rules.services.event_service import event_bulk_create\n"
+        "event_bulk_create(events=[Event(rule=1), Event(rule=1), Event(rule=1, acknowledged=True)])\n"
+    )
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="conf.settings",
+        DB_NAME=connection.settings_dict["NAME"],
+        PROMETHEUS_MULTIPROC_DIR=str(tmp_path),
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, cwd=settings.BASE_DIR, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    assert Event.objects.count() == 3
+    assert reported_value(events_unacknowledged) == 2
+
+
+def test_prune_expired_events_deletes_old_events_in_batches(rule, settings):
+    settings.EVENTS_RETENTION_DAYS = 30
+    settings.RETENTION_DELETE_BATCH_SIZE = 2
+    old = timezone.now() - timedelta(days=31)
+    for _ in range(3):
+        Event.objects.create(rule=rule.pk, rule_triggered_at=old)
+    recent = Event.objects.create(rule=rule.pk)
+    events_unacknowledged.set(4)
+
+    prune_expired_events()
+
+    assert list(Event.objects.values_list("id", flat=True)) == [recent.id]
+    assert events_unacknowledged._value.get() == 1
+
+
+def test_prune_expired_events_is_disabled_by_zero_retention(rule, settings):
+    settings.EVENTS_RETENTION_DAYS = 0
+    Event.objects.create(rule=rule.pk, rule_triggered_at=timezone.now() - timedelta(days=3650))
+
+    prune_expired_events()
+
+    assert Event.objects.count() == 1
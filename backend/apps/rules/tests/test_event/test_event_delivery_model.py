@@ -3,6 +3,7 @@ import uuid
 from django.utils import timezone
 from datetime import timedelta
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 
 from apps.rules.models.event_delivery import EventDelivery, DeliveryType, Status
 
@@ -242,14 +243,18 @@ def test_event_delivery_verbose_name():
     assert EventDelivery._meta.verbose_name_plural == "Event Deliveries"
 
 
-def test_event_delivery_has_status_index():
-    index_field_sets = [set(idx.fields) for idx in EventDelivery._meta.indexes]
-    assert {"status"} in index_field_sets
+def test_event_delivery_has_partial_due_index():
+    index = next(idx for idx in EventDelivery._meta.indexes if idx.name == "idx_event_deliv_due")
+    assert index.fields == ["next_retry_at"]
+    assert index.condition == Q(status__in=[Status.PENDING, Status.RETRY])
 
 
-def test_event_delivery_has_status_next_retry_at_index():
-    index_field_sets = [set(idx.fields) for idx in EventDelivery._meta.indexes]
-    assert {"status", "next_retry_at"} in index_field_sets
+def test_event_delivery_has_partial_finished_index():
+    index = next(
+        idx for idx in EventDelivery._meta.indexes if idx.name == "idx_event_deliv_finished"
+    )
+    assert index.fields == ["updated_at"]
+    assert index.condition == Q(status__in=[Status.SUCCESS, Status.REJECTED])
 
 
 def test_event_delivery_has_unique_constraint():
@@ -160,7 +160,7 @@ def test_event_verbose_name():
 
 def test_event_has_expected_indexes():
     index_field_sets = [set(idx.fields) for idx in Event._meta.indexes]
-    assert {"rule_triggered_at"} in index_field_sets
+    assert {"rule_triggered_at", "id"} in index_field_sets
     assert {"rule"} in index_field_sets
     assert {"acknowledged"} in index_field_sets
     assert {"trigger_device_serial_id"} in index_field_sets
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import MagicMock, patch
+
+import jwt
+import pytest
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+
+from apps.devices.models import Device, DeviceMetric, Metric
+from apps.rules.consumers.event_stream_handler import EventStreamHandler
+from apps.rules.consumers.event_ws_consumer import EventConsumer
+from apps.rules.models import Event, Rule
+from apps.rules.services.event_stream import (
+    EventStreamHub,
+    event_owners,
+    publish_event_acks,
+    publish_events,
+)
+from apps.users.models import User
+
+
+@pytest.fixture
+def owner(db):
+    return User.objects.create_user(
+        username="stream_owner", email="stream_owner@example.com", password="pass123"
+    )
+
+
+@pytest.fixture
+def stranger(db):
+    return User.objects.create_user(
+        username="stream_other", email="stream_other@example.com", password="pass123"
+    )
+
+
+@pytest.fixture
+def rule(owner):
+    device = Device.objects.create(user=owner, serial_id="ST-DEV-001", name="Stream Device")
+    metric = Metric.objects.create(metric_type="temperature", data_type="numeric")
+    return Rule.objects.create(
+        name="Stream Rule",
+        device_metric=DeviceMetric.objects.create(device=device, metric=metric),
+        condition={"type": "threshold", "operator": ">", "value": 50},
+        action="notify",
+    )
+
+
+@pytest.fixture
+def stranger_device(stranger):
+    return Device.objects.create(user=stranger, serial_id="ST-DEV-002", name="Other Device")
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    with patch("apps.rules.services.event_stream.get_redis_client", return_value=client):
+        yield client
+
+
+def published_points(redis_client):
+    channel, envelope = redis_client.publish.call_args.args
+    assert channel == settings.EVENTS_STREAM_CHANNEL
+    return json.loads(envelope)["points"]
+
+
+def kafka_event(rule, device_serial_id):
+    return {
+        "event_uuid": str(uuid.uuid4()),
+        "rule_triggered_at": "2026-02-04T12:00:00+00:00",
+        "rule_id": rule.pk,
+        "trigger_device_serial_id": device_serial_id,
+        "trigger_context": {"value": 70},
+    }
+
+
+@pytest.mark.django_db
+def test_event_owners_include_device_and_rule_owners(rule, owner, stranger, stranger_device):
+    owners = event_owners(
+        [
+            (rule.pk, "ST-DEV-001", False),
+            (rule.pk, stranger_device.serial_id, False),
+            (None, "UNKNOWN", False),
+        ]
+    )
+
+    assert owners == [
+        frozenset({owner.pk}),
+        frozenset({owner.pk, stranger.pk}),
+        frozenset(),
+    ]
+
+
+@pytest.mark.django_db
+def test_template_events_are_routed_to_device_owner_only(
+    redis_client, rule, owner, stranger, stranger_device
+):
+    # a template event carries a RuleTemplate id that collides with rule.pk
+    item = {**kafka_event(rule, stranger_device.serial_id), "is_template": True}
+    assert publish_events([item]) is True
+    [created] = published_points(redis_client)
+
+    event = Event.objects.create(
+        rule=rule.pk, trigger_device_serial_id=stranger_device.serial_id, is_template=True
+    )
+    assert publish_event_acks([event.pk]) is True
+    [acked] = published_points(redis_client)
+
+    assert created["users"] == [stranger.pk]
+    assert acked["users"] == [stranger.pk]
+
+
+@pytest.mark.django_db
+def test_publish_events_sends_one_envelope_routed_by_owner(
+    redis_client, rule, owner, django_assert_num_queries
+):
+    items = [kafka_event(rule, "ST-DEV-001"), {"event_uuid": "missing-rule"}]
+
+    with django_assert_num_queries(2):
+        assert publish_events(items) is True
+
+    redis_client.publish.assert_called_once()
+    [point] = published_points(redis_client)
+    frame = json.loads(point["frame"])
+    assert point["users"] == [owner.pk]
+    assert frame["type"] == "event.created"
+    assert frame["data"]["event_uuid"] == items[0]["event_uuid"]
+    assert frame["data"]["rule"] == rule.pk
+    assert frame["data"]["acknowledged"] is False
+
+
+@pytest.mark.django_db
+def test_publish_event_acks_groups_events_by_owners(
+    redis_client, rule, owner, stranger, stranger_device
+):
+    own = [
+        Event.objects.create(rule=rule.pk, trigger_device_serial_id="ST-DEV-001") for _ in range(2)
+    ]
+    shared = Event.objects.create(rule=rule.pk, trigger_device_serial_id="ST-DEV-002")
+
+    assert publish_event_acks([e.pk for e in own] + [shared.pk]) is True
+
+    points = {tuple(p["users"]): json.loads(p["frame"]) for p in published_points(redis_client)}
+    assert set(points) == {(owner.pk,), tuple(sorted([owner.pk, stranger.pk]))}
+    assert points[(owner.pk,)]["type"] == "event.acknowledged"
+    assert sorted(points[(owner.pk,)]["data"]["event_uuids"]) == sorted(
+        str(e.event_uuid) for e in own
+    )
+
+
+def test_handler_raises_when_publish_fails():
+    with patch(
+        "apps.rules.consumers.event_stream_handler.publish_events", return_value=False
+    ) as publish_mock:
+        with pytest.raises(RuntimeError):
+            EventStreamHandler().handle([{"event_uuid": "a"}, "not an event"])
+
+    publish_mock.assert_called_once_with([{"event_uuid": "a"}])
+
+
+@pytest.fixture
+def hub():
+    hub = EventStreamHub(channel="events.stream.test")
+    hub._read = lambda: asyncio.sleep(0)
+    with patch("apps.rules.consumers.event_ws_consumer.get_event_stream_hub", return_value=hub):
+        yield hub
+
+
+def communicator(user, role):
+    comm = WebsocketCommunicator(EventConsumer.as_asgi(), "/ws/events/stream/")
+    comm.scope["user"] = user
+    comm.scope["role"] = role
+    return comm
+
+
+@pytest.mark.django_db
+def test_sockets_receive_own_events_and_admins_all(hub, owner, stranger):
+    frames = [json.dumps({"type": "event.created", "n": n}) for n in range(3)]
+
+    async def scenario():
+        own, other, admin = (
+            communicator(owner, "client"),
+            communicator(stranger, "client"),
+            communicator(stranger, "admin"),
+        )
+        for comm in (own, other, admin):
+            connected, _ = await comm.connect()
+            assert connected
+        await hub.dispatch(
+            [
+                {"users": [owner.pk], "frame": frames[0]},
+                {"users": [owner.pk, stranger.pk], "frame": frames[1]},
+                {"users": [], "frame": frames[2]},
+            ]
+        )
+        received = {
+            "own": [await own.receive_json_from() for _ in range(2)],
+            "other": [await other.receive_json_from()],
+            "admin": [await admin.receive_json_from() for _ in range(3)],
+        }
+        nothing_else = await own.receive_nothing() and await other.receive_nothing()
+        for comm in (own, other, admin):
+            await comm.disconnect()
+        return received, nothing_else
+
+    received, nothing_else = asyncio.run(scenario())
+
+    assert [f["n"] for f in received["own"]] == [0, 1]
+    assert [f["n"] for f in received["other"]] == [1]
+    assert [f["n"] for f in received["admin"]] == [0, 1, 2]
+    assert nothing_else
+    assert hub.subscriber_count == 0
+
+
+@pytest.mark.parametrize("role, code", [(None, 4403), ("client", 4401)])
+def test_unauthorized_sockets_are_closed(hub, role, code):
+    user = AnonymousUser() if code == 4401 else MagicMock(is_authenticated=True)
+
+    async def scenario():
+        return await communicator(user, role).connect()
+
+    assert asyncio.run(scenario()) == (False, code)
+
+
+@pytest.mark.django_db
+def test_ack_pushes_acknowledgement_after_commit(
+    client, rule, owner, django_capture_on_commit_callbacks
+):
+    event = Event.objects.create(rule=rule.pk, trigger_device_serial_id="ST-DEV-001")
+    token = jwt.encode({"sub": owner.pk, "role": "client"}, settings.SECRET_KEY, algorithm="HS256")
+
+    with patch("apps.rules.tasks.stream_event_acks.delay") as delay_mock:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                f"/api/events/{event.event_uuid}/ack/", HTTP_AUTHORIZATION=f"Bearer {token}"
+            )
+        assert response.status_code == 200
+        delay_mock.assert_called_once_with([event.pk])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                "/api/events/ack/",
+                data=json.dumps({"event_uuids": [str(event.event_uuid)]}),
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+        # already acknowledged: nothing changed, nothing pushed
+        delay_mock.assert_called_once()
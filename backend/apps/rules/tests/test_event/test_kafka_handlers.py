@@ -24,9 +24,11 @@ pytestmark = pytest.mark.django_db
 def _disable_audit_publish():
     with (
         patch("apps.rules.consumers.event_notification_handler.publish_audit_event"),
+        patch("apps.rules.consumers.event_notification_handler.publish_audit_events"),
         patch("apps.rules.consumers.event_db_handler.publish_audit_event"),
+        patch("apps.rules.consumers.event_db_handler.publish_audit_events") as publish_batch,
     ):
-        yield
+        yield publish_batch
 
 
 # ============================================================================
@@ -175,6 +177,52 @@ def test_event_db_handler_is_idempotent_for_duplicate_uuid(valid_db_payload):
     assert Event.objects.filter(event_uuid=valid_db_payload["event_uuid"]).count() == 1
 
 
+def test_event_db_handler_batch_audits_only_created_events(
+    valid_db_payload, _disable_audit_publish
+):
+    """A batch with an existing and an in-batch duplicate uuid audits only new rows, once."""
+    EventDBHandler().handle(valid_db_payload)
+    new_payload = {**valid_db_payload, "event_uuid": str(uuid.uuid4())}
+
+    EventDBHandler().handle([valid_db_payload, new_payload, new_payload])
+
+    assert Event.objects.count() == 2
+    _disable_audit_publish.assert_called_once()
+    records = _disable_audit_publish.call_args.kwargs["events"]
+    assert [r.details["after"]["event_uuid"] for r in records] == [new_payload["event_uuid"]]
+
+
+def test_event_db_handler_batch_skips_invalid_items(valid_db_payload):
+    """Invalid items are dropped without failing the rest of the batch."""
+    bad_uuid = {**valid_db_payload, "event_uuid": "not-a-uuid"}
+    missing_key = {"event_uuid": str(uuid.uuid4())}
+    bad_rule = {**valid_db_payload, "event_uuid": str(uuid.uuid4()), "rule_id": "abc"}
+
+    EventDBHandler().handle([bad_uuid, missing_key, bad_rule, valid_db_payload])
+
+    assert list(Event.objects.values_list("event_uuid", flat=True)) == [
+        uuid.UUID(valid_db_payload["event_uuid"])
+    ]
+
+
+def test_event_db_handler_batch_uses_single_insert(valid_db_payload, django_assert_num_queries):
+    payloads = [{**valid_db_payload, "event_uuid": str(uuid.uuid4())} for _ in range(20)]
+
+    with django_assert_num_queries(1):
+        EventDBHandler().handle(payloads)
+
+    assert Event.objects.count() == 20
+
+
+def test_event_db_handler_batch_raises_on_database_error(valid_db_payload):
+    with patch(
+        "apps.rules.consumers.event_db_handler.event_bulk_create",
+        side_effect=DatabaseError("db down"),
+    ):
+        with pytest.raises(DatabaseError):
+            EventDBHandler().handle([valid_db_payload])
+
+
 # ============================================================================
 # EventDBHandler — Poison Pill protection (negative paths)
 # ============================================================================
@@ -396,6 +444,75 @@ def test_notification_handler_on_commit_dispatches_two_tasks_for_both_channels(
     assert mock_task.delay.call_count == 2
 
 
+# ============================================================================
+# EventNotificationHandler — batch path
+# ============================================================================
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_handler_batch_dispatches_one_group(
+    webhook_only_payload, both_channels_payload
+):
+    """A batch creates all deliveries and enqueues them with a single grouped Celery call."""
+    with (
+        patch('apps.rules.consumers.event_notification_handler.process_delivery_task') as task,
+        patch('apps.rules.consumers.event_notification_handler.group') as mock_group,
+    ):
+        EventNotificationHandler().handle([webhook_only_payload, both_channels_payload])
+
+    delivery_ids = set(EventDelivery.objects.values_list("id", flat=True))
+    assert len(delivery_ids) == 3
+    mock_group.return_value.apply_async.assert_called_once()
+    assert {c.args[0] for c in task.s.call_args_list} == delivery_ids
+    task.delay.assert_not_called()
+
+
+def test_notification_handler_batch_skips_existing_deliveries(webhook_only_payload):
+    """Deliveries that already exist are neither re-created nor audited."""
+    with patch('apps.rules.consumers.event_notification_handler.process_delivery_task'):
+        EventNotificationHandler().handle(webhook_only_payload)
+
+    with patch(
+        'apps.rules.consumers.event_notification_handler.publish_audit_events'
+    ) as publish_batch:
+        EventNotificationHandler().handle([webhook_only_payload, webhook_only_payload])
+
+    assert EventDelivery.objects.count() == 1
+    publish_batch.assert_not_called()
+
+
+def test_notification_handler_batch_audits_created_deliveries(both_channels_payload):
+    with patch(
+        'apps.rules.consumers.event_notification_handler.publish_audit_events'
+    ) as publish_batch:
+        EventNotificationHandler().handle([both_channels_payload])
+
+    records = publish_batch.call_args.kwargs["events"]
+    assert sorted(r.details["delivery_type"] for r in records) == ["notification", "webhook"]
+
+
+def test_notification_handler_batch_skips_invalid_items(webhook_only_payload):
+    bad_uuid = {**webhook_only_payload, "event_uuid": "not-a-uuid"}
+
+    EventNotificationHandler().handle([{"wrong": "data"}, bad_uuid, webhook_only_payload])
+
+    assert list(EventDelivery.objects.values_list("event_uuid", flat=True)) == [
+        uuid.UUID(webhook_only_payload["event_uuid"])
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_handler_batch_rolls_back_on_database_error(webhook_only_payload):
+    with patch(
+        'apps.rules.consumers.event_notification_handler.bulk_insert_ignore_conflicts',
+        side_effect=DatabaseError("db down"),
+    ):
+        with pytest.raises(DatabaseError):
+            EventNotificationHandler().handle([webhook_only_payload])
+
+    assert EventDelivery.objects.count() == 0
+
+
 # ============================================================================
 # EventNotificationHandler — Poison Pill protection
 # ============================================================================
@@ -0,0 +1,84 @@
+import jwt
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.devices.models import Device, DeviceMetric, Metric
+from apps.rules.models import Rule
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="rule_owner", email="rule_owner@example.com", password="pass123", role="client"
+    )
+
+
+@pytest.fixture
+def token(owner):
+    return jwt.encode({"sub": owner.id, "role": "client"}, settings.SECRET_KEY, algorithm="HS256")
+
+
+@pytest.fixture
+def device_metric(owner):
+    device = Device.objects.create(user=owner, serial_id="RULE-DEV-001", name="Rule Device")
+    metric = Metric.objects.create(metric_type="temperature", data_type="numeric")
+    return DeviceMetric.objects.create(device=device, metric=metric)
+
+
+def make_rules(device_metric, count):
+    start = Rule.objects.count()
+    return [
+        Rule.objects.create(
+            name=f"Rule {i}",
+            device_metric=device_metric,
+            condition={"type": "threshold", "operator": ">", "value": i},
+            action={},
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def list_rules(client, token, query=""):
+    return client.get(f"/api/rules/{query}", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def test_rule_list_query_count_does_not_grow_with_page_size(client, token, device_metric):
+    make_rules(device_metric, 2)
+    # the first request also loads the JWT principal into the auth cache
+    list_rules(client, token)
+    with CaptureQueriesContext(connection) as small:
+        list_rules(client, token)
+
+    make_rules(device_metric, 8)
+    with CaptureQueriesContext(connection) as large:
+        response = list_rules(client, token)
+
+    assert len(response.json()["items"]) == 10
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+def test_rule_list_cursor_walks_all_rules(client, token, device_metric):
+    rules = make_rules(device_metric, 5)
+
+    seen, cursor = [], None
+    while True:
+        data = list_rules(
+            client, token, "?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        ).json()
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [rule.id for rule in rules]
+    assert data["total"] == 5
+
+
+def test_rule_list_rejects_invalid_cursor(client, token):
+    response = list_rules(client, token, "?cursor=bm90LWpzb24")
+    assert response.status_code == 400
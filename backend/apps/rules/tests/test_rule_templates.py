@@ -0,0 +1,202 @@
+import pytest
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import caches
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.users.models import User
+from apps.devices.models import Device, Metric, DeviceMetric, Telemetry
+from apps.rules.models import Rule, RuleTemplate
+from apps.rules.services.action import Action
+from apps.rules.services.rule_processor import RuleProcessor, template_index_cache_key
+from apps.rules.utils.rule_engine_utils import PostgresTelemetryRepository
+
+pytestmark = pytest.mark.django_db
+
+THRESHOLD_80 = {"type": "threshold", "operator": ">", "value": 80}
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def force_postgres_repository():
+    with patch(
+        "apps.rules.services.rule_processor.choose_repository",
+        return_value=PostgresTelemetryRepository(),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def locmem_rules_cache():
+    caches_config = {k: v for k, v in settings.CACHES.items() if k != "rules"}
+    caches_config["rules"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    with override_settings(CACHES=caches_config):
+        caches["rules"].clear()
+        yield
+
+
+@pytest.fixture
+def mock_action():
+    with patch.object(Action, "dispatch_action") as mock:
+        yield mock
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create(username="owner", email="owner@example.com", password="123")
+
+
+@pytest.fixture
+def other_owner():
+    return User.objects.create(username="other", email="other@example.com", password="123")
+
+
+@pytest.fixture
+def temperature():
+    return Metric.objects.create(metric_type="temperature", data_type="numeric")
+
+
+@pytest.fixture
+def humidity():
+    return Metric.objects.create(metric_type="humidity", data_type="numeric")
+
+
+def make_device_metric(user, serial_id, metric):
+    device = Device.objects.create(user=user, serial_id=serial_id, name=serial_id)
+    return DeviceMetric.objects.create(device=device, metric=metric)
+
+
+def make_telemetry(device_metric, value):
+    return Telemetry.objects.create(
+        device_metric=device_metric,
+        value_jsonb={"t": "numeric", "v": value},
+        ts=timezone.now(),
+    )
+
+
+@pytest.fixture
+def fleet_template(temperature):
+    return RuleTemplate.objects.create(
+        name="Fleet overheat",
+        metric=temperature,
+        condition=THRESHOLD_80,
+        action={"severity": "critical"},
+    )
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_template_triggers_for_every_device_of_metric(
+    owner, other_owner, temperature, fleet_template, mock_action
+):
+    dm_a = make_device_metric(owner, "thermo-a", temperature)
+    dm_b = make_device_metric(other_owner, "thermo-b", temperature)
+
+    result_a = RuleProcessor.run(make_telemetry(dm_a, 95))
+    result_b = RuleProcessor.run(make_telemetry(dm_b, 95))
+
+    assert result_a["results"] == [{"rule_template_id": fleet_template.id, "triggered": True}]
+    assert result_b["results"] == [{"rule_template_id": fleet_template.id, "triggered": True}]
+    assert mock_action.call_count == 2
+    assert mock_action.call_args.args[0] == fleet_template
+
+
+def test_template_ignores_other_metrics(owner, humidity, fleet_template, mock_action):
+    dm = make_device_metric(owner, "hygro-1", humidity)
+
+    result = RuleProcessor.run(make_telemetry(dm, 95))
+
+    assert result["results"] == []
+    mock_action.assert_not_called()
+
+
+def test_template_filtered_by_device_owner(owner, other_owner, temperature, mock_action):
+    RuleTemplate.objects.create(
+        name="Owner only", metric=temperature, user=owner, condition=THRESHOLD_80, action={}
+    )
+    own = make_device_metric(owner, "own-1", temperature)
+    foreign = make_device_metric(other_owner, "foreign-1", temperature)
+
+    RuleProcessor.run(make_telemetry(foreign, 95))
+    mock_action.assert_not_called()
+
+    RuleProcessor.run(make_telemetry(own, 95))
+    mock_action.assert_called_once()
+
+
+def test_device_rule_overrides_template(owner, temperature, fleet_template, mock_action):
+    dm = make_device_metric(owner, "thermo-override", temperature)
+    override = Rule.objects.create(
+        name="Hotter threshold",
+        device_metric=dm,
+        template=fleet_template,
+        condition={"type": "threshold", "operator": ">", "value": 100},
+        action={},
+    )
+
+    result = RuleProcessor.run(make_telemetry(dm, 95))
+
+    assert result["results"] == [{"rule_id": override.id, "triggered": False}]
+    mock_action.assert_not_called()
+
+
+def test_inactive_override_disables_template(owner, temperature, fleet_template, mock_action):
+    dm = make_device_metric(owner, "thermo-off", temperature)
+    RuleProcessor.run(make_telemetry(dm, 95))  # warm up cache
+    assert mock_action.call_count == 1
+
+    Rule.objects.create(
+        name="Disabled",
+        device_metric=dm,
+        template=fleet_template,
+        condition=THRESHOLD_80,
+        action={},
+        is_active=False,
+    )
+    result = RuleProcessor.run(make_telemetry(dm, 95))
+
+    assert result["results"] == []
+    assert mock_action.call_count == 1
+
+
+def test_template_index_cached_per_metric(owner, temperature, fleet_template, mock_action):
+    for i in range(3):
+        RuleProcessor.run(make_telemetry(make_device_metric(owner, f"t-{i}", temperature), 95))
+
+    cached = caches["rules"].get(template_index_cache_key(temperature.id))
+    assert [t.id for t in cached] == [fleet_template.id]
+
+
+def test_template_change_invalidates_index(owner, temperature, fleet_template, mock_action):
+    dm = make_device_metric(owner, "thermo-inv", temperature)
+    RuleProcessor.run(make_telemetry(dm, 95))  # warm up cache
+
+    fleet_template.is_active = False
+    fleet_template.save()
+    result = RuleProcessor.run(make_telemetry(dm, 95))
+
+    assert result["results"] == []
+    assert caches["rules"].get(template_index_cache_key(temperature.id)) == []
+
+
+def test_dispatch_marks_template_events():
+    template = RuleTemplate(id=7, name="tpl", condition=THRESHOLD_80, action={})
+    telemetry = type(
+        "T", (), {"device_serial_id": "s", "device_metric_id": 1, "value": 1.0, "ts": None}
+    )()
+    telemetry.timestamp = timezone.now()
+
+    with patch("apps.rules.services.action.get_producer") as get_producer:
+        Action.dispatch_action(template, telemetry)
+
+    payload = get_producer.return_value.produce.call_args.kwargs["payload"]
+    assert payload["rule_id"] == 7
+    assert payload["is_template"] is True
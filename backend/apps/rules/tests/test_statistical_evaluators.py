@@ -0,0 +1,236 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+from django.core.exceptions import ValidationError
+
+from apps.rules.services.condition_evaluator import ConditionEvaluator, EvaluationContext
+from apps.rules.utils.quantile_sketch import QuantileSketch
+from apps.rules.utils.rule_engine_utils import SeriesStateStore, TelemetryEvent
+from apps.rules.validators.rule_validator import validate_condition
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@pytest.fixture
+def store():
+    return SeriesStateStore(fakeredis.FakeRedis(decode_responses=True), ttl_seconds=60)
+
+
+def feed(
+    store, condition, values, step_seconds=60, device_metric_id=1, rule_id=1, is_template=False
+):
+    """Evaluate `condition` for each value in order and return the trigger flags."""
+    results = []
+    for i, value in enumerate(values):
+        telemetry = TelemetryEvent(
+            device_serial_id="dev",
+            value=value,
+            timestamp=START + timedelta(seconds=i * step_seconds),
+            device_metric_id=device_metric_id,
+        )
+        context = EvaluationContext(
+            telemetry=telemetry,
+            telemetries_in_window=[],
+            state_store=store,
+            rule_id=rule_id,
+            is_template=is_template,
+        )
+        results.append(ConditionEvaluator.evaluate(condition, context))
+    return results
+
+
+# ============================================================================
+# Evaluators
+# ============================================================================
+
+
+def test_ewma_triggers_on_spike_after_warm_up(store):
+    condition = {"type": "ewma", "operator": ">", "value": 10, "alpha": 0.5, "min_samples": 3}
+
+    results = feed(store, condition, [20, 21, 20, 21, 45])
+
+    assert results == [False, False, False, False, True]
+
+
+def test_ewma_does_not_trigger_during_warm_up(store):
+    condition = {"type": "ewma", "operator": ">", "value": 10, "min_samples": 5}
+
+    assert feed(store, condition, [20, 90]) == [False, False]
+
+
+def test_zscore_flags_outlier(store):
+    condition = {"type": "zscore", "operator": ">", "value": 3, "alpha": 0.1}
+    values = [50 + (i % 3) for i in range(30)] + [80]
+
+    results = feed(store, condition, values)
+
+    assert not any(results[:-1])
+    assert results[-1] is True
+
+
+def test_rate_of_change_scales_to_per_seconds(store):
+    condition = {"type": "rate_of_change", "operator": ">", "value": 5, "per_seconds": 60}
+
+    # +3/min then +10/min with samples 60s apart
+    assert feed(store, condition, [10, 13, 23]) == [False, False, True]
+
+
+def test_rate_of_change_detects_drop(store):
+    condition = {"type": "rate_of_change", "operator": "<", "value": -5}
+
+    assert feed(store, condition, [100, 99, 80]) == [False, False, True]
+
+
+def test_quantile_flags_values_above_p99(store):
+    condition = {"type": "quantile", "operator": ">", "quantile": 0.99, "min_samples": 50}
+    rng = random.Random(7)
+    values = [rng.uniform(0, 100) for _ in range(200)] + [150, 50]
+
+    results = feed(store, condition, values)
+
+    assert results[-2:] == [True, False]
+
+
+def test_state_is_skipped_for_already_processed_timestamp(store):
+    condition = {"type": "ewma", "operator": ">", "value": 1, "min_samples": 1}
+    feed(store, condition, [10, 10])
+
+    # replay of the first timestamp with a large value must not update or trigger
+    assert feed(store, condition, [1000]) == [False]
+    key = store.key(condition, 1, rule_id=1)
+    assert store.load(key)[1:] == [2, 10]
+
+
+def test_state_is_kept_per_series_and_condition(store):
+    strict = {"type": "ewma", "operator": ">", "value": 1, "min_samples": 1}
+    loose = {"type": "ewma", "operator": ">", "value": 100, "min_samples": 1}
+
+    feed(store, strict, [10, 20], device_metric_id=1)
+    feed(store, loose, [10], device_metric_id=1)
+    feed(store, strict, [10], device_metric_id=2)
+
+    assert store.load(store.key(strict, 1, rule_id=1))[1] == 2
+    assert store.load(store.key(loose, 1, rule_id=1))[1] == 1
+    assert store.load(store.key(strict, 2, rule_id=1))[1] == 1
+
+
+def test_state_is_kept_per_rule_and_template(store):
+    condition = {"type": "rate_of_change", "operator": ">", "value": 5}
+
+    # identical conditions on the same series must each see every sample
+    assert feed(store, condition, [10, 30], rule_id=1) == [False, True]
+    assert feed(store, condition, [10, 30], rule_id=2) == [False, True]
+    assert feed(store, condition, [10, 30], rule_id=1, is_template=True) == [False, True]
+
+    assert store.key(condition, 1, rule_id=1) != store.key(
+        condition, 1, rule_id=1, is_template=True
+    )
+
+
+def test_state_update_is_retried_after_concurrent_write(store):
+    key = "rules:state:test"
+    store.save(key, [1, 1])
+    seen = []
+
+    def apply(stored):
+        seen.append(stored)
+        if len(seen) == 1:
+            # another worker commits between our read and write
+            store.redis.set(key, "[2, 5]")
+        return "done", [3, stored[1] + 1]
+
+    assert store.update(key, apply) == "done"
+    assert seen == [[1, 1], [2, 5]]
+    assert store.load(key) == [3, 6]
+
+
+def test_state_update_without_new_state_leaves_key(store):
+    key = "rules:state:test"
+    store.save(key, [1, 1])
+
+    assert store.update(key, lambda stored: (False, None)) is False
+    assert store.load(key) == [1, 1]
+
+
+def test_non_numeric_values_do_not_trigger(store):
+    condition = {"type": "zscore", "operator": ">", "value": 0, "min_samples": 1}
+
+    assert feed(store, condition, [True, "on"]) == [False, False]
+
+
+def test_stateful_rule_without_store_does_not_trigger():
+    telemetry = TelemetryEvent("dev", 1.0, START, 1)
+    context = EvaluationContext(telemetry=telemetry, telemetries_in_window=[])
+
+    assert (
+        ConditionEvaluator.evaluate({"type": "ewma", "operator": ">", "value": 0}, context)
+        is False
+    )
+
+
+# ============================================================================
+# Sketch
+# ============================================================================
+
+
+def test_sketch_is_bounded_and_accurate():
+    sketch = QuantileSketch(compression=50)
+    for value in range(10_000):
+        sketch.add(value)
+
+    assert len(sketch.centroids) <= 100
+    assert sketch.quantile(0.5) == pytest.approx(5000, rel=0.02)
+    assert sketch.quantile(0.99) == pytest.approx(9900, rel=0.01)
+
+
+def test_sketch_roundtrip_and_merge():
+    left, right = QuantileSketch(), QuantileSketch()
+    for value in range(500):
+        left.add(value)
+        right.add(value + 500)
+
+    restored = QuantileSketch.from_list(left.to_list())
+    restored.merge(right)
+
+    assert restored.count == 1000
+    assert restored.quantile(0.5) == pytest.approx(500, rel=0.05)
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"type": "ewma", "operator": ">", "value": 5, "alpha": 0.2},
+        {"type": "zscore", "operator": ">=", "value": 3, "min_samples": 20},
+        {"type": "rate_of_change", "operator": "<", "value": -1, "per_seconds": 1},
+        {"type": "quantile", "operator": ">", "quantile": 0.95, "compression": 100},
+    ],
+)
+def test_statistical_conditions_are_valid(condition):
+    validate_condition(condition)
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"type": "ewma", "operator": ">", "value": 5, "alpha": 1.5},
+        {"type": "zscore", "operator": "==", "value": 3},
+        {"type": "rate_of_change", "operator": ">", "value": 1, "per_seconds": 0},
+        {"type": "quantile", "operator": ">", "quantile": 1},
+        {"type": "quantile", "operator": ">"},
+    ],
+)
+def test_invalid_statistical_conditions_are_rejected(condition):
+    with pytest.raises(ValidationError):
+        validate_condition(condition)
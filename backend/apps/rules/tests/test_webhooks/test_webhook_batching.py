@@ -0,0 +1,246 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ValidationError
+
+from apps.rules.consumers.event_notification_handler import EventNotificationHandler
+from apps.rules.models.event_delivery import DeliveryType, EventDelivery, Status
+from apps.rules.tasks import process_delivery_task
+from apps.rules.validators.rule_validator import validate_action
+from apps.rules.webhooks.circuit_breaker import CircuitBreaker
+from apps.rules.webhooks.http_client import AsyncWebhookClient
+from apps.rules.webhooks.worker import WebhookDeliveryWorker
+
+pytestmark = pytest.mark.django_db
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def _disable_audit_publish():
+    with (
+        patch('apps.rules.webhooks.worker.publish_audit_events'),
+        patch('apps.rules.tasks.enqueue_audit_event'),
+        patch('apps.rules.tasks.enqueue_audit_events'),
+    ):
+        yield
+
+
+def make_delivery(url, max_batch=None, max_wait_ms=0, **kwargs):
+    payload = {'url': url, 'enabled': True}
+    if max_batch is not None:
+        payload.update(max_batch=max_batch, max_wait_ms=max_wait_ms)
+    defaults = dict(
+        event_uuid=uuid.uuid4(),
+        rule_id=1,
+        trigger_device_serial_id='DEV-001',
+        delivery_type=DeliveryType.WEBHOOK,
+        payload=payload,
+    )
+    defaults.update(kwargs)
+    return EventDelivery.objects.create(**defaults)
+
+
+def run_batch(batch_size=100):
+    worker = WebhookDeliveryWorker(
+        client=AsyncWebhookClient(max_connections_per_host=2),
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+        batch_size=batch_size,
+        timeout=5,
+    )
+
+    async def _run():
+        try:
+            return await worker.run_batch()
+        finally:
+            await worker.client.close()
+
+    return async_to_sync(_run)()
+
+
+def statuses(deliveries):
+    return {EventDelivery.objects.get(id=delivery.id).status for delivery in deliveries}
+
+
+# ============================================================================
+# Async worker
+# ============================================================================
+
+
+def test_worker_coalesces_deliveries_to_same_url(stub_server):
+    deliveries = [make_delivery(stub_server.url(), max_batch=3) for _ in range(7)]
+
+    assert run_batch() == 7
+
+    sizes = sorted(len(body) for _, body in stub_server.received)
+    assert sizes == [1, 3, 3]
+    sent = {item['event_uuid'] for _, body in stub_server.received for item in body}
+    assert sent == {str(delivery.event_uuid) for delivery in deliveries}
+    assert statuses(deliveries) == {Status.SUCCESS}
+
+
+def test_worker_holds_partial_batch_until_max_wait(stub_server):
+    deliveries = [
+        make_delivery(stub_server.url(), max_batch=5, max_wait_ms=60_000) for _ in range(3)
+    ]
+
+    assert run_batch() == 0
+    assert stub_server.received == []
+    assert statuses(deliveries) == {Status.PENDING}
+
+    deliveries += [
+        make_delivery(stub_server.url(), max_batch=5, max_wait_ms=60_000) for _ in range(2)
+    ]
+
+    assert run_batch() == 5
+    assert len(stub_server.received) == 1
+    assert statuses(deliveries) == {Status.SUCCESS}
+
+
+def test_held_back_deliveries_do_not_take_up_the_claim_window(stub_server):
+    held = [
+        make_delivery(stub_server.url('/batched'), max_batch=10, max_wait_ms=60_000)
+        for _ in range(3)
+    ]
+    plain = make_delivery(stub_server.url('/plain'))
+    same_url = make_delivery(stub_server.url('/batched'))
+
+    assert run_batch(batch_size=2) == 2
+
+    assert sorted(path for path, _ in stub_server.received) == ['/batched', '/plain']
+    assert statuses([plain, same_url]) == {Status.SUCCESS}
+    assert statuses(held) == {Status.PENDING}
+
+
+def test_batch_larger_than_claim_window_is_sent_once_full(stub_server):
+    deliveries = [
+        make_delivery(stub_server.url(), max_batch=4, max_wait_ms=60_000) for _ in range(3)
+    ]
+
+    assert run_batch(batch_size=2) == 0
+
+    deliveries.append(make_delivery(stub_server.url(), max_batch=4, max_wait_ms=60_000))
+
+    assert run_batch(batch_size=2) == 4
+    assert [len(body) for _, body in stub_server.received] == [4]
+    assert statuses(deliveries) == {Status.SUCCESS}
+
+
+def test_worker_records_batch_failure_on_every_delivery(stub_server):
+    stub_server.status = 503
+    deliveries = [make_delivery(stub_server.url(), max_batch=10) for _ in range(4)]
+
+    run_batch()
+
+    assert len(stub_server.received) == 1
+    for delivery in deliveries:
+        delivery.refresh_from_db()
+        assert delivery.status == Status.RETRY
+        assert delivery.attempts == 1
+        assert delivery.response_status == 503
+
+
+def test_worker_does_not_coalesce_deliveries_without_batching(stub_server):
+    deliveries = [make_delivery(stub_server.url()) for _ in range(3)]
+
+    run_batch()
+
+    assert len(stub_server.received) == 3
+    assert all(isinstance(body, dict) for _, body in stub_server.received)
+    assert statuses(deliveries) == {Status.SUCCESS}
+
+
+# ============================================================================
+# Celery path
+# ============================================================================
+
+
+def test_celery_task_sends_due_siblings_in_one_request():
+    url = 'https://example.com/hook'
+    first, *siblings = [make_delivery(url, max_batch=3) for _ in range(4)]
+
+    with patch('apps.rules.tasks.requests.post') as mock_post:
+        mock_post.return_value = MagicMock(status_code=200)
+        process_delivery_task(first.id)
+
+    mock_post.assert_called_once()
+    body = mock_post.call_args.kwargs['json']
+    assert [item['event_uuid'] for item in body] == [
+        str(delivery.event_uuid) for delivery in [first, *siblings[:2]]
+    ]
+    assert statuses([first, *siblings[:2]]) == {Status.SUCCESS}
+    assert statuses(siblings[2:]) == {Status.PENDING}
+
+
+def test_celery_task_records_batch_failure_on_siblings():
+    url = 'https://example.com/hook'
+    first, sibling = make_delivery(url, max_batch=5), make_delivery(url, max_batch=5)
+    response = MagicMock(status_code=500)
+    response.raise_for_status.side_effect = requests.HTTPError('500 Server Error')
+
+    with patch('apps.rules.tasks.requests.post', return_value=response):
+        process_delivery_task(first.id)
+
+    sibling.refresh_from_db()
+    assert sibling.status == Status.RETRY
+    assert sibling.attempts == 1
+    assert sibling.response_status == 500
+    assert sibling.next_retry_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batched_webhook_dispatch_is_delayed_by_max_wait():
+    payload = {
+        'event_uuid': str(uuid.uuid4()),
+        'rule_id': 1,
+        'trigger_device_serial_id': 'DEV-001',
+        'action': {
+            'webhook': {
+                'url': 'https://example.com/hook',
+                'enabled': True,
+                'max_batch': 50,
+                'max_wait_ms': 250,
+            }
+        },
+    }
+
+    with (
+        patch('apps.rules.consumers.event_notification_handler.process_delivery_task') as task,
+        patch('apps.rules.consumers.event_notification_handler.publish_audit_event'),
+    ):
+        EventNotificationHandler().handle(payload)
+
+    task.apply_async.assert_called_once()
+    assert task.apply_async.call_args.kwargs['countdown'] == 0.25
+    task.delay.assert_not_called()
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+
+def test_batching_fields_are_valid():
+    validate_action({'webhook': {'url': 'https://example.com', 'enabled': True, 'max_batch': 100}})
+
+
+@pytest.mark.parametrize(
+    'fields',
+    [
+        {'max_batch': 0},
+        {'max_batch': 1001},
+        {'max_batch': '10'},
+        {'max_batch': True},
+        {'max_batch': 10, 'max_wait_ms': -1},
+        {'max_batch': 10, 'max_wait_ms': 1.5},
+    ],
+)
+def test_invalid_batching_fields_are_rejected(fields):
+    with pytest.raises(ValidationError):
+        validate_action({'webhook': {'url': 'https://example.com', 'enabled': True, **fields}})
@@ -0,0 +1,191 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from apps.rules.models.event_delivery import DeliveryType, EventDelivery, Status
+from apps.rules.webhooks.circuit_breaker import CircuitBreaker
+from apps.rules.webhooks.http_client import AsyncWebhookClient
+from apps.rules.webhooks.worker import WebhookDeliveryWorker
+
+pytestmark = pytest.mark.django_db
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def _disable_audit_publish():
+    with patch('apps.rules.webhooks.worker.publish_audit_events') as mock_publish:
+        yield mock_publish
+
+
+def make_delivery(url, **kwargs):
+    defaults = dict(
+        event_uuid=uuid.uuid4(),
+        rule_id=1,
+        trigger_device_serial_id='DEV-001',
+        delivery_type=DeliveryType.WEBHOOK,
+        payload={'url': url},
+    )
+    defaults.update(kwargs)
+    return EventDelivery.objects.create(**defaults)
+
+
+def make_worker(**kwargs):
+    defaults = dict(
+        client=AsyncWebhookClient(max_connections_per_host=2),
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+        batch_size=100,
+        timeout=5,
+    )
+    defaults.update(kwargs)
+    return WebhookDeliveryWorker(**defaults)
+
+
+def run_batch(worker):
+    async def _run():
+        try:
+            return await worker.run_batch()
+        finally:
+            await worker.client.close()
+
+    return async_to_sync(_run)()
+
+
+# ============================================================================
+# Delivery
+# ============================================================================
+
+
+def test_successful_deliveries_reuse_pooled_connections(stub_server):
+    deliveries = [make_delivery(stub_server.url()) for _ in range(20)]
+
+    assert run_batch(make_worker()) == 20
+
+    assert len(stub_server.received) == 20
+    assert stub_server.connections <= 2
+    for delivery in deliveries:
+        delivery.refresh_from_db()
+        assert delivery.status == Status.SUCCESS
+        assert delivery.attempts == 1
+        assert delivery.response_status == 200
+
+
+def test_webhook_body_matches_celery_path(stub_server):
+    delivery = make_delivery(stub_server.url('/hook?token=1'))
+
+    run_batch(make_worker())
+
+    path, body = stub_server.received[0]
+    assert path == '/hook?token=1'
+    assert body['event_uuid'] == str(delivery.event_uuid)
+    assert body['rule_id'] == delivery.rule_id
+    assert body['device_serial'] == 'DEV-001'
+
+
+def test_failed_delivery_is_scheduled_for_retry(stub_server):
+    stub_server.status = 503
+    delivery = make_delivery(stub_server.url())
+
+    run_batch(make_worker())
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.RETRY
+    assert delivery.attempts == 1
+    assert delivery.response_status == 503
+    assert delivery.next_retry_at > timezone.now()
+
+
+def test_redirect_is_not_followed_and_counts_as_failure(stub_server):
+    stub_server.status = 302
+    delivery = make_delivery(stub_server.url())
+
+    run_batch(make_worker())
+
+    assert len(stub_server.received) == 1
+    delivery.refresh_from_db()
+    assert delivery.status == Status.RETRY
+    assert delivery.response_status == 302
+
+
+def test_last_failed_attempt_rejects_delivery(stub_server, _disable_audit_publish):
+    stub_server.status = 500
+    delivery = make_delivery(stub_server.url(), attempts=4, max_attempts=5)
+
+    run_batch(make_worker())
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.REJECTED
+    assert delivery.attempts == 5
+    assert _disable_audit_publish.call_args.kwargs['events']
+
+
+def test_connection_error_is_retried():
+    delivery = make_delivery('http://127.0.0.1:1/hook')
+
+    run_batch(make_worker())
+
+    delivery.refresh_from_db()
+    assert delivery.status == Status.RETRY
+    assert delivery.error_message
+
+
+def test_only_due_webhook_deliveries_are_claimed(stub_server):
+    future = make_delivery(
+        stub_server.url(),
+        status=Status.RETRY,
+        next_retry_at=timezone.now() + timedelta(hours=1),
+    )
+    done = make_delivery(stub_server.url(), status=Status.SUCCESS)
+    email = make_delivery(stub_server.url(), delivery_type=DeliveryType.NOTIFICATION)
+
+    assert run_batch(make_worker()) == 0
+
+    for delivery, status in (
+        (future, Status.RETRY),
+        (done, Status.SUCCESS),
+        (email, Status.PENDING),
+    ):
+        delivery.refresh_from_db()
+        assert delivery.status == status
+
+
+# ============================================================================
+# Circuit breaker
+# ============================================================================
+
+
+def test_open_circuit_parks_deliveries_without_consuming_attempts(stub_server):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure('127.0.0.1')
+    delivery = make_delivery(stub_server.url())
+
+    assert run_batch(make_worker(breaker=breaker)) == 0
+
+    delivery.refresh_from_db()
+    assert stub_server.received == []
+    assert delivery.status == Status.RETRY
+    assert delivery.attempts == 0
+    assert delivery.next_retry_at > timezone.now() + timedelta(seconds=50)
+
+
+def test_circuit_allows_single_trial_after_reset_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure('host')
+    assert breaker.allow('host')
+    breaker.record_failure('host')
+    assert not breaker.allow('host')
+
+    now[0] = 11
+    assert breaker.allow('host')
+    assert not breaker.allow('host')
+
+    breaker.record_success('host')
+    assert breaker.allow('host')
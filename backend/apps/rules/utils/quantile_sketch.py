@@ -0,0 +1,89 @@
+import bisect
+import math
+from typing import List, Optional
+
+DEFAULT_COMPRESSION = 50
+
+
+class QuantileSketch:
+    """
+    Small merging t-digest used by the quantile evaluator.
+
+    Values are kept as (mean, weight) centroids. The k1 (arcsine) scale function keeps
+    centroids small near the tails, so extreme quantiles stay accurate while the number
+    of centroids stays below `2 * compression` regardless of how many values were added.
+    Sketches are mergeable and serialize to a flat list of floats.
+    """
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        centroids: Optional[List[List[float]]] = None,
+    ):
+        self.compression = compression
+        self.centroids = centroids or []
+        self.count = sum(weight for _, weight in self.centroids)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        bisect.insort(self.centroids, [value, weight])
+        self.count += weight
+        if len(self.centroids) > 2 * self.compression:
+            self.compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.centroids = sorted(self.centroids + other.centroids)
+        self.count += other.count
+        self.compress()
+
+    def compress(self) -> None:
+        if len(self.centroids) < 2:
+            return
+
+        merged = []
+        cumulative = 0.0
+        mean, weight = self.centroids[0]
+        k_left = self._scale(0.0)
+        for next_mean, next_weight in self.centroids[1:]:
+            if self._scale((cumulative + weight + next_weight) / self.count) - k_left <= 1:
+                mean += (next_mean - mean) * next_weight / (weight + next_weight)
+                weight += next_weight
+            else:
+                merged.append([mean, weight])
+                cumulative += weight
+                k_left = self._scale(cumulative / self.count)
+                mean, weight = next_mean, next_weight
+        merged.append([mean, weight])
+        self.centroids = merged
+
+    def _scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(q, 1.0) - 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile `q` (0..1), or None for an empty sketch."""
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+
+        target = q * self.count
+        cumulative = 0.0
+        prev_center = prev_mean = None
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target <= center:
+                if prev_center is None:
+                    return mean
+                ratio = (target - prev_center) / (center - prev_center)
+                return prev_mean + ratio * (mean - prev_mean)
+            prev_center, prev_mean = center, mean
+            cumulative += weight
+        return self.centroids[-1][0]
+
+    def to_list(self) -> List[float]:
+        """Flatten centroids to [mean, weight, mean, weight, ...] for compact storage."""
+        return [round(x, 6) for centroid in self.centroids for x in centroid]
+
+    @classmethod
+    def from_list(cls, data: List[float], compression: int = DEFAULT_COMPRESSION):
+        centroids = [[data[i], data[i + 1]] for i in range(0, len(data), 2)]
+        return cls(compression=compression, centroids=centroids)
@@ -1,10 +1,14 @@
 from dataclasses import dataclass
 from datetime import timedelta, datetime
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import Any, Callable, Tuple, List, Optional
+import hashlib
+import json
 import logging
 from enum import Enum
 
+from redis.exceptions import WatchError
+
 from apps.devices.models.telemetry import Telemetry
 from apps.devices.models.device_metric import DeviceMetric
 
@@ -191,3 +195,88 @@ class RedisTelemetryRepository(TelemetryRepository):
             )
             for value, score in items
         ]
+
+
+###=========================
+### SERIES STATE
+###=========================
+
+
+class SeriesStateStore:
+    """
+    Redis store for the incremental state of statistical evaluators.
+
+    State is a short JSON list per (rule, condition, device metric):
+        - key = rules:state:{rule|template}:{rule_id}:{rule_type}:{device_metric_id}:{condition_hash}
+        - value = [last_ts, *evaluator_state]
+    Rules and rule templates have separate id spaces, so the owner kind is part of the key.
+    The condition hash keeps the subconditions of a composite rule apart and resets
+    the state when a rule's condition is edited.
+    """
+
+    KEY_PREFIX = "rules:state"
+    MAX_UPDATE_ATTEMPTS = 5
+
+    def __init__(self, redis_client, ttl_seconds: int):
+        """
+        :param redis_client: Initialized Redis client instance
+        :param ttl_seconds: Expiry of idle series state
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def key(
+        self,
+        condition: dict,
+        device_metric_id: int,
+        rule_id: Optional[int] = None,
+        is_template: bool = False,
+    ) -> str:
+        digest = hashlib.sha1(
+            json.dumps(condition, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()[:12]
+        owner = f"{'template' if is_template else 'rule'}:{rule_id}"
+        return f"{self.KEY_PREFIX}:{owner}:{condition.get('type')}:{device_metric_id}:{digest}"
+
+    def _decode(self, key: str, raw) -> Optional[list]:
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("Corrupted series state, resetting", extra={"key": key})
+            return None
+
+    def load(self, key: str) -> Optional[list]:
+        return self._decode(key, self.redis.get(key))
+
+    def save(self, key: str, state: list) -> None:
+        self.redis.set(key, json.dumps(state, separators=(",", ":")), ex=self.ttl_seconds)
+
+    def update(self, key: str, apply: Callable[[Optional[list]], Tuple[Any, Optional[list]]]):
+        """
+        Atomically replace the state of `key` (optimistic WATCH/MULTI transaction).
+
+        `apply` receives the stored state (None when missing) and returns
+        (result, new_state); new_state None leaves the key untouched. `apply` is
+        called again with the fresh state when another worker wrote the key in
+        between, so it must not have side effects.
+        :return: result of the committed `apply` call, None if the key stayed contended.
+        """
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            with self.redis.pipeline() as pipe:
+                try:
+                    pipe.watch(key)
+                    result, state = apply(self._decode(key, pipe.get(key)))
+                    if state is None:
+                        pipe.unwatch()
+                        return result
+                    pipe.multi()
+                    pipe.set(key, json.dumps(state, separators=(",", ":")), ex=self.ttl_seconds)
+                    pipe.execute()
+                    return result
+                except WatchError:
+                    continue
+
+        logger.warning("Series state is contended, skipping update", extra={"key": key})
+        return None
@@ -9,6 +9,10 @@ from apps.rules.services.condition_evaluator import (
     CompositeEvaluator,
     BooleanEvaluator,
     StringMatchEvaluator,
+    EwmaEvaluator,
+    ZScoreEvaluator,
+    RateOfChangeEvaluator,
+    QuantileEvaluator,
 )
 
 EVALUATOR_CLASSES = [
@@ -17,10 +21,17 @@ EVALUATOR_CLASSES = [
     CompositeEvaluator,
     BooleanEvaluator,
     StringMatchEvaluator,
+    EwmaEvaluator,
+    ZScoreEvaluator,
+    RateOfChangeEvaluator,
+    QuantileEvaluator,
 ]
 
 CONDITION_SCHEMAS = {cls.rule_type: cls.schema for cls in EVALUATOR_CLASSES}
 
+WEBHOOK_MAX_BATCH_LIMIT = 1000
+WEBHOOK_MAX_WAIT_MS_LIMIT = 60_000
+
 
 def validate_condition(condition: dict[str, Any]) -> None:
     if isinstance(condition, str):
@@ -62,6 +73,26 @@ def validate_action_enabled(action_type: dict) -> None:
         raise ValidationError("Action 'enabled' must be bool")
 
 
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_action_webhook_batching(webhook: dict) -> None:
+    """Validation for the optional batching fields 'max_batch' and 'max_wait_ms'"""
+    if "max_batch" in webhook:
+        max_batch = webhook["max_batch"]
+        if not _is_int(max_batch) or not 1 <= max_batch <= WEBHOOK_MAX_BATCH_LIMIT:
+            raise ValidationError(
+                f"Webhook 'max_batch' must be an integer between 1 and {WEBHOOK_MAX_BATCH_LIMIT}"
+            )
+    if "max_wait_ms" in webhook:
+        max_wait_ms = webhook["max_wait_ms"]
+        if not _is_int(max_wait_ms) or not 0 <= max_wait_ms <= WEBHOOK_MAX_WAIT_MS_LIMIT:
+            raise ValidationError(
+                f"Webhook 'max_wait_ms' must be an integer between 0 and {WEBHOOK_MAX_WAIT_MS_LIMIT}"
+            )
+
+
 def validate_action_notification_channel(notification: dict) -> None:
     try:
         NotificationChannels(notification.get("channel"))
@@ -75,7 +106,9 @@ def validate_action(action: dict[str, Any]) -> None:
     Example:
     {'webhook': {
              'url': 'https://webhook.site/a6bf3275-595d-42fd-b759-c42d74ce8c9e',
-             'enabled': true # is there any purposes in it?
+             'enabled': true, # is there any purposes in it?
+             'max_batch': 100, # optional, POST up to 100 events as one JSON array
+             'max_wait_ms': 500 # optional, how long a batch may wait to fill up
                 },
     'notification': {
         'channel': 'email', # only one?
@@ -115,6 +148,7 @@ def validate_action(action: dict[str, Any]) -> None:
             raise ValidationError("Webhook requires 'url'")
 
         validate_action_enabled(webhook)
+        validate_action_webhook_batching(webhook)
 
     if ActionTypes.NOTIFICATION.value in action:
         notification = action.get(ActionTypes.NOTIFICATION.value)
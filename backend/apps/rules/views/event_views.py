@@ -2,6 +2,8 @@ import json
 from typing import Any, Optional
 from uuid import UUID
 
+from django.conf import settings
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -12,25 +14,33 @@ from apps.rules.serializers.event_serializer import (
     EventListQuerySerializer,
     EventListItemSerializer,
     EventDetailSerializer,
+    EventBulkAckSerializer,
     ExternalEventRequestSerializer,
     map_external_to_internal,
 )
 from apps.common.checker.redis_checker import build_redis_checker
+from apps.common.utils.response_cache import conditional_response
 from producers.kafka_producer import KafkaProducer, ProduceResult
 from apps.rules.services.event_service import (
+    EventListResult,
     event_list,
     event_get,
     event_ack,
+    event_ack_queryset,
+    event_bulk_ack,
 )
 from apps.users.decorators import jwt_required, role_required
 from apps.rules.producers import get_external_events_producer
-from apps.audit.publisher import publish_audit_event
+from apps.rules.tasks import stream_event_acks_on_commit
+from apps.audit.outbox import enqueue_audit_event, enqueue_audit_events
+from apps.common.utils.views_utils import parse_json_body
 
 
 @csrf_exempt
 @require_http_methods(["GET"])
 @jwt_required
 @role_required({"GET": ["client", "admin"]})
+@conditional_response(Event)
 def list_events(request):
     """
     GET /api/events/
@@ -41,7 +51,10 @@ def list_events(request):
     - severity (reserved, ignored)
     Pagination:
     - limit
+    - cursor (next_cursor of the previous page)
     - offset
+    Count:
+    - count=exact|estimate|none
     """
     serializer = EventListQuerySerializer(request.GET)
 
@@ -52,10 +65,9 @@ def list_events(request):
 
     return JsonResponse(
         _list_response_json(
-            count=result.count,
+            result=result,
             limit=serializer.validated_data.limit,
             offset=serializer.validated_data.offset,
-            events=result.results,
         ),
         status=200,
     )
@@ -86,28 +98,77 @@ def ack_event(request, event_uuid: UUID):
     """
     POST /api/events/{event_uuid}/ack
     Body: none
+    Clients may only acknowledge events of their own devices or rules.
+    The acknowledgement is pushed to WebSocket event subscribers after commit.
     """
     try:
-        event = event_ack(event_uuid=event_uuid)
+        with transaction.atomic():
+            event = event_ack(event_uuid=event_uuid, owner=_event_owner(request))
+            enqueue_audit_event(event=event_acknowledged(request.user.pk, event))
+            stream_event_acks_on_commit([event.pk])
     except Event.DoesNotExist:
         return JsonResponse({"detail": "Event not found."}, status=404)
 
-    publish_audit_event(event=event_acknowledged(request.user.pk, event))
     return JsonResponse(EventDetailSerializer.to_dict(event), status=200)
 
 
+@csrf_exempt
+@require_http_methods(["POST"])
+@jwt_required
+@role_required({"POST": ["client", "admin"]})
+def bulk_ack_events(request):
+    """
+    POST /api/events/ack/
+    Body: {"event_uuids": [...]} and/or filters {"rule_id", "device_serial_id", "before"}
+    Acknowledges up to EVENTS_BULK_ACK_MAX_ROWS matching events (of the client's
+    own devices or rules) in one statement; `has_more` asks the caller to repeat
+    the request. Acknowledgements are pushed to WebSocket event subscribers after
+    commit, in chunks of EVENTS_STREAM_ACK_CHUNK_SIZE.
+    """
+    data, error_response = parse_json_body(request.body)
+    if error_response:
+        return error_response
+
+    serializer = EventBulkAckSerializer(data)
+    if not serializer.is_valid():
+        return JsonResponse({"errors": serializer.errors}, status=400)
+
+    events = event_ack_queryset(query=serializer.validated_data, owner=_event_owner(request))
+    with transaction.atomic():
+        result = event_bulk_ack(events=events, limit=settings.EVENTS_BULK_ACK_MAX_ROWS)
+        enqueue_audit_events(
+            events=[event_acknowledged(request.user.pk, event_id) for event_id in result.ids]
+        )
+        stream_event_acks_on_commit(result.ids)
+
+    return JsonResponse(
+        {
+            "acknowledged": len(result.ids),
+            "has_more": result.has_more,
+            "event_uuids": [str(event_uuid) for event_uuid in result.event_uuids],
+        },
+        status=200,
+    )
+
+
+def _event_owner(request):
+    """User whose events a request may acknowledge, None for admins (all events)."""
+    return None if request.user.role == "admin" else request.user
+
+
 def _list_response_json(
     *,
-    count: int,
+    result: EventListResult,
     limit: int,
     offset: int,
-    events: list[Event],
 ) -> dict[str, Any]:
     return {
-        "count": count,
+        "count": result.count,
+        "count_is_estimate": result.count_is_estimate,
         "limit": limit,
         "offset": offset,
-        "results": [EventListItemSerializer.to_dict(e) for e in events],
+        "next_cursor": result.next_cursor,
+        "results": [EventListItemSerializer.to_dict(e) for e in result.results],
     }
 
 
@@ -3,7 +3,7 @@ from django.http import JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.core.exceptions import ValidationError
 
 from apps.rules.serializers.rule_serializers import RuleCreateSerializer, RulePatchSerializer
@@ -15,8 +15,17 @@ from apps.devices.models.device import Device
 from apps.devices.models.device_metric import DeviceMetric
 from apps.users.decorators import jwt_required, role_required
 from apps.rules.services.rule_processor import RuleProcessor
+from apps.common.utils.pagination import (
+    COUNT_MODES,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    parse_count_mode,
+)
+from apps.common.utils.response_cache import conditional_response
 from apps.common.utils.views_utils import parse_json_body
-from apps.audit.publisher import publish_audit_event
+from apps.audit.outbox import enqueue_audit_event
 
 logger = logging.getLogger("rules")
 
@@ -36,6 +45,7 @@ logger = logging.getLogger("rules")
     name='dispatch',
 )
 class RuleView(View):
+    @method_decorator(conditional_response(Rule, DeviceMetric, Device))
     def get(self, request, rule_id=None):
         """Get rule(s)"""
         user = request.user
@@ -51,7 +61,7 @@ class RuleView(View):
                 data = {
                     "id": rule.id,
                     "name": rule.name,
-                    "device_metric_id": rule.device_metric.id,
+                    "device_metric_id": rule.device_metric_id,
                     "description": rule.description,
                     "condition": rule.condition,
                     "action": rule.action,
@@ -75,18 +85,41 @@ class RuleView(View):
                     status=400,
                 )
 
+            count_mode = parse_count_mode(request.GET.get("count"))
+            if count_mode is None:
+                return JsonResponse(
+                    {"code": 400, "message": f"Count must be one of: {', '.join(COUNT_MODES)}"},
+                    status=400,
+                )
+
             all_rules = (
                 Rule.objects.all()
                 if is_admin
                 else Rule.objects.filter(device_metric__device__user=user)
-            )
-            total = all_rules.count()
-            rules = all_rules[offset : offset + limit]
+            ).order_by("id")
+            total, is_estimate = count_rows(all_rules, mode=count_mode)
+
+            cursor = request.GET.get("cursor")
+            if cursor:
+                if offset:
+                    return JsonResponse(
+                        {"code": 400, "message": "Offset cannot be combined with cursor"},
+                        status=400,
+                    )
+                try:
+                    (last_id,) = decode_cursor(cursor, size=1)
+                    all_rules = all_rules.filter(id__gt=int(last_id))
+                except (TypeError, ValueError):
+                    return JsonResponse({"code": 400, "message": "Invalid cursor"}, status=400)
+            else:
+                all_rules = all_rules[offset:]
+
+            rules, has_more = keyset_page(all_rules, limit=limit)
             data = [
                 {
                     "id": r.id,
                     "name": r.name,
-                    "device_metric_id": r.device_metric.id,
+                    "device_metric_id": r.device_metric_id,
                     "description": r.description,
                     "condition": r.condition,
                     "action": r.action,
@@ -94,7 +127,16 @@ class RuleView(View):
                 }
                 for r in rules
             ]
-            return JsonResponse({"total": total, "limit": limit, "offset": offset, "items": data})
+            return JsonResponse(
+                {
+                    "total": total,
+                    "total_is_estimate": is_estimate,
+                    "limit": limit,
+                    "offset": offset,
+                    "next_cursor": encode_cursor([rules[-1].id]) if has_more else None,
+                    "items": data,
+                }
+            )
 
     def post(self, request):
         """Create a new rule"""
@@ -120,7 +162,9 @@ class RuleView(View):
             )
 
         try:
-            rule = rule_create(rule_data=serializer.validated_data)
+            with transaction.atomic():
+                rule = rule_create(rule_data=serializer.validated_data)
+                enqueue_audit_event(event=rule_created(user.pk, rule))
         except IntegrityError as e:
             if "unique_rule_name_per_device_metric" in str(e):
                 return JsonResponse(
@@ -147,11 +191,10 @@ class RuleView(View):
                 status=400,
             )
 
-        publish_audit_event(event=rule_created(user.pk, rule))
         data = {
             "id": rule.id,
             "name": rule.name,
-            "device_metric_id": rule.device_metric.id,
+            "device_metric_id": rule.device_metric_id,
             "description": rule.description,
             "condition": rule.condition,
             "action": rule.action,
@@ -182,7 +225,9 @@ class RuleView(View):
             return JsonResponse({"code": 400, "message": serializer.errors}, status=400)
 
         try:
-            rule_new = rule_put(rule_id=rule_id, rule_data=serializer.validated_data)
+            with transaction.atomic():
+                rule_new = rule_put(rule_id=rule_id, rule_data=serializer.validated_data)
+                enqueue_audit_event(event=rule_updated(user.pk, rule_old, rule_new))
         except ValidationError as e:
             return JsonResponse(
                 {
@@ -192,11 +237,10 @@ class RuleView(View):
                 status=400,
             )
 
-        publish_audit_event(event=rule_updated(user.pk, rule_old, rule_new))
         data = {
             "id": rule_new.id,
             "name": rule_new.name,
-            "device_metric_id": rule_new.device_metric.id,
+            "device_metric_id": rule_new.device_metric_id,
             "description": rule_new.description,
             "condition": rule_new.condition,
             "action": rule_new.action,
@@ -227,7 +271,9 @@ class RuleView(View):
             return JsonResponse({"code": 400, "message": serializer.errors}, status=400)
 
         try:
-            rule_new = rule_patch(rule_id=rule_id, rule_data=serializer.validated_data)
+            with transaction.atomic():
+                rule_new = rule_patch(rule_id=rule_id, rule_data=serializer.validated_data)
+                enqueue_audit_event(event=rule_updated(user.pk, rule_old, rule_new))
         except ValidationError as e:
             return JsonResponse(
                 {
@@ -237,8 +283,6 @@ class RuleView(View):
                 status=400,
             )
 
-        publish_audit_event(event=rule_updated(user.pk, rule_old, rule_new))
-
         return JsonResponse({"status": 200, "rule_id": rule_new.id}, status=200)
 
     def delete(self, request, rule_id):
@@ -254,8 +298,9 @@ class RuleView(View):
         except Rule.DoesNotExist:
             return JsonResponse({"code": 404, "message": "Rule not found"}, status=404)
 
-        publish_audit_event(event=rule_deleted(user.pk, rule))
-        rule_delete(rule_id=rule_id)
+        with transaction.atomic():
+            enqueue_audit_event(event=rule_deleted(user.pk, rule))
+            rule_delete(rule_id=rule_id)
 
         return JsonResponse({}, status=204)
 
@@ -308,7 +353,11 @@ class RuleEvaluateView(View):
                     status=400,
                 )
 
-        last_telemetries = qs.order_by('device_metric', '-created_at').distinct('device_metric')
+        last_telemetries = (
+            qs.select_related('device_metric__device')
+            .order_by('device_metric', '-created_at')
+            .distinct('device_metric')
+        )
 
         results = []
         for telemetry in last_telemetries:
@@ -316,13 +365,13 @@ class RuleEvaluateView(View):
             results.append(
                 {
                     "telemetry_id": telemetry.id,
-                    "device_metric_id": telemetry.device_metric.id,
+                    "device_metric_id": telemetry.device_metric_id,
                     "device_name": telemetry.device_metric.device.name,
                     "result": evaluation_result,
                 }
             )
             if evaluation_result["triggered"]:
-                publish_audit_event(
+                enqueue_audit_event(
                     event=rule_evaluated(
                         rule_id=evaluation_result["rule_id"],
                         details=evaluation_result["telemetry"],
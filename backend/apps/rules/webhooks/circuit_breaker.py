@@ -0,0 +1,60 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(slots=True)
+class _HostState:
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the host is open for `reset_timeout`
+    seconds and deliveries to it are parked instead of attempted. When the timeout has
+    passed the circuit is half-open: a single trial request is let through, a success
+    closes the circuit and a failure opens it again for another `reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._hosts: dict[str, _HostState] = {}
+
+    def retry_after(self, host: str) -> float:
+        """Seconds until `host` may be tried again, 0 when the circuit is not open."""
+        state = self._hosts.get(host)
+        if state is None or state.opened_at is None:
+            return 0.0
+        return max(0.0, state.opened_at + self.reset_timeout - self._clock())
+
+    def allow(self, host: str) -> bool:
+        """Return True if a request to `host` may be sent now."""
+        state = self._hosts.get(host)
+        if state is None or state.opened_at is None:
+            return True
+        if self.retry_after(host) > 0 or state.trial_in_flight:
+            return False
+        state.trial_in_flight = True
+        return True
+
+    def record_success(self, host: str) -> None:
+        self._hosts.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        state = self._hosts.setdefault(host, _HostState())
+        state.failures += 1
+        state.trial_in_flight = False
+        if state.failures >= self.failure_threshold:
+            state.opened_at = self._clock()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import logging
+import ssl
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'iot-hub-webhooks/1.0'
+MAX_RESPONSE_BYTES = 1024 * 1024  # larger bodies are not drained, the connection is dropped
+
+
+class WebhookHttpError(Exception):
+    """Raised for transport failures and malformed HTTP responses."""
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    status: int
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        """
+        Only 2xx counts as delivered. Redirects are not followed, so a 3xx response
+        is a failed attempt like 4xx and 5xx: webhook URLs must point at the final endpoint.
+        """
+        return 200 <= self.status < 300
+
+
+class AsyncWebhookClient:
+    """
+    Webhook sender on top of one shared `httpx.AsyncClient`.
+
+    httpx keeps idle connections alive and reuses them per origin, so deliveries
+    do not pay a TCP/TLS handshake each time. At most `max_connections_per_host`
+    requests run concurrently against one origin, which also bounds the number of
+    connections opened to it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self._max_connections_per_host = max_connections_per_host
+        self._semaphores: dict[tuple[str, str, int], asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            verify=ssl_context or True,
+            follow_redirects=False,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+            headers={'User-Agent': USER_AGENT},
+        )
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise WebhookHttpError(f'Unsupported webhook URL: {url}')
+
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self._max_connections_per_host)
+        return semaphore
+
+    async def post_json(self, url: str, payload: Any, *, timeout: float) -> HttpResponse:
+        semaphore = self._semaphore_for(url)
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        async with semaphore:
+            try:
+                async with self._client.stream(
+                    'POST',
+                    url,
+                    content=body,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=timeout,
+                ) as response:
+                    return HttpResponse(status=response.status_code, body=await _read(response))
+            except httpx.TimeoutException as exc:
+                raise WebhookHttpError(f'Request to {url} timed out after {timeout}s') from exc
+            except httpx.HTTPError as exc:
+                raise WebhookHttpError(f'Request to {url} failed: {exc!r}') from exc
+
+    async def close(self) -> None:
+        await self._client.aclose()
+        self._semaphores.clear()
+
+
+async def _read(response: httpx.Response) -> bytes:
+    """Read at most MAX_RESPONSE_BYTES of the body, the rest is discarded with the connection."""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_raw():
+        size += len(chunk)
+        if size > MAX_RESPONSE_BYTES:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
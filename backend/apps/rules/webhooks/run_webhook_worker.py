@@ -0,0 +1,48 @@
+import asyncio
+import logging
+import os
+import signal
+
+import django
+from django.conf import settings
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conf.settings')
+django.setup()
+
+from apps.rules.webhooks.worker import WebhookDeliveryWorker  # noqa: E402
+
+
+def setup_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format='[%(asctime)s] %(levelname)s %(name)s %(message)s', force=True
+    )
+
+
+async def run() -> None:
+    logger = logging.getLogger(__name__)
+    stop_event = asyncio.Event()
+
+    def handle_shutdown():
+        logger.warning('Received shutdown signal. Stopping webhook worker gracefully...')
+        stop_event.set()
+
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, handle_shutdown)
+    loop.add_signal_handler(signal.SIGINT, handle_shutdown)
+
+    if not settings.WEBHOOK_WORKER_ENABLED:
+        # webhooks are still delivered by Celery, stay idle so both paths never race
+        logger.warning('WEBHOOK_WORKER_ENABLED is off, webhook worker is idle')
+        await stop_event.wait()
+        return
+
+    await WebhookDeliveryWorker().run(stop_event)
+
+
+def main():
+    setup_logging()
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
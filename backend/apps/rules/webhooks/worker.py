@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.db.models.fields.json import KT
+from django.utils import timezone
+
+from apps.audit.publisher import publish_audit_events
+from apps.common.metrics import webhook_deliveries_total, webhook_delivery_seconds
+from apps.rules.audit.actions_audit import action_rejected, action_succeeded
+from apps.rules.models.event_delivery import DeliveryType, EventDelivery, Status
+from apps.rules.services.delivery_service import (
+    apply_delivery_result,
+    due_delivery_filter,
+    group_webhook_batches,
+    webhook_batch_body,
+    webhook_batching,
+    webhook_body,
+)
+from apps.rules.webhooks.circuit_breaker import CircuitBreaker
+from apps.rules.webhooks.http_client import AsyncWebhookClient
+
+logger = logging.getLogger(__name__)
+
+# parked deliveries of a half-open host wait at least this long for the trial request
+PARK_MIN_SECONDS = 1
+
+CLAIM_UPDATE_FIELDS = ['status', 'attempts', 'last_attempt_at', 'next_retry_at', 'updated_at']
+RESULT_UPDATE_FIELDS = [
+    'status',
+    'response_status',
+    'error_message',
+    'next_retry_at',
+    'updated_at',
+]
+
+
+@dataclass(slots=True)
+class WebhookOutcome:
+    delivery: EventDelivery
+    response_status: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _url(delivery: EventDelivery) -> Optional[str]:
+    return delivery.payload.get('url') if isinstance(delivery.payload, dict) else None
+
+
+def _host(delivery: EventDelivery) -> Optional[str]:
+    url = _url(delivery)
+    return urlsplit(url).hostname if url else None
+
+
+def _batched_urls(now: datetime) -> tuple[list[str], int]:
+    """
+    URLs whose pending batched deliveries are neither a full batch nor old enough to
+    be sent, and the largest `max_batch` of the full batches. Counted over all due rows
+    rather than the claim window, so a batch larger than the claim batch size can fill up.
+    """
+    groups = list(
+        EventDelivery.objects.filter(
+            due_delivery_filter(now),
+            delivery_type=DeliveryType.WEBHOOK,
+            status=Status.PENDING,
+            payload__max_batch__gt=1,
+        )
+        .values(url=KT('payload__url'))
+        .annotate(pending=Count('id'), oldest=Min('created_at'), first_id=Min('id'))
+    )
+    # the first delivery of a URL decides its batching settings, as in group_webhook_batches
+    payloads = dict(
+        EventDelivery.objects.filter(id__in=[group['first_id'] for group in groups]).values_list(
+            'id', 'payload'
+        )
+    )
+
+    held, full_batch = [], 0
+    for group in groups:
+        batching = webhook_batching(payloads.get(group['first_id']))
+        if batching is None:
+            continue
+        deadline = group['oldest'] + timedelta(milliseconds=batching.max_wait_ms)
+        if group['pending'] < batching.max_batch and deadline > now:
+            held.append(group['url'])
+        elif group['pending'] >= batching.max_batch:
+            full_batch = max(full_batch, batching.max_batch)
+    return held, full_batch
+
+
+class WebhookDeliveryWorker:
+    """
+    Asyncio webhook sender that replaces the blocking Celery path for webhooks.
+
+    Due deliveries are claimed from the database in batches, sent concurrently
+    through per-host keep-alive pools and their outcome is written back with the
+    same status/attempts semantics as `process_delivery_task`:
+    PENDING/RETRY -> PROCESSING (attempts + 1) -> SUCCESS | RETRY (backoff) | REJECTED.
+    Hosts with an open circuit are not contacted, their deliveries are parked in
+    RETRY until the circuit may close again, without consuming an attempt.
+
+    Deliveries of webhook actions configured with `max_batch` are coalesced per URL
+    into one POST of a JSON array, sent once `max_batch` of them are pending or the
+    oldest one has waited `max_wait_ms`.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Optional[AsyncWebhookClient] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.client = client or AsyncWebhookClient(
+            max_connections_per_host=settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST
+        )
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.WEBHOOK_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.WEBHOOK_BREAKER_RESET_SECONDS,
+        )
+        self.batch_size = batch_size or settings.WEBHOOK_CLAIM_BATCH_SIZE
+        self.max_in_flight = max_in_flight or settings.WEBHOOK_MAX_IN_FLIGHT
+        self.timeout = timeout or settings.WEBHOOK_TIMEOUT_SECONDS
+        self.poll_interval = poll_interval or settings.WEBHOOK_POLL_INTERVAL_SECONDS
+
+    # ------------------------------------------------------------------
+    # Database side (sync)
+    # ------------------------------------------------------------------
+
+    def claim(self, limit: int) -> list[list[EventDelivery]]:
+        """
+        Lock due webhook deliveries, mark the sendable ones PROCESSING and return
+        them grouped into requests.
+        """
+        now = timezone.now()
+        held, full_batch = _batched_urls(now)
+        held_rows = Q(
+            status=Status.PENDING,
+            payload__max_batch__isnull=False,
+            payload__max_batch__gt=1,
+            payload__url__in=held,
+        )
+        with transaction.atomic():
+            # held rows are excluded in SQL so they do not take up the claim window,
+            # which is widened to let a full batch go out in one request
+            rows = list(
+                EventDelivery.objects.select_for_update(skip_locked=True)
+                .filter(due_delivery_filter(now), delivery_type=DeliveryType.WEBHOOK)
+                .exclude(held_rows)
+                .order_by('id')[: max(limit, full_batch)]
+            )
+
+            updated, claimed, rejected = [], [], []
+            for delivery in rows:
+                updated.append(delivery)
+                delivery.updated_at = now
+                host = _host(delivery)
+                if delivery.attempts >= delivery.max_attempts:
+                    delivery.status = Status.REJECTED
+                    rejected.append(delivery)
+                elif host and not self.breaker.allow(host):
+                    wait = max(self.breaker.retry_after(host), PARK_MIN_SECONDS)
+                    delivery.status = Status.RETRY
+                    delivery.next_retry_at = now + timedelta(seconds=wait)
+                    webhook_deliveries_total.labels(outcome='parked').inc()
+                else:
+                    delivery.status = Status.PROCESSING
+                    delivery.attempts += 1
+                    delivery.last_attempt_at = now
+                    claimed.append(delivery)
+
+            if updated:
+                EventDelivery.objects.bulk_update(updated, CLAIM_UPDATE_FIELDS)
+
+        if rejected:
+            publish_audit_events(events=[action_rejected(delivery) for delivery in rejected])
+        return group_webhook_batches(claimed)
+
+    def record(self, outcomes: list[WebhookOutcome]) -> None:
+        """Persist the outcome of sent deliveries and publish their audit records."""
+        if not outcomes:
+            return
+
+        now = timezone.now()
+        audit = []
+        for outcome in outcomes:
+            delivery = outcome.delivery
+            apply_delivery_result(
+                delivery, response_status=outcome.response_status, error=outcome.error, now=now
+            )
+            if delivery.status == Status.SUCCESS:
+                audit.append(action_succeeded(delivery))
+                webhook_deliveries_total.labels(outcome='success').inc()
+            elif delivery.status == Status.REJECTED:
+                audit.append(action_rejected(delivery))
+                webhook_deliveries_total.labels(outcome='rejected').inc()
+            else:
+                webhook_deliveries_total.labels(outcome='retry').inc()
+
+        EventDelivery.objects.bulk_update([o.delivery for o in outcomes], RESULT_UPDATE_FIELDS)
+        publish_audit_events(events=audit)
+
+    # ------------------------------------------------------------------
+    # Network side (async)
+    # ------------------------------------------------------------------
+
+    async def deliver(self, batch: list[EventDelivery]) -> list[WebhookOutcome]:
+        """
+        Send one request for `batch` (all deliveries share the URL) and return the
+        outcome of every delivery in it. Never raises.
+        """
+        first = batch[0]
+        url = _url(first)
+        host = _host(first)
+        if webhook_batching(first.payload):
+            body = webhook_batch_body(batch)
+        else:
+            body = webhook_body(first)
+
+        start = time.perf_counter()
+        try:
+            if not url:
+                raise ValueError("Webhook URL is missing in payload.")
+            response = await self.client.post_json(url, body, timeout=self.timeout)
+        except Exception as exc:
+            logger.warning(
+                'Webhook delivery %s failed: %s', [delivery.id for delivery in batch], exc
+            )
+            if host:
+                self.breaker.record_failure(host)
+            return [WebhookOutcome(delivery=delivery, error=str(exc)) for delivery in batch]
+        finally:
+            webhook_delivery_seconds.observe(time.perf_counter() - start)
+
+        # 5xx and 429 mean the host is struggling, other statuses prove it is reachable
+        if response.status >= 500 or response.status == 429:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+
+        error = None if response.ok else f'{response.status} response from {url}'
+        return [
+            WebhookOutcome(delivery=delivery, response_status=response.status, error=error)
+            for delivery in batch
+        ]
+
+    async def run_batch(self) -> int:
+        """Claim one batch, send it concurrently and record the results."""
+        batches = await sync_to_async(self.claim)(self.batch_size)
+        if not batches:
+            return 0
+        results = await asyncio.gather(*(self.deliver(batch) for batch in batches))
+        outcomes = [outcome for result in results for outcome in result]
+        await sync_to_async(self.record)(outcomes)
+        return len(outcomes)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """
+        Main loop: keep up to `max_in_flight` requests in flight, claiming more as
+        requests complete, and flush finished outcomes to the database in batches.
+        """
+        in_flight: set[asyncio.Task] = set()
+        finished: list[WebhookOutcome] = []
+
+        def on_done(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            if not task.cancelled():
+                finished.extend(task.result())
+
+        logger.info('Webhook delivery worker started (max in flight: %s)', self.max_in_flight)
+        try:
+            while not stop_event.is_set():
+                free = self.max_in_flight - len(in_flight)
+                limit = min(self.batch_size, free)
+                batches = await sync_to_async(self.claim)(limit) if limit > 0 else []
+                for batch in batches:
+                    task = asyncio.create_task(self.deliver(batch))
+                    in_flight.add(task)
+                    task.add_done_callback(on_done)
+
+                if finished:
+                    outcomes, finished[:] = finished[:], []
+                    await sync_to_async(self.record)(outcomes)
+
+                claimed = sum(len(batch) for batch in batches)
+                if claimed < limit or limit == 0:
+                    # idle or saturated: wait for completions, new work or shutdown
+                    waiters = [*in_flight, asyncio.ensure_future(stop_event.wait())]
+                    await asyncio.wait(
+                        waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    waiters[-1].cancel()
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if finished:
+                await sync_to_async(self.record)(finished)
+            await self.client.close()
+            logger.info('Webhook delivery worker stopped')
@@ -3,6 +3,7 @@ from django.http import JsonResponse
 from functools import wraps
 from django.conf import settings
 from .models import User
+from .principal_cache import get_principal
 
 
 def jwt_required(func):
@@ -21,7 +22,7 @@ def jwt_required(func):
         except jwt.InvalidTokenError:
             return JsonResponse({"error": "Invalid token"}, status=401)
         try:
-            request.user = User.objects.get(id=payload["sub"])
+            request.user = get_principal(payload["sub"])
             request.role = payload.get("role")
         except User.DoesNotExist:
             return JsonResponse({"error": "User not found"}, status=401)
@@ -5,10 +5,14 @@ from asgiref.sync import sync_to_async
 from django.conf import settings
 
 from apps.users.models import User
+from apps.users.principal_cache import cached_principal, get_principal
 
 
-@sync_to_async
-def get_user_from_token(token: str):
+async def get_user_from_token(token: str):
+    """
+    Resolve the user of a token. Cached principals are returned without
+    leaving the event loop; only cache misses query the database.
+    """
     from django.contrib.auth.models import AnonymousUser
 
     try:
@@ -17,7 +21,11 @@ def get_user_from_token(token: str):
         if not user_id:
             return AnonymousUser(), None
 
-        user = User.objects.get(id=user_id, is_active=True)
+        user = cached_principal(user_id)
+        if user is None:
+            user = await sync_to_async(get_principal)(user_id)
+        if not user.is_active:
+            return AnonymousUser(), None
         return user, payload.get("role")
     except (
         jwt.ExpiredSignatureError,
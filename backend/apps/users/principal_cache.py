@@ -0,0 +1,63 @@
+from typing import Iterable, Optional
+
+from django.core.cache import caches
+
+from apps.devices.models import Device
+from apps.users.models import User
+
+AUTH_CACHE_ALIAS = "auth"
+
+
+def principal_cache_key(user_id) -> str:
+    return f"principal:{user_id}"
+
+
+def owned_devices_cache_key(user_id) -> str:
+    return f"devices:{user_id}"
+
+
+def cached_principal(user_id) -> Optional[User]:
+    """User of a token sub from the process-local cache only, None on a miss."""
+    return caches[AUTH_CACHE_ALIAS].get(principal_cache_key(user_id))
+
+
+def get_principal(user_id) -> User:
+    """
+    User of a token sub, loaded once per AUTH_CACHE_TTL per process.
+    Raises User.DoesNotExist; misses are not cached.
+    """
+    user = cached_principal(user_id)
+    if user is None:
+        user = User.objects.get(id=user_id)
+        caches[AUTH_CACHE_ALIAS].set(principal_cache_key(user_id), user)
+    return user
+
+
+def cached_owned_device_serial_ids(user_id) -> Optional[frozenset[str]]:
+    """Active devices of a user from the process-local cache only, None on a miss."""
+    return caches[AUTH_CACHE_ALIAS].get(owned_devices_cache_key(user_id))
+
+
+def get_owned_device_serial_ids(user_id) -> frozenset[str]:
+    """Serial ids of the active devices of a user, loaded once per AUTH_CACHE_TTL per process."""
+    serial_ids = cached_owned_device_serial_ids(user_id)
+    if serial_ids is None:
+        serial_ids = frozenset(
+            Device.objects.filter(user_id=user_id, is_active=True).values_list(
+                "serial_id", flat=True
+            )
+        )
+        caches[AUTH_CACHE_ALIAS].set(owned_devices_cache_key(user_id), serial_ids)
+    return serial_ids
+
+
+def invalidate_principal(user_id) -> None:
+    caches[AUTH_CACHE_ALIAS].delete_many(
+        [principal_cache_key(user_id), owned_devices_cache_key(user_id)]
+    )
+
+
+def invalidate_owned_devices(user_ids: Iterable) -> None:
+    caches[AUTH_CACHE_ALIAS].delete_many(
+        [owned_devices_cache_key(user_id) for user_id in user_ids if user_id is not None]
+    )
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.devices.models import Device
+from apps.users.models import User
+from apps.users.principal_cache import invalidate_owned_devices, invalidate_principal
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+@receiver(pre_save, sender=Device)
+def remember_device_owner(sender, instance, **kwargs):
+    """Keep the previous owner so a transferred device leaves no stale device set."""
+    if instance.pk is None:
+        instance._previous_user_id = None
+        return
+    instance._previous_user_id = (
+        Device.objects.filter(pk=instance.pk).values_list("user_id", flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Device)
+def invalidate_device_owners(sender, instance, **kwargs):
+    invalidate_owned_devices({instance.user_id, getattr(instance, "_previous_user_id", None)})
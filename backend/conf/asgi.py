@@ -7,14 +7,15 @@ from django.core.asgi import get_asgi_application
 django_asgi_app = get_asgi_application()
 
 from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
-from apps.devices.routing import websocket_urlpatterns  # noqa: E402
+from apps.devices.routing import websocket_urlpatterns as devices_websocket_urls  # noqa: E402
+from apps.rules.routing import websocket_urlpatterns as rules_websocket_urls  # noqa: E402
 from apps.users.middleware.channels_jwt import JWTAuthMiddleware  # noqa: E402
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": JWTAuthMiddleware(
-            URLRouter(websocket_urlpatterns),
+            URLRouter(devices_websocket_urls + rules_websocket_urls),
         ),
     }
 )
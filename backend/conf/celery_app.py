@@ -11,6 +11,7 @@ app.conf.imports = [
     'scripts.DB.delete_chunks',
     'scripts.DB.compress_chunks',
     'apps.rules.tasks',
+    'apps.audit.tasks',
 ] 
 # for logging
 app.conf.worker_hijack_root_logger = False # to keep custom logging; don't hijack root logger
@@ -35,5 +36,43 @@ app.conf.beat_schedule = {
         'task': 'apps.rules.tasks.recover_stuck_deliveries',
         'schedule': crontab(minute='*/2'),
     },
+
+    'dispatch-due-deliveries-every-5-secs': {
+        'task': 'apps.rules.tasks.dispatch_due_deliveries',
+        'schedule': 5.0,
+    },
+
+    'archive-finished-deliveries-hourly': {
+        'task': 'apps.rules.tasks.archive_finished_deliveries',
+        'schedule': crontab(minute=15),
+    },
+
+    # events and audit_logs are plain tables, old rows are deleted in batches
+    'prune-expired-events-daily-3-30am': {
+        'task': 'apps.rules.tasks.prune_expired_events',
+        'schedule': crontab(hour=3, minute=30),
+    },
+
+    'prune-expired-audit-logs-daily-3-45am': {
+        'task': 'apps.audit.tasks.prune_expired_audit_logs',
+        'schedule': crontab(hour=3, minute=45),
+    },
+
+    'sync-unacknowledged-events-gauge-every-10-mins': {
+        'task': 'apps.rules.tasks.sync_unacknowledged_events_gauge',
+        'schedule': crontab(minute='*/10'),
+    },
 }
 
+
+@app.on_after_configure.connect
+def setup_email_digest_schedule(sender, **kwargs):
+    from django.conf import settings
+
+    # the digest window is a Django setting, so the entry is added once settings are loaded
+    if settings.EMAIL_DIGEST_WINDOW_SECONDS:
+        sender.add_periodic_task(
+            settings.EMAIL_DIGEST_WINDOW_SECONDS,
+            sender.signature('apps.rules.tasks.send_email_digests'),
+            name='send-email-digests',
+        )
@@ -205,6 +205,13 @@ CORS_ALLOW_HEADERS = [
 
 # Cache conf 
 RULES_CACHE_TTL = config("RULES_CACHE_TTL", default = 86400, cast=int) # default = 24h
+# process-local cache of JWT principals (user by token sub) and their owned device sets;
+# entries are dropped on user/device changes in the same process, other processes after the TTL
+AUTH_CACHE_TTL = config('AUTH_CACHE_TTL', default=30, cast=int)
+AUTH_CACHE_MAX_ENTRIES = config('AUTH_CACHE_MAX_ENTRIES', default=10000, cast=int)
+RULES_STATE_TTL = config("RULES_STATE_TTL", default=7 * 86400, cast=int)  # default = 7d
+# seconds a serialized GET response is reused for the same user, query and data generation (0 = off)
+API_RESPONSE_CACHE_TTL = config("API_RESPONSE_CACHE_TTL", default=0, cast=int)
 
 CACHES = {
     'default': {
@@ -219,7 +226,23 @@ CACHES = {
         "OPTIONS": {
             "password": REDIS_PASSWORD,
     }
-    }
+    },
+    "api": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/2",
+        "KEY_PREFIX": "api",
+        "OPTIONS": {
+            "password": REDIS_PASSWORD,
+        },
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+        "TIMEOUT": AUTH_CACHE_TTL,
+        "OPTIONS": {
+            "MAX_ENTRIES": AUTH_CACHE_MAX_ENTRIES,
+        },
+    },
 }
 
 # Rate limit: load from env JSON for scalability; defaults preserved when RATE_LIMIT_CONFIG_JSON unset
@@ -275,6 +298,35 @@ CELERY_RESULT_EXPIRES = 60 * 60
 
 RULES_ALLOW_WEBHOOKS = config('RULES_ALLOW_WEBHOOKS', default=False, cast=bool)
 
+# Async webhook delivery worker (python -m apps.rules.webhooks.run_webhook_worker).
+# When enabled, webhook deliveries are no longer dispatched to Celery.
+WEBHOOK_WORKER_ENABLED = config('WEBHOOK_WORKER_ENABLED', default=False, cast=bool)
+WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=10.0, cast=float)
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = config('WEBHOOK_MAX_CONNECTIONS_PER_HOST', default=10, cast=int)
+WEBHOOK_MAX_IN_FLIGHT = config('WEBHOOK_MAX_IN_FLIGHT', default=1000, cast=int)
+WEBHOOK_CLAIM_BATCH_SIZE = config('WEBHOOK_CLAIM_BATCH_SIZE', default=200, cast=int)
+WEBHOOK_POLL_INTERVAL_SECONDS = config('WEBHOOK_POLL_INTERVAL_SECONDS', default=1.0, cast=float)
+WEBHOOK_BREAKER_FAILURE_THRESHOLD = config('WEBHOOK_BREAKER_FAILURE_THRESHOLD', default=5, cast=int)
+WEBHOOK_BREAKER_RESET_SECONDS = config('WEBHOOK_BREAKER_RESET_SECONDS', default=60.0, cast=float)
+
+# Delivery scheduler (dispatch_due_deliveries) and archiving of finished deliveries
+DELIVERY_SCHEDULER_BATCH_SIZE = config('DELIVERY_SCHEDULER_BATCH_SIZE', default=500, cast=int)
+DELIVERY_SCHEDULER_MAX_BATCHES = config('DELIVERY_SCHEDULER_MAX_BATCHES', default=20, cast=int)
+# how long the scheduler leaves a new delivery to its immediately dispatched task
+DELIVERY_PENDING_GRACE_SECONDS = config('DELIVERY_PENDING_GRACE_SECONDS', default=60, cast=int)
+DELIVERY_ARCHIVE_AFTER_HOURS = config('DELIVERY_ARCHIVE_AFTER_HOURS', default=24, cast=int)
+DELIVERY_ARCHIVE_BATCH_SIZE = config('DELIVERY_ARCHIVE_BATCH_SIZE', default=5000, cast=int)
+
+# Retention of the plain events and audit_logs tables (prune_expired_* beat tasks), 0 keeps rows forever
+EVENTS_RETENTION_DAYS = config('EVENTS_RETENTION_DAYS', default=365, cast=int)
+AUDIT_LOG_RETENTION_DAYS = config('AUDIT_LOG_RETENTION_DAYS', default=730, cast=int)
+RETENTION_DELETE_BATCH_SIZE = config('RETENTION_DELETE_BATCH_SIZE', default=5000, cast=int)
+
+# Audit outbox relay (relay_audit_outbox command)
+AUDIT_OUTBOX_BATCH_SIZE = config('AUDIT_OUTBOX_BATCH_SIZE', default=1000, cast=int)
+# seconds the relay sleeps when the outbox is empty
+AUDIT_OUTBOX_POLL_INTERVAL = config('AUDIT_OUTBOX_POLL_INTERVAL', default=0.5, cast=float)
+
 # scheduler conf
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
@@ -379,6 +431,54 @@ LOGGING = {
 # ???
 TELEMETRY_SYNC_HEADER = 'Ingest-Sync'
 TELEMETRY_MAX_AGE_SECONDS = config('TELEMETRY_MAX_AGE_SECONDS', default=3600, cast=int)
+# max [ts_offset, value] samples per metric of a schema_version 2 telemetry message
+TELEMETRY_MAX_SAMPLES_PER_METRIC = config(
+    'TELEMETRY_MAX_SAMPLES_PER_METRIC', default=3600, cast=int
+)
+# NDJSON telemetry ingest (Content-Type: application/x-ndjson): records per Kafka produce batch,
+# max bytes of one line, and max per-line errors reported in the response
+TELEMETRY_NDJSON_BATCH_SIZE = config('TELEMETRY_NDJSON_BATCH_SIZE', default=500, cast=int)
+TELEMETRY_NDJSON_MAX_LINE_BYTES = config(
+    'TELEMETRY_NDJSON_MAX_LINE_BYTES', default=1048576, cast=int
+)
+TELEMETRY_INGEST_MAX_ERRORS = config('TELEMETRY_INGEST_MAX_ERRORS', default=100, cast=int)
+# max decoded NDJSON body, seconds a request may wait for space in the producer queue
+TELEMETRY_NDJSON_MAX_BODY_BYTES = config(
+    'TELEMETRY_NDJSON_MAX_BODY_BYTES', default=268435456, cast=int
+)
+TELEMETRY_NDJSON_PRODUCE_TIMEOUT = config(
+    'TELEMETRY_NDJSON_PRODUCE_TIMEOUT', default=30.0, cast=float
+)
+# Redis pub/sub channel the WebSocket telemetry hub of every ASGI process subscribes to
+TELEMETRY_STREAM_CHANNEL = config('TELEMETRY_STREAM_CHANNEL', default='telemetry.stream')
+# Redis pub/sub channel the WebSocket event hub of every ASGI process subscribes to
+EVENTS_STREAM_CHANNEL = config('EVENTS_STREAM_CHANNEL', default='events.stream')
+# max events acknowledged per bulk acknowledge request, event ids per stream_event_acks task
+EVENTS_BULK_ACK_MAX_ROWS = config('EVENTS_BULK_ACK_MAX_ROWS', default=5000, cast=int)
+EVENTS_STREAM_ACK_CHUNK_SIZE = config('EVENTS_STREAM_ACK_CHUNK_SIZE', default=500, cast=int)
+# seconds the latest frame per series is kept for WebSocket subscribe snapshots
+TELEMETRY_LAST_VALUE_TTL = config('TELEMETRY_LAST_VALUE_TTL', default=86400, cast=int)
+# max device/metric series a single WebSocket connection may subscribe to
+TELEMETRY_WS_MAX_SERIES = config('TELEMETRY_WS_MAX_SERIES', default=200, cast=int)
+# WebSocket replay ("since" in subscribe messages): rows per server-side cursor chunk and frame,
+# max points per replay, and seconds live duplicates of replayed points are dropped after it
+TELEMETRY_WS_REPLAY_CHUNK_SIZE = config('TELEMETRY_WS_REPLAY_CHUNK_SIZE', default=500, cast=int)
+TELEMETRY_WS_REPLAY_MAX_POINTS = config('TELEMETRY_WS_REPLAY_MAX_POINTS', default=50000, cast=int)
+TELEMETRY_WS_REPLAY_DEDUPE_SECONDS = config(
+    'TELEMETRY_WS_REPLAY_DEDUPE_SECONDS', default=60, cast=int
+)
+# Per-connection WebSocket delivery (?mode=stream|batch|latest&interval_ms=&max_rate=):
+# frames buffered per connection before the oldest are dropped, default and minimum flush
+# interval of the batch/latest modes, and the default cap of frames per second (0 = no cap)
+TELEMETRY_WS_BUFFER_SIZE = config('TELEMETRY_WS_BUFFER_SIZE', default=1000, cast=int)
+TELEMETRY_WS_INTERVAL_MS = config('TELEMETRY_WS_INTERVAL_MS', default=250, cast=int)
+TELEMETRY_WS_MIN_INTERVAL_MS = config('TELEMETRY_WS_MIN_INTERVAL_MS', default=50, cast=int)
+TELEMETRY_WS_MAX_RATE = config('TELEMETRY_WS_MAX_RATE', default=0, cast=float)
 
 # For development/testing, use console email backend to avoid sending real emails
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Email notification digests: when > 0, pending email deliveries are grouped per recipient
+# and sent as one digest every EMAIL_DIGEST_WINDOW_SECONDS instead of one email per event
+EMAIL_DIGEST_WINDOW_SECONDS = config('EMAIL_DIGEST_WINDOW_SECONDS', default=0, cast=int)
+EMAIL_DIGEST_BATCH_SIZE = config('EMAIL_DIGEST_BATCH_SIZE', default=1000, cast=int)
@@ -5,6 +5,7 @@ import os
 import django
 import pytest
 from django.conf import settings
+from django.core.cache import caches
 from django.test import Client
 
 
@@ -25,3 +26,10 @@ def client():
 def api_client():
     """HTTP test client for API endpoint testing."""
     return Client()
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Principals cached by one test must not authenticate requests of the next."""
+    yield
+    caches["auth"].clear()
@@ -14,7 +14,7 @@ from utils.logging import setup_logging
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conf.settings')
 django.setup()
 
-from apps.audit.services.audit_log_services import audit_log_create_batch  # noqa
+from apps.audit.services.audit_log_services import audit_log_insert_batch  # noqa
 
 TOPIC = config('KAFKA_TOPIC_AUDIT_RECORDS', default='audit.records')
 CONSUME_TIMEOUT = config('KAFKA_CONSUMER_CONSUME_TIMEOUT', default=1.0, cast=float)
@@ -36,11 +36,17 @@ class AuditRecordWriter:
             return
 
         s = AuditLogBatchSerializer(payload)
-        if not s.is_valid() and not s.valid_items:
-            logger.warning('Telemetry ingestion task rejected: errors=%s', len(s.errors))
+        if not s.is_valid():
+            logger.warning('Audit records rejected: invalid=%s', len(s.item_errors))
+        if not s.valid_items:
             return
 
-        audit_log_create_batch(s.valid_items)
+        result = audit_log_insert_batch(s.valid_items)
+        logger.info(
+            'Audit records written: created=%s duplicates=%s',
+            result.created,
+            result.duplicates,
+        )
 
 
 def main():
@@ -13,6 +13,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conf.settings')
 django.setup()
 
 from apps.common.redis_client import get_redis_client  # noqa
+from apps.devices.services.telemetry_samples import expand_sample_rows  # noqa
 from apps.rules.tasks import evaluate_rule  # noqa
 
 
@@ -38,11 +39,11 @@ class RuleEvalHandler:
         self.rule_runner = rule_runner
 
     def handle(self, payload):
-        if isinstance(payload, list):
-            for item in payload:
-                self._handle_single(item)
-        else:
-            self._handle_single(payload)
+        if not isinstance(payload, list):
+            payload = [payload]
+        # compact schema_version 2 records are evaluated sample by sample
+        for item in expand_sample_rows(payload):
+            self._handle_single(item)
 
     def _handle_single(self, item):
         try:
@@ -19,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 TOPIC = config("KAFKA_TOPIC_TELEMETRY_CLEAN", default="telemetry.clean")
 CONSUME_TIMEOUT = config("KAFKA_CONSUMER_CONSUME_TIMEOUT", default=1.0, cast=float)
+BATCH_MAX_SIZE = config("KAFKA_CONSUMER_BATCH_MAX_SIZE", default=100, cast=int)
 
 
 def main() -> None:
@@ -29,6 +30,8 @@ def main() -> None:
         handler=WebSocketTelemetryCleanHandler(),
         consume_timeout=CONSUME_TIMEOUT,
         decode_json=True,
+        consume_batch=True,
+        batch_max_size=BATCH_MAX_SIZE,
     )
     signal.signal(signal.SIGTERM, consumer.stop)
     signal.signal(signal.SIGINT, consumer.stop)
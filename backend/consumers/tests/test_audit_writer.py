@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+
+from apps.audit.models import AuditLog
+from consumers.audit_writer import AuditRecordWriter
+
+
+def record(**overrides):
+    payload = {
+        'audit_event_id': str(uuid.uuid4()),
+        'entity_type': 'rules.Rule',
+        'entity_id': '42',
+        'event_type': 'rules.RULE_UPDATED',
+        'actor_type': 'user',
+        'actor_id': '7',
+        'occurred_at': '2026-02-04T12:00:00Z',
+        'details': {'changed_fields': ['name']},
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.django_db
+class TestAuditRecordWriter:
+    def test_writes_valid_records_and_skips_invalid_ones(self):
+        valid = record()
+
+        AuditRecordWriter().handle([valid, record(audit_event_id='not-a-uuid')])
+
+        assert list(AuditLog.objects.values_list('audit_event_id', flat=True)) == [
+            uuid.UUID(valid['audit_event_id'])
+        ]
+
+    def test_redelivered_records_are_logged_as_duplicates(self, caplog):
+        batch = [record(), record()]
+        AuditRecordWriter().handle(batch)
+
+        with caplog.at_level('INFO', logger='consumers.audit_writer'):
+            AuditRecordWriter().handle(batch)
+
+        assert AuditLog.objects.count() == 2
+        assert 'created=0 duplicates=2' in caplog.text
+
+    def test_single_record_payload(self):
+        AuditRecordWriter().handle(record())
+
+        assert AuditLog.objects.count() == 1
@@ -15,3 +15,5 @@ class MqttConfig:
     password: str = config('MQTT_PASSWORD', 'change-me-password-insecure')
     min_reconnect_delay: int = config('MQTT_MIN_RECONNECT_DELAY', default='1', cast=int)
     max_reconnect_delay: int = config('MQTT_MAX_RECONNECT_DELAY', default='120', cast=int)
+    # 4 = MQTT 3.1.1, 5 = MQTT 5 (payload content type property)
+    protocol: int = config('MQTT_PROTOCOL_VERSION', default='4', cast=int)
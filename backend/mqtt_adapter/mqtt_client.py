@@ -1,4 +1,3 @@
-import json
 import logging
 import time
 from dataclasses import dataclass
@@ -8,6 +7,14 @@ import paho.mqtt.client as mqtt
 
 from .config import MqttConfig
 from .message_handlers import MQTTJsonMessage, MessageHandler
+from utils.payload_codecs import (
+    BINARY_FORMATS,
+    JSON,
+    PayloadDecodeError,
+    content_type_format,
+    decode_payload,
+    topic_format,
+)
 
 # Import Prometheus metrics
 from apps.common.metrics import (
@@ -23,16 +30,26 @@ logger = logging.getLogger(__name__)
 class MqttCallbacks:
     """
     Container for Paho MQTT client callbacks.
-    Subscribes to the configured topic on successful connect;
-    Decodes JSON payload and passes it to MessageHandler instance;
-    Rejects malformed/non-JSON messages.
+    Subscribes to the configured topic on successful connect, and to its
+    /msgpack and /cbor sub-topics;
+    Decodes the payload and passes it to MessageHandler instance. The payload
+    format comes from the MQTT v5 content type property if set, else from the
+    topic suffix (telemetry/msgpack, telemetry/cbor), else it is JSON;
+    Rejects malformed messages and messages that are not an object or array.
     Collects Prometheus metrics for monitoring.
     """
 
     config: MqttConfig
     handler: MessageHandler
 
-    def on_connect(self, c: mqtt.Client, userdata: Any, flags: dict[str, Any], rc: int) -> None:
+    def on_connect(
+        self,
+        c: mqtt.Client,
+        userdata: Any,
+        flags: dict[str, Any],
+        rc: int,
+        properties: Any = None,
+    ) -> None:
         if rc != 0:
             logger.error(
                 'MQTT connect failed: rc=%s host=%s port=%s',
@@ -42,16 +59,19 @@ class MqttCallbacks:
             )
             return
 
+        topics = self._topics()
         logger.info(
-            'Connected to MQTT broker %s:%s. Subscribing to topic=%s qos=%s',
+            'Connected to MQTT broker %s:%s. Subscribing to topics=%s qos=%s',
             self.config.host,
             self.config.port,
-            self.config.topic,
+            topics,
             self.config.qos,
         )
-        c.subscribe(self.config.topic, qos=self.config.qos)
+        c.subscribe([(topic, self.config.qos) for topic in topics])
 
-    def on_disconnect(self, c: mqtt.Client, userdata: Any, rc: int) -> None:
+    def on_disconnect(
+        self, c: mqtt.Client, userdata: Any, rc: int, properties: Any = None
+    ) -> None:
         if rc != 0:
             logger.warning('Unexpected MQTT disconnect: rc=%s', rc)
         else:
@@ -64,13 +84,14 @@ class MqttCallbacks:
         """
         start_time = time.perf_counter()
 
-        # Parse JSON payload
-        obj = self._payload_to_json(m.payload)
+        # Parse JSON / MessagePack / CBOR payload
+        payload_format = self._payload_format(m)
+        obj = self._decode_payload(m.payload, payload_format)
 
         if obj is None:
             # Track parse errors
             ingestion_errors_total.labels(source='mqtt', error_type='parse_error').inc()
-            logger.warning('Invalid JSON object rejected.', extra=self._extra(m))
+            logger.warning('Invalid %s object rejected.', payload_format, extra=self._extra(m))
             return
 
         logger.info('MQTT message received.', extra=self._extra(m))
@@ -95,14 +116,31 @@ class MqttCallbacks:
             latency = time.perf_counter() - start_time
             ingestion_latency_seconds.labels(source='mqtt').observe(latency)
 
+    def _topics(self) -> list[str]:
+        """The configured topic and its sub-topics selecting a binary payload format."""
+        topic = self.config.topic
+        if topic.endswith('#'):
+            return [topic]
+        return [topic, *(f'{topic}/{payload_format}' for payload_format in BINARY_FORMATS)]
+
     @staticmethod
-    def _payload_to_json(payload: bytes) -> dict | list | None:
+    def _payload_format(m: mqtt.MQTTMessage) -> str:
+        content_type = getattr(getattr(m, 'properties', None), 'ContentType', None)
+        if isinstance(content_type, str) and content_type:
+            return content_type_format(content_type)
+        return topic_format(m.topic)
+
+    @staticmethod
+    def _decode_payload(payload: bytes, payload_format: str) -> dict | list | None:
         try:
-            text = payload.decode('utf-8')
-            obj = json.loads(text)
-            return obj if isinstance(obj, (dict, list)) else None
-        except (UnicodeDecodeError, json.JSONDecodeError):
+            obj = decode_payload(payload, payload_format)
+        except PayloadDecodeError:
             return None
+        return obj if isinstance(obj, (dict, list)) else None
+
+    @staticmethod
+    def _payload_to_json(payload: bytes) -> dict | list | None:
+        return MqttCallbacks._decode_payload(payload, JSON)
 
     @staticmethod
     def _extra(m: mqtt.MQTTMessage) -> dict[str, Any]:
@@ -133,7 +171,7 @@ def apply_mqtt_auth(client: mqtt.Client, config: MqttConfig) -> None:
 
 
 def build_client(config: MqttConfig, callbacks: MqttCallbacks) -> mqtt.Client:
-    client = mqtt.Client(client_id=config.client_id)
+    client = mqtt.Client(client_id=config.client_id, protocol=config.protocol)
     apply_mqtt_auth(client=client, config=config)
 
     client.on_connect = callbacks.on_connect
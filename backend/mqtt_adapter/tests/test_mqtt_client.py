@@ -1,5 +1,7 @@
 from unittest.mock import Mock, create_autospec, patch
 
+import cbor2
+import msgpack
 import pytest
 
 import logging
@@ -82,7 +84,19 @@ def test_on_connect_subscribes_on_success(config, handler):
     client = Mock()
     callbacks.on_connect(client, userdata=None, flags={}, rc=0)
 
-    client.subscribe.assert_called_once_with(config.topic, qos=config.qos)
+    client.subscribe.assert_called_once_with(
+        [('telemetry', 1), ('telemetry/msgpack', 1), ('telemetry/cbor', 1)]
+    )
+
+
+def test_on_connect_wildcard_topic_is_subscribed_alone(handler):
+    """Test a multi-level wildcard topic already covers the format sub-topics."""
+    callbacks = MqttCallbacks(config=MqttConfig(topic='devices/#', qos=0), handler=handler)
+    client = Mock()
+
+    callbacks.on_connect(client, userdata=None, flags={}, rc=0)
+
+    client.subscribe.assert_called_once_with([('devices/#', 0)])
 
 
 def test_on_connect_does_not_subscribe_on_error(config, handler):
@@ -109,6 +123,44 @@ def test_on_message_calls_handler_on_valid_json(config, handler):
     assert args[0].payload['device'] == 'DEV-001'
 
 
+@pytest.mark.parametrize(
+    'topic, content_type, payload',
+    [
+        ('telemetry/msgpack', None, msgpack.packb({'device': 'DEV-001', 'ts': 1})),
+        ('telemetry/cbor', None, cbor2.dumps({'device': 'DEV-001', 'ts': 1})),
+        ('telemetry', 'application/msgpack', msgpack.packb({'device': 'DEV-001', 'ts': 1})),
+        ('telemetry', 'application/cbor; x=1', cbor2.dumps({'device': 'DEV-001', 'ts': 1})),
+        ('telemetry/cbor', 'application/json', b'{"device": "DEV-001", "ts": 1}'),
+    ],
+)
+def test_on_message_negotiates_payload_format(config, handler, topic, content_type, payload):
+    """Test the v5 content type, else the topic suffix, selects the payload format."""
+    callbacks = MqttCallbacks(config=config, handler=handler)
+    message = mqtt_message(payload, topic=topic)
+    message.properties = Mock(ContentType=content_type) if content_type else None
+
+    callbacks.on_message(Mock(), userdata=None, m=message)
+
+    handler.handle.assert_called_once()
+    assert handler.handle.call_args.args[0].payload == {'device': 'DEV-001', 'ts': 1}
+
+
+@pytest.mark.parametrize(
+    'topic, payload',
+    [
+        ('telemetry/msgpack', b'{"device": "DEV-001"}'),
+        ('telemetry/msgpack', msgpack.packb(1)),
+        ('telemetry/cbor', b'\xa1'),
+    ],
+)
+def test_on_message_rejects_invalid_binary_payload(config, handler, topic, payload):
+    callbacks = MqttCallbacks(config=config, handler=handler)
+
+    callbacks.on_message(Mock(), userdata=None, m=mqtt_message(payload, topic=topic))
+
+    handler.handle.assert_not_called()
+
+
 def test_on_message_does_not_call_handler_on_invalid_json(config, handler):
     """
     Test on_message rejects invalid payload
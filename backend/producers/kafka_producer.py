@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, Callable, Iterable, Optional
 from enum import Enum
 
 from confluent_kafka import Producer, Message, KafkaException, KafkaError
@@ -9,6 +10,12 @@ from producers.config import ProducerConfig
 
 logger = logging.getLogger(__name__)
 
+# called with the index of the message in its batch and the delivery error (None if delivered)
+DeliveryCallback = Callable[[int, Optional[KafkaError]], None]
+
+# longest single poll() while waiting for space in a full local queue
+BUFFER_FULL_POLL_SECONDS = 0.1
+
 
 class ProduceResult(Enum):
     ENQUEUED = 'enqueued'
@@ -48,37 +55,104 @@ class KafkaProducer:
             BUFFER_FULL - producer queue is full;
             PRODUCER_ERROR - producer error occurred.
         """
-        value = self._encode_payload(payload)
-        if value is None:
-            return ProduceResult.SERIALIZATION_FAILED
+        try:
+            return self._enqueue(payload, key)
+        finally:
+            self._producer.poll(self._poll_timeout)
 
-        key_bytes = self._encode_key(key)
+    def produce_batch(
+        self,
+        messages: Iterable[tuple[Any, Any]],
+        *,
+        on_delivery: Optional[DeliveryCallback] = None,
+    ) -> list[ProduceResult]:
+        """
+        Produce (payload, key) pairs to the configured Kafka topic asynchronously.
+
+        Same semantics as produce(), but delivery callbacks are served with a single
+        poll after the whole batch is enqueued. Returns one ProduceResult per message.
+
+        on_delivery, if given, is called from poll()/flush() with the index of every
+        enqueued message and its delivery error (None once the broker acknowledged it).
+        """
+        try:
+            return [
+                self._enqueue(payload, key, self._indexed_callback(on_delivery, index))
+                for index, (payload, key) in enumerate(messages)
+            ]
+        finally:
+            self._producer.poll(self._poll_timeout)
 
+    def produce_raw_batch(
+        self,
+        messages: Iterable[tuple[bytes, Any]],
+        *,
+        deadline: Optional[float] = None,
+    ) -> list[ProduceResult]:
+        """
+        Produce already serialized (value, key) pairs to the configured Kafka topic.
+
+        Values are sent as given, without JSON encoding; delivery callbacks are
+        served with a single poll after the whole batch is enqueued.
+        Returns one ProduceResult per message.
+
+        deadline, a time.monotonic() value, applies backpressure: while the local
+        queue is full, delivery reports are polled to free space and the message
+        is retried until the deadline, BUFFER_FULL is only returned after it.
+        """
         try:
-            self._producer.produce(
-                topic=self._topic,
-                value=value,
-                key=key_bytes,
-                on_delivery=self._delivery_report,
-            )
-            result = ProduceResult.ENQUEUED
-        except BufferError:
-            self._dropped_messages += 1
-            self._producer.poll(0)
-            logger.warning('Kafka producer local buffer full. Dropped: %s', self._dropped_messages)
-            result = ProduceResult.BUFFER_FULL
-        except KafkaException:
-            logger.exception('Kafka produce failed.')
-            result = ProduceResult.PRODUCER_ERROR
+            return [self._enqueue_value(value, key, deadline=deadline) for value, key in messages]
         finally:
             self._producer.poll(self._poll_timeout)
 
-        return result
+    def _enqueue(
+        self, payload: Any, key: Any, on_delivery: Optional[Callable] = None
+    ) -> ProduceResult:
+        value = self._encode_payload(payload)
+        if value is None:
+            return ProduceResult.SERIALIZATION_FAILED
+        return self._enqueue_value(value, key, on_delivery)
+
+    def _enqueue_value(
+        self,
+        value: bytes,
+        key: Any,
+        on_delivery: Optional[Callable] = None,
+        deadline: Optional[float] = None,
+    ) -> ProduceResult:
+        key_bytes = self._encode_key(key)
 
-    def flush(self, timeout: float = 2.0) -> None:
-        """Graceful shutdown: flush pending messages."""
-        logger.info('Shutting down the producer...')
-        self._producer.flush(timeout)
+        while True:
+            try:
+                self._producer.produce(
+                    topic=self._topic,
+                    value=value,
+                    key=key_bytes,
+                    on_delivery=on_delivery or self._delivery_report,
+                )
+                return ProduceResult.ENQUEUED
+            except BufferError:
+                remaining = deadline - time.monotonic() if deadline is not None else 0
+                if remaining > 0:
+                    self._producer.poll(min(remaining, BUFFER_FULL_POLL_SECONDS))
+                    continue
+                self._dropped_messages += 1
+                self._producer.poll(0)
+                logger.warning(
+                    'Kafka producer local buffer full. Dropped: %s', self._dropped_messages
+                )
+                return ProduceResult.BUFFER_FULL
+            except KafkaException:
+                logger.exception('Kafka produce failed.')
+                return ProduceResult.PRODUCER_ERROR
+
+    def flush(self, timeout: float = 2.0) -> int:
+        """
+        Wait up to `timeout` seconds for pending messages to be delivered.
+        Returns the number of messages still pending.
+        """
+        logger.debug('Flushing the producer...')
+        return self._producer.flush(timeout)
 
     @staticmethod
     def _encode_payload(payload: Any) -> Optional[bytes]:
@@ -97,6 +171,19 @@ class KafkaProducer:
             return s.encode('utf-8') if s else None
         return str(key).encode('utf-8')
 
+    @classmethod
+    def _indexed_callback(
+        cls, on_delivery: Optional[DeliveryCallback], index: int
+    ) -> Optional[Callable]:
+        if on_delivery is None:
+            return None
+
+        def report(error: KafkaError, message: Message) -> None:
+            cls._delivery_report(error, message)
+            on_delivery(index, error)
+
+        return report
+
     @staticmethod
     def _delivery_report(error: KafkaError, message: Message) -> None:
         extra = {
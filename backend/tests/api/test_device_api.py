@@ -102,6 +102,49 @@ class TestDeviceListAPI:
 
         assert response.status_code == 400
 
+    def test_list_devices_cursor_pagination(self, client):
+        """Test that next_cursor walks all devices in id order without repeats."""
+        user = UserFactory(role="admin")
+        token = create_jwt_token(user)
+        DeviceFactory.create_batch(5)
+
+        seen, cursor = [], None
+        while True:
+            url = "/api/devices/?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}").json()
+            seen += [item["id"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == list(Device.objects.order_by("id").values_list("id", flat=True))
+
+    def test_list_devices_invalid_cursor(self, client):
+        """Test that a malformed cursor returns 400."""
+        user = UserFactory(role="admin")
+        token = create_jwt_token(user)
+
+        response = client.get(
+            "/api/devices/?cursor=%%%",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+        assert response.status_code == 400
+
+    def test_list_devices_without_count(self, client):
+        """Test that count=none skips the total."""
+        user = UserFactory(role="admin")
+        token = create_jwt_token(user)
+        DeviceFactory()
+
+        response = client.get(
+            "/api/devices/?count=none",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] is None
+
 
 class TestDeviceCreateAPI:
     """Tests for POST /api/devices/"""
@@ -0,0 +1,107 @@
+"""Tests for the cached JWT principal and owned device set."""
+
+import asyncio
+
+import jwt
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.middleware.channels_jwt import get_user_from_token
+from apps.users.principal_cache import get_owned_device_serial_ids, get_principal
+from tests.fixtures.factories import DeviceFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def token_for(user, role="client"):
+    return jwt.encode({"sub": user.pk, "role": role}, settings.SECRET_KEY, algorithm="HS256")
+
+
+class TestPrincipalCache:
+    """Tests for get_principal()"""
+
+    def test_user_is_loaded_once(self, django_assert_num_queries):
+        """Test the second lookup of a sub does not query the database."""
+        user = UserFactory()
+
+        with django_assert_num_queries(1):
+            assert get_principal(user.pk).pk == user.pk
+        with django_assert_num_queries(0):
+            assert get_principal(user.pk).pk == user.pk
+
+    def test_user_change_invalidates_principal(self):
+        """Test a saved user is reloaded on the next lookup."""
+        user = UserFactory(is_active=True)
+        get_principal(user.pk)
+
+        user.is_active = False
+        user.save()
+
+        assert get_principal(user.pk).is_active is False
+
+    def test_api_requests_reuse_cached_principal(self, client):
+        """Test jwt_required resolves the user from the cache after the first request."""
+        user = UserFactory(role="client")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token_for(user)}"}
+        assert client.get("/api/devices/", **headers).status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get("/api/devices/", **headers).status_code == 200
+
+        assert all('FROM "users"' not in query["sql"] for query in queries.captured_queries)
+
+
+class TestOwnedDeviceCache:
+    """Tests for get_owned_device_serial_ids()"""
+
+    def test_device_set_is_loaded_once(self, django_assert_num_queries):
+        """Test the owned devices of a user are queried once."""
+        device = DeviceFactory(is_active=True)
+
+        with django_assert_num_queries(1):
+            assert get_owned_device_serial_ids(device.user_id) == {device.serial_id}
+        with django_assert_num_queries(0):
+            get_owned_device_serial_ids(device.user_id)
+
+    def test_device_transfer_invalidates_both_owners(self):
+        """Test moving a device to another user refreshes both device sets."""
+        device = DeviceFactory(is_active=True)
+        new_owner = UserFactory()
+        previous_owner_id = device.user_id
+        get_owned_device_serial_ids(previous_owner_id)
+        get_owned_device_serial_ids(new_owner.pk)
+
+        device.user = new_owner
+        device.save()
+
+        assert get_owned_device_serial_ids(previous_owner_id) == frozenset()
+        assert get_owned_device_serial_ids(new_owner.pk) == {device.serial_id}
+
+
+class TestChannelsMiddleware:
+    """Tests for get_user_from_token()"""
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cached_principal_is_resolved_without_query(self, django_assert_num_queries):
+        """Test a warm principal is returned without a database query."""
+        user = UserFactory(is_active=True)
+        get_principal(user.pk)
+
+        with django_assert_num_queries(0):
+            resolved, role = asyncio.run(get_user_from_token(token_for(user, "admin")))
+
+        assert resolved.pk == user.pk
+        assert role == "admin"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_inactive_user_is_anonymous(self):
+        """Test tokens of deactivated users are rejected."""
+        user = UserFactory(is_active=False)
+
+        resolved, role = asyncio.run(get_user_from_token(token_for(user)))
+
+        assert isinstance(resolved, AnonymousUser)
+        assert role is None
@@ -0,0 +1,141 @@
+"""API tests for ETag / conditional GET on the read endpoints."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.rules.models import Event
+from apps.rules.services.event_service import event_bulk_create
+from tests.fixtures.factories import DeviceFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def locmem_api_cache():
+    caches_config = {k: v for k, v in settings.CACHES.items() if k != "api"}
+    caches_config["api"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    with override_settings(CACHES=caches_config):
+        caches["api"].clear()
+        yield
+
+
+def create_jwt_token(user):
+    exp = datetime.now(timezone.utc) + timedelta(hours=1)
+    payload = {"sub": user.id, "role": user.role, "exp": int(exp.timestamp())}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+
+@pytest.fixture
+def user():
+    return UserFactory(role="admin")
+
+
+@pytest.fixture
+def auth(user):
+    return {"HTTP_AUTHORIZATION": f"Bearer {create_jwt_token(user)}"}
+
+
+class TestConditionalGet:
+    def test_response_has_etag(self, client, auth):
+        response = client.get("/api/events/", **auth)
+
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_matching_etag_returns_304_without_running_the_view(self, client, auth):
+        etag = client.get("/api/events/", **auth)["ETag"]
+
+        with patch("apps.rules.views.event_views.event_list") as event_list:
+            response = client.get("/api/events/", HTTP_IF_NONE_MATCH=etag, **auth)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        event_list.assert_not_called()
+
+    def test_new_event_changes_etag(self, client, auth, django_capture_on_commit_callbacks):
+        etag = client.get("/api/events/", **auth)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Event.objects.create(rule=1)
+
+        response = client.get("/api/events/", HTTP_IF_NONE_MATCH=etag, **auth)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.json()["count"] == 1
+
+    def test_bulk_event_insert_changes_etag(
+        self, client, auth, django_capture_on_commit_callbacks
+    ):
+        etag = client.get("/api/events/", **auth)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            event_bulk_create(events=[Event(rule=1), Event(rule=2)])
+
+        response = client.get("/api/events/", HTTP_IF_NONE_MATCH=etag, **auth)
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+
+    def test_bump_waits_for_commit(self, client, auth, django_capture_on_commit_callbacks):
+        etag = client.get("/api/devices/", **auth)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=False):
+            DeviceFactory()
+            uncommitted = client.get("/api/devices/", **auth)["ETag"]
+
+        assert uncommitted == etag
+
+    def test_etag_is_per_user(self, client, auth):
+        other = {"HTTP_AUTHORIZATION": f"Bearer {create_jwt_token(UserFactory(role='admin'))}"}
+
+        assert (
+            client.get("/api/rules/", **auth)["ETag"] != client.get("/api/rules/", **other)["ETag"]
+        )
+
+    def test_etag_is_per_query(self, client, auth):
+        first = client.get("/api/devices/?limit=1", **auth)["ETag"]
+        second = client.get("/api/devices/?limit=2", **auth)["ETag"]
+
+        assert first != second
+
+    def test_cache_unavailable_serves_without_etag(self, client, auth):
+        with patch("apps.common.utils.response_cache.get_generations", return_value=None):
+            response = client.get("/api/devices/", **auth)
+
+        assert response.status_code == 200
+        assert "ETag" not in response
+
+    def test_error_responses_have_no_etag(self, client, auth):
+        response = client.get("/api/devices/?limit=0", **auth)
+
+        assert response.status_code == 400
+        assert "ETag" not in response
+
+
+class TestResponseBodyCache:
+    @override_settings(API_RESPONSE_CACHE_TTL=5)
+    def test_cached_body_skips_the_queries(self, client, auth, user):
+        DeviceFactory.create_batch(3, user=user)
+        first = client.get("/api/devices/", **auth)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get("/api/devices/", **auth)
+
+        assert second.json() == first.json()
+        assert not any("devices" in q["sql"] for q in queries.captured_queries)
+
+    @override_settings(API_RESPONSE_CACHE_TTL=0)
+    def test_body_cache_can_be_disabled(self, client, auth):
+        client.get("/api/devices/", **auth)
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get("/api/devices/", **auth)
+
+        assert any("devices" in q["sql"] for q in queries.captured_queries)
@@ -69,7 +69,7 @@ def dm_door(device, door_metric):
 # ──────────────────────────────────────────────
 
 
-@patch('apps.devices.services.telemetry_services.publish_telemetry_event')
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
 @patch("apps.common.checker.idempotency_store.redis.Redis", fakeredis.FakeRedis)
 class TestSinglePayload:
     """E2E tests for single dict payloads."""
@@ -139,7 +139,7 @@ class TestSinglePayload:
 # ──────────────────────────────────────────────
 
 
-@patch('apps.devices.services.telemetry_services.publish_telemetry_event')
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
 @patch("apps.common.checker.idempotency_store.redis.Redis", fakeredis.FakeRedis)
 class TestBatchPayload:
     """E2E tests for batch (list) payloads."""
@@ -204,7 +204,7 @@ class TestBatchPayload:
 # ──────────────────────────────────────────────
 
 
-@patch('apps.devices.services.telemetry_services.publish_telemetry_event')
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
 class TestValidationErrors:
     """E2E tests for payloads that fail validation."""
 
@@ -264,7 +264,7 @@ class TestValidationErrors:
 # ──────────────────────────────────────────────
 
 
-@patch('apps.devices.services.telemetry_services.publish_telemetry_event')
+@patch('apps.devices.tasks.stream_telemetry_rows.delay')
 class TestEdgeCases:
     """E2E tests for edge cases."""
 
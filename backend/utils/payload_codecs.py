@@ -0,0 +1,59 @@
+import json
+from typing import Any, Optional
+
+import cbor2
+import msgpack
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+CBOR = 'cbor'
+
+BINARY_FORMATS = (MSGPACK, CBOR)
+
+CONTENT_TYPES = {
+    'application/json': JSON,
+    'application/msgpack': MSGPACK,
+    'application/x-msgpack': MSGPACK,
+    'application/vnd.msgpack': MSGPACK,
+    'application/cbor': CBOR,
+}
+
+
+class PayloadDecodeError(ValueError):
+    pass
+
+
+def content_type_format(content_type: Optional[str]) -> str:
+    """
+    Payload format of a media type (parameters are ignored).
+    Anything but MessagePack or CBOR is JSON, as before content negotiation.
+    """
+    if not content_type:
+        return JSON
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return CONTENT_TYPES.get(media_type, JSON)
+
+
+def topic_format(topic: str) -> str:
+    """Payload format selected by the last MQTT topic level, e.g. telemetry/msgpack."""
+    suffix = topic.rsplit('/', 1)[-1]
+    return suffix if suffix in BINARY_FORMATS else JSON
+
+
+def decode_payload(data: bytes, payload_format: str) -> Any:
+    """
+    Decode a device payload. MessagePack maps and CBOR maps decode to dicts and
+    arrays to lists, the same structure json.loads returns, so serializers and
+    downstream consumers do not depend on the wire format. Binary and extension
+    values have no JSON counterpart and are rejected when records are JSON-encoded.
+
+    Raises PayloadDecodeError on malformed payloads.
+    """
+    try:
+        if payload_format == MSGPACK:
+            return msgpack.unpackb(data, raw=False)
+        if payload_format == CBOR:
+            return cbor2.loads(data)
+        return json.loads(data)
+    except (ValueError, TypeError, EOFError) as e:
+        raise PayloadDecodeError(str(e)) from e
@@ -5,9 +5,10 @@ from typing import Any
 import logging
 from apps.devices.models import Device, DeviceMetric
 from apps.common.checker.redis_checker import build_redis_checker
+from apps.devices.services.telemetry_samples import SAMPLES_FIELD, sample_ts
 from utils.unit_aliases import REVERSE_UNIT_ALIASES
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -196,6 +197,18 @@ class TelemetryBatchValidator(BaseValidator):
                     )
                     continue
 
+                if SAMPLES_FIELD in payload:
+                    self._validate_samples(
+                        index=index,
+                        serial=serial,
+                        ts=ts,
+                        metric_name=metric_name,
+                        unit=unit,
+                        samples=payload[SAMPLES_FIELD],
+                        device_metric_data=device_metric_data,
+                    )
+                    continue
+
                 if not self._value_matches_data_type(value, device_metric_data["data_type"]):
                     self._add_invalid_record(
                         index=index,
@@ -232,15 +245,76 @@ class TelemetryBatchValidator(BaseValidator):
                     unit,
                 )
 
+    def _validate_samples(
+        self,
+        *,
+        index: int,
+        serial: str,
+        ts: datetime,
+        metric_name: str,
+        unit: str,
+        samples: list[list[Any]],
+        device_metric_data: dict[str, Any],
+    ) -> None:
+        """
+        Validate the samples of a schema_version 2 metric, whose device, metric
+        and unit are already checked once for all of them. Valid samples are kept
+        as one compact row, expanded into telemetry rows only at write time.
+        """
+        data_type = device_metric_data["data_type"]
+        valid_samples = []
+
+        for offset, value in samples:
+            if not self._value_matches_data_type(value, data_type):
+                self._add_invalid_record(
+                    index=index,
+                    serial=serial,
+                    ts=sample_ts(ts, offset),
+                    metric=metric_name,
+                    value=value,
+                    unit=unit,
+                    error="type_mismatch",
+                )
+                continue
+            valid_samples.append([offset, value])
+
+        if not valid_samples:
+            return
+
+        self._validated_rows.append(
+            {
+                "device_serial_id": serial,
+                "device_metric_id": device_metric_data["device_metric_id"],
+                "ts": ts,
+                "t": data_type,
+                SAMPLES_FIELD: valid_samples,
+            }
+        )
+        logger.debug(
+            "[%d] Validated metric samples: device=%s metric=%s samples=%d unit=%s",
+            index,
+            serial,
+            metric_name,
+            len(valid_samples),
+            unit,
+        )
+
     def _validate_duplicates(self) -> None:
         """
         Check for duplicate telemetry entries using Redis-based DuplicateChecker.
         Moves duplicates to _invalid_rows and keeps only unique validated rows.
+        Samples of compact rows are checked one by one.
         """
         checker = build_redis_checker()
         unique_valid_items = []
 
         for index, item in enumerate(self._validated_rows):
+            if SAMPLES_FIELD in item:
+                unique_samples = self._unique_samples(checker, index, item)
+                if unique_samples:
+                    unique_valid_items.append({**item, SAMPLES_FIELD: unique_samples})
+                continue
+
             dm_id = item.get("device_metric_id")
             ts = item.get("ts")
             serial = item.get("device_serial_id")
@@ -263,6 +337,25 @@ class TelemetryBatchValidator(BaseValidator):
 
         self._validated_rows = unique_valid_items
 
+    def _unique_samples(self, checker, index: int, item: dict[str, Any]) -> list[list[Any]]:
+        dm_id = item.get("device_metric_id")
+        unique = []
+        for offset, value in item[SAMPLES_FIELD]:
+            ts = sample_ts(item["ts"], offset)
+            if not checker.process(f"{dm_id},{ts}"):
+                self._add_invalid_record(
+                    index=index,
+                    serial=item.get("device_serial_id"),
+                    ts=ts,
+                    metric=None,
+                    value=value,
+                    unit=None,
+                    error="duplicate",
+                )
+                continue
+            unique.append([offset, value])
+        return unique
+
     def _value_matches_data_type(self, value: Any, data_type: str) -> bool:
         type_checkers = {
             "numeric": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
@@ -293,6 +386,10 @@ class TelemetryBatchValidator(BaseValidator):
                 fresh.append(item)
                 continue
 
+            if SAMPLES_FIELD in item:
+                self._split_expired_samples(item, threshold, fresh, expired)
+                continue
+
             if ts < threshold:
                 expired.append(item)
             else:
@@ -307,6 +404,25 @@ class TelemetryBatchValidator(BaseValidator):
             len(expired),
         )
 
+    @staticmethod
+    def _split_expired_samples(
+        item: dict[str, Any],
+        threshold: datetime,
+        fresh: list[dict[str, Any]],
+        expired: list[dict[str, Any]],
+    ) -> None:
+        fresh_samples, expired_samples = [], []
+        for sample in item[SAMPLES_FIELD]:
+            if sample_ts(item["ts"], sample[0]) < threshold:
+                expired_samples.append(sample)
+            else:
+                fresh_samples.append(sample)
+
+        if fresh_samples:
+            fresh.append({**item, SAMPLES_FIELD: fresh_samples})
+        if expired_samples:
+            expired.append({**item, SAMPLES_FIELD: expired_samples})
+
     def _add_invalid_record(
         self,
         *,